@@ -0,0 +1,90 @@
+"""Benchmark of the classification of the lines of the notes by the compiled matchers of the layouts, against the
+slicing of every line once per marker.
+
+python -m benchmarks.broker_layout_benchmark --lines 1000000
+"""
+
+import argparse
+import random
+import time
+from functools import partial
+from typing import Callable, List, Optional
+
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.parsers.brokerage_notes.broker_layout import BrokerLayout, LineKind
+from correpy.parsers.brokerage_notes.broker_layouts import B3_LAYOUT, INTER_LAYOUT, NUINVEST_LAYOUT
+
+TRANSACTION_LINES = [
+    "1-BOVESPA C VISTA PETROBRAS PN N2 100 28,50 2.850,00 D",
+    "BOVESPA V FRACIONARIO ITAUSA PN N1 7 10,12 70,84 C",
+    "N 1-BOVESPA C OPCAO DE COMPRA 03/24 PETRD300 PN 1.000 0,45 450,00 D",
+]
+
+
+def classify_by_slicing(layout: BrokerLayout, line_text: str) -> LineKind:
+    kind = LineKind.NONE
+    if any(line_text[: len(marker)] == marker for marker in layout.transactions_end_markers):
+        kind |= LineKind.END
+    if layout.transaction_row_markers and not any(
+        line_text[: len(marker)] == marker for marker in layout.transaction_row_markers
+    ):
+        kind |= LineKind.END
+    if any(line_text[: len(marker)] == marker for marker in layout.transactions_header_markers):
+        kind |= LineKind.HEADER
+    return kind
+
+
+def get_fee_type_by_slicing(layout: BrokerLayout, line_text: str) -> Optional[BrokerageNoteFeeType]:
+    for header, fee_type in layout.fee_header_map.items():
+        if line_text[: len(header)] == header:
+            return fee_type
+    return None
+
+
+def build_lines(randomizer: random.Random, layout: BrokerLayout, lines: int) -> List[str]:
+    """Lines of the transactions and financial summary sections, most of them transactions and fees"""
+    candidates = [
+        *TRANSACTION_LINES,
+        *(f"{header} 1,23 D" for header in layout.fee_header_map),
+        *layout.transactions_header_markers,
+        *layout.transactions_end_markers,
+        "Valor das operações 2.850,00",
+    ]
+    return randomizer.choices(candidates, k=lines)
+
+
+def measure(lines: List[str], classify: Callable[[str], object], get_fee_type: Callable[[str], object]) -> float:
+    started_at = time.perf_counter()
+    for line_text in lines:
+        classify(line_text)
+        get_fee_type(line_text)
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--lines", type=int, default=1_000_000)
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    for layout in (B3_LAYOUT, INTER_LAYOUT, NUINVEST_LAYOUT):
+        lines = build_lines(randomizer, layout, arguments.lines)
+        assert all(
+            layout.classify_transactions_line(line_text) == classify_by_slicing(layout, line_text)
+            and layout.get_fee_type(line_text) == get_fee_type_by_slicing(layout, line_text)
+            for line_text in lines[:10_000]
+        )
+        sliced = measure(
+            lines,
+            classify=partial(classify_by_slicing, layout),
+            get_fee_type=partial(get_fee_type_by_slicing, layout),
+        )
+        compiled = measure(lines, classify=layout.classify_transactions_line, get_fee_type=layout.get_fee_type)
+        print(
+            f"{layout.name}: {len(lines)} lines, slicing {sliced:.2f}s, compiled matchers {compiled:.2f}s "
+            f"({sliced / compiled:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
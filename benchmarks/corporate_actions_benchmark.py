@@ -0,0 +1,83 @@
+"""Benchmark of the adjustment of note histories by corporate actions.
+
+    python -m benchmarks.corporate_actions_benchmark --clients 200 --years 5
+
+Reports the bulk adjustment throughput, the ingestion of the histories into ledgers with and without events, and
+the time to add a new event to ledgers already built against rebuilding them.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from fractions import Fraction
+from typing import List
+
+from benchmarks.ledger_benchmark import TICKERS, build_client_history
+from correpy.portfolio.corporate_actions import CorporateAction, CorporateActionIndex, CorporateActionType
+from correpy.portfolio.ledger import PositionLedger
+
+
+def build_corporate_actions(*, randomizer: random.Random, years: int, events_per_year: int) -> List[CorporateAction]:
+    corporate_actions = []
+    first_date = date(2015, 1, 2)
+    for ticker in TICKERS:
+        for _ in range(years * events_per_year):
+            action_type = randomizer.choice(list(CorporateActionType))
+            factor = {
+                CorporateActionType.SPLIT: Fraction(randomizer.randint(2, 10)),
+                CorporateActionType.REVERSE_SPLIT: Fraction(1, randomizer.randint(2, 10)),
+                CorporateActionType.BONUS: Fraction(100 + randomizer.randint(1, 50), 100),
+            }[action_type]
+            ex_date = first_date + timedelta(days=randomizer.randint(0, years * 365))
+            corporate_actions.append(CorporateAction(ticker, ex_date, action_type, factor))
+    return corporate_actions
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--clients", type=int, default=200)
+    argument_parser.add_argument("--years", type=int, default=5)
+    argument_parser.add_argument("--notes-per-year", type=int, default=50)
+    argument_parser.add_argument("--events-per-year", type=int, default=1)
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    histories = [
+        build_client_history(randomizer=randomizer, years=arguments.years, notes_per_year=arguments.notes_per_year)
+        for _ in range(arguments.clients)
+    ]
+    corporate_actions = build_corporate_actions(
+        randomizer=randomizer, years=arguments.years, events_per_year=arguments.events_per_year
+    )
+    transactions_count = sum(len(note.transactions) for history in histories for note in history)
+    print(f"{arguments.clients} clients, {transactions_count} transactions, {len(corporate_actions)} events")
+
+    started_at = time.perf_counter()
+    corporate_action_index = CorporateActionIndex(corporate_actions)
+    for history in histories:
+        corporate_action_index.adjust_brokerage_notes(history)
+    elapsed = time.perf_counter() - started_at
+    print(f"bulk adjustment: {elapsed:.2f}s ({transactions_count / elapsed:,.0f} transactions/s)")
+
+    for label, index_corporate_actions in (("without events", []), ("with events", corporate_actions)):
+        started_at = time.perf_counter()
+        ledgers = []
+        for history in histories:
+            ledger = PositionLedger(corporate_actions=CorporateActionIndex(index_corporate_actions))
+            ledger.add_brokerage_notes(history)
+            ledgers.append(ledger)
+        print(f"ledgers {label}: {time.perf_counter() - started_at:.2f}s")
+    rebuild_seconds = time.perf_counter() - started_at
+
+    # The newest event, the usual case, and one in the middle of the histories
+    for ex_date in (date(2015, 1, 2) + timedelta(days=arguments.years * 365), date(2015, 1, 2) + timedelta(days=365)):
+        started_at = time.perf_counter()
+        for ledger in ledgers:
+            ledger.add_corporate_action(CorporateAction("PETR4", ex_date, CorporateActionType.SPLIT, Fraction(2)))
+        elapsed = time.perf_counter() - started_at
+        print(f"new event on {ex_date}: {elapsed * 1000:.1f}ms for every ledger (rebuilding: {rebuild_seconds:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
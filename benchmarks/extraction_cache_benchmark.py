@@ -0,0 +1,60 @@
+"""Benchmark of the extraction stage with MuPDF and replayed from the ExtractionCache, in documents per second.
+
+python -m benchmarks.extraction_cache_benchmark tests/fixtures/b3_one_page.pdf --documents 200 --pages 5
+"""
+
+import argparse
+import tempfile
+import time
+from typing import List
+
+import fitz
+
+from correpy.pipeline.brokerage_notes import build_sections, extract_document, extract_lines
+from correpy.pipeline.extraction_cache import ExtractionCache, get_document_digest
+from correpy.pipeline.products import DocumentJob
+
+
+def build_documents(path: str, documents: int, pages: int) -> List[bytes]:
+    """Each document gets different metadata, so every one has its own digest"""
+    one_page_document = fitz.open(path)
+    contents = []
+    for index in range(documents):
+        document = fitz.open()
+        for _ in range(pages):
+            document.insert_pdf(one_page_document)
+        document.set_metadata({"title": str(index)})
+        contents.append(document.tobytes())
+    return contents
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("path")
+    argument_parser.add_argument("--documents", type=int, default=200)
+    argument_parser.add_argument("--pages", type=int, default=5)
+    arguments = argument_parser.parse_args()
+
+    contents = build_documents(arguments.path, arguments.documents, arguments.pages)
+    assert len({get_document_digest(content) for content in contents}) == len(contents)
+
+    with tempfile.TemporaryDirectory() as directory:
+        extraction_cache = ExtractionCache(directory)
+        for label in ("mupdf", "cache"):
+            started_at = time.perf_counter()
+            extracted_documents = [
+                extract_document(DocumentJob(source=content), extraction_cache=extraction_cache) for content in contents
+            ]
+            extraction_elapsed = time.perf_counter() - started_at
+            for extracted_document in extracted_documents:
+                extract_lines(build_sections(extracted_document))
+            parsing_elapsed = time.perf_counter() - started_at - extraction_elapsed
+            print(
+                f"{label}: extraction {extraction_elapsed:.2f}s ({len(contents) / extraction_elapsed:,.0f} documents/s),"
+                f" sections and lines {parsing_elapsed:.2f}s"
+            )
+        print(f"hits {extraction_cache.stats.hits}, misses {extraction_cache.stats.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark of the validation of the fees of many notes against a fee schedule.
+
+python -m benchmarks.fee_estimator_benchmark --clients 3000
+"""
+
+import argparse
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from benchmarks.ledger_benchmark import build_client_history
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.fees.fee_estimator import HAS_NUMPY, FeeEstimator
+from correpy.fees.fee_schedule import FeeRate, FeeSchedule
+
+FEE_SCHEDULE = FeeSchedule(
+    [
+        FeeRate(BrokerageNoteFeeType.SETTLEMENT_FEE, date(2015, 1, 1), Decimal("0.000275"), Decimal("0.0002")),
+        FeeRate(BrokerageNoteFeeType.SETTLEMENT_FEE, date(2019, 11, 1), Decimal("0.00025"), Decimal("0.00018")),
+        FeeRate(BrokerageNoteFeeType.EMOLUMENTS, date(2015, 1, 1), Decimal("0.00004"), Decimal("0.00004")),
+        FeeRate(BrokerageNoteFeeType.EMOLUMENTS, date(2019, 11, 1), Decimal("0.00005"), Decimal("0.00005")),
+    ]
+)
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--clients", type=int, default=3000)
+    argument_parser.add_argument("--years", type=int, default=5)
+    argument_parser.add_argument("--notes-per-year", type=int, default=24)
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    brokerage_notes = [
+        brokerage_note
+        for _ in range(arguments.clients)
+        for brokerage_note in build_client_history(
+            randomizer=randomizer, years=arguments.years, notes_per_year=arguments.notes_per_year
+        )
+    ]
+    print(f"{len(brokerage_notes)} notes")
+
+    fee_estimator = FeeEstimator(FEE_SCHEDULE, use_numpy=False)
+    started_at = time.perf_counter()
+    columns = fee_estimator.load_columns(brokerage_notes)
+    print(f"columns: {time.perf_counter() - started_at:.2f}s")
+
+    # Parsed fees as charged, except for 1% of the notes
+    for fee_type, expected_fees in fee_estimator.estimate_columns(columns).items():
+        columns.fees[fee_type] = [
+            (expected_fee or 0.0) * (10 if randomizer.random() < 0.01 else 1) for expected_fee in expected_fees
+        ]
+
+    for use_numpy in (False, True) if HAS_NUMPY else (False,):
+        fee_estimator = FeeEstimator(FEE_SCHEDULE, use_numpy=use_numpy)
+        started_at = time.perf_counter()
+        deviations = fee_estimator.find_column_deviations(columns)
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"{'numpy' if use_numpy else 'python'}: {elapsed:.3f}s "
+            f"({len(brokerage_notes) / elapsed:,.0f} notes/s), {len(deviations)} deviations"
+        )
+
+
+if __name__ == "__main__":
+    main()
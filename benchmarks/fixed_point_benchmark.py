@@ -0,0 +1,72 @@
+"""Benchmark of the aggregations of fees, volume and withheld taxes with Decimals and with fixed-point integers.
+
+python -m benchmarks.fixed_point_benchmark --clients 3000
+"""
+
+import argparse
+import random
+import time
+from decimal import Decimal
+
+from benchmarks.ledger_benchmark import build_client_history
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE
+from correpy.domain.fixed_point import (
+    FixedPointBrokerageNote,
+    sum_fees,
+    sum_source_withheld_taxes,
+    sum_volume,
+)
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--clients", type=int, default=3000)
+    argument_parser.add_argument("--years", type=int, default=5)
+    argument_parser.add_argument("--notes-per-year", type=int, default=24)
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    brokerage_notes = [
+        brokerage_note
+        for _ in range(arguments.clients)
+        for brokerage_note in build_client_history(
+            randomizer=randomizer, years=arguments.years, notes_per_year=arguments.notes_per_year
+        )
+    ]
+    transactions = [transaction for brokerage_note in brokerage_notes for transaction in brokerage_note.transactions]
+    print(f"{len(brokerage_notes)} notes, {len(transactions)} transactions")
+
+    started_at = time.perf_counter()
+    fixed_point_brokerage_notes = [
+        FixedPointBrokerageNote.from_brokerage_note(brokerage_note) for brokerage_note in brokerage_notes
+    ]
+    fixed_point_transactions = [
+        transaction for brokerage_note in fixed_point_brokerage_notes for transaction in brokerage_note.transactions
+    ]
+    print(f"conversion: {time.perf_counter() - started_at:.2f}s")
+
+    started_at = time.perf_counter()
+    decimal_fees = {
+        fee_type: sum((getattr(brokerage_note, field_name) for brokerage_note in brokerage_notes), Decimal(0))
+        for fee_type, field_name in FEE_FIELD_NAME_BY_FEE_TYPE.items()
+    }
+    decimal_volume = sum((transaction.amount * transaction.unit_price for transaction in transactions), Decimal(0))
+    decimal_taxes = sum((transaction.source_withheld_taxes for transaction in transactions), Decimal(0))
+    decimal_elapsed = time.perf_counter() - started_at
+    print(f"decimal: {decimal_elapsed:.3f}s ({len(transactions) / decimal_elapsed:,.0f} transactions/s)")
+
+    started_at = time.perf_counter()
+    fixed_point_fees = sum_fees(fixed_point_brokerage_notes)
+    fixed_point_volume = sum_volume(fixed_point_transactions)
+    fixed_point_taxes = sum_source_withheld_taxes(fixed_point_transactions)
+    fixed_point_elapsed = time.perf_counter() - started_at
+    print(f"fixed point: {fixed_point_elapsed:.3f}s ({len(transactions) / fixed_point_elapsed:,.0f} transactions/s)")
+    print(f"speedup: {decimal_elapsed / fixed_point_elapsed:.1f}x")
+
+    assert fixed_point_fees == decimal_fees
+    assert fixed_point_volume == decimal_volume
+    assert fixed_point_taxes == decimal_taxes
+
+
+if __name__ == "__main__":
+    main()
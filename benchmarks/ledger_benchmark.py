@@ -0,0 +1,89 @@
+"""Ingestion benchmark of the PositionLedger over synthetic multi-year histories of many clients.
+
+    python -m benchmarks.ledger_benchmark --clients 200 --years 5
+
+Reports the total ingestion throughput and the mean time to add one note at the start and at the end of the
+histories, which should stay flat since adding a note does not depend on the history size.
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import List
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.security import Security
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.enums import TransactionType
+from correpy.portfolio.ledger import PositionLedger
+
+TICKERS = [
+    f"{prefix}{suffix}" for prefix in ("VALE", "PETR", "ITSA", "BBAS", "WEGE", "MGLU", "BBSE") for suffix in (3, 4)
+]
+
+
+def build_client_history(*, randomizer: random.Random, years: int, notes_per_year: int) -> List[BrokerageNote]:
+    brokerage_notes = []
+    first_date = date(2015, 1, 2)
+    for note_index in range(years * notes_per_year):
+        transactions = [
+            Transaction(
+                transaction_type=randomizer.choice(list(TransactionType)),
+                amount=Decimal(randomizer.randint(1, 50) * 100),
+                unit_price=Decimal(randomizer.randint(500, 10000)) / 100,
+                security=Security(name=f"{randomizer.choice(TICKERS)} ON NM"),
+            )
+            for _ in range(randomizer.randint(1, 5))
+        ]
+        brokerage_notes.append(
+            BrokerageNote(
+                reference_id=note_index,
+                reference_date=first_date + timedelta(days=note_index * 365 // notes_per_year),
+                settlement_fee=Decimal(randomizer.randint(1, 500)) / 100,
+                emoluments=Decimal(randomizer.randint(1, 100)) / 100,
+                transactions=transactions,
+            )
+        )
+    return brokerage_notes
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--clients", type=int, default=200)
+    argument_parser.add_argument("--years", type=int, default=5)
+    argument_parser.add_argument("--notes-per-year", type=int, default=50)
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    histories = [
+        build_client_history(randomizer=randomizer, years=arguments.years, notes_per_year=arguments.notes_per_year)
+        for _ in range(arguments.clients)
+    ]
+    notes_count = sum(len(history) for history in histories)
+    transactions_count = sum(len(note.transactions) for history in histories for note in history)
+
+    first_notes_seconds = last_notes_seconds = 0.0
+    window = max(len(histories[0]) // 10, 1)
+    started_at = time.perf_counter()
+    for history in histories:
+        ledger = PositionLedger()
+        for note_index, brokerage_note in enumerate(history):
+            note_started_at = time.perf_counter()
+            ledger.add_brokerage_note(brokerage_note)
+            elapsed = time.perf_counter() - note_started_at
+            if note_index < window:
+                first_notes_seconds += elapsed
+            elif note_index >= len(history) - window:
+                last_notes_seconds += elapsed
+    total_seconds = time.perf_counter() - started_at
+
+    print(f"{arguments.clients} clients, {notes_count} notes, {transactions_count} transactions")
+    print(f"ingestion: {total_seconds:.2f}s ({notes_count / total_seconds:,.0f} notes/s)")
+    print(f"mean per note, first {window} notes: {first_notes_seconds / (window * len(histories)) * 1e6:.1f}us")
+    print(f"mean per note, last {window} notes: {last_notes_seconds / (window * len(histories)) * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark of the resolution of the tickers of security names, against a linear scan of every reference name.
+
+python -m benchmarks.name_resolver_benchmark --companies 3000 --transactions 1000000
+"""
+
+import argparse
+import difflib
+import random
+import string
+import time
+from typing import List, Optional, Tuple
+
+from correpy.instruments.name_resolver import NameResolver, split_security_name
+
+SHARE_CLASSES = ["ON", "PN", "UNT"]
+SEGMENTS = ["NM", "N1", "N2", ""]
+
+
+def build_reference(randomizer: random.Random, companies: int) -> List[Tuple[str, str, str]]:
+    """Corporate name, name printed in the notes and ticker of each share class of the companies"""
+    reference = []
+    for company_index in range(companies):
+        words = ["".join(randomizer.choices(string.ascii_uppercase, k=randomizer.randint(3, 9))) for _ in range(3)]
+        # The notes abbreviate the first word, e.g. "MAGAZ LUIZA", so most names are not prefixes of the reference
+        short_name = f"{words[0][: randomizer.randint(3, len(words[0]))]} {words[1]}"
+        ticker_root = f"{words[0][:3]}{string.ascii_uppercase[company_index % 26]}"
+        for share_class, ticker_suffix in zip(SHARE_CLASSES, ("3", "4", "11")):
+            segment = randomizer.choice(SEGMENTS)
+            reference.append(
+                (
+                    f"{' '.join(words)} S.A. {share_class} {segment}",
+                    f"{short_name} {share_class} {segment}".strip(),
+                    f"{ticker_root}{ticker_suffix}",
+                )
+            )
+    return reference
+
+
+def resolve_by_scan(reference: List[Tuple[str, str]], name: str) -> Optional[str]:
+    base, share_class = split_security_name(name)
+    best_ratio, best_ticker = 0.0, None
+    for reference_name, ticker in reference:
+        reference_base, reference_share_class = split_security_name(reference_name)
+        if reference_share_class == share_class:
+            ratio = difflib.SequenceMatcher(None, base, reference_base).ratio()
+            if ratio > best_ratio:
+                best_ratio, best_ticker = ratio, ticker
+    return best_ticker
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--companies", type=int, default=3000)
+    argument_parser.add_argument("--transactions", type=int, default=1_000_000)
+    argument_parser.add_argument("--scanned-names", type=int, default=20)
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    reference = build_reference(randomizer, arguments.companies)
+    instrument_names = [(corporate_name, ticker) for corporate_name, _, ticker in reference]
+    expected_tickers = {note_name: ticker for _, note_name, ticker in reference}
+    note_names = list(expected_tickers)
+
+    started_at = time.perf_counter()
+    name_resolver = NameResolver(instrument_names)
+    print(f"{len(instrument_names)} reference names compiled: {time.perf_counter() - started_at:.2f}s")
+
+    started_at = time.perf_counter()
+    resolved_tickers = {note_name: name_resolver.resolve(note_name) for note_name in note_names}
+    elapsed = time.perf_counter() - started_at
+    resolved = sum(ticker == expected_tickers[note_name] for note_name, ticker in resolved_tickers.items())
+    unresolved = sum(ticker is None for ticker in resolved_tickers.values())
+    print(
+        f"{len(note_names)} distinct names: {elapsed:.2f}s ({len(note_names) / elapsed:,.0f} names/s), "
+        f"{resolved} right, {unresolved} unresolved, {len(note_names) - resolved - unresolved} wrong"
+    )
+
+    transaction_names = randomizer.choices(note_names, k=arguments.transactions)
+    started_at = time.perf_counter()
+    for transaction_name in transaction_names:
+        name_resolver.resolve(transaction_name)
+    elapsed = time.perf_counter() - started_at
+    print(f"{len(transaction_names)} transactions: {elapsed:.2f}s ({len(transaction_names) / elapsed:,.0f}/s)")
+
+    scanned_names = note_names[: arguments.scanned_names]
+    started_at = time.perf_counter()
+    for note_name in scanned_names:
+        resolve_by_scan(instrument_names, note_name)
+    elapsed = time.perf_counter() - started_at
+    print(f"linear scan: {elapsed / len(scanned_names) * 1000:.1f}ms per distinct name")
+
+
+if __name__ == "__main__":
+    main()
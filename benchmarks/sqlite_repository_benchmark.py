@@ -0,0 +1,59 @@
+"""Benchmark of the SQLiteNoteRepository ingest and streamed load, in transactions per second.
+
+python -m benchmarks.sqlite_repository_benchmark --clients 2000 --path /tmp/notes.sqlite
+"""
+
+import argparse
+import os
+import random
+import time
+
+from benchmarks.ledger_benchmark import build_client_history
+from correpy.storage.sqlite_repository import SQLiteNoteRepository
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--clients", type=int, default=2000)
+    argument_parser.add_argument("--years", type=int, default=1)
+    argument_parser.add_argument("--notes-per-year", type=int, default=24)
+    argument_parser.add_argument("--batch-size", type=int, default=5000)
+    argument_parser.add_argument("--path", default=":memory:")
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    brokerage_notes = []
+    for _ in range(arguments.clients):
+        for brokerage_note in build_client_history(
+            randomizer=randomizer, years=arguments.years, notes_per_year=arguments.notes_per_year
+        ):
+            # Every client shares the same note numbers, so they are renumbered to keep one row per note
+            brokerage_note.reference_id = len(brokerage_notes)
+            brokerage_notes.append(brokerage_note)
+    transactions_count = sum(len(brokerage_note.transactions) for brokerage_note in brokerage_notes)
+
+    if arguments.path != ":memory:" and os.path.exists(arguments.path):
+        os.remove(arguments.path)
+    with SQLiteNoteRepository(path=arguments.path, batch_size=arguments.batch_size) as repository:
+        started_at = time.perf_counter()
+        repository.save_brokerage_notes(brokerage_notes)
+        elapsed = time.perf_counter() - started_at
+        print(f"ingest: {transactions_count} transactions in {elapsed:.2f}s ({transactions_count / elapsed:,.0f}/s)")
+
+        started_at = time.perf_counter()
+        repository.save_brokerage_notes(brokerage_notes)
+        elapsed = time.perf_counter() - started_at
+        print(f"upsert: {transactions_count} transactions in {elapsed:.2f}s ({transactions_count / elapsed:,.0f}/s)")
+
+        started_at = time.perf_counter()
+        loaded_transactions_count = sum(
+            len(brokerage_note.transactions) for brokerage_note in repository.iter_brokerage_notes()
+        )
+        elapsed = time.perf_counter() - started_at
+        print(
+            f"load: {loaded_transactions_count} transactions in {elapsed:.2f}s ({loaded_transactions_count / elapsed:,.0f}/s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
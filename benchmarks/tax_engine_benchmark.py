@@ -0,0 +1,41 @@
+"""Benchmark of the CapitalGainsTaxEngine, with NumPy and with the plain Python fallback.
+
+python -m benchmarks.tax_engine_benchmark --clients 10000 --years 1
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.ledger_benchmark import build_client_history
+from correpy.taxes.capital_gains import HAS_NUMPY, CapitalGainsTaxEngine, TransactionColumns
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser()
+    argument_parser.add_argument("--clients", type=int, default=10000)
+    argument_parser.add_argument("--years", type=int, default=1)
+    argument_parser.add_argument("--notes-per-year", type=int, default=24)
+    arguments = argument_parser.parse_args()
+
+    randomizer = random.Random(42)
+    brokerage_notes_by_client = {
+        f"client-{client_index}": build_client_history(
+            randomizer=randomizer, years=arguments.years, notes_per_year=arguments.notes_per_year
+        )
+        for client_index in range(arguments.clients)
+    }
+
+    started_at = time.perf_counter()
+    columns = TransactionColumns.from_brokerage_notes(brokerage_notes_by_client)
+    print(f"{len(columns.amounts)} transactions loaded into columns in {time.perf_counter() - started_at:.2f}s")
+
+    for use_numpy in (True, False) if HAS_NUMPY else (False,):
+        started_at = time.perf_counter()
+        results = CapitalGainsTaxEngine(use_numpy=use_numpy).compute_columns(columns)
+        elapsed = time.perf_counter() - started_at
+        print(f"{'numpy' if use_numpy else 'python'}: {len(results)} client-months in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
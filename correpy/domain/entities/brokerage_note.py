@@ -1,12 +1,26 @@
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
-from typing import List
+from typing import Dict, List
 
 from correpy.domain.entities.transaction import Transaction
 from correpy.domain.enums import BrokerageNoteFeeType
 from correpy.domain.exceptions import InvalidBrokerageNoteFeeTypeException
 
+FEE_FIELD_NAME_BY_FEE_TYPE = {
+    BrokerageNoteFeeType.SETTLEMENT_FEE: "settlement_fee",
+    BrokerageNoteFeeType.REGISTRATION_FE: "registration_fee",
+    BrokerageNoteFeeType.TERM_FEE: "term_fee",
+    BrokerageNoteFeeType.ANA_FEE: "ana_fee",
+    BrokerageNoteFeeType.EMOLUMENTS: "emoluments",
+    BrokerageNoteFeeType.OPERATIONAL_FEE: "operational_fee",
+    BrokerageNoteFeeType.EXECUTION: "execution",
+    BrokerageNoteFeeType.CUSTODY_FEE: "custody_fee",
+    BrokerageNoteFeeType.IRRF: "irrf",
+    BrokerageNoteFeeType.TAXES: "taxes",
+    BrokerageNoteFeeType.OTHERS: "others",
+}
+
 
 @dataclass
 class BrokerageNote:  # pylint:disable=too-many-instance-attributes
@@ -25,9 +39,19 @@ class BrokerageNote:  # pylint:disable=too-many-instance-attributes
     others: Decimal = Decimal(0)
     transactions: List[Transaction] = field(default_factory=list)
 
+    @property
+    def fees_by_fee_type(self) -> Dict[BrokerageNoteFeeType, Decimal]:
+        return {fee_type: getattr(self, field_name) for fee_type, field_name in FEE_FIELD_NAME_BY_FEE_TYPE.items()}
+
     def add_transaction(self, transaction: Transaction) -> None:
         self.transactions.append(transaction)
 
+    def merge(self, brokerage_note: "BrokerageNote") -> None:
+        """Adds the fees and transactions of a partial note with the same reference id and date"""
+        for fee_type, fee_value in brokerage_note.fees_by_fee_type.items():
+            self.update_fee_from_fee_type(fee_type=fee_type, fee_value=fee_value)
+        self.transactions.extend(brokerage_note.transactions)
+
     def update_fee_from_fee_type(self, fee_type: BrokerageNoteFeeType, fee_value: Decimal) -> None:
         if fee_type == BrokerageNoteFeeType.SETTLEMENT_FEE:
             self.settlement_fee += fee_value
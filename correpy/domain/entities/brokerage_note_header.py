@@ -0,0 +1,18 @@
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+
+@dataclass
+class BrokerageNoteHeader:
+    """Identification of a note, read without parsing its transactions and fees.
+
+    `net_value` is negative when it is a debit (D) to the client and None if no page of the note has it.
+    """
+
+    reference_id: int
+    reference_date: date
+    broker_cnpj: Optional[str] = None
+    net_value: Optional[Decimal] = None
+    page_numbers: List[int] = field(default_factory=list)
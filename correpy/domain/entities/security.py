@@ -2,6 +2,8 @@ import re
 from dataclasses import dataclass
 from typing import Optional
 
+from correpy.domain.enums import SecurityType
+
 # 3	Ordinárias / VALE3
 # 4	Preferenciais / GGBR4
 # 5	Preferenciais Classe A / USIM5
@@ -19,10 +21,14 @@ BDR_TICKER_PATTERN = "([A-Z-0-9]{4})(31|32|33|34|35|36|39)"
 class Security:
     name: str
     ticker: Optional[str] = None
+    security_type: Optional[SecurityType] = None
 
     def __post_init__(self) -> None:
+        """The ticker is extracted from the name unless given. The type is only the given one, parsers classify the
+        securities with correpy.instruments.security_classifier."""
         self.__cleanup_name()
-        self.ticker = self.extract_ticker_from_name()
+        if self.ticker is None:
+            self.ticker = self.extract_ticker_from_name()
 
     def __cleanup_name(self) -> None:
         self.name = re.sub(r"#[a-zA-z0-9]*", "", self.name)
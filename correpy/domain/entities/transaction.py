@@ -20,3 +20,8 @@ class Transaction:
             self.source_withheld_taxes = Decimal(
                 round(self.unit_price * self.amount * BRAZIL_SOURCE_WITHHELD_TAX_PERCENTAGE / 100, 2)
             )
+
+
+def get_position_key(transaction: Transaction) -> str:
+    """Positions are kept by ticker, or by the security name when the ticker is unknown"""
+    return transaction.security.ticker or transaction.security.name
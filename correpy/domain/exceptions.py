@@ -1,2 +1,6 @@
 class InvalidBrokerageNoteFeeTypeException(Exception):
     pass
+
+
+class InvalidFixedPointValueException(Exception):
+    pass
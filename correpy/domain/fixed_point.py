@@ -0,0 +1,177 @@
+"""Optional fixed-point representation of the money of the domain.
+
+Fees and withheld taxes are integers of centavos and unit prices integers at a configurable scale (e.g. 1000 for
+prices with 3 decimal places), so aggregations are exact integer sums. Values are converted from and to Decimal
+only when a BrokerageNote or a Transaction is converted.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List, NamedTuple
+
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE, BrokerageNote
+from correpy.domain.entities.security import Security
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+from correpy.domain.exceptions import InvalidFixedPointValueException
+
+CENTS_SCALE = 100
+DEFAULT_UNIT_PRICE_SCALE = CENTS_SCALE
+# BRAZIL_SOURCE_WITHHELD_TAX_PERCENTAGE (0.005%) of the volume in centavos is volume / 200
+SOURCE_WITHHELD_TAX_DIVISOR = 200
+
+FEE_TYPES = list(FEE_FIELD_NAME_BY_FEE_TYPE)
+
+
+def to_scaled_int(value: Decimal, scale: int) -> int:
+    """Raises when the value has more decimal places than the scale holds, instead of silently rounding"""
+    scaled_value = value * scale
+    if scaled_value != scaled_value.to_integral_value():
+        raise InvalidFixedPointValueException(f"Value {value} can not be represented with scale {scale}")
+    return int(scaled_value)
+
+
+def round_to_scaled_int(value: Decimal, scale: int) -> int:
+    """Rounds half up the decimal places the scale does not hold, e.g. a volume with fractions of a centavo"""
+    return int((value * scale).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_scaled_int(value: int, scale: int) -> Decimal:
+    """Powers of ten keep their number of decimal places, so 100 centavos is Decimal("1.00")"""
+    decimal_places = len(str(scale)) - 1
+    if 10**decimal_places == scale:
+        return Decimal(value).scaleb(-decimal_places)
+    return Decimal(value) / scale
+
+
+def divide_rounding_half_up(dividend: int, divisor: int) -> int:
+    quotient, remainder = divmod(abs(dividend), divisor)
+    if 2 * remainder >= divisor:
+        quotient += 1
+    return quotient if dividend >= 0 else -quotient
+
+
+def compute_source_withheld_taxes_in_cents(*, amount: int, unit_price: int, unit_price_scale: int) -> int:
+    """Same result as Transaction.__post_init__: BRAZIL_SOURCE_WITHHELD_TAX_PERCENTAGE is built from a float slightly
+    above 0.005, so exact halves of a centavo are rounded up there as well.
+    """
+    return divide_rounding_half_up(amount * unit_price, SOURCE_WITHHELD_TAX_DIVISOR * unit_price_scale)
+
+
+class FixedPointTransaction(NamedTuple):
+    transaction_type: TransactionType
+    amount: int
+    unit_price: int
+    security: Security
+    source_withheld_taxes: int
+    unit_price_scale: int = DEFAULT_UNIT_PRICE_SCALE
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        transaction_type: TransactionType,
+        amount: int,
+        unit_price: int,
+        security: Security,
+        unit_price_scale: int = DEFAULT_UNIT_PRICE_SCALE,
+    ) -> "FixedPointTransaction":
+        """Computes the withheld taxes of sells with integers, as Transaction does with Decimals"""
+        source_withheld_taxes = 0
+        if transaction_type == TransactionType.SELL:
+            source_withheld_taxes = compute_source_withheld_taxes_in_cents(
+                amount=amount, unit_price=unit_price, unit_price_scale=unit_price_scale
+            )
+        return cls(transaction_type, amount, unit_price, security, source_withheld_taxes, unit_price_scale)
+
+    @classmethod
+    def from_transaction(
+        cls, transaction: Transaction, unit_price_scale: int = DEFAULT_UNIT_PRICE_SCALE
+    ) -> "FixedPointTransaction":
+        return cls(
+            transaction_type=transaction.transaction_type,
+            amount=to_scaled_int(transaction.amount, 1),
+            unit_price=to_scaled_int(transaction.unit_price, unit_price_scale),
+            security=transaction.security,
+            source_withheld_taxes=to_scaled_int(transaction.source_withheld_taxes, CENTS_SCALE),
+            unit_price_scale=unit_price_scale,
+        )
+
+    @property
+    def volume(self) -> int:
+        """Amount times unit price, at the unit price scale"""
+        return self.amount * self.unit_price
+
+    def to_transaction(self) -> Transaction:
+        transaction = Transaction(
+            transaction_type=self.transaction_type,
+            amount=Decimal(self.amount),
+            unit_price=from_scaled_int(self.unit_price, self.unit_price_scale),
+            security=self.security,
+        )
+        transaction.source_withheld_taxes = from_scaled_int(self.source_withheld_taxes, CENTS_SCALE)
+        return transaction
+
+
+@dataclass
+class FixedPointBrokerageNote:
+    reference_id: int
+    reference_date: date
+    fees: List[int] = field(default_factory=lambda: [0] * len(FEE_TYPES))
+    transactions: List[FixedPointTransaction] = field(default_factory=list)
+
+    @classmethod
+    def from_brokerage_note(
+        cls, brokerage_note: BrokerageNote, unit_price_scale: int = DEFAULT_UNIT_PRICE_SCALE
+    ) -> "FixedPointBrokerageNote":
+        return cls(
+            reference_id=brokerage_note.reference_id,
+            reference_date=brokerage_note.reference_date,
+            fees=[
+                to_scaled_int(getattr(brokerage_note, field_name), CENTS_SCALE)
+                for field_name in FEE_FIELD_NAME_BY_FEE_TYPE.values()
+            ],
+            transactions=[
+                FixedPointTransaction.from_transaction(transaction, unit_price_scale=unit_price_scale)
+                for transaction in brokerage_note.transactions
+            ],
+        )
+
+    @property
+    def fees_by_fee_type(self) -> Dict[BrokerageNoteFeeType, int]:
+        return dict(zip(FEE_TYPES, self.fees))
+
+    def to_brokerage_note(self) -> BrokerageNote:
+        fees: Dict[str, Decimal] = {
+            field_name: from_scaled_int(fee_value, CENTS_SCALE)
+            for field_name, fee_value in zip(FEE_FIELD_NAME_BY_FEE_TYPE.values(), self.fees)
+        }
+        transactions = [transaction.to_transaction() for transaction in self.transactions]
+        return BrokerageNote(
+            reference_id=self.reference_id, reference_date=self.reference_date, transactions=transactions, **fees
+        )
+
+
+def sum_fees(brokerage_notes: Iterable[FixedPointBrokerageNote]) -> Dict[BrokerageNoteFeeType, Decimal]:
+    totals = [0] * len(FEE_TYPES)
+    for brokerage_note in brokerage_notes:
+        for fee_index, fee_value in enumerate(brokerage_note.fees):
+            totals[fee_index] += fee_value
+    return {fee_type: from_scaled_int(total, CENTS_SCALE) for fee_type, total in zip(FEE_TYPES, totals)}
+
+
+def sum_volume(transactions: Iterable[FixedPointTransaction]) -> Decimal:
+    """Transactions may have different unit price scales, so volumes are summed per scale"""
+    volumes_by_scale: Dict[int, int] = {}
+    for transaction in transactions:
+        volumes_by_scale[transaction.unit_price_scale] = (
+            volumes_by_scale.get(transaction.unit_price_scale, 0) + transaction.volume
+        )
+    return sum(
+        (from_scaled_int(volume, unit_price_scale) for unit_price_scale, volume in volumes_by_scale.items()), Decimal(0)
+    )
+
+
+def sum_source_withheld_taxes(transactions: Iterable[FixedPointTransaction]) -> Decimal:
+    return from_scaled_int(sum(transaction.source_withheld_taxes for transaction in transactions), CENTS_SCALE)
@@ -0,0 +1,11 @@
+from typing import Type, TypeVar
+
+EntityT = TypeVar("EntityT")
+
+
+def build_new_entity(entity_class: Type[EntityT], **fields: object) -> EntityT:
+    """Rebuilds an entity from values already cleaned and derived, without running __post_init__ again, so stored or
+    encoded entities come back with exactly the same values"""
+    entity = entity_class.__new__(entity_class)
+    entity.__dict__.update(fields)
+    return entity
@@ -0,0 +1,2 @@
+class InvalidFeeScheduleException(Exception):
+    pass
@@ -0,0 +1,231 @@
+"""Validation of the fees of the notes against the fees expected from a FeeSchedule.
+
+The expected fee of a note is its swing trade volume times the rate of the date of the note, plus its day trade
+volume (the same ticker bought and sold in the note) times the day trade rate, rounded to cents. Notes are loaded
+into columns and, with NumPy installed, the rates of every note are found with one vectorized binary search per fee
+type, falling back to plain Python otherwise.
+"""
+
+import typing
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE, BrokerageNote
+from correpy.domain.entities.transaction import get_position_key
+from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+from correpy.fees.fee_schedule import FeeSchedule
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+
+# Fees are charged in cents, brokers truncate or round them
+DEFAULT_ABSOLUTE_TOLERANCE = 0.01
+DEFAULT_RELATIVE_TOLERANCE = 0.01
+# Float errors of values in cents, so a deviation equal to the tolerance is not flagged
+TOLERANCE_EPSILON = 1e-9
+
+
+def _get_note_volumes(brokerage_note: BrokerageNote) -> Tuple[Decimal, Decimal]:
+    """Swing trade and day trade volumes of a note"""
+    # Buy amount, buy value, sell amount and sell value by ticker
+    trades: Dict[str, List[Decimal]] = {}
+    volume = Decimal(0)
+    for transaction in brokerage_note.transactions:
+        trade = trades.setdefault(get_position_key(transaction), [Decimal(0)] * 4)
+        value = transaction.amount * transaction.unit_price
+        offset = 0 if transaction.transaction_type == TransactionType.BUY else 2
+        trade[offset] += transaction.amount
+        trade[offset + 1] += value
+        volume += value
+    day_trade_volume = Decimal(0)
+    for buy_amount, buy_value, sell_amount, sell_value in trades.values():
+        if buy_amount and sell_amount:
+            day_trade_volume += min(buy_amount, sell_amount) * (buy_value / buy_amount + sell_value / sell_amount)
+    return volume - day_trade_volume, day_trade_volume
+
+
+@dataclass
+class NoteFeeColumns:
+    """Notes in columns: their dates, swing trade and day trade volumes and the fees parsed from them"""
+
+    reference_ids: List[int] = field(default_factory=list)
+    reference_dates: List[date] = field(default_factory=list)
+    day_ordinals: List[int] = field(default_factory=list)
+    swing_trade_volumes: List[float] = field(default_factory=list)
+    day_trade_volumes: List[float] = field(default_factory=list)
+    fees: Dict[BrokerageNoteFeeType, List[float]] = field(default_factory=dict)
+
+    @classmethod
+    def from_brokerage_notes(
+        cls, brokerage_notes: Iterable[BrokerageNote], fee_types: Iterable[BrokerageNoteFeeType]
+    ) -> "NoteFeeColumns":
+        columns = cls(fees={fee_type: [] for fee_type in fee_types})
+        fee_field_names = [(FEE_FIELD_NAME_BY_FEE_TYPE[fee_type], fees) for fee_type, fees in columns.fees.items()]
+        for brokerage_note in brokerage_notes:
+            swing_trade_volume, day_trade_volume = _get_note_volumes(brokerage_note)
+            columns.reference_ids.append(brokerage_note.reference_id)
+            columns.reference_dates.append(brokerage_note.reference_date)
+            columns.day_ordinals.append(brokerage_note.reference_date.toordinal())
+            columns.swing_trade_volumes.append(float(swing_trade_volume))
+            columns.day_trade_volumes.append(float(day_trade_volume))
+            for field_name, fees in fee_field_names:
+                fees.append(float(getattr(brokerage_note, field_name)))
+        return columns
+
+
+@dataclass
+class FeeDeviation:
+    """A parsed fee farther from the expected fee than the tolerance. `note_index` is the position of the note."""
+
+    note_index: int
+    reference_id: int
+    reference_date: date
+    fee_type: BrokerageNoteFeeType
+    parsed_fee: Decimal
+    expected_fee: Decimal
+
+
+def _to_cents(value: float) -> Decimal:
+    # Adding zero turns -0.00 into 0.00
+    return Decimal(f"{value:.2f}") + 0
+
+
+class FeeEstimator:
+    """Expected fees of the fee types of the schedule. Notes dated before the first rate of a fee type are not
+    checked for it, nor are the fee types missing from the schedule.
+
+    A fee deviates when it differs from the expected one by more than the absolute tolerance and by more than the
+    relative tolerance of the expected fee.
+    """
+
+    def __init__(
+        self,
+        fee_schedule: FeeSchedule,
+        absolute_tolerance: float = DEFAULT_ABSOLUTE_TOLERANCE,
+        relative_tolerance: float = DEFAULT_RELATIVE_TOLERANCE,
+        use_numpy: Optional[bool] = None,
+    ) -> None:
+        self.fee_schedule = fee_schedule
+        self.absolute_tolerance = absolute_tolerance
+        self.relative_tolerance = relative_tolerance
+        self.use_numpy = HAS_NUMPY if use_numpy is None else use_numpy
+        if self.use_numpy and not HAS_NUMPY:
+            raise ImportError("NumPy is not installed")
+
+    def load_columns(self, brokerage_notes: Iterable[BrokerageNote]) -> NoteFeeColumns:
+        return NoteFeeColumns.from_brokerage_notes(brokerage_notes, fee_types=self.fee_schedule.fee_types)
+
+    def estimate_columns(self, columns: NoteFeeColumns) -> Dict[BrokerageNoteFeeType, List[Optional[float]]]:
+        """Expected fee of each note by fee type, None before the first rate of the fee type"""
+        if self.use_numpy:
+            return {
+                fee_type: [None if np.isnan(fee) else float(fee) for fee in expected_fees]
+                for fee_type, expected_fees in _estimate_with_numpy(self.fee_schedule, columns).items()
+            }
+        return _estimate_with_python(self.fee_schedule, columns)
+
+    def find_deviations(self, brokerage_notes: Iterable[BrokerageNote]) -> List[FeeDeviation]:
+        return self.find_column_deviations(self.load_columns(brokerage_notes))
+
+    def find_column_deviations(self, columns: NoteFeeColumns) -> List[FeeDeviation]:
+        """Deviations sorted by note, then in the order of the fee types of the schedule"""
+        deviations: List[FeeDeviation] = []
+        if self.use_numpy:
+            for fee_type, expected_fees in _estimate_with_numpy(self.fee_schedule, columns).items():
+                parsed_fees = np.asarray(columns.fees[fee_type], dtype=np.float64)
+                tolerances = np.maximum(self.absolute_tolerance, self.relative_tolerance * np.abs(expected_fees))
+                # NaN expected fees (no rate yet) are never greater than the tolerance
+                with np.errstate(invalid="ignore"):
+                    deviating = np.abs(parsed_fees - expected_fees) > tolerances + TOLERANCE_EPSILON
+                note_indexes = np.flatnonzero(deviating)
+                deviations.extend(
+                    self.__build_deviations(
+                        columns, fee_type, zip(note_indexes.tolist(), expected_fees[note_indexes].tolist())
+                    )
+                )
+        else:
+            for fee_type, python_expected_fees in _estimate_with_python(self.fee_schedule, columns).items():
+                deviating_fees = [
+                    (note_index, expected_fee)
+                    for note_index, (parsed_fee, expected_fee) in enumerate(
+                        zip(columns.fees[fee_type], python_expected_fees)
+                    )
+                    if expected_fee is not None and self.__deviates(parsed_fee, expected_fee)
+                ]
+                deviations.extend(self.__build_deviations(columns, fee_type, deviating_fees))
+        # Stable, so the fee types of a note stay in the order of the schedule
+        deviations.sort(key=lambda deviation: deviation.note_index)
+        return deviations
+
+    def __deviates(self, parsed_fee: float, expected_fee: float) -> bool:
+        tolerance = max(self.absolute_tolerance, self.relative_tolerance * abs(expected_fee))
+        return abs(parsed_fee - expected_fee) > tolerance + TOLERANCE_EPSILON
+
+    @staticmethod
+    def __build_deviations(
+        columns: NoteFeeColumns, fee_type: BrokerageNoteFeeType, deviating_fees: Iterable[Tuple[int, float]]
+    ) -> Iterator[FeeDeviation]:
+        for note_index, expected_fee in deviating_fees:
+            yield FeeDeviation(
+                note_index=note_index,
+                reference_id=columns.reference_ids[note_index],
+                reference_date=columns.reference_dates[note_index],
+                fee_type=fee_type,
+                parsed_fee=_to_cents(columns.fees[fee_type][note_index]),
+                expected_fee=_to_cents(expected_fee),
+            )
+
+
+def _estimate_with_python(
+    fee_schedule: FeeSchedule, columns: NoteFeeColumns
+) -> Dict[BrokerageNoteFeeType, List[Optional[float]]]:
+    expected_fees_by_fee_type: Dict[BrokerageNoteFeeType, List[Optional[float]]] = {}
+    for fee_type in fee_schedule.fee_types:
+        start_ordinals, rates, day_trade_rates = fee_schedule.get_rate_columns(fee_type)
+        expected_fees: List[Optional[float]] = []
+        for day_ordinal, swing_trade_volume, day_trade_volume in zip(
+            columns.day_ordinals, columns.swing_trade_volumes, columns.day_trade_volumes
+        ):
+            rate_index = bisect_right(start_ordinals, day_ordinal) - 1
+            if rate_index < 0:
+                expected_fees.append(None)
+                continue
+            expected_fees.append(
+                round(swing_trade_volume * rates[rate_index] + day_trade_volume * day_trade_rates[rate_index], 2)
+            )
+        expected_fees_by_fee_type[fee_type] = expected_fees
+    return expected_fees_by_fee_type
+
+
+if HAS_NUMPY:
+    FloatArray = npt.NDArray[np.float64]
+
+    def _estimate_with_numpy(
+        fee_schedule: FeeSchedule, columns: NoteFeeColumns
+    ) -> Dict[BrokerageNoteFeeType, FloatArray]:
+        """NaN before the first rate of the fee type"""
+        day_ordinals = np.asarray(columns.day_ordinals, dtype=np.int64)
+        swing_trade_volumes = np.asarray(columns.swing_trade_volumes, dtype=np.float64)
+        day_trade_volumes = np.asarray(columns.day_trade_volumes, dtype=np.float64)
+        expected_fees_by_fee_type = {}
+        for fee_type in fee_schedule.fee_types:
+            start_ordinals, rates, day_trade_rates = fee_schedule.get_rate_columns(fee_type)
+            rate_indexes = np.searchsorted(np.asarray(start_ordinals, dtype=np.int64), day_ordinals, side="right") - 1
+            valid_rate_indexes = np.maximum(rate_indexes, 0)
+            expected_fees = np.round(
+                swing_trade_volumes * np.asarray(rates, dtype=np.float64)[valid_rate_indexes]
+                + day_trade_volumes * np.asarray(day_trade_rates, dtype=np.float64)[valid_rate_indexes],
+                2,
+            )
+            expected_fees_by_fee_type[fee_type] = typing.cast(
+                FloatArray, np.where(rate_indexes >= 0, expected_fees, np.nan)
+            )
+        return expected_fees_by_fee_type
@@ -0,0 +1,108 @@
+"""Date-versioned schedule of the fees charged on the volume of the notes (B3 emoluments, settlement fee...).
+
+Each rate applies from its start date until the next start date of the same fee type. Day trades have their own
+rates, e.g. the settlement fee of the B3 is lower for them.
+"""
+
+import csv
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.fees.exceptions import InvalidFeeScheduleException
+from correpy.utils import PathOrFile, parse_date
+
+FEE_SCHEDULE_COLUMNS = ("fee_type", "start_date", "rate")
+DAY_TRADE_RATE_COLUMN = "day_trade_rate"
+
+
+@dataclass(frozen=True)
+class FeeRate:
+    """Rates are fractions of the volume (0.00005 for 0,005%)"""
+
+    fee_type: BrokerageNoteFeeType
+    start_date: date
+    rate: Decimal
+    day_trade_rate: Decimal
+
+
+class FeeSchedule:
+    """Rates of each fee type sorted by start date, found by binary search on the date of the note"""
+
+    def __init__(self, fee_rates: Iterable[FeeRate]) -> None:
+        self.__fee_rates_by_fee_type: Dict[BrokerageNoteFeeType, List[FeeRate]] = {}
+        for fee_rate in sorted(fee_rates, key=lambda fee_rate: fee_rate.start_date):
+            fee_type_rates = self.__fee_rates_by_fee_type.setdefault(fee_rate.fee_type, [])
+            if fee_type_rates and fee_type_rates[-1].start_date == fee_rate.start_date:
+                raise InvalidFeeScheduleException(
+                    f"Fee {fee_rate.fee_type.name} has two rates starting on {fee_rate.start_date}"
+                )
+            fee_type_rates.append(fee_rate)
+        self.__start_ordinals_by_fee_type = {
+            fee_type: [fee_rate.start_date.toordinal() for fee_rate in fee_type_rates]
+            for fee_type, fee_type_rates in self.__fee_rates_by_fee_type.items()
+        }
+
+    @property
+    def fee_types(self) -> List[BrokerageNoteFeeType]:
+        return list(self.__fee_rates_by_fee_type)
+
+    def get_fee_rates(self, fee_type: BrokerageNoteFeeType) -> List[FeeRate]:
+        return list(self.__fee_rates_by_fee_type.get(fee_type, []))
+
+    def get_fee_rate(self, fee_type: BrokerageNoteFeeType, reference_date: date) -> Optional[FeeRate]:
+        """None before the first rate of the fee type"""
+        rate_index = bisect_right(self.__start_ordinals_by_fee_type.get(fee_type, []), reference_date.toordinal())
+        return self.__fee_rates_by_fee_type[fee_type][rate_index - 1] if rate_index else None
+
+    def get_rate_columns(self, fee_type: BrokerageNoteFeeType) -> Tuple[List[int], List[float], List[float]]:
+        """Start date ordinals, rates and day trade rates of the fee type, for vectorized lookups"""
+        fee_type_rates = self.__fee_rates_by_fee_type.get(fee_type, [])
+        return (
+            list(self.__start_ordinals_by_fee_type.get(fee_type, [])),
+            [float(fee_rate.rate) for fee_rate in fee_type_rates],
+            [float(fee_rate.day_trade_rate) for fee_rate in fee_type_rates],
+        )
+
+
+def _parse_fee_type(value: str) -> BrokerageNoteFeeType:
+    if value in BrokerageNoteFeeType.__members__:
+        return BrokerageNoteFeeType[value]
+    return BrokerageNoteFeeType(value)
+
+
+def _parse_rate(value: str) -> Decimal:
+    """A fraction of the volume, or a percentage when it ends with %. Decimal commas are accepted."""
+    value = value.replace(",", ".")
+    if value.endswith("%"):
+        return Decimal(value[:-1].strip()) / 100
+    return Decimal(value)
+
+
+def read_fee_schedule(path: PathOrFile, delimiter: str = ";", encoding: str = "utf-8") -> FeeSchedule:
+    """Schedule of a delimited file with the FEE_SCHEDULE_COLUMNS and, optionally, DAY_TRADE_RATE_COLUMN, e.g.
+    `EMOLUMENTS;2019-11-01;0,005%;0,005%`. Without a day trade rate, day trades pay the rate.
+    """
+    fee_rates = []
+    with open(path, newline="", encoding=encoding) as file:
+        rows = csv.DictReader(file, delimiter=delimiter)
+        if rows.fieldnames is None or not set(FEE_SCHEDULE_COLUMNS).issubset(rows.fieldnames):
+            raise InvalidFeeScheduleException(f"Columns {', '.join(FEE_SCHEDULE_COLUMNS)} were not found")
+        for line_number, row in enumerate(rows, start=2):
+            try:
+                rate = _parse_rate(row["rate"].strip())
+                day_trade_rate = (row.get(DAY_TRADE_RATE_COLUMN) or "").strip()
+                fee_rates.append(
+                    FeeRate(
+                        fee_type=_parse_fee_type(row["fee_type"].strip().upper()),
+                        start_date=parse_date(row["start_date"].strip()),
+                        rate=rate,
+                        day_trade_rate=_parse_rate(day_trade_rate) if day_trade_rate else rate,
+                    )
+                )
+            except (ValueError, InvalidOperation, AttributeError) as exc:
+                raise InvalidFeeScheduleException(f"Line {line_number} of {path} is not valid") from exc
+    return FeeSchedule(fee_rates)
@@ -0,0 +1,19 @@
+import argparse
+
+from correpy.instruments.instrument_index import compile_instrument_index_file
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(
+        prog="python -m correpy.instruments", description="Compiles an instrument list into a ticker index"
+    )
+    argument_parser.add_argument("instrument_list", help="Instrument list, e.g. the B3 instruments CSV")
+    argument_parser.add_argument("index", help="Path of the compiled index")
+    arguments = argument_parser.parse_args()
+
+    entries_count = compile_instrument_index_file(arguments.instrument_list, arguments.index)
+    print(f"{entries_count} tickers indexed in {arguments.index}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+class InvalidInstrumentIndexException(Exception):
+    pass
+
+
+class InvalidInstrumentListException(Exception):
+    pass
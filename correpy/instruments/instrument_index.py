@@ -0,0 +1,186 @@
+"""Compiled, memory-mappable index from ticker to SecurityType.
+
+The instrument list (e.g. the B3 instruments CSV) is read once and compiled into an open addressing hash table,
+so loading the index is a mmap and a lookup is a crc32 plus, on average, a single comparison.
+
+Layout (little-endian, every section padded to 8 bytes):
+
+- header: magic, version, entries count, slots count (a power of two) and tickers blob size
+- slots: entry index + 1 (uint32, 0 for an empty slot)
+- ticker offsets: uint32, one more than the entries
+- security types: SecurityType ordinal (uint8)
+- tickers blob: the ascii tickers
+"""
+
+import csv
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+from correpy.domain.enums import SecurityType
+from correpy.instruments.exceptions import InvalidInstrumentIndexException, InvalidInstrumentListException
+from correpy.serialization.columnar import ColumnReader, pack_column, padding
+from correpy.utils import PathOrFile
+
+INSTRUMENT_INDEX_MAGIC = b"CRPI"
+INSTRUMENT_INDEX_VERSION = 1
+HEADER_STRUCT = struct.Struct("<4sHxxIII")
+EMPTY_SLOT = 0
+
+SECURITY_TYPES = list(SecurityType)
+SECURITY_TYPE_ORDINALS = {security_type: ordinal for ordinal, security_type in enumerate(SECURITY_TYPES)}
+
+# Values of the SctyCtgyNm column of the B3 instruments file
+B3_SECURITY_TYPE_BY_CATEGORY = {
+    "SHARES": SecurityType.STOCK,
+    "UNIT": SecurityType.STOCK,
+    "BDR": SecurityType.BDR,
+    "FUNDS": SecurityType.REAL_STATE_FUND,
+    "ETF EQUITIES": SecurityType.ETF,
+    "ETF FOREIGN INDEX": SecurityType.ETF,
+    "OPTION ON EQUITIES": SecurityType.OPTION,
+    "OPTION ON INDEX": SecurityType.OPTION,
+    "INDEX": SecurityType.INDEX,
+}
+B3_TICKER_COLUMN = "TckrSymb"
+B3_CATEGORY_COLUMN = "SctyCtgyNm"
+
+
+def _hash_ticker(ticker: bytes) -> int:
+    return zlib.crc32(ticker)
+
+
+def read_instrument_list(
+    path: PathOrFile,
+    ticker_column: str = B3_TICKER_COLUMN,
+    category_column: str = B3_CATEGORY_COLUMN,
+    security_type_by_category: Optional[Mapping[str, SecurityType]] = None,
+    delimiter: str = ";",
+    encoding: str = "latin-1",
+) -> Iterator[Tuple[str, SecurityType]]:
+    """Tickers and types of a delimited instrument list, skipping the lines before its header and unknown categories.
+
+    Categories are mapped with B3_SECURITY_TYPE_BY_CATEGORY unless `security_type_by_category` is given.
+    """
+    if security_type_by_category is None:
+        security_type_by_category = B3_SECURITY_TYPE_BY_CATEGORY
+    with open(path, newline="", encoding=encoding) as file:
+        rows = csv.reader(file, delimiter=delimiter)
+        for header in rows:
+            if ticker_column in header and category_column in header:
+                break
+        else:
+            raise InvalidInstrumentListException(f"Columns {ticker_column} and {category_column} were not found")
+        ticker_index, category_index = header.index(ticker_column), header.index(category_column)
+        for row in rows:
+            if len(row) <= max(ticker_index, category_index):
+                continue
+            ticker = row[ticker_index].strip().upper()
+            security_type = security_type_by_category.get(row[category_index].strip().upper())
+            if ticker and security_type is not None:
+                yield ticker, security_type
+
+
+def compile_instrument_index(instruments: Iterable[Tuple[str, SecurityType]]) -> bytes:
+    """Later entries of a repeated ticker win"""
+    security_types: Dict[bytes, SecurityType] = {}
+    for instrument_ticker, security_type in instruments:
+        try:
+            security_types[instrument_ticker.encode("ascii")] = security_type
+        except UnicodeEncodeError as exc:
+            raise InvalidInstrumentListException(f"Ticker {instrument_ticker} is not ascii") from exc
+
+    tickers = list(security_types)
+    slots_count = 1
+    while slots_count < 2 * len(tickers):
+        slots_count *= 2
+    slots = array("I", [EMPTY_SLOT]) * slots_count
+    mask = slots_count - 1
+    for entry_index, ticker in enumerate(tickers):
+        slot = _hash_ticker(ticker) & mask
+        while slots[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        slots[slot] = entry_index + 1
+
+    ticker_offsets = array("I", [0])
+    for ticker in tickers:
+        ticker_offsets.append(ticker_offsets[-1] + len(ticker))
+    ordinals = array("B", (SECURITY_TYPE_ORDINALS[security_types[ticker]] for ticker in tickers))
+    tickers_blob = b"".join(tickers)
+
+    sections = [
+        HEADER_STRUCT.pack(
+            INSTRUMENT_INDEX_MAGIC, INSTRUMENT_INDEX_VERSION, len(tickers), slots_count, len(tickers_blob)
+        )
+    ]
+    sections.append(pack_column("I", slots))
+    sections.append(pack_column("I", ticker_offsets))
+    sections.append(pack_column("B", ordinals))
+    sections.append(tickers_blob + padding(len(tickers_blob)))
+    return b"".join(sections)
+
+
+class InstrumentIndex:
+    """Read-only view over a compiled index, usually memory-mapped from a file with `open`"""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        self.__buffer = memoryview(buffer).cast("B")
+        if len(self.__buffer) < HEADER_STRUCT.size:
+            raise InvalidInstrumentIndexException("Buffer is smaller than the instrument index header")
+        magic, version, entries_count, slots_count, tickers_size = HEADER_STRUCT.unpack_from(self.__buffer)
+        if magic != INSTRUMENT_INDEX_MAGIC:
+            raise InvalidInstrumentIndexException("Buffer does not contain an instrument index")
+        if version != INSTRUMENT_INDEX_VERSION:
+            raise InvalidInstrumentIndexException(f"Unsupported instrument index version {version}")
+
+        reader = ColumnReader(self.__buffer, HEADER_STRUCT.size, exception_class=InvalidInstrumentIndexException)
+        self.__mask = slots_count - 1
+        self.__slots = reader.read_column("I", slots_count)
+        self.__ticker_offsets = reader.read_column("I", entries_count + 1)
+        self.__ordinals = reader.read_column("B", entries_count)
+        self.__tickers = reader.read_bytes(tickers_size)
+        self.entries_count: int = entries_count
+
+    @classmethod
+    def open(cls, path: PathOrFile) -> "InstrumentIndex":
+        with open(path, "rb") as file:
+            # The mapping stays valid after the file is closed
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self) -> int:
+        return self.entries_count
+
+    def get_security_type(self, ticker: str) -> Optional[SecurityType]:
+        try:
+            encoded_ticker = ticker.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        slot = _hash_ticker(encoded_ticker) & self.__mask
+        while (entry := self.__slots[slot]) != EMPTY_SLOT:
+            start, end = self.__ticker_offsets[entry - 1], self.__ticker_offsets[entry]
+            if self.__tickers[start:end] == encoded_ticker:
+                return SECURITY_TYPES[int(self.__ordinals[entry - 1])]
+            slot = (slot + 1) & self.__mask
+        return None
+
+    def __contains__(self, ticker: str) -> bool:
+        return self.get_security_type(ticker) is not None
+
+
+def compile_instrument_index_file(instrument_list_path: PathOrFile, index_path: PathOrFile) -> int:
+    """Compiles an instrument list into an index file, returning how many tickers were indexed"""
+    index_content = compile_instrument_index(read_instrument_list(instrument_list_path))
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(index_path)), suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(index_content)
+        # Replaced at once, so processes reading the previous index never see a partial file
+        os.replace(temporary_path, index_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+    return int(HEADER_STRUCT.unpack_from(index_content)[2])
@@ -0,0 +1,230 @@
+"""Resolution of the tickers of securities printed only by name, e.g. "BBSEGURIDADE ON NM" or "BR PARTNERS UNT N2".
+
+A name is split into its base (the words of the company, compacted without spaces, accents and punctuation) and its
+share class (ON, PN, UNT, DRN...), ignoring the codes of the listing segment and of the corporate events (NM, N2,
+EJ...).
+The reference names are compiled into:
+
+- an exact index from base to the tickers of each share class
+- the sorted bases, where the bases starting with a truncated name are found by bisection
+- an inverted index from the trigrams of the bases to the bases having them
+
+A name missing from the exact index is matched first by prefix, then by the share of its trigrams found in each base,
+so only the bases sharing trigrams with it are ever scored. Resolved names are cached, since a few thousand names
+repeat over millions of transactions.
+"""
+
+import csv
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Collection, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from correpy.instruments.exceptions import InvalidInstrumentListException
+from correpy.utils import PathOrFile
+
+# Columns of the B3 instruments file. The short names printed in the notes are not in it, the corporate name is.
+B3_NAME_COLUMN = "CrpnNm"
+B3_TICKER_COLUMN = "TckrSymb"
+B3_SPECIFICATION_COLUMN = "SpcfctnCd"
+B3_CATEGORY_COLUMN = "SctyCtgyNm"
+NAMED_INSTRUMENT_CATEGORIES = frozenset({"SHARES", "UNIT", "BDR", "FUNDS", "ETF EQUITIES", "ETF FOREIGN INDEX"})
+
+SHARE_CLASSES = frozenset(
+    {"ON", "PN", "PNA", "PNB", "PNC", "PND", "PNE", "PNF", "PNG", "PNH", "UNT", "CI", "DRN", "DR1", "DR2", "DR3"}
+)
+# Listing segments, corporate events (ex-dividend, ex-rights...) and the legal form of the companies
+IGNORED_NAME_WORDS = frozenset(
+    {
+        "NM", "N1", "N2", "MA", "MB", "M2", "DR", "ED", "EJ", "EDJ", "EDR", "ER", "EB", "EBR", "ES", "EG", "EC", "ATZ",
+        "INT", "BDR", "SA", "S/A", "LTDA",
+    }
+)  # fmt: skip
+NAME_WORD_REGEX = re.compile(r"[A-Z0-9/]+")
+
+DEFAULT_MIN_SCORE = 0.75
+DEFAULT_CACHE_SIZE = 100_000
+
+
+def split_security_name(name: str) -> Tuple[str, Optional[str]]:
+    """Compacted base of the name and its share class, the last one written"""
+    ascii_name = unicodedata.normalize("NFKD", name.upper()).encode("ascii", "ignore").decode("ascii")
+    base_words: List[str] = []
+    share_class = None
+    for word in NAME_WORD_REGEX.findall(ascii_name.replace(".", "")):
+        if word in SHARE_CLASSES:
+            share_class = word
+        elif word not in IGNORED_NAME_WORDS:
+            base_words.append(word.replace("/", ""))
+    return "".join(base_words), share_class
+
+
+def _get_trigrams(base: str) -> FrozenSet[str]:
+    # The leading space weighs the start of the name, which the notes never truncate
+    padded_base = f" {base}"
+    return frozenset(padded_base[index : index + 3] for index in range(len(padded_base) - 2))
+
+
+def read_instrument_names(
+    path: PathOrFile,
+    name_column: str = B3_NAME_COLUMN,
+    ticker_column: str = B3_TICKER_COLUMN,
+    specification_column: Optional[str] = B3_SPECIFICATION_COLUMN,
+    category_column: Optional[str] = B3_CATEGORY_COLUMN,
+    categories: Collection[str] = NAMED_INSTRUMENT_CATEGORIES,
+    delimiter: str = ";",
+    encoding: str = "latin-1",
+) -> Iterator[Tuple[str, str]]:
+    """Names and tickers of a delimited instrument list, skipping the lines before its header.
+
+    The specification is appended to the name when its column exists, and rows are filtered by category when the
+    category column exists, so a list of names such as "BBSEGURIDADE ON NM;BBSE3" only needs the first two columns.
+    """
+    with open(path, newline="", encoding=encoding) as file:
+        rows = csv.reader(file, delimiter=delimiter)
+        for header in rows:
+            if name_column in header and ticker_column in header:
+                break
+        else:
+            raise InvalidInstrumentListException(f"Columns {name_column} and {ticker_column} were not found")
+        name_index, ticker_index = header.index(name_column), header.index(ticker_column)
+        specification_index = header.index(specification_column) if specification_column in header else None
+        category_index = header.index(category_column) if category_column in header else None
+        for row in rows:
+            if len(row) != len(header):
+                continue
+            if category_index is not None and row[category_index].strip().upper() not in categories:
+                continue
+            name, ticker = row[name_index].strip(), row[ticker_index].strip().upper()
+            if specification_index is not None:
+                name = f"{name} {row[specification_index].strip()}"
+            if name and ticker:
+                yield name, ticker
+
+
+class NameResolver:
+    """Ticker of a security name, from reference names and their tickers (see `read_instrument_names`).
+
+    A share class with two tickers keeps the shortest one (e.g. PETR4 over its fractional PETR4F), and is ambiguous
+    when they have the same length. Fuzzy matches need `min_score` of the trigrams of the name in the reference base,
+    and are ambiguous, so unresolved, when another base scores the same.
+    """
+
+    def __init__(
+        self,
+        instrument_names: Iterable[Tuple[str, str]],
+        min_score: float = DEFAULT_MIN_SCORE,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.min_score = min_score
+        self.cache_size = cache_size
+        shortest_tickers_by_base: Dict[str, Dict[Optional[str], Set[str]]] = defaultdict(dict)
+        for name, ticker in instrument_names:
+            base, share_class = split_security_name(name)
+            if not base:
+                continue
+            shortest_tickers = shortest_tickers_by_base[base].setdefault(share_class, {ticker})
+            shortest_length = len(next(iter(shortest_tickers)))
+            if len(ticker) < shortest_length:
+                shortest_tickers.clear()
+            if len(ticker) <= shortest_length:
+                shortest_tickers.add(ticker)
+
+        self.__tickers_by_base: Dict[str, Dict[Optional[str], Optional[str]]] = {
+            base: {
+                share_class: next(iter(tickers)) if len(tickers) == 1 else None
+                for share_class, tickers in shortest_tickers_by_class.items()
+            }
+            for base, shortest_tickers_by_class in shortest_tickers_by_base.items()
+        }
+        self.__sorted_bases = sorted(self.__tickers_by_base)
+        self.__trigram_counts = [len(_get_trigrams(base)) for base in self.__sorted_bases]
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for base_index, base in enumerate(self.__sorted_bases):
+            for trigram in _get_trigrams(base):
+                postings[trigram].append(base_index)
+        self.__postings = dict(postings)
+        self.__cache: Dict[str, Optional[str]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __len__(self) -> int:
+        return len(self.__sorted_bases)
+
+    def resolve(self, name: str) -> Optional[str]:
+        try:
+            ticker = self.__cache[name]
+        except KeyError:
+            pass
+        else:
+            self.cache_hits += 1
+            return ticker
+        self.cache_misses += 1
+        if len(self.__cache) >= self.cache_size:
+            # The names in use come back on the next lookups, without the cost of tracking the least recent one
+            self.__cache.clear()
+        ticker = self.__cache[name] = self.__resolve(*split_security_name(name))
+        return ticker
+
+    def __get_ticker(self, base: str, share_class: Optional[str]) -> Optional[str]:
+        tickers = self.__tickers_by_base[base]
+        if share_class in tickers:
+            return tickers[share_class]
+        # A name or a reference without share class is only resolved when the base has a single ticker
+        if len(tickers) == 1 and (share_class is None or None in tickers):
+            return next(iter(tickers.values()))
+        return None
+
+    def __has_share_class(self, base: str, share_class: Optional[str]) -> bool:
+        return self.__get_ticker(base, share_class) is not None
+
+    def __resolve(self, base: str, share_class: Optional[str]) -> Optional[str]:
+        if not base:
+            return None
+        if base in self.__tickers_by_base:
+            return self.__get_ticker(base, share_class)
+        prefixed_bases = self.__find_prefixed_bases(base, share_class)
+        if len(prefixed_bases) == 1:
+            return self.__get_ticker(prefixed_bases[0], share_class)
+        return self.__find_fuzzy_ticker(base, share_class)
+
+    def __find_prefixed_bases(self, base: str, share_class: Optional[str]) -> List[str]:
+        prefixed_bases = []
+        for base_index in range(bisect_left(self.__sorted_bases, base), len(self.__sorted_bases)):
+            reference_base = self.__sorted_bases[base_index]
+            if not reference_base.startswith(base):
+                break
+            if self.__has_share_class(reference_base, share_class):
+                prefixed_bases.append(reference_base)
+        return prefixed_bases
+
+    def __find_fuzzy_ticker(self, base: str, share_class: Optional[str]) -> Optional[str]:
+        trigrams = _get_trigrams(base)
+        shared_trigram_counts: Dict[int, int] = defaultdict(int)
+        for trigram in trigrams:
+            for base_index in self.__postings.get(trigram, ()):
+                shared_trigram_counts[base_index] += 1
+
+        # Scored by the share of the trigrams of the name found in the base, then by the Dice coefficient, which
+        # prefers the base with the fewest trigrams the name does not have
+        min_shared_trigrams = self.min_score * len(trigrams)
+        best_bases: List[str] = []
+        best_score = (0.0, 0.0)
+        for base_index, shared_trigrams in shared_trigram_counts.items():
+            if shared_trigrams < min_shared_trigrams:
+                continue
+            reference_base = self.__sorted_bases[base_index]
+            if not self.__has_share_class(reference_base, share_class):
+                continue
+            score = (
+                shared_trigrams / len(trigrams),
+                2 * shared_trigrams / (len(trigrams) + self.__trigram_counts[base_index]),
+            )
+            if score > best_score:
+                best_score, best_bases = score, [reference_base]
+            elif score == best_score:
+                best_bases.append(reference_base)
+        if len(best_bases) != 1:
+            return None
+        return self.__get_ticker(best_bases[0], share_class)
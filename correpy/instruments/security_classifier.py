@@ -0,0 +1,113 @@
+import functools
+import os
+import re
+from typing import Optional, Tuple
+
+from correpy.domain.entities.security import Security
+from correpy.domain.enums import SecurityType
+from correpy.instruments.instrument_index import InstrumentIndex
+from correpy.instruments.name_resolver import NameResolver, read_instrument_names
+
+# Path of a compiled index loaded by the default classifier, inherited by worker processes
+INSTRUMENT_INDEX_ENVIRONMENT_VARIABLE = "CORREPY_INSTRUMENT_INDEX"
+# Path of an instrument list whose names are compiled by the default classifier, see read_instrument_names
+INSTRUMENT_NAMES_ENVIRONMENT_VARIABLE = "CORREPY_INSTRUMENT_NAMES"
+
+# Format XXXXYZZ or XXXXYZZZ where Y is the series letter (A-L calls, M-X puts) and Z the strike code
+OPTION_TICKER_REGEX = re.compile(r"\b[A-Z]{4}[A-X][0-9]{2,3}E?\b")
+BDR_TICKER_SUFFIX_REGEX = re.compile(r"3[1-9]F?$")
+STOCK_TICKER_SUFFIX_REGEX = re.compile(r"[A-Z][3-8]F?$")
+
+# Specification codes written after the name of the security in the brokerage notes
+STOCK_SPECIFICATION_REGEX = re.compile(r"\b(ON|PN|PNA|PNB|PNC|PND|UNT)\b")
+BDR_SPECIFICATION_REGEX = re.compile(r"\bDR[N1-3]\b")
+REAL_STATE_FUND_NAME_REGEX = re.compile(r"\b(FII|IMOB)\b")
+ETF_NAME_REGEX = re.compile(r"\b(ETF|ISHARE|ISHARES)\b")
+
+
+class SecurityClassifier:
+    """Finds the ticker and SecurityType of a security name.
+
+    Words of the name are looked up in the instrument index, with and without the fractional market suffix (F).
+    Names without an indexed ticker fall back to regexes on the ticker and on the specification of the name, and
+    names without any ticker are resolved by the name resolver.
+    """
+
+    def __init__(self, index: Optional[InstrumentIndex] = None, name_resolver: Optional[NameResolver] = None) -> None:
+        self.index = index
+        self.name_resolver = name_resolver
+
+    def build_security(self, name: str) -> Security:
+        """Security of a name parsed from a note, with its ticker and type"""
+        security = Security(name=name)
+        if (indexed_ticker := self.find_indexed_ticker(security.name)) is not None:
+            security.ticker, security.security_type = indexed_ticker
+            return security
+        security.ticker = self.find_option_ticker(security.name) or security.ticker
+        if security.ticker is None and (resolved_ticker := self.find_resolved_ticker(security.name)):
+            security.ticker, security.security_type = resolved_ticker
+        else:
+            security.security_type = self.guess_security_type(security.name, security.ticker)
+        return security
+
+    def find_indexed_ticker(self, name: str) -> Optional[Tuple[str, SecurityType]]:
+        if self.index is None:
+            return None
+        for word in name.split():
+            if (security_type := self.index.get_security_type(word)) is not None:
+                return word, security_type
+            if word.endswith("F") and (security_type := self.index.get_security_type(word[:-1])) is not None:
+                return word, security_type
+        return None
+
+    def find_resolved_ticker(self, name: str) -> Optional[Tuple[str, Optional[SecurityType]]]:
+        if self.name_resolver is None or (ticker := self.name_resolver.resolve(name)) is None:
+            return None
+        if self.index is not None and (security_type := self.index.get_security_type(ticker)) is not None:
+            return ticker, security_type
+        return ticker, self.guess_security_type(name, ticker)
+
+    @staticmethod
+    def find_option_ticker(name: str) -> Optional[str]:
+        if extracted_text := OPTION_TICKER_REGEX.search(name):
+            return extracted_text[0]
+        return None
+
+    @staticmethod
+    def guess_security_type(name: str, ticker: Optional[str]) -> Optional[SecurityType]:
+        if ticker is not None:
+            if OPTION_TICKER_REGEX.fullmatch(ticker):
+                return SecurityType.OPTION
+            if BDR_TICKER_SUFFIX_REGEX.search(ticker):
+                return SecurityType.BDR
+            if STOCK_TICKER_SUFFIX_REGEX.search(ticker):
+                return SecurityType.STOCK
+        if REAL_STATE_FUND_NAME_REGEX.search(name):
+            return SecurityType.REAL_STATE_FUND
+        if ETF_NAME_REGEX.search(name):
+            return SecurityType.ETF
+        if BDR_SPECIFICATION_REGEX.search(name):
+            return SecurityType.BDR
+        # Units (XXXX11) share the suffix with funds and ETFs, so they are only classified by the specification
+        if STOCK_SPECIFICATION_REGEX.search(name):
+            return SecurityType.STOCK
+        return None
+
+
+def build_security_classifier_from_environment() -> SecurityClassifier:
+    """Classifier of the files named by the environment variables, which worker processes inherit"""
+    index_path = os.environ.get(INSTRUMENT_INDEX_ENVIRONMENT_VARIABLE)
+    instrument_names_path = os.environ.get(INSTRUMENT_NAMES_ENVIRONMENT_VARIABLE)
+    return SecurityClassifier(
+        index=InstrumentIndex.open(index_path) if index_path else None,
+        name_resolver=NameResolver(read_instrument_names(instrument_names_path)) if instrument_names_path else None,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_default_security_classifier() -> SecurityClassifier:
+    """Classifier of the parsers not given one, built from the environment on the first call and kept after it.
+
+    To use another classifier, pass it as the `security_classifier` of ParserFactory or of the parser.
+    """
+    return build_security_classifier_from_environment()
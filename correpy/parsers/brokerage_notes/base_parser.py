@@ -2,108 +2,103 @@ import io
 from abc import ABC, abstractmethod
 from datetime import date
 from decimal import Decimal
-from itertools import groupby
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, List, Optional
 
 import fitz
 
 from correpy.domain.entities.brokerage_note import BrokerageNote
 from correpy.domain.entities.security import Security
 from correpy.domain.entities.transaction import Transaction
-from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+from correpy.domain.enums import TransactionType
+from correpy.instruments.security_classifier import SecurityClassifier, get_default_security_classifier
+from correpy.parsers.brokerage_notes.broker_layout import BrokerLayout
 from correpy.parsers.brokerage_notes.brokerage_note_section import BrokerageNoteSection
-from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+from correpy.parsers.brokerage_notes.transaction_columns import TransactionRow, WordsByColumn
 from correpy.parsers.fitz_parser import FitzParser
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.parsers.password_resolver import Password
 from correpy.utils import extract_value_from_line, extract_amount_from_line
 
 NoteKey = tuple[int, date]
 
 
 class BaseBrokerageNoteParser(ABC):
-    def __init__(self, brokerage_note: io.BytesIO, password: Optional[str] = None) -> None:
-        self.fitz_parser = FitzParser(file=brokerage_note, password=password)
+    def __init__(
+        self,
+        brokerage_note: io.BytesIO,
+        password: Optional[Password] = None,
+        budget: Optional[ParsingBudget] = None,
+        fitz_parser: Optional[FitzParser] = None,
+        page_range: Optional[range] = None,
+        security_classifier: Optional[SecurityClassifier] = None,
+    ) -> None:
+        self.security_classifier = security_classifier
+        self.fitz_parser = fitz_parser or FitzParser(
+            file=brokerage_note, password=password, budget=budget, page_range=page_range
+        )
         self.brokerage_notes: Dict[NoteKey, BrokerageNote] = {}
 
     @property
     @abstractmethod
-    def buy_transaction_indicator_on_brokerage_note(self) -> str:
-        ...
-
-    @property
-    @abstractmethod
-    def sell_transaction_indicator_on_brokerage_note(self) -> str:
-        ...
-
-    @property
-    @abstractmethod
-    def first_column_transactions(self) -> str:
-        ...
-
-    @property
-    @abstractmethod
-    def transaction_columns_index(self) -> Dict[str, int]:
-        ...
-
-    @property
-    @abstractmethod
-    def financial_summary_header_mapper(self) -> Dict[str, BrokerageNoteFeeType]:
-        ...
-
-    @property
-    @abstractmethod
-    def last_transaction_item(self) -> str:
-        ...
-
-    @classmethod
-    def _group_words_by_line(cls, *, words: Iterable[WordRectangle]) -> List[List[WordRectangle]]:
-        return [
-            list(grouped_word[1])
-            for grouped_word in groupby(words, key=lambda word: word.y1)  # type:ignore[no-any-return]
-        ]
-
-    @classmethod
-    def _sort_words_per_line_then_per_column(cls, words: List[WordRectangle]) -> Iterable[WordRectangle]:
-        return sorted(words, key=lambda word: (word.y1, word.x0))
-
-    def _build_text_from_words(self, words: Iterable[WordRectangle]) -> str:
-        line = self._get_text_line_from_list_of_words(words=words)
-        return " ".join(line)
-
-    def _build_text_from_all_words_in_line(
-        self, words_grouped_by_line: Iterable[Tuple[float, Iterable[WordRectangle]]]
-    ) -> str:
-        return "".join(self._build_text_from_words(words=words) for _, words in words_grouped_by_line)
-
-    @staticmethod
-    def _get_text_line_from_list_of_words(*, words: Iterable[WordRectangle]) -> List[str]:
-        return [word.value for word in words]
-
-    def _sort_and_group_elements_by_line_on_file(
-        self, elements: List[WordRectangle]
-    ) -> Iterable[Iterable[WordRectangle]]:
-        elements_text = self._sort_words_per_line_then_per_column(words=elements)
-        return self._group_words_by_line(words=elements_text)
+    def layout(self) -> BrokerLayout: ...
 
     def __parse_transaction_type(self, *, line_array: List[str]) -> TransactionType:
-        transaction_type = line_array[self.transaction_columns_index["transaction_type"]]
-        if transaction_type == self.buy_transaction_indicator_on_brokerage_note:
+        transaction_type = line_array[self.layout.transaction_columns_index["transaction_type"]]
+        if transaction_type == self.layout.buy_transaction_indicator:
             return TransactionType.BUY
         return TransactionType.SELL
 
     def __parse_security_name(self, *, line_array: List[str]) -> str:
+        transaction_columns_index = self.layout.transaction_columns_index
         security_name_array = line_array[
-            self.transaction_columns_index["start_short_name"] : self.transaction_columns_index["end_short_name"]
+            transaction_columns_index["start_short_name"] : transaction_columns_index["end_short_name"]
         ]
         return " ".join(security_name_array)
 
     def __parse_transaction_unit_price(self, *, line_array: List[str]) -> Decimal:
-        unit_value_string = line_array[self.transaction_columns_index["unit_value"]]
+        unit_value_string = line_array[self.layout.transaction_columns_index["unit_value"]]
         return extract_value_from_line(line=unit_value_string)
 
     def __parse_transaction_amount(self, *, line_array: List[str]) -> Decimal:
-        amount_string = line_array[self.transaction_columns_index["amount"]]
+        amount_string = line_array[self.layout.transaction_columns_index["amount"]]
         return extract_amount_from_line(line=amount_string)
 
+    def _build_security(self, *, name: str) -> Security:
+        # The default classifier is only loaded when the first transaction is parsed
+        security_classifier = self.security_classifier or get_default_security_classifier()
+        return security_classifier.build_security(name)
+
+    def __get_column_words(self, *, words_by_column: WordsByColumn, field_name: str) -> List[str]:
+        return words_by_column[self.layout.transaction_column_header_by_field[field_name]]
+
+    def __create_transaction_from_columns(self, *, words_by_column: WordsByColumn) -> Optional[Transaction]:
+        """None when a required column is empty, e.g. a row whose words are shifted away from the header"""
+        transaction_type_words, security_name_words, unit_value_words, amount_words = (
+            self.__get_column_words(words_by_column=words_by_column, field_name=field_name)
+            for field_name in ("transaction_type", "security_name", "unit_value", "amount")
+        )
+        if not (transaction_type_words and security_name_words and unit_value_words and amount_words):
+            return None
+
+        return Transaction(
+            transaction_type=(
+                TransactionType.BUY
+                if transaction_type_words[-1] == self.layout.buy_transaction_indicator
+                else TransactionType.SELL
+            ),
+            amount=extract_amount_from_line(line=amount_words[-1]),
+            unit_price=extract_value_from_line(line=unit_value_words[-1]),
+            security=self._build_security(name=" ".join(security_name_words)),
+        )
+
+    def create_transaction(self, *, transaction_row: TransactionRow) -> Transaction:
+        """Parses the words bucketed by column, falling back to the fixed indexes of the line text"""
+        if transaction_row.words_by_column is not None and (
+            transaction := self.__create_transaction_from_columns(words_by_column=transaction_row.words_by_column)
+        ):
+            return transaction
+        return self._create_transaction(line=transaction_row.line)
+
     def _create_transaction(self, *, line: str) -> Transaction:
         line_array = line.split(" ")
         transaction_type = self.__parse_transaction_type(line_array=line_array)
@@ -115,7 +110,7 @@ class BaseBrokerageNoteParser(ABC):
             transaction_type=transaction_type,
             amount=amount,
             unit_price=unit_price,
-            security=Security(name=security_name),
+            security=self._build_security(name=security_name),
         )
 
     def _build_brokerage_note_section_from_two_rectangles(
@@ -127,11 +122,9 @@ class BaseBrokerageNoteParser(ABC):
         rectangle_between = self.fitz_parser.build_rectangle_from_beginning_first_rectangle_end_second_rectangle(
             first_rect=first_rectangle, second_rect=second_rectangle
         )
-        rectangle_text_elements = self.fitz_parser.get_words_in_rectangle(
-            page_number=page_number, rectangle=rectangle_between
-        )
-        grouped_words = self._sort_and_group_elements_by_line_on_file(elements=rectangle_text_elements)
-        return BrokerageNoteSection(words_grouped_by_line=grouped_words)
+        page_layout = self.fitz_parser.get_page_layout(page_number=page_number)
+        lines_in_rectangle = page_layout.get_lines_in_rectangle(rectangle=rectangle_between)
+        return BrokerageNoteSection(words_grouped_by_line=lines_in_rectangle)
 
     @abstractmethod
     def _get_or_create_brokerage_note_by_page(self, page: fitz.Page, page_number: int) -> BrokerageNote:
@@ -0,0 +1,135 @@
+"""Layouts of the notes of each broker, described as data and compiled once into matchers.
+
+A layout holds the texts locating the sections of a page, the columns of the transactions table, the headers of the
+fees and the markers of the transactions: the start of their header line, the lines ending them and, for brokers
+printing no end line, the start of every transaction line.
+
+Markers are compiled into a single anchored regex per layout, an alternation of the escaped markers from the longest
+to the shortest. Python tries the alternatives in order, so a line is classified by the longest marker it starts with
+in one C-level call, instead of slicing the line once per marker. Each marker carries the kinds of all the markers it
+starts with, so lines starting with several markers keep every kind.
+"""
+
+import re
+from dataclasses import dataclass, field
+from enum import Flag
+from functools import cached_property
+from typing import Dict, Generic, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.parsers.exceptions import InvalidBrokerLayoutException
+
+V = TypeVar("V")
+
+TRANSACTION_FIELDS = ("transaction_type", "security_name", "amount", "unit_value")
+
+
+class LineKind(Flag):
+    """Kinds of a line of the transactions section. A line with no kind is a transaction once the header was found"""
+
+    NONE = 0
+    HEADER = 1
+    END = 2
+
+
+class PrefixMatcher(Generic[V]):
+    """Value of the longest prefix a text starts with, from a single compiled regex"""
+
+    def __init__(self, values_by_prefix: Iterable[Tuple[str, V]], default: Optional[V] = None) -> None:
+        self.values_by_prefix: Dict[str, V] = dict(values_by_prefix)
+        self.default = default
+        prefixes = sorted(self.values_by_prefix, key=len, reverse=True)
+        # An alternation matching nothing when there is no prefix
+        self.regex = re.compile("|".join(re.escape(prefix) for prefix in prefixes) if prefixes else r"(?!)")
+
+    def match(self, text: str) -> Optional[V]:
+        if (prefix_match := self.regex.match(text)) is None:
+            return self.default
+        return self.values_by_prefix[prefix_match.group()]
+
+
+@dataclass(frozen=True)
+class BrokerLayout:
+    """Layout of the notes of a broker, detected by the CNPJ printed on them (None for the default layout).
+
+    Transactions start after a line starting with a header marker and stop at a line starting with an end marker.
+    With `transaction_row_markers`, they also stop at the first line not starting with one of them.
+    """
+
+    name: str
+    cnpj: Optional[str]
+    reference_note_id_title: str
+    ci_title: str
+    transactions_section_title: str
+    transactions_summary_title: str
+    financial_summary_title: str
+    net_value_section_title: str
+    buy_transaction_indicator: str
+    sell_transaction_indicator: str
+    transactions_header_markers: Sequence[str]
+    transactions_end_markers: Sequence[str]
+    # First word of the header of every column of the transactions table, from left to right
+    transaction_columns_headers: Sequence[str]
+    transaction_column_header_by_field: Mapping[str, str]
+    # Indexes of the words of a transaction line, used when its words can not be bucketed by column
+    transaction_columns_index: Mapping[str, int]
+    fee_header_map: Mapping[str, BrokerageNoteFeeType]
+    transaction_row_markers: Sequence[str] = field(default_factory=tuple)
+
+    def __post_init__(self) -> None:
+        if not self.transactions_header_markers:
+            raise InvalidBrokerLayoutException(f"Layout {self.name} has no transactions header marker")
+        if missing_fields := set(TRANSACTION_FIELDS) - set(self.transaction_column_header_by_field):
+            raise InvalidBrokerLayoutException(
+                f"Layout {self.name} has no column for {', '.join(sorted(missing_fields))}"
+            )
+        if unknown_headers := set(self.transaction_column_header_by_field.values()) - set(
+            self.transaction_columns_headers
+        ):
+            raise InvalidBrokerLayoutException(
+                f"Columns {', '.join(sorted(unknown_headers))} of layout {self.name} are not transaction columns"
+            )
+
+    @property
+    def anchor_texts(self) -> List[str]:
+        """Texts searched on every page to locate its sections"""
+        return [
+            self.reference_note_id_title,
+            self.ci_title,
+            self.transactions_section_title,
+            self.transactions_summary_title,
+            self.financial_summary_title,
+            self.net_value_section_title,
+        ]
+
+    def __get_marker_kind(self, marker: str) -> LineKind:
+        kind = LineKind.NONE
+        if any(marker.startswith(header_marker) for header_marker in self.transactions_header_markers):
+            kind |= LineKind.HEADER
+        if any(marker.startswith(end_marker) for end_marker in self.transactions_end_markers):
+            kind |= LineKind.END
+        if self.transaction_row_markers and not any(
+            marker.startswith(row_marker) for row_marker in self.transaction_row_markers
+        ):
+            kind |= LineKind.END
+        return kind
+
+    @cached_property
+    def transactions_line_matcher(self) -> PrefixMatcher[LineKind]:
+        markers = {*self.transactions_header_markers, *self.transactions_end_markers, *self.transaction_row_markers}
+        return PrefixMatcher(
+            ((marker, self.__get_marker_kind(marker)) for marker in markers),
+            default=LineKind.END if self.transaction_row_markers else LineKind.NONE,
+        )
+
+    @cached_property
+    def fee_header_matcher(self) -> PrefixMatcher[BrokerageNoteFeeType]:
+        return PrefixMatcher(self.fee_header_map.items())
+
+    def classify_transactions_line(self, line_text: str) -> LineKind:
+        kind = self.transactions_line_matcher.match(line_text)
+        return LineKind.NONE if kind is None else kind
+
+    def get_fee_type(self, line_text: str) -> Optional[BrokerageNoteFeeType]:
+        """Fee type of the longest fee header the line starts with"""
+        return self.fee_header_matcher.match(line_text)
@@ -0,0 +1,91 @@
+from dataclasses import replace
+
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.parsers.brokerage_notes.broker_layout import BrokerLayout
+
+B3_LAYOUT = BrokerLayout(
+    name="B3",
+    cnpj=None,
+    reference_note_id_title="Nr. nota",
+    ci_title="C.I",
+    transactions_section_title="Negócios realizados",
+    transactions_summary_title="Resumo dos Negócios",
+    financial_summary_title="Resumo Financeiro",
+    net_value_section_title="Líquido para",
+    buy_transaction_indicator="C",
+    sell_transaction_indicator="V",
+    transactions_header_markers=("Q",),
+    transactions_end_markers=("Resumo dos Negócios",),
+    transaction_columns_headers=(
+        "Q",
+        "Negociação",
+        "C/V",
+        "Tipo",
+        "Prazo",
+        "Especificação",
+        "Obs.",
+        "Quantidade",
+        "Preço",
+        "Valor",
+        "D/C",
+    ),
+    transaction_column_header_by_field={
+        "transaction_type": "C/V",
+        "security_name": "Especificação",
+        "amount": "Quantidade",
+        "unit_value": "Preço",
+    },
+    transaction_columns_index={
+        "transaction_type": 1,
+        "start_short_name": 3,
+        "end_short_name": -4,
+        "unit_value": -3,
+        "amount": -4,
+    },
+    fee_header_map={
+        "Taxa de liquidação": BrokerageNoteFeeType.SETTLEMENT_FEE,
+        "Taxa de Registro": BrokerageNoteFeeType.REGISTRATION_FE,
+        "Taxa de termo/opções": BrokerageNoteFeeType.TERM_FEE,
+        "Taxa A.N.A.": BrokerageNoteFeeType.ANA_FEE,
+        "Emolumentos": BrokerageNoteFeeType.EMOLUMENTS,
+        "Taxa Operacional": BrokerageNoteFeeType.OPERATIONAL_FEE,
+        "Execução": BrokerageNoteFeeType.EXECUTION,
+        "Taxa de Custódia": BrokerageNoteFeeType.CUSTODY_FEE,
+        "I.R.R.F": BrokerageNoteFeeType.IRRF,
+        "Impostos": BrokerageNoteFeeType.TAXES,
+        "Outros": BrokerageNoteFeeType.OTHERS,
+    },
+)
+
+# Transactions are the lines right after the header that start with the market name
+NUINVEST_LAYOUT = replace(
+    B3_LAYOUT,
+    name="NuInvest",
+    cnpj="62.169.875/0001-79",
+    reference_note_id_title="Número da nota",
+    ci_title="Valor/Ajuste D/C",
+    transactions_section_title="Nome do Cliente",
+    transactions_header_markers=("Mercado",),
+    transactions_end_markers=(),
+    transaction_row_markers=("BOVESPA",),
+    fee_header_map={
+        "Taxa de Liquidação": BrokerageNoteFeeType.SETTLEMENT_FEE,
+        "Taxa de Registro": BrokerageNoteFeeType.REGISTRATION_FE,
+        "Taxa de Termo / Opções": BrokerageNoteFeeType.TERM_FEE,
+        "Taxa A.N.A.": BrokerageNoteFeeType.ANA_FEE,
+        "Emolumentos": BrokerageNoteFeeType.EMOLUMENTS,
+        "Taxa Operacional": BrokerageNoteFeeType.OPERATIONAL_FEE,
+        "Execução": BrokerageNoteFeeType.EXECUTION,
+        "Taxa de Custódia": BrokerageNoteFeeType.CUSTODY_FEE,
+        "Impostos": BrokerageNoteFeeType.TAXES,
+        "Outros": BrokerageNoteFeeType.OTHERS,
+    },
+)
+
+# Notes generated by the Inter app
+INTER_LAYOUT = replace(
+    B3_LAYOUT,
+    name="Inter",
+    cnpj="18.945.670/0001-46",
+    transactions_end_markers=("Resumo dos negócios", "D/C"),
+)
@@ -1,6 +1,8 @@
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Iterable, List
 
+from correpy.parsers.brokerage_notes.page_layout import TextLine
 from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
 
 
@@ -12,14 +14,17 @@ class BrokerageNoteSection:
     def get_text_line_from_list_of_words(*, words: Iterable[WordRectangle]) -> List[str]:
         return [word.value for word in words]
 
-    @property
+    @cached_property
     def text_by_lines(self) -> List[str]:
-        return [self.get_text_from_words(words=words) for words in self.words_grouped_by_line]
+        return [
+            words.text if isinstance(words, TextLine) else self.get_text_from_words(words=words)
+            for words in self.words_grouped_by_line
+        ]
 
     def get_text_from_words(self, words: Iterable[WordRectangle]) -> str:
         line = self.get_text_line_from_list_of_words(words=words)
         return " ".join(line)
 
-    @property
+    @cached_property
     def full_text(self) -> str:
-        return "".join(self.get_text_from_words(words=words) for words in self.words_grouped_by_line)
+        return "".join(self.text_by_lines)
@@ -0,0 +1,120 @@
+import io
+from decimal import Decimal
+from typing import Dict, List, Optional, Type
+
+import fitz
+from fitz import Page, TextPage
+
+from correpy.domain.entities.brokerage_note_header import BrokerageNoteHeader
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.base_parser import NoteKey
+from correpy.parsers.brokerage_notes.brokerage_note_section import BrokerageNoteSection
+from correpy.parsers.brokerage_notes.page_layout import PageLayout
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.exceptions import ProblemParsingBrokerageNoteException
+from correpy.parsers.fitz_parser import FitzParser
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.parsers.password_resolver import Password
+from correpy.utils import extract_cnpj_from_line, extract_value_from_line
+
+
+class BrokerageNoteHeaderScanner:
+    """Quick scan of the notes of a document: only the header and the net value regions of each page are extracted."""
+
+    HEADER_HEIGHT_RATIO = 0.25
+    FINANCIAL_SUMMARY_START_RATIO = 0.5
+    DEBIT_INDICATOR = "D"
+
+    def __init__(
+        self, brokerage_note: io.BytesIO, password: Optional[Password] = None, budget: Optional[ParsingBudget] = None
+    ) -> None:
+        self.fitz_parser = FitzParser(file=brokerage_note, password=password, budget=budget, extract_words=False)
+        self.parser_class: Type[B3Parser] = B3Parser
+        self.broker_cnpj: Optional[str] = None
+
+    def __detect_broker(self, header_text_page: TextPage, header_layout: PageLayout) -> None:
+        for cnpj, parser_class in ParserFactory.CNPJ_PARSER_MAP.items():
+            if header_text_page.search(cnpj):
+                self.parser_class = parser_class
+                self.broker_cnpj = cnpj
+                return
+        self.broker_cnpj = extract_cnpj_from_line(line=" ".join(line.text for line in header_layout.lines))
+
+    def __scan_header(self, page: Page, header_text_page: TextPage, header_layout: PageLayout) -> NoteKey:
+        header_clip = header_text_page.rect
+        reference_id_rect = FitzParser.search_and_extract_rectangle_from_text(
+            page=header_text_page, text=self.parser_class.layout.reference_note_id_title
+        )
+        try:
+            ci_rect = FitzParser.search_and_extract_rectangle_from_text(
+                page=header_text_page, text=self.parser_class.layout.ci_title
+            )
+        except ProblemParsingBrokerageNoteException:
+            ci_rect = fitz.Rect(reference_id_rect.x0, reference_id_rect.y0, page.rect.width, header_clip.y1)
+        summary_section = BrokerageNoteSection(
+            words_grouped_by_line=header_layout.get_lines_in_rectangle(rectangle=reference_id_rect | ci_rect)
+        )
+        return (
+            self.parser_class._get_reference_id_from_section(  # pylint:disable=protected-access
+                brokerage_note_section=summary_section
+            ),
+            self.parser_class._get_reference_date_from_section(  # pylint:disable=protected-access
+                brokerage_note_section=summary_section
+            ),
+        )
+
+    def __scan_net_value(
+        self, page: Page, summary_text_page: TextPage, summary_layout: PageLayout
+    ) -> Optional[Decimal]:
+        try:
+            net_value_title_rect = FitzParser.search_and_extract_rectangle_from_text(
+                page=summary_text_page, text=self.parser_class.layout.net_value_section_title
+            )
+        except ProblemParsingBrokerageNoteException:
+            return None
+        net_value_line_rect = fitz.Rect(
+            net_value_title_rect.x0, net_value_title_rect.y0, page.rect.width, net_value_title_rect.y1
+        )
+        net_value_lines = summary_layout.get_lines_in_rectangle(rectangle=net_value_line_rect)
+        if not net_value_lines:
+            return None
+        net_value = extract_value_from_line(line=net_value_lines[0].text)
+        if net_value_lines[0].words[-1].value == self.DEBIT_INDICATOR:
+            return -net_value
+        return net_value
+
+    def scan(self) -> List[BrokerageNoteHeader]:
+        brokerage_note_headers: Dict[NoteKey, BrokerageNoteHeader] = {}
+        for page in self.fitz_parser.iter_pages():
+            self.fitz_parser.budget_tracker.check_deadline()
+            header_clip = fitz.Rect(0, 0, page.rect.width, page.rect.height * self.HEADER_HEIGHT_RATIO)
+            summary_clip = fitz.Rect(
+                0, page.rect.height * self.FINANCIAL_SUMMARY_START_RATIO, page.rect.width, page.rect.height
+            )
+            header_text_page = page.get_textpage(clip=header_clip)
+            summary_text_page = page.get_textpage(clip=summary_clip)
+            # Both regions are checked against the word and memory budgets as the words of the page
+            header_words, summary_words = self.fitz_parser.parse_words_from_text_pages(
+                [header_text_page, summary_text_page]
+            )
+            header_layout, summary_layout = PageLayout(words=header_words), PageLayout(words=summary_words)
+            if page.number == self.fitz_parser.first_page_number:
+                self.__detect_broker(header_text_page=header_text_page, header_layout=header_layout)
+            try:
+                note_key = self.__scan_header(page=page, header_text_page=header_text_page, header_layout=header_layout)
+            except ProblemParsingBrokerageNoteException:
+                continue
+
+            if (brokerage_note_header := brokerage_note_headers.get(note_key)) is None:
+                brokerage_note_header = BrokerageNoteHeader(
+                    reference_id=note_key[0], reference_date=note_key[1], broker_cnpj=self.broker_cnpj
+                )
+                brokerage_note_headers[note_key] = brokerage_note_header
+            brokerage_note_header.page_numbers.append(page.number)
+            net_value = self.__scan_net_value(
+                page=page, summary_text_page=summary_text_page, summary_layout=summary_layout
+            )
+            if net_value is not None:
+                brokerage_note_header.net_value = net_value
+
+        return list(brokerage_note_headers.values())
@@ -0,0 +1,91 @@
+import typing
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterable, Iterator, List
+
+import fitz
+
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+
+# Words whose bottom (y1) is up to this distance from the first word of a line belong to the same line
+LINE_Y_TOLERANCE = 1.0
+
+
+@dataclass
+class TextLine:
+    words: List[WordRectangle] = field(default_factory=list)
+
+    def __iter__(self) -> Iterator[WordRectangle]:
+        return iter(self.words)
+
+    @cached_property
+    def text(self) -> str:
+        return " ".join(word.value for word in self.words)
+
+    @cached_property
+    def y0(self) -> float:
+        return typing.cast(float, min(word.y0 for word in self.words))
+
+    @cached_property
+    def y1(self) -> float:
+        return typing.cast(float, max(word.y1 for word in self.words))
+
+
+def is_word_in_rectangle(*, rectangle: fitz.Rect, word: WordRectangle) -> bool:
+    """Same result as fitz.Rect.intersects, without building a fitz.Rect for every word"""
+    return typing.cast(
+        bool,
+        word.x0 < word.x1
+        and word.y0 < word.y1
+        and word.x0 < rectangle.x1
+        and rectangle.x0 < word.x1
+        and word.y0 < rectangle.y1
+        and rectangle.y0 < word.y1,
+    )
+
+
+class PageLayout:
+    """Words of a page ordered into lines (top to bottom, then left to right) once, to be sliced by sections"""
+
+    def __init__(self, words: Iterable[WordRectangle], y_tolerance: float = LINE_Y_TOLERANCE) -> None:
+        self.y_tolerance = y_tolerance
+        self.lines: List[TextLine] = self.__cluster_words_by_line(words=words, y_tolerance=y_tolerance)
+        self.__lines_first_y1 = [line.words[0].y1 for line in self.lines]
+        self.__max_word_height = max((line.y1 - line.y0 for line in self.lines), default=0.0)
+
+    @staticmethod
+    def __cluster_words_by_line(*, words: Iterable[WordRectangle], y_tolerance: float) -> List[TextLine]:
+        lines: List[TextLine] = []
+        line_words: List[WordRectangle] = []
+        for word in sorted(words, key=lambda word: (word.y1, word.x0)):
+            if line_words and word.y1 - line_words[0].y1 > y_tolerance:
+                lines.append(TextLine(words=sorted(line_words, key=lambda line_word: line_word.x0)))
+                line_words = []
+            line_words.append(word)
+        if line_words:
+            lines.append(TextLine(words=sorted(line_words, key=lambda line_word: line_word.x0)))
+        return lines
+
+    def get_lines_in_rectangle(self, *, rectangle: fitz.Rect) -> List[TextLine]:
+        """Lines with at least one word intersecting the rectangle, keeping only those words.
+
+        Lines fully inside the rectangle are shared with the layout, so their text is only built once.
+        """
+        if rectangle.x0 >= rectangle.x1 or rectangle.y0 >= rectangle.y1:
+            return []
+
+        lines_in_rectangle = []
+        # Words of a line have their y1 up to y_tolerance past the first word's, on both ends of the rectangle
+        first_line_index = bisect_left(self.__lines_first_y1, rectangle.y0 - self.y_tolerance)
+        for line in self.lines[first_line_index:]:
+            if line.words[0].y1 >= rectangle.y1 + self.__max_word_height + self.y_tolerance:
+                break
+            if line.y1 <= rectangle.y0 or line.y0 >= rectangle.y1:
+                continue
+            words = [word for word in line.words if is_word_in_rectangle(rectangle=rectangle, word=word)]
+            if len(words) == len(line.words):
+                lines_in_rectangle.append(line)
+            elif words:
+                lines_in_rectangle.append(TextLine(words=words))
+        return lines_in_rectangle
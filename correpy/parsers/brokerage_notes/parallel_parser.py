@@ -0,0 +1,131 @@
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.base_parser import NoteKey
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.fitz_parser import FitzParser
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.parsers.password_resolver import Password
+from correpy.serialization.binary_format import decode_brokerage_notes, encode_brokerage_notes
+
+BrokerageNoteSource = Union[io.BytesIO, str, "os.PathLike[str]"]
+
+
+def split_page_ranges(*, page_count: int, pages_per_range: int) -> List[range]:
+    return [range(start, min(start + pages_per_range, page_count)) for start in range(0, page_count, pages_per_range)]
+
+
+def merge_brokerage_notes(
+    partial_brokerage_notes: Iterable[Dict[NoteKey, BrokerageNote]],
+) -> Dict[NoteKey, BrokerageNote]:
+    """Merges, in order, the notes parsed from each page range. Notes spanning two ranges are combined by NoteKey"""
+    brokerage_notes: Dict[NoteKey, BrokerageNote] = {}
+    for partial_brokerage_note in partial_brokerage_notes:
+        for note_key, brokerage_note in partial_brokerage_note.items():
+            if (merged_brokerage_note := brokerage_notes.get(note_key)) is None:
+                brokerage_notes[note_key] = brokerage_note
+            else:
+                merged_brokerage_note.merge(brokerage_note)
+    return brokerage_notes
+
+
+def read_brokerage_note_source(source: Union[BrokerageNoteSource, bytes]) -> io.BytesIO:
+    if isinstance(source, io.BytesIO):
+        return io.BytesIO(source.getvalue())
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    with open(source, "rb") as file:
+        return io.BytesIO(file.read())
+
+
+def _parse_page_range(
+    parser_class: Type[B3Parser],
+    source: Union[bytes, str, "os.PathLike[str]"],
+    password: Optional[str],
+    budget: Optional[ParsingBudget],
+    page_range: range,
+) -> Dict[NoteKey, BrokerageNote]:
+    parser = parser_class(
+        brokerage_note=read_brokerage_note_source(source), password=password, budget=budget, page_range=page_range
+    )
+    parser.parse_brokerage_note()
+    return parser.brokerage_notes
+
+
+def _parse_page_range_to_wire_format(
+    parser_class: Type[B3Parser],
+    source: Union[bytes, str, "os.PathLike[str]"],
+    password: Optional[str],
+    budget: Optional[ParsingBudget],
+    page_range: range,
+) -> bytes:
+    """Sends the notes back to the parent encoded in the wire format, which is cheaper than pickling them"""
+    brokerage_notes = _parse_page_range(parser_class, source, password, budget, page_range)
+    return encode_brokerage_notes(brokerage_notes.values())
+
+
+def _decode_partial_brokerage_notes(payload: bytes) -> Dict[NoteKey, BrokerageNote]:
+    return {
+        (brokerage_note.reference_id, brokerage_note.reference_date): brokerage_note
+        for brokerage_note in decode_brokerage_notes(payload)
+    }
+
+
+class ParallelParser:
+    """Parses a single large document by splitting it into page ranges, each one parsed in a separate process.
+
+    Every process opens the document on its own, so the budget (deadline included) applies to each range.
+    """
+
+    def __init__(
+        self,
+        brokerage_note: BrokerageNoteSource,
+        password: Optional[Password] = None,
+        budget: Optional[ParsingBudget] = None,
+        max_workers: Optional[int] = None,
+        pages_per_range: Optional[int] = None,
+    ) -> None:
+        self.__brokerage_note = brokerage_note
+        self.__password = password
+        self.__budget = budget
+        self.__max_workers = max_workers or os.cpu_count() or 1
+        self.__pages_per_range = pages_per_range
+
+    def __build_page_ranges(self, page_count: int) -> List[range]:
+        pages_per_range = self.__pages_per_range or math.ceil(page_count / self.__max_workers)
+        return split_page_ranges(page_count=page_count, pages_per_range=max(pages_per_range, 1))
+
+    def parse(self) -> List[BrokerageNote]:
+        content = read_brokerage_note_source(self.__brokerage_note)
+        first_page_parser = FitzParser(
+            file=content, password=self.__password, budget=self.__budget, page_range=range(0, 1)
+        )
+        parser_class = ParserFactory.get_parser_class(fitz_parser=first_page_parser)
+        page_count = first_page_parser.document.page_count  # type: ignore[union-attr]
+        page_ranges = self.__build_page_ranges(page_count=page_count)
+        # Workers receive the path when there is one, otherwise the document bytes
+        source = content.getvalue() if isinstance(self.__brokerage_note, io.BytesIO) else self.__brokerage_note
+        parse_arguments = (
+            repeat(parser_class),
+            repeat(source),
+            repeat(first_page_parser.password),
+            repeat(self.__budget),
+            page_ranges,
+        )
+
+        if len(page_ranges) <= 1:
+            partial_brokerage_notes = list(map(_parse_page_range, *parse_arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.__max_workers, len(page_ranges))) as executor:
+                partial_brokerage_notes = [
+                    _decode_partial_brokerage_notes(payload)
+                    for payload in executor.map(_parse_page_range_to_wire_format, *parse_arguments)
+                ]
+
+        return list(merge_brokerage_notes(partial_brokerage_notes).values())
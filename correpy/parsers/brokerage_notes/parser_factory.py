@@ -4,34 +4,57 @@
     :copyright: (c) 2024 by Alby
 """
 import io
-from typing import Optional, List
+from typing import Optional, List, Type
 
 from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.instruments.security_classifier import SecurityClassifier
 from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
 from correpy.parsers.brokerage_notes.base_parser import BaseBrokerageNoteParser
 from correpy.parsers.brokerage_notes.nuinvest_parser.nuinvest import NuInvestParser
 from correpy.parsers.brokerage_notes.inter_parser.inter import InterParser
 from correpy.parsers.fitz_parser import FitzParser
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.parsers.password_resolver import Password
 
 
 class ParserFactory:
+    # Every broker detected by the CNPJ of its layout
     CNPJ_PARSER_MAP = {
-        "62.169.875/0001-79": NuInvestParser,
-        "18.945.670/0001-46": InterParser
+        parser_class.layout.cnpj: parser_class
+        for parser_class in (NuInvestParser, InterParser)
+        if parser_class.layout.cnpj is not None
     }
 
-    def __init__(self, brokerage_note: io.BytesIO, password: Optional[str] = None):
+    def __init__(
+        self,
+        brokerage_note: io.BytesIO,
+        password: Optional[Password] = None,
+        budget: Optional[ParsingBudget] = None,
+        security_classifier: Optional[SecurityClassifier] = None,
+    ):
+        """Without a security classifier, the parsers use get_default_security_classifier"""
         self.__brokerage_note = brokerage_note
         self.__password = password
+        self.__budget = budget
+        self.__security_classifier = security_classifier
 
-    def get_parser(self) -> BaseBrokerageNoteParser:
-        fitz_parser = FitzParser(file=self.__brokerage_note, password=self.__password)
-
-        for cnpj, parser in self.CNPJ_PARSER_MAP.items():
+    @classmethod
+    def get_parser_class(cls, fitz_parser: FitzParser) -> Type[B3Parser]:
+        for cnpj, parser in cls.CNPJ_PARSER_MAP.items():
             if fitz_parser.is_text_in_document(text=cnpj):
-                return parser(brokerage_note=self.__brokerage_note, password=self.__password)
+                return parser
+        return B3Parser
 
-        return B3Parser(brokerage_note=self.__brokerage_note, password=self.__password)
+    def get_parser(self) -> BaseBrokerageNoteParser:
+        fitz_parser = FitzParser(file=self.__brokerage_note, password=self.__password, budget=self.__budget)
+        parser_class = self.get_parser_class(fitz_parser=fitz_parser)
+
+        # The already opened and authenticated document is reused, so the password is resolved only once
+        return parser_class(
+            brokerage_note=self.__brokerage_note,
+            fitz_parser=fitz_parser,
+            security_classifier=self.__security_classifier,
+        )
 
     def parse(self) -> List[BrokerageNote]:
         parser = self.get_parser()
@@ -0,0 +1,62 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+
+WordsByColumn = Dict[str, List[str]]
+
+
+# Mark printed before some transactions, not one of their fields
+TRANSACTION_MARK_PATTERN = re.compile(r"^N\s")
+
+
+class TransactionRow(NamedTuple):
+    """Text of a transaction line, as classified by the layout, and its words split by column header when the header
+    columns were found. The text is only parsed when the columns can not be used."""
+
+    text: str
+    words_by_column: Optional[WordsByColumn] = None
+
+    @property
+    def line(self) -> str:
+        """Text read by the fixed indexes of the layout, built only when falling back to them"""
+        return TRANSACTION_MARK_PATTERN.sub("", self.text)
+
+
+class TransactionColumns:
+    """Column boundaries of a transactions table, computed once from the words of its header line.
+
+    Each column starts at the x0 of its header and ends where the next one starts, so a word belongs to the column
+    containing its horizontal center. It works for both left-aligned texts and right-aligned numbers, which end a
+    little after their header but always before the next one.
+    """
+
+    def __init__(self, headers: Sequence[str], starts: Sequence[float]) -> None:
+        self.headers = list(headers)
+        self.starts = list(starts)
+
+    @classmethod
+    def from_header_words(
+        cls, header_words: Iterable[WordRectangle], headers: Sequence[str]
+    ) -> Optional["TransactionColumns"]:
+        """None when some header is missing or out of order, so the caller falls back to the line text"""
+        header_words = list(header_words)
+        starts = []
+        word_index = 0
+        for header in headers:
+            while word_index < len(header_words) and header_words[word_index].value != header:
+                word_index += 1
+            if word_index == len(header_words):
+                return None
+            starts.append(header_words[word_index].x0)
+            word_index += 1
+        return cls(headers=headers, starts=starts)
+
+    def split_words(self, words: Iterable[WordRectangle]) -> WordsByColumn:
+        words_by_column: WordsByColumn = {header: [] for header in self.headers}
+        for word in words:
+            column_index = bisect_right(self.starts, (word.x0 + word.x1) / 2) - 1
+            if column_index >= 0:
+                words_by_column[self.headers[column_index]].append(word.value)
+        return words_by_column
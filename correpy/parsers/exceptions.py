@@ -1,6 +1,25 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from correpy.parsers.parsing_budget import ParsingDiagnostics
+
+
 class InvalidPasswordException(Exception):
     pass
 
 
 class ProblemParsingBrokerageNoteException(Exception):
     pass
+
+
+class InvalidBrokerLayoutException(Exception):
+    pass
+
+
+class ParsingBudgetExceededException(Exception):
+    def __init__(self, *, budget_name: str, limit: float, observed: float, diagnostics: "ParsingDiagnostics") -> None:
+        super().__init__(f"Parsing budget '{budget_name}' exceeded: {observed} > {limit}")
+        self.budget_name = budget_name
+        self.limit = limit
+        self.observed = observed
+        self.diagnostics = diagnostics
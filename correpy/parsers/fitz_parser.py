@@ -1,20 +1,52 @@
 import io
-import typing
-from typing import List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Sequence, Union
 
 import fitz
-from fitz import Document, TextPage
+from fitz import Document, Page, TextPage
 
+from correpy.parsers.brokerage_notes.page_layout import PageLayout
 from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
 from correpy.parsers.exceptions import InvalidPasswordException, ProblemParsingBrokerageNoteException
+from correpy.parsers.parsing_budget import ParsingBudget, ParsingBudgetTracker
+from correpy.parsers.password_resolver import Password, PasswordResolver
 
 
 class FitzParser:
-    def __init__(self, file: io.BytesIO, password: Optional[str]) -> None:
+    def __init__(
+        self,
+        file: io.BytesIO,
+        password: Optional[Password],
+        budget: Optional[ParsingBudget] = None,
+        page_range: Optional[range] = None,
+        extract_words: bool = True,
+    ) -> None:
+        """When a page range is given only those pages are read, `words` then starts at the range's first page.
+
+        With `extract_words` disabled the document is only opened and authenticated, leaving `words` empty.
+        """
         self.document: Optional[Document] = None
+        self.password: Optional[str] = None
+        self.page_range = page_range
         self.words: List[List[WordRectangle]] = []
+        self._page_layouts: Dict[int, PageLayout] = {}
+        self.budget_tracker = ParsingBudgetTracker(budget=budget)
+
+        self.__parse(file=file, password=password, extract_words=extract_words)
+
+    @classmethod
+    def from_extracted_words(cls, *, words: List[List[WordRectangle]], page_range: range) -> "FitzParser":
+        """Parser over words extracted elsewhere (e.g. in another process), one list per page of the range.
 
-        self.__parse(file=file, password=password)
+        There is no open document, so only the helpers working on words and page layouts can be used.
+        """
+        fitz_parser = cls.__new__(cls)
+        fitz_parser.document = None
+        fitz_parser.password = None
+        fitz_parser.page_range = page_range
+        fitz_parser.words = words
+        fitz_parser._page_layouts = {}
+        fitz_parser.budget_tracker = ParsingBudgetTracker()
+        return fitz_parser
 
     @classmethod
     def build_rectangle_from_beginning_first_rectangle_end_second_rectangle(
@@ -22,10 +54,6 @@ class FitzParser:
     ) -> fitz.Rect:
         return first_rect | second_rect
 
-    @classmethod
-    def is_word_in_rectangle(cls, *, rectangle: fitz.Rect, word: WordRectangle) -> bool:
-        return typing.cast(bool, fitz.Rect(word.x0, word.y0, word.x1, word.y1).intersects(rectangle))
-
     @classmethod
     def search_and_extract_rectangle_from_text(cls, *, page: TextPage, text: Union[str, List[str]]) -> fitz.Rect:
         if isinstance(text, str):
@@ -39,30 +67,73 @@ class FitzParser:
             raise ProblemParsingBrokerageNoteException
         return quadrilateral_position[0].rect
 
+    @property
+    def first_page_number(self) -> int:
+        return self.page_range.start if self.page_range is not None else 0
+
+    def iter_pages(self) -> Iterator[Page]:
+        if self.page_range is None:
+            yield from self.document  # type: ignore[misc]
+            return
+        for page_number in self.page_range:
+            yield self.document[page_number]  # type: ignore[index]
+
+    def get_page_layout(self, *, page_number: int) -> PageLayout:
+        """Line layout of the page, built on the first call and shared by all the sections of the page"""
+        if (page_layout := self._page_layouts.get(page_number)) is None:
+            page_layout = PageLayout(words=self.words[page_number - self.first_page_number])
+            self._page_layouts[page_number] = page_layout
+        return page_layout
+
     def get_words_in_rectangle(self, *, page_number: int, rectangle: fitz.Rect) -> List[WordRectangle]:
-        return [word for word in self.words[page_number] if self.is_word_in_rectangle(rectangle=rectangle, word=word)]
+        """Words intersecting the rectangle, by line then by column, sliced from the cached layout of the page"""
+        page_layout = self.get_page_layout(page_number=page_number)
+        return [word for line in page_layout.get_lines_in_rectangle(rectangle=rectangle) for word in line]
 
-    def __parse(self, *, file: io.BytesIO, password: Optional[str]) -> None:
-        doc: Document = fitz.open(stream=file, filetype="pdf")
-        authenticated = doc.authenticate(password)
+    @staticmethod
+    def __authenticate(*, document: Document, password: Optional[Password]) -> Optional[str]:
+        if isinstance(password, PasswordResolver):
+            return password.resolve(document=document)
+
+        authenticated = document.authenticate(password)
         if not authenticated:
             raise InvalidPasswordException
+        return password
+
+    def __parse(self, *, file: io.BytesIO, password: Optional[Password], extract_words: bool) -> None:
+        doc: Document = fitz.open(stream=file, filetype="pdf")
+        self.password = self.__authenticate(document=doc, password=password)
 
         self.document = doc
-        self.__read_pages_and_words_from_pages()
+        self.budget_tracker.check_page_count(page_count=doc.page_count)
+        if self.page_range is not None:
+            self.page_range = range(max(self.page_range.start, 0), min(self.page_range.stop, doc.page_count))
+        if extract_words:
+            self.__read_pages_and_words_from_pages()
 
     def __read_pages_and_words_from_pages(self) -> None:
-        for page in self.document:  # type:ignore[union-attr]
+        for page in self.iter_pages():
+            self.budget_tracker.check_deadline()
             text_page = page.get_textpage()
-            self.words.append(self.__parse_fitz_word_tuple_to_word_object(text_page))
+            self.words.append(self.parse_words_from_text_page(text_page))
 
-    @staticmethod
-    def __parse_fitz_word_tuple_to_word_object(text_page: fitz.TextPage) -> List[WordRectangle]:
-        extracted_words = text_page.extractWORDS()
-        return [WordRectangle(word[0], word[1], word[2], word[3], word[4]) for word in extracted_words]
+    def parse_words_from_text_page(self, text_page: fitz.TextPage) -> List[WordRectangle]:
+        return self.parse_words_from_text_pages([text_page])[0]
+
+    def parse_words_from_text_pages(self, text_pages: Sequence[fitz.TextPage]) -> List[List[WordRectangle]]:
+        """Words of text pages clipped from the same page, checked against the budgets as a single page"""
+        extracted_words_by_text_page = [text_page.extractWORDS() for text_page in text_pages]
+        self.budget_tracker.register_page_words(
+            words=[word for extracted_words in extracted_words_by_text_page for word in extracted_words]
+        )
+        return [
+            [WordRectangle(word[0], word[1], word[2], word[3], word[4]) for word in extracted_words]
+            for extracted_words in extracted_words_by_text_page
+        ]
 
     def is_text_in_document(self, *, text: str) -> bool:
-        for page_document in self.document:
+        for page_document in self.iter_pages():
+            self.budget_tracker.check_deadline()
             if page_document.get_textpage().search(text):
                 return True
         return False
@@ -0,0 +1,78 @@
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from correpy.parsers.exceptions import ParsingBudgetExceededException
+
+# Rough size in bytes of one WordRectangle (namedtuple + 4 floats + empty str), used to estimate memory
+WORD_RECTANGLE_ESTIMATED_SIZE_IN_BYTES = 230
+
+
+@dataclass(frozen=True)
+class ParsingBudget:
+    """Limits applied while parsing a single document. Limits set as None are not enforced."""
+
+    max_pages: Optional[int] = None
+    max_words_per_page: Optional[int] = None
+    deadline_in_seconds: Optional[float] = None
+    max_memory_in_bytes: Optional[int] = None
+
+
+@dataclass
+class ParsingDiagnostics:
+    pages_in_document: int = 0
+    pages_read: int = 0
+    words_read: int = 0
+    words_per_page: List[int] = field(default_factory=list)
+    estimated_memory_in_bytes: int = 0
+    elapsed_seconds: float = 0.0
+
+
+class ParsingBudgetTracker:
+    def __init__(self, budget: Optional[ParsingBudget] = None) -> None:
+        self.budget = budget or ParsingBudget()
+        self.diagnostics = ParsingDiagnostics()
+        self.__started_at = time.monotonic()
+
+    @staticmethod
+    def estimate_words_memory(words: Sequence[Sequence[object]]) -> int:
+        return sum(WORD_RECTANGLE_ESTIMATED_SIZE_IN_BYTES + len(str(word[4])) for word in words)
+
+    def __raise_exceeded(self, *, budget_name: str, limit: float, observed: float) -> None:
+        self.diagnostics.elapsed_seconds = time.monotonic() - self.__started_at
+        raise ParsingBudgetExceededException(
+            budget_name=budget_name, limit=limit, observed=observed, diagnostics=self.diagnostics
+        )
+
+    def check_page_count(self, page_count: int) -> None:
+        self.diagnostics.pages_in_document = page_count
+        if self.budget.max_pages is not None and page_count > self.budget.max_pages:
+            self.__raise_exceeded(budget_name="max_pages", limit=self.budget.max_pages, observed=page_count)
+
+    def check_deadline(self) -> None:
+        if self.budget.deadline_in_seconds is None:
+            return
+        elapsed_seconds = time.monotonic() - self.__started_at
+        if elapsed_seconds > self.budget.deadline_in_seconds:
+            self.__raise_exceeded(
+                budget_name="deadline_in_seconds", limit=self.budget.deadline_in_seconds, observed=elapsed_seconds
+            )
+
+    def register_page_words(self, words: Sequence[Sequence[object]]) -> None:
+        """Checks the budgets of a page before its words are kept in memory."""
+        words_count = len(words)
+        if self.budget.max_words_per_page is not None and words_count > self.budget.max_words_per_page:
+            self.__raise_exceeded(
+                budget_name="max_words_per_page", limit=self.budget.max_words_per_page, observed=words_count
+            )
+
+        estimated_memory = self.diagnostics.estimated_memory_in_bytes + self.estimate_words_memory(words)
+        if self.budget.max_memory_in_bytes is not None and estimated_memory > self.budget.max_memory_in_bytes:
+            self.__raise_exceeded(
+                budget_name="max_memory_in_bytes", limit=self.budget.max_memory_in_bytes, observed=estimated_memory
+            )
+
+        self.diagnostics.pages_read += 1
+        self.diagnostics.words_read += words_count
+        self.diagnostics.words_per_page.append(words_count)
+        self.diagnostics.estimated_memory_in_bytes = estimated_memory
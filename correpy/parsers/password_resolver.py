@@ -0,0 +1,80 @@
+import threading
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+
+from fitz import Document
+
+from correpy.parsers.exceptions import InvalidPasswordException
+
+PasswordCandidatesCallback = Callable[[], Iterable[str]]
+
+
+class PasswordMemory:
+    """Keeps, per client, the passwords that opened a document, the most recent one first."""
+
+    def __init__(self) -> None:
+        self.__passwords_by_client: Dict[str, List[str]] = {}
+        self.__lock = threading.Lock()
+
+    def get_passwords(self, client_id: str) -> List[str]:
+        with self.__lock:
+            return list(self.__passwords_by_client.get(client_id, []))
+
+    def remember(self, client_id: str, password: str) -> None:
+        with self.__lock:
+            passwords = self.__passwords_by_client.setdefault(client_id, [])
+            if password in passwords:
+                passwords.remove(password)
+            passwords.insert(0, password)
+
+
+default_password_memory = PasswordMemory()
+
+
+class PasswordResolver:
+    """Tries a list of password candidates against an already opened document.
+
+    Passwords remembered for the client are tried first, then the given candidates and, at last, the ones
+    lazily produced by the callback. The password that works is remembered for the next documents of the client.
+    """
+
+    def __init__(
+        self,
+        candidates: Sequence[str] = (),
+        callback: Optional[PasswordCandidatesCallback] = None,
+        client_id: Optional[str] = None,
+        memory: Optional[PasswordMemory] = None,
+    ) -> None:
+        self.candidates = candidates
+        self.callback = callback
+        self.client_id = client_id
+        self.memory = memory or default_password_memory
+
+    def __iter_all_candidates(self) -> Iterator[str]:
+        if self.client_id is not None:
+            yield from self.memory.get_passwords(client_id=self.client_id)
+        yield from self.candidates
+        if self.callback is not None:
+            yield from self.callback()
+
+    def iter_candidates(self) -> Iterator[str]:
+        already_tried: Set[str] = set()
+        for candidate in self.__iter_all_candidates():
+            if candidate not in already_tried:
+                already_tried.add(candidate)
+                yield candidate
+
+    def resolve(self, *, document: Document) -> Optional[str]:
+        """Authenticates the document and returns the password used, None if the document has no password."""
+        if not document.needs_pass:
+            return None
+
+        for candidate in self.iter_candidates():
+            if document.authenticate(candidate):
+                if self.client_id is not None:
+                    self.memory.remember(client_id=self.client_id, password=candidate)
+                return candidate
+
+        raise InvalidPasswordException
+
+
+Password = Union[str, PasswordResolver]
@@ -0,0 +1,209 @@
+"""Brokerage note parsing split into pipeline stages.
+
+extraction (open, authenticate, words and anchors; the only stage using MuPDF) -> sections -> lines -> entities
+"""
+
+import threading
+from functools import partial
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Type, TypeVar, Union
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.base_parser import NoteKey
+from correpy.parsers.brokerage_notes.parallel_parser import BrokerageNoteSource, read_brokerage_note_source
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.exceptions import ProblemParsingBrokerageNoteException
+from correpy.parsers.fitz_parser import FitzParser
+from correpy.parsers.parsing_budget import ParsingBudget, ParsingBudgetTracker
+from correpy.parsers.password_resolver import Password
+from correpy.pipeline.extraction_cache import ExtractionCache, get_document_digest
+from correpy.pipeline.merge_index import BrokerageNoteMergeIndex, iter_new_sources, merge_brokerage_note_results
+from correpy.pipeline.pipeline import DEFAULT_QUEUE_SIZE, Pipeline, PipelineResult, Stage
+from correpy.pipeline.products import (
+    DocumentJob,
+    DocumentLines,
+    DocumentSections,
+    ExtractedDocument,
+    ExtractedPage,
+    PageLines,
+    PageSections,
+)
+from correpy.utils import extract_value_from_line
+
+SectionT = TypeVar("SectionT")
+SectionT_co = TypeVar("SectionT_co", covariant=True)
+
+
+class PageSectionBuilder(Protocol[SectionT_co]):
+    def __call__(self, page: ExtractedPage, page_number: int) -> SectionT_co: ...
+
+
+# MuPDF does not support being used by several threads at once, so extraction threads take turns
+_MUPDF_LOCK = threading.Lock()
+
+
+def _check_extracted_document_budget(extracted_document: ExtractedDocument, budget: Optional[ParsingBudget]) -> None:
+    """Budgets are enforced on documents replayed from the cache as they are while extracting them"""
+    budget_tracker = ParsingBudgetTracker(budget=budget)
+    budget_tracker.check_page_count(page_count=len(extracted_document.pages))
+    for page in extracted_document.pages:
+        budget_tracker.check_deadline()
+        budget_tracker.register_page_words(words=page.words)
+
+
+def extract_document(job: DocumentJob, extraction_cache: Optional[ExtractionCache] = None) -> ExtractedDocument:
+    """The broker is detected on the first page, as done by the ParallelParser.
+
+    With an `extraction_cache`, documents already extracted by the same PyMuPDF version and parsers are replayed
+    without MuPDF. Encrypted documents are not cached, so their password is always checked.
+    """
+    content = read_brokerage_note_source(job.source)
+    digest = None
+    if extraction_cache is not None:
+        digest = get_document_digest(content.getbuffer())
+        if (cached_document := extraction_cache.get(digest)) is not None:
+            _check_extracted_document_budget(cached_document, job.budget)
+            return cached_document
+
+    with _MUPDF_LOCK:
+        fitz_parser = FitzParser(file=content, password=job.password, budget=job.budget, extract_words=False)
+        parser_class: Optional[Type[B3Parser]] = None
+        extracted_pages = []
+        for page in fitz_parser.iter_pages():
+            fitz_parser.budget_tracker.check_deadline()
+            text_page = page.get_textpage()
+            if parser_class is None:
+                parser_class = B3Parser
+                for cnpj, cnpj_parser_class in ParserFactory.CNPJ_PARSER_MAP.items():
+                    if text_page.search(cnpj):
+                        parser_class = cnpj_parser_class
+                        break
+            anchors = {}
+            for anchor_text in parser_class.get_anchor_texts():
+                anchor_matches = text_page.search(anchor_text)
+                anchors[anchor_text] = tuple(anchor_matches[0].rect) if anchor_matches else None
+            extracted_pages.append(
+                ExtractedPage(
+                    number=page.number,
+                    width=page.rect.width,
+                    height=page.rect.height,
+                    words=fitz_parser.parse_words_from_text_page(text_page),
+                    anchors=anchors,
+                )
+            )
+        is_encrypted = bool(fitz_parser.document.needs_pass)  # type: ignore[union-attr]
+        fitz_parser.document.close()  # type: ignore[union-attr]
+    extracted_document = ExtractedDocument(parser_class=parser_class or B3Parser, pages=extracted_pages)
+    if extraction_cache is not None and digest is not None and not is_encrypted:
+        extraction_cache.put(digest, extracted_document)
+    return extracted_document
+
+
+def _build_section_or_none(build_section: PageSectionBuilder[SectionT], page: ExtractedPage) -> Optional[SectionT]:
+    try:
+        return build_section(page=page, page_number=page.number)
+    except ProblemParsingBrokerageNoteException:
+        return None
+
+
+def build_sections(extracted_document: ExtractedDocument) -> DocumentSections:
+    parser = extracted_document.build_parser()
+    return DocumentSections(
+        parser=parser,
+        pages=[
+            PageSections(
+                page_number=page.number,
+                note_key=_build_section_or_none(parser.get_note_key_by_page, page),
+                transactions_section=_build_section_or_none(parser.build_transactions_section, page),
+                financial_summary_section=_build_section_or_none(parser.build_financial_summary_section, page),
+            )
+            for page in extracted_document.pages
+        ],
+    )
+
+
+def extract_lines(document_sections: DocumentSections) -> DocumentLines:
+    parser = document_sections.parser
+    document_lines = DocumentLines(parser=parser)
+    for page_sections in document_sections.pages:
+        # Pages without a note number are skipped by the parsers as well
+        if page_sections.note_key is None:
+            continue
+        page_lines = PageLines(page_number=page_sections.page_number, note_key=page_sections.note_key)
+        if page_sections.transactions_section is not None:
+            page_lines.transaction_rows = parser.get_transaction_rows(
+                transactions_brokerage_note_section=page_sections.transactions_section
+            )
+        if page_sections.financial_summary_section is not None:
+            page_lines.fee_lines = parser.get_fee_lines(
+                financial_summary_brokerage_note_section=page_sections.financial_summary_section
+            )
+        document_lines.pages.append(page_lines)
+    return document_lines
+
+
+def build_entities(document_lines: DocumentLines) -> List[BrokerageNote]:
+    brokerage_notes: Dict[NoteKey, BrokerageNote] = {}
+    for page_lines in document_lines.pages:
+        reference_id, reference_date = page_lines.note_key
+        if (brokerage_note := brokerage_notes.get(page_lines.note_key)) is None:
+            brokerage_note = BrokerageNote(reference_id=reference_id, reference_date=reference_date)
+            brokerage_notes[page_lines.note_key] = brokerage_note
+        for transaction_row in page_lines.transaction_rows:
+            brokerage_note.add_transaction(
+                transaction=document_lines.parser.create_transaction(transaction_row=transaction_row)
+            )
+        for fee_type, fee_line in page_lines.fee_lines:
+            brokerage_note.update_fee_from_fee_type(fee_type=fee_type, fee_value=extract_value_from_line(line=fee_line))
+    return list(brokerage_notes.values())
+
+
+def build_brokerage_note_pipeline(
+    *,
+    extraction_workers: int = 1,
+    extraction_in_processes: bool = False,
+    parsing_workers: int = 1,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    extraction_cache: Optional[ExtractionCache] = None,
+) -> Pipeline[DocumentJob, List[BrokerageNote]]:
+    """Extraction threads take turns on MuPDF, so `extraction_in_processes` is what extracts several documents at
+    once. Passwords must then be strings, since PasswordResolver can not be sent to another process.
+
+    With an `extraction_cache`, re-parsing an archive after a parser change only runs MuPDF on new documents.
+    """
+    return (
+        Pipeline.from_stage(
+            Stage(
+                name="extraction",
+                function=partial(extract_document, extraction_cache=extraction_cache),
+                workers=extraction_workers,
+                in_processes=extraction_in_processes,
+            ),
+            queue_size=queue_size,
+        )
+        .then(Stage(name="sections", function=build_sections, workers=parsing_workers))
+        .then(Stage(name="lines", function=extract_lines, workers=parsing_workers))
+        .then(Stage(name="entities", function=build_entities, workers=parsing_workers))
+    )
+
+
+def parse_brokerage_notes(
+    sources: Iterable[Union[BrokerageNoteSource, bytes]],
+    password: Optional[Password] = None,
+    budget: Optional[ParsingBudget] = None,
+    pipeline: Optional[Pipeline[DocumentJob, List[BrokerageNote]]] = None,
+    ordered: bool = False,
+    merge_index: Optional[BrokerageNoteMergeIndex] = None,
+) -> Iterator[PipelineResult[DocumentJob, List[BrokerageNote]]]:
+    """Parses many documents, yielding one result per document with its notes or the error that stopped it.
+
+    With a `merge_index`, files already seen are not parsed again and each result holds only the notes the index
+    created or changed, merged with the partial notes of the previous files.
+    """
+    if merge_index is not None:
+        sources = iter_new_sources(sources, merge_index)
+    jobs = (DocumentJob(source=source, password=password, budget=budget) for source in sources)
+    results = (pipeline or build_brokerage_note_pipeline()).run(jobs, ordered=ordered)
+    if merge_index is not None:
+        return merge_brokerage_note_results(results, merge_index)
+    return results
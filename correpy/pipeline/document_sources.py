@@ -0,0 +1,178 @@
+"""Sources streaming the PDFs of ZIP archives and e-mails straight into the parsers, without temporary files.
+
+Every PDF is read into memory and yielded as a NamedDocument, a BytesIO accepted wherever a BrokerageNoteSource is
+(ParserFactory, ParallelParser, parse_brokerage_notes), named after where it came from: `notes.zip!2022/05.pdf` or
+`inbox.mbox!3!nota.pdf`. Sources are generators, so the batch pipeline pulls one document at a time and a large
+archive is never fully loaded.
+
+ZIP archives are read within ArchiveLimits: members larger than the maximum size, archives nested too deep and
+archives with too many members (nested ones included) raise InvalidDocumentArchiveException, so a ZIP bomb is refused
+before it is decompressed.
+"""
+
+import email
+import email.policy
+import io
+import mailbox
+import os
+import zipfile
+from email.message import Message
+from typing import IO, Generator, Iterable, Iterator, NamedTuple, Union
+
+from correpy.parsers.brokerage_notes.parallel_parser import BrokerageNoteSource
+from correpy.pipeline.exceptions import InvalidDocumentArchiveException
+
+PDF_SUFFIX = ".pdf"
+ZIP_SUFFIX = ".zip"
+EML_SUFFIX = ".eml"
+MBOX_SUFFIX = ".mbox"
+PDF_CONTENT_TYPES = {"application/pdf", "application/x-pdf"}
+ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed"}
+# Attachments whose type says nothing about the content, identified by the file name instead
+GENERIC_CONTENT_TYPES = {"application/octet-stream"}
+
+ArchiveSource = Union[str, "os.PathLike[str]", IO[bytes]]
+
+
+class ArchiveLimits(NamedTuple):
+    """`max_member_size` is the uncompressed size of a member, in bytes. The archive given is at depth 0."""
+
+    max_member_size: int = 64 * 1024 * 1024
+    max_nesting_depth: int = 3
+    max_members: int = 10_000
+
+
+DEFAULT_ARCHIVE_LIMITS = ArchiveLimits()
+
+
+class NamedDocument(io.BytesIO):
+    """Content of a PDF found inside an archive or an e-mail. Pickled with its name, so it can go to processes."""
+
+    name: str
+
+    def __init__(self, content: bytes, name: str) -> None:
+        super().__init__(content)
+        self.name = name
+
+
+def _has_suffix(file_name: str, suffix: str) -> bool:
+    return file_name.lower().endswith(suffix)
+
+
+def _iter_zip_documents(
+    archive: ArchiveSource, *, archive_name: str, limits: ArchiveLimits, depth: int, max_members: int
+) -> Generator[NamedDocument, None, int]:
+    """Returns the number of members of the archive, nested ones included"""
+    members_count = 0
+    try:
+        with zipfile.ZipFile(archive) as zip_file:
+            for member in zip_file.infolist():
+                if member.is_dir():
+                    continue
+                members_count += 1
+                if members_count > max_members:
+                    raise InvalidDocumentArchiveException(
+                        f"ZIP archive {archive_name} has more than {limits.max_members} members"
+                    )
+                is_pdf = _has_suffix(member.filename, PDF_SUFFIX)
+                if not (is_pdf or _has_suffix(member.filename, ZIP_SUFFIX)):
+                    continue
+                member_name = f"{archive_name}!{member.filename}"
+                # Reading stops at the declared size, a member decompressing to more fails its CRC check
+                if member.file_size > limits.max_member_size:
+                    raise InvalidDocumentArchiveException(
+                        f"Member {member_name} has {member.file_size} bytes, over {limits.max_member_size}"
+                    )
+                if is_pdf:
+                    yield NamedDocument(zip_file.read(member), name=member_name)
+                    continue
+                if depth >= limits.max_nesting_depth:
+                    raise InvalidDocumentArchiveException(
+                        f"ZIP archive {member_name} is nested more than {limits.max_nesting_depth} levels deep"
+                    )
+                members_count += yield from _iter_zip_documents(
+                    io.BytesIO(zip_file.read(member)),
+                    archive_name=member_name,
+                    limits=limits,
+                    depth=depth + 1,
+                    max_members=max_members - members_count,
+                )
+    except (zipfile.BadZipFile, RuntimeError, EOFError) as exc:
+        # RuntimeError is raised for encrypted members, EOFError for truncated ones
+        raise InvalidDocumentArchiveException(f"Could not read the ZIP archive {archive_name}: {exc}") from exc
+    return members_count
+
+
+def iter_zip_documents(
+    archive: ArchiveSource, name: str = "", limits: ArchiveLimits = DEFAULT_ARCHIVE_LIMITS
+) -> Iterator[NamedDocument]:
+    """PDFs of the archive in the order they are stored, ZIPs inside it included. Members are read one at a time."""
+    archive_name = name or (os.fspath(archive) if isinstance(archive, (str, os.PathLike)) else "")
+    yield from _iter_zip_documents(
+        archive, archive_name=archive_name, limits=limits, depth=0, max_members=limits.max_members
+    )
+
+
+def iter_message_documents(
+    message: Message, name: str = "", limits: ArchiveLimits = DEFAULT_ARCHIVE_LIMITS
+) -> Iterator[NamedDocument]:
+    """PDF attachments of the message, including those of forwarded messages and of attached ZIPs"""
+    for part in message.walk():
+        if part.is_multipart():
+            continue
+        content_type = part.get_content_type()
+        file_name = part.get_filename() or ""
+        is_pdf = content_type in PDF_CONTENT_TYPES or (
+            content_type in GENERIC_CONTENT_TYPES and _has_suffix(file_name, PDF_SUFFIX)
+        )
+        is_zip = content_type in ZIP_CONTENT_TYPES or (
+            content_type in GENERIC_CONTENT_TYPES and _has_suffix(file_name, ZIP_SUFFIX)
+        )
+        if not (is_pdf or is_zip):
+            continue
+        content = part.get_payload(decode=True)
+        if not isinstance(content, bytes) or not content:
+            continue
+        part_name = f"{name}!{file_name or 'attachment'}"
+        if is_pdf:
+            yield NamedDocument(content, name=part_name)
+        else:
+            yield from iter_zip_documents(io.BytesIO(content), name=part_name, limits=limits)
+
+
+def iter_eml_documents(
+    path: "Union[str, os.PathLike[str]]", limits: ArchiveLimits = DEFAULT_ARCHIVE_LIMITS
+) -> Iterator[NamedDocument]:
+    with open(path, "rb") as file:
+        message = email.message_from_binary_file(file, policy=email.policy.compat32)
+    yield from iter_message_documents(message, name=os.fspath(path), limits=limits)
+
+
+def iter_mbox_documents(
+    path: "Union[str, os.PathLike[str]]", limits: ArchiveLimits = DEFAULT_ARCHIVE_LIMITS
+) -> Iterator[NamedDocument]:
+    """Messages are read one at a time from the mailbox file, named by their position in it"""
+    if not os.path.isfile(path):
+        raise InvalidDocumentArchiveException(f"Mailbox {os.fspath(path)} does not exist")
+    mbox = mailbox.mbox(path, create=False)
+    try:
+        for message_index, message in enumerate(mbox):
+            yield from iter_message_documents(message, name=f"{os.fspath(path)}!{message_index}", limits=limits)
+    finally:
+        mbox.close()
+
+
+def iter_brokerage_note_sources(
+    paths: Iterable["Union[str, os.PathLike[str]]"], limits: ArchiveLimits = DEFAULT_ARCHIVE_LIMITS
+) -> Iterator[BrokerageNoteSource]:
+    """Expands `.zip`, `.eml` and `.mbox` files into their PDFs. Any other path is yielded as is."""
+    for path in paths:
+        file_name = os.fspath(path)
+        if _has_suffix(file_name, ZIP_SUFFIX):
+            yield from iter_zip_documents(path, limits=limits)
+        elif _has_suffix(file_name, EML_SUFFIX):
+            yield from iter_eml_documents(path, limits=limits)
+        elif _has_suffix(file_name, MBOX_SUFFIX):
+            yield from iter_mbox_documents(path, limits=limits)
+        else:
+            yield path
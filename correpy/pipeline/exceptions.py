@@ -0,0 +1,6 @@
+class InvalidExtractionCacheException(Exception):
+    pass
+
+
+class InvalidDocumentArchiveException(Exception):
+    pass
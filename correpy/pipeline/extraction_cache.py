@@ -0,0 +1,233 @@
+"""On-disk cache of the extraction stage, so documents are parsed again without MuPDF.
+
+Entries are keyed by the blake2b digest of the PDF and live under a directory per PyMuPDF version and per parsers
+fingerprint. Upgrading MuPDF (which may extract different words), changing the anchors of a layout or the CNPJ
+detecting a broker starts a new cache, while other parser changes in correpy reuse it. Each entry is a compact binary
+file read through mmap.
+
+Layout (little-endian, every section padded to 8 bytes):
+
+- header: magic, version, pages count, words count, anchors count, strings count and strings blob size
+- interned strings: offsets (uint32) followed by the utf-8 blob; the parser class name is always the first string
+- pages columns: number, width and height, words count and anchors count
+- words columns: x0, y0, x1, y1 (float64, so coordinates are replayed exactly) and the value string index
+- anchors columns: text string index, 1 when found and x0, y0, x1, y1 of the match
+
+Entries are replayed without opening the PDF, so encrypted documents are never cached: their password is checked by
+MuPDF on every extraction. Changes to how the broker is detected, beyond the CNPJ map, must bump
+EXTRACTION_CACHE_VERSION.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import struct
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, Optional, Type, Union
+
+import fitz
+
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+from correpy.pipeline.exceptions import InvalidExtractionCacheException
+from correpy.pipeline.products import ExtractedDocument, ExtractedPage, RectangleCoordinates
+from correpy.serialization.columnar import ColumnReader, StringInterner, pack_column
+
+EXTRACTION_CACHE_MAGIC = b"CRPX"
+EXTRACTION_CACHE_VERSION = 1
+EXTRACTION_CACHE_SUFFIX = ".cpx"
+HEADER_STRUCT = struct.Struct("<4sHxxIIIII")
+NO_ANCHOR_RECTANGLE = (0.0, 0.0, 0.0, 0.0)
+
+PARSER_CLASS_BY_NAME: Dict[str, Type[B3Parser]] = {
+    parser_class.__name__: parser_class for parser_class in (B3Parser, *ParserFactory.CNPJ_PARSER_MAP.values())
+}
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+def get_pymupdf_version() -> str:
+    return str(fitz.VersionBind)
+
+
+def get_document_digest(content: Union[bytes, memoryview]) -> str:
+    return hashlib.blake2b(content, digest_size=20).hexdigest()
+
+
+def get_parsers_fingerprint() -> str:
+    """Digest of what the entries hold from the parsers: the CNPJ detecting each broker and the anchor texts"""
+    parser_classes = (B3Parser, *ParserFactory.CNPJ_PARSER_MAP.values())
+    description = {
+        "parser_class_by_cnpj": {cnpj: parser.__name__ for cnpj, parser in ParserFactory.CNPJ_PARSER_MAP.items()},
+        "anchor_texts_by_parser_class": {parser.__name__: parser.get_anchor_texts() for parser in parser_classes},
+    }
+    return hashlib.blake2b(json.dumps(description, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def encode_extracted_document(extracted_document: ExtractedDocument) -> bytes:
+    interner = StringInterner()
+    interner.intern(extracted_document.parser_class.__name__)
+    words = [word for page in extracted_document.pages for word in page.words]
+    anchors = [anchor for page in extracted_document.pages for anchor in page.anchors.items()]
+    word_value_indexes = [interner.intern(word.value) for word in words]
+    anchor_text_indexes = [interner.intern(anchor_text) for anchor_text, _ in anchors]
+    strings_sections, strings_size = interner.pack()
+
+    pages = extracted_document.pages
+    return b"".join(
+        [
+            HEADER_STRUCT.pack(
+                EXTRACTION_CACHE_MAGIC,
+                EXTRACTION_CACHE_VERSION,
+                len(pages),
+                len(words),
+                len(anchors),
+                len(interner.strings),
+                strings_size,
+            ),
+            strings_sections,
+            pack_column("I", (page.number for page in pages)),
+            pack_column("d", (dimension for page in pages for dimension in (page.width, page.height))),
+            pack_column("I", (len(page.words) for page in pages)),
+            pack_column("I", (len(page.anchors) for page in pages)),
+            pack_column("d", (coordinate for word in words for coordinate in word[:4])),
+            pack_column("I", word_value_indexes),
+            pack_column("I", anchor_text_indexes),
+            pack_column("B", (coordinates is not None for _, coordinates in anchors)),
+            pack_column(
+                "d", (coordinate for _, coordinates in anchors for coordinate in coordinates or NO_ANCHOR_RECTANGLE)
+            ),
+        ]
+    )
+
+
+def decode_extracted_document(buffer: Buffer) -> ExtractedDocument:
+    view = memoryview(buffer).cast("B")
+    try:
+        if len(view) < HEADER_STRUCT.size:
+            raise InvalidExtractionCacheException("Extraction cache entry is smaller than its header")
+        magic, version, pages_count, words_count, anchors_count, strings_count, strings_size = (
+            HEADER_STRUCT.unpack_from(view)
+        )
+        if magic != EXTRACTION_CACHE_MAGIC or version != EXTRACTION_CACHE_VERSION:
+            raise InvalidExtractionCacheException("Extraction cache entry has an unsupported format")
+
+        # Copied out of the buffer, so the file can be closed once the document is decoded
+        reader = ColumnReader(view, HEADER_STRUCT.size, exception_class=InvalidExtractionCacheException, copy=True)
+        string_offsets, strings_blob = reader.read_strings(strings_count, strings_size)
+        strings = [
+            str(strings_blob[string_offsets[index] : string_offsets[index + 1]], "utf-8")
+            for index in range(strings_count)
+        ]
+        page_numbers = reader.read_column("I", pages_count)
+        page_dimensions = reader.read_float_column(pages_count * 2)
+        words_counts = reader.read_column("I", pages_count)
+        anchors_counts = reader.read_column("I", pages_count)
+        word_coordinates = reader.read_float_column(words_count * 4)
+        word_value_indexes = reader.read_column("I", words_count)
+        anchor_text_indexes = reader.read_column("I", anchors_count)
+        anchor_found_flags = reader.read_column("B", anchors_count)
+        anchor_coordinates = reader.read_float_column(anchors_count * 4)
+    finally:
+        view.release()
+
+    if not strings or strings[0] not in PARSER_CLASS_BY_NAME:
+        raise InvalidExtractionCacheException("Extraction cache entry has an unknown parser")
+    if sum(words_counts) != words_count or sum(anchors_counts) != anchors_count:
+        raise InvalidExtractionCacheException("Extraction cache entry has inconsistent counts")
+
+    pages = []
+    first_word_index = first_anchor_index = 0
+    for page_index in range(pages_count):
+        words_range = range(first_word_index, first_word_index + words_counts[page_index])
+        anchors_range = range(first_anchor_index, first_anchor_index + anchors_counts[page_index])
+        first_word_index, first_anchor_index = words_range.stop, anchors_range.stop
+        anchors: Dict[str, Optional[RectangleCoordinates]] = {}
+        for anchor_index in anchors_range:
+            x0, y0, x1, y1 = anchor_coordinates[anchor_index * 4 : anchor_index * 4 + 4]
+            anchors[strings[anchor_text_indexes[anchor_index]]] = (
+                (x0, y0, x1, y1) if anchor_found_flags[anchor_index] else None
+            )
+        pages.append(
+            ExtractedPage(
+                number=page_numbers[page_index],
+                width=page_dimensions[page_index * 2],
+                height=page_dimensions[page_index * 2 + 1],
+                words=[
+                    WordRectangle(
+                        word_coordinates[word_index * 4],
+                        word_coordinates[word_index * 4 + 1],
+                        word_coordinates[word_index * 4 + 2],
+                        word_coordinates[word_index * 4 + 3],
+                        strings[word_value_indexes[word_index]],
+                    )
+                    for word_index in words_range
+                ],
+                anchors=anchors,
+            )
+        )
+    return ExtractedDocument(parser_class=PARSER_CLASS_BY_NAME[strings[0]], pages=pages)
+
+
+@dataclass
+class ExtractionCacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class ExtractionCache:
+    """Extracted documents stored under `directory/pymupdf-<version>/parsers-<fingerprint>/<digest[:2]>/<digest>.cpx`.
+
+    Only a path is kept, so the cache can be sent to extraction processes; the stats then only count the lookups
+    made in the current process. Unreadable entries are treated as misses and written again.
+    """
+
+    def __init__(
+        self,
+        directory: "os.PathLike[str]",
+        pymupdf_version: Optional[str] = None,
+        parsers_fingerprint: Optional[str] = None,
+    ) -> None:
+        self.directory = pathlib.Path(directory)
+        self.pymupdf_version = pymupdf_version or get_pymupdf_version()
+        self.parsers_fingerprint = parsers_fingerprint or get_parsers_fingerprint()
+        self.stats = ExtractionCacheStats()
+
+    def get_path(self, digest: str) -> pathlib.Path:
+        return (
+            self.directory
+            / f"pymupdf-{self.pymupdf_version}"
+            / f"parsers-{self.parsers_fingerprint}"
+            / digest[:2]
+            / f"{digest}{EXTRACTION_CACHE_SUFFIX}"
+        )
+
+    def get(self, digest: str) -> Optional[ExtractedDocument]:
+        try:
+            with open(self.get_path(digest), "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped_file:
+                extracted_document = decode_extracted_document(mapped_file)
+        except (OSError, ValueError, InvalidExtractionCacheException):
+            # Missing, empty (mmap raises ValueError) or corrupted entries
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return extracted_document
+
+    def put(self, digest: str, extracted_document: ExtractedDocument) -> None:
+        """Written to a temporary file then renamed, so concurrent readers never see a partial entry"""
+        path = self.get_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(encode_extracted_document(extracted_document))
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
@@ -0,0 +1,239 @@
+"""Batch-level index merging the notes parsed from many files.
+
+The same note (same NoteKey) shows up in several files: daily and monthly consolidated documents, corrections sent
+again or a note split between two files. Each parsed note is compared to what the index already holds for its key:
+
+- same content fingerprint, or contained in the known note: duplicate, dropped
+- no transaction in common and fees on different fields: partial note, merged
+- contains the known note: the known note was partial, replaced
+- anything else: conflict, reported and the known note is kept
+"""
+
+import hashlib
+import io
+import os
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE, BrokerageNote
+from correpy.domain.entities.transaction import Transaction
+from correpy.parsers.brokerage_notes.base_parser import NoteKey
+from correpy.parsers.brokerage_notes.parallel_parser import BrokerageNoteSource
+from correpy.pipeline.document_sources import NamedDocument
+from correpy.pipeline.pipeline import PipelineResult
+from correpy.pipeline.products import DocumentJob
+
+TransactionFingerprint = Tuple[str, str, str, str]
+
+FEE_COLUMNS = list(FEE_FIELD_NAME_BY_FEE_TYPE.values())
+SOURCE_DIGEST_CHUNK_SIZE = 1024 * 1024
+
+
+class MergeOutcome(Enum):
+    NEW = "new"
+    MERGED = "merged"
+    REPLACED = "replaced"
+    DUPLICATE = "duplicate"
+    CONFLICT = "conflict"
+
+
+@dataclass(frozen=True)
+class BrokerageNoteConflict:
+    note_key: NoteKey
+    known_sources: Tuple[str, ...]
+    source: str
+    reason: str
+
+
+@dataclass
+class MergeStats:
+    outcomes: Dict[MergeOutcome, int] = field(default_factory=lambda: {outcome: 0 for outcome in MergeOutcome})
+    skipped_sources: int = 0
+
+
+def get_transaction_fingerprint(transaction: Transaction) -> TransactionFingerprint:
+    # Normalized, so the same value written with another scale (10 and 10.00) has the same fingerprint
+    return (
+        transaction.transaction_type.value,
+        str(transaction.amount.normalize()),
+        str(transaction.unit_price.normalize()),
+        transaction.security.name,
+    )
+
+
+def get_fee_values(brokerage_note: BrokerageNote) -> List[Decimal]:
+    return [getattr(brokerage_note, fee_column) for fee_column in FEE_COLUMNS]
+
+
+def get_brokerage_note_fingerprint(brokerage_note: BrokerageNote) -> bytes:
+    """Digest of the fees and transactions of the note, independent of the transactions order"""
+    content = "|".join(
+        [
+            str(brokerage_note.reference_id),
+            brokerage_note.reference_date.isoformat(),
+            *(str(fee_value.normalize()) for fee_value in get_fee_values(brokerage_note)),
+            *sorted("\t".join(get_transaction_fingerprint(transaction)) for transaction in brokerage_note.transactions),
+        ]
+    )
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def get_source_digest(source: Union[BrokerageNoteSource, bytes]) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(source, bytes):
+        digest.update(source)
+    elif isinstance(source, io.BytesIO):
+        digest.update(source.getbuffer())
+    else:
+        with open(source, "rb") as file:
+            while chunk := file.read(SOURCE_DIGEST_CHUNK_SIZE):
+                digest.update(chunk)
+    return digest.digest()
+
+
+def get_source_label(source: Union[BrokerageNoteSource, bytes], index: int) -> str:
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, NamedDocument):
+        return source.name
+    return f"#{index}"
+
+
+@dataclass
+class _MergedBrokerageNote:
+    brokerage_note: BrokerageNote
+    transactions: "Counter[TransactionFingerprint]"
+    fingerprints: Set[bytes]
+    sources: List[str]
+
+
+def _contains_fees(container: BrokerageNote, contained: BrokerageNote) -> bool:
+    return all(
+        fee_value in (0, container_fee_value)
+        for fee_value, container_fee_value in zip(get_fee_values(contained), get_fee_values(container))
+    )
+
+
+def _are_fees_disjoint(brokerage_note: BrokerageNote, other_brokerage_note: BrokerageNote) -> bool:
+    return all(
+        fee_value == 0 or other_fee_value == 0
+        for fee_value, other_fee_value in zip(get_fee_values(brokerage_note), get_fee_values(other_brokerage_note))
+    )
+
+
+class BrokerageNoteMergeIndex:
+    """Keeps, per NoteKey, the merged note with the fingerprints and transactions seen so far.
+
+    Notes given to the index are not changed: the first note of a key is copied before merging others into it.
+    """
+
+    def __init__(self) -> None:
+        self.__merged_brokerage_notes: Dict[NoteKey, _MergedBrokerageNote] = {}
+        self.__source_digests: Set[bytes] = set()
+        self.conflicts: List[BrokerageNoteConflict] = []
+        self.stats = MergeStats()
+
+    def __len__(self) -> int:
+        return len(self.__merged_brokerage_notes)
+
+    @property
+    def brokerage_notes(self) -> List[BrokerageNote]:
+        return [merged.brokerage_note for merged in self.__merged_brokerage_notes.values()]
+
+    def get_brokerage_note(self, note_key: NoteKey) -> Optional[BrokerageNote]:
+        if (merged := self.__merged_brokerage_notes.get(note_key)) is None:
+            return None
+        return merged.brokerage_note
+
+    def add_source(self, source: Union[BrokerageNoteSource, bytes]) -> bool:
+        """False when a file with the same content was already added, so it does not need to be parsed"""
+        source_digest = get_source_digest(source)
+        if source_digest in self.__source_digests:
+            self.stats.skipped_sources += 1
+            return False
+        self.__source_digests.add(source_digest)
+        return True
+
+    def add_brokerage_note(self, brokerage_note: BrokerageNote, source: str = "") -> MergeOutcome:
+        outcome = self.__add_brokerage_note(brokerage_note, source)
+        self.stats.outcomes[outcome] += 1
+        return outcome
+
+    def __add_brokerage_note(self, brokerage_note: BrokerageNote, source: str) -> MergeOutcome:
+        note_key = (brokerage_note.reference_id, brokerage_note.reference_date)
+        fingerprint = get_brokerage_note_fingerprint(brokerage_note)
+        transactions = Counter(get_transaction_fingerprint(transaction) for transaction in brokerage_note.transactions)
+        if (merged := self.__merged_brokerage_notes.get(note_key)) is None:
+            self.__merged_brokerage_notes[note_key] = _MergedBrokerageNote(
+                brokerage_note=replace(brokerage_note, transactions=list(brokerage_note.transactions)),
+                transactions=transactions,
+                fingerprints={fingerprint},
+                sources=[source],
+            )
+            return MergeOutcome.NEW
+
+        if fingerprint in merged.fingerprints:
+            return MergeOutcome.DUPLICATE
+        merged.fingerprints.add(fingerprint)
+        known_brokerage_note = merged.brokerage_note
+
+        if not transactions - merged.transactions and _contains_fees(known_brokerage_note, brokerage_note):
+            return MergeOutcome.DUPLICATE
+        if not merged.transactions - transactions and _contains_fees(brokerage_note, known_brokerage_note):
+            merged.brokerage_note = replace(brokerage_note, transactions=list(brokerage_note.transactions))
+            merged.transactions = transactions
+            merged.sources.append(source)
+            return MergeOutcome.REPLACED
+        if transactions & merged.transactions:
+            return self.__add_conflict(note_key, merged, source, reason="transactions differ")
+        if not _are_fees_disjoint(known_brokerage_note, brokerage_note):
+            return self.__add_conflict(note_key, merged, source, reason="fees differ")
+
+        known_brokerage_note.merge(brokerage_note)
+        merged.transactions.update(transactions)
+        merged.sources.append(source)
+        return MergeOutcome.MERGED
+
+    def __add_conflict(self, note_key: NoteKey, merged: _MergedBrokerageNote, source: str, reason: str) -> MergeOutcome:
+        self.conflicts.append(
+            BrokerageNoteConflict(note_key=note_key, known_sources=tuple(merged.sources), source=source, reason=reason)
+        )
+        return MergeOutcome.CONFLICT
+
+    def add_brokerage_notes(self, brokerage_notes: Iterable[BrokerageNote], source: str = "") -> List[BrokerageNote]:
+        """Notes of the index that were created or changed, e.g. to be saved again in a repository"""
+        changed_brokerage_notes: Dict[NoteKey, BrokerageNote] = {}
+        for brokerage_note in brokerage_notes:
+            if self.add_brokerage_note(brokerage_note, source) in (
+                MergeOutcome.NEW,
+                MergeOutcome.MERGED,
+                MergeOutcome.REPLACED,
+            ):
+                note_key = (brokerage_note.reference_id, brokerage_note.reference_date)
+                changed_brokerage_notes[note_key] = self.__merged_brokerage_notes[note_key].brokerage_note
+        return list(changed_brokerage_notes.values())
+
+
+def iter_new_sources(
+    sources: Iterable[Union[BrokerageNoteSource, bytes]], merge_index: BrokerageNoteMergeIndex
+) -> Iterator[Union[BrokerageNoteSource, bytes]]:
+    """Lazily drops files already seen by the index, before they reach the parsing pipeline"""
+    return (source for source in sources if merge_index.add_source(source))
+
+
+def merge_brokerage_note_results(
+    results: Iterable[PipelineResult[DocumentJob, List[BrokerageNote]]], merge_index: BrokerageNoteMergeIndex
+) -> Iterator[PipelineResult[DocumentJob, List[BrokerageNote]]]:
+    """Feeds each parsed document to the index as it arrives, replacing its notes by the ones created or changed.
+
+    Duplicates are not yielded again, so a sink only stores each change once. Failed documents are yielded as is.
+    """
+    for result in results:
+        if result.value is not None:
+            result.value = merge_index.add_brokerage_notes(
+                result.value, source=get_source_label(result.item.source, result.index)
+            )
+        yield result
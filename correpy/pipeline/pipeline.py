@@ -0,0 +1,222 @@
+import queue
+import threading
+import time
+import typing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+InputT = TypeVar("InputT")
+OutputT = TypeVar("OutputT")
+NextT = TypeVar("NextT")
+
+DEFAULT_QUEUE_SIZE = 8
+# How often blocked workers check whether the pipeline was stopped
+STOP_CHECK_INTERVAL_IN_SECONDS = 0.1
+
+_END_OF_STREAM = object()
+
+
+@dataclass(frozen=True)
+class Stage(Generic[InputT, OutputT]):
+    """One step of a pipeline, run by `workers` threads.
+
+    With `in_processes` the function runs in a pool of `workers` processes instead, so the function and the
+    products it receives and returns must be picklable.
+    """
+
+    name: str
+    function: Callable[[InputT], OutputT]
+    workers: int = 1
+    in_processes: bool = False
+
+
+@dataclass
+class StageStats:
+    name: str
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+
+@dataclass
+class PipelineResult(Generic[InputT, OutputT]):
+    """Outcome of one item: the last stage output or the error and the name of the stage that raised it"""
+
+    index: int
+    item: InputT
+    value: Optional[OutputT] = None
+    error: Optional[Exception] = None
+    failed_stage: Optional[str] = None
+
+
+@dataclass
+class _Envelope:
+    index: int
+    item: object
+    value: object
+    error: Optional[Exception] = None
+    failed_stage: Optional[str] = None
+
+
+def _put(target_queue: "queue.Queue[object]", value: object, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            target_queue.put(value, timeout=STOP_CHECK_INTERVAL_IN_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(source_queue: "queue.Queue[object]", stop: threading.Event) -> object:
+    while not stop.is_set():
+        try:
+            return source_queue.get(timeout=STOP_CHECK_INTERVAL_IN_SECONDS)
+        except queue.Empty:
+            continue
+    return _END_OF_STREAM
+
+
+class _StageRunner:
+    def __init__(self, stage: "Stage[object, object]", input_queue: "queue.Queue[object]", next_workers: int) -> None:
+        self.stage = stage
+        self.input_queue = input_queue
+        self.next_workers = next_workers
+        self.stats = StageStats(name=stage.name)
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.__live_workers = stage.workers
+        self.__lock = threading.Lock()
+
+    def __process(self, envelope: _Envelope) -> None:
+        started_at = time.perf_counter()
+        try:
+            if self.executor is not None:
+                envelope.value = self.executor.submit(self.stage.function, envelope.value).result()
+            else:
+                envelope.value = self.stage.function(envelope.value)
+        except Exception as exc:  # pylint:disable=broad-except
+            envelope.value, envelope.error, envelope.failed_stage = None, exc, self.stage.name
+        with self.__lock:
+            self.stats.busy_seconds += time.perf_counter() - started_at
+            if envelope.error is None:
+                self.stats.processed += 1
+            else:
+                self.stats.failed += 1
+
+    def run_worker(self, output_queue: "queue.Queue[object]", stop: threading.Event) -> None:
+        while (envelope := _get(self.input_queue, stop)) is not _END_OF_STREAM:
+            envelope = typing.cast(_Envelope, envelope)
+            # Items that failed on a previous stage only flow through, so results keep one entry per item
+            if envelope.error is None:
+                self.__process(envelope)
+            if not _put(output_queue, envelope, stop):
+                return
+
+        with self.__lock:
+            self.__live_workers -= 1
+            is_last_worker = self.__live_workers == 0
+        if is_last_worker:
+            for _ in range(self.next_workers):
+                _put(output_queue, _END_OF_STREAM, stop)
+
+
+class Pipeline(Generic[InputT, OutputT]):
+    """Chain of stages connected by bounded queues.
+
+    Every stage works on its own threads (or processes), so different items are in different stages at the same
+    time and a slow stage only holds as many items as the queue size allows. Build it with `from_stage` and `then`:
+
+        Pipeline.from_stage(Stage("extraction", extract)).then(Stage("parsing", parse, workers=4))
+    """
+
+    def __init__(self, stages: Sequence["Stage[object, object]"], queue_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self.stages = list(stages)
+        self.queue_size = queue_size
+        self.stats: List[StageStats] = [StageStats(name=stage.name) for stage in self.stages]
+
+    @classmethod
+    def from_stage(
+        cls, stage: "Stage[InputT, OutputT]", queue_size: int = DEFAULT_QUEUE_SIZE
+    ) -> "Pipeline[InputT, OutputT]":
+        return cls(stages=[typing.cast("Stage[object, object]", stage)], queue_size=queue_size)
+
+    def then(self, stage: "Stage[OutputT, NextT]") -> "Pipeline[InputT, NextT]":
+        return Pipeline(stages=[*self.stages, typing.cast("Stage[object, object]", stage)], queue_size=self.queue_size)
+
+    def __feed(
+        self,
+        items: Iterable[InputT],
+        output_queue: "queue.Queue[object]",
+        feed_errors: List[Exception],
+        stop: threading.Event,
+    ) -> None:
+        try:
+            for index, item in enumerate(items):
+                if not _put(output_queue, _Envelope(index=index, item=item, value=item), stop):
+                    return
+        except Exception as exc:  # pylint:disable=broad-except
+            feed_errors.append(exc)
+        for _ in range(self.stages[0].workers):
+            _put(output_queue, _END_OF_STREAM, stop)
+
+    def run(self, items: Iterable[InputT], ordered: bool = False) -> Iterator[PipelineResult[InputT, OutputT]]:
+        """Yields one result per item as soon as it leaves the last stage, or in the items order when `ordered`"""
+        stop = threading.Event()
+        queues: List["queue.Queue[object]"] = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        feed_errors: List[Exception] = []
+        runners = [
+            _StageRunner(
+                stage=stage,
+                input_queue=queues[stage_index],
+                next_workers=self.stages[stage_index + 1].workers if stage_index + 1 < len(self.stages) else 1,
+            )
+            for stage_index, stage in enumerate(self.stages)
+        ]
+        self.stats = [runner.stats for runner in runners]
+        threads = [threading.Thread(target=self.__feed, args=(items, queues[0], feed_errors, stop), daemon=True)]
+        for stage_index, runner in enumerate(runners):
+            if runner.stage.in_processes:
+                runner.executor = ProcessPoolExecutor(max_workers=runner.stage.workers)
+            threads.extend(
+                threading.Thread(target=runner.run_worker, args=(queues[stage_index + 1], stop), daemon=True)
+                for _ in range(runner.stage.workers)
+            )
+
+        for thread in threads:
+            thread.start()
+        try:
+            yield from self.__collect_results(output_queue=queues[-1], ordered=ordered, stop=stop)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            for runner in runners:
+                if runner.executor is not None:
+                    runner.executor.shutdown()
+        if feed_errors:
+            raise feed_errors[0]
+
+    def __collect_results(
+        self, output_queue: "queue.Queue[object]", ordered: bool, stop: threading.Event
+    ) -> Iterator[PipelineResult[InputT, OutputT]]:
+        pending_results: Dict[int, PipelineResult[InputT, OutputT]] = {}
+        next_index = 0
+        while (envelope := _get(output_queue, stop)) is not _END_OF_STREAM:
+            envelope = typing.cast(_Envelope, envelope)
+            result: PipelineResult[InputT, OutputT] = PipelineResult(
+                index=envelope.index,
+                item=typing.cast(InputT, envelope.item),
+                value=typing.cast(Optional[OutputT], envelope.value),
+                error=envelope.error,
+                failed_stage=envelope.failed_stage,
+            )
+            if not ordered:
+                yield result
+                continue
+            pending_results[result.index] = result
+            while next_index in pending_results:
+                yield pending_results.pop(next_index)
+                next_index += 1
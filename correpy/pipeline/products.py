@@ -0,0 +1,100 @@
+"""Intermediate products handed from one stage of the brokerage note pipeline to the next."""
+
+import io
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Tuple, Type, Union
+
+import fitz
+
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.base_parser import NoteKey
+from correpy.parsers.brokerage_notes.brokerage_note_section import BrokerageNoteSection
+from correpy.parsers.brokerage_notes.parallel_parser import BrokerageNoteSource
+from correpy.parsers.brokerage_notes.transaction_columns import TransactionRow
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+from correpy.parsers.fitz_parser import FitzParser
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.parsers.password_resolver import Password
+
+RectangleCoordinates = Tuple[float, float, float, float]
+
+
+@dataclass
+class DocumentJob:
+    source: Union[BrokerageNoteSource, bytes]
+    password: Optional[Password] = None
+    budget: Optional[ParsingBudget] = None
+
+
+class AnchorMatch(NamedTuple):
+    rect: fitz.Rect
+
+
+@dataclass
+class ExtractedPage:
+    """Words of a page and the position of the parser anchors, searched while the document was open.
+
+    It answers `search` and `rect` like a fitz.TextPage, so the parsers locate their sections on it.
+    """
+
+    number: int
+    width: float
+    height: float
+    words: List[WordRectangle] = field(default_factory=list)
+    anchors: Dict[str, Optional[RectangleCoordinates]] = field(default_factory=dict)
+
+    @property
+    def rect(self) -> fitz.Rect:
+        return fitz.Rect(0, 0, self.width, self.height)
+
+    def search(self, text: str) -> List[AnchorMatch]:
+        if text not in self.anchors:
+            raise ValueError(f"Text '{text}' was not searched when the page was extracted")
+        if (coordinates := self.anchors[text]) is None:
+            return []
+        return [AnchorMatch(rect=fitz.Rect(*coordinates))]
+
+
+@dataclass
+class ExtractedDocument:
+    parser_class: Type[B3Parser]
+    pages: List[ExtractedPage] = field(default_factory=list)
+
+    def build_parser(self) -> B3Parser:
+        first_page_number = self.pages[0].number if self.pages else 0
+        fitz_parser = FitzParser.from_extracted_words(
+            words=[page.words for page in self.pages],
+            page_range=range(first_page_number, first_page_number + len(self.pages)),
+        )
+        return self.parser_class(brokerage_note=io.BytesIO(), fitz_parser=fitz_parser)
+
+
+@dataclass
+class PageSections:
+    """Sections of a page, None when the page does not have them"""
+
+    page_number: int
+    note_key: Optional[NoteKey]
+    transactions_section: Optional[BrokerageNoteSection] = None
+    financial_summary_section: Optional[BrokerageNoteSection] = None
+
+
+@dataclass
+class DocumentSections:
+    parser: B3Parser
+    pages: List[PageSections] = field(default_factory=list)
+
+
+@dataclass
+class PageLines:
+    page_number: int
+    note_key: NoteKey
+    transaction_rows: List[TransactionRow] = field(default_factory=list)
+    fee_lines: List[Tuple[BrokerageNoteFeeType, str]] = field(default_factory=list)
+
+
+@dataclass
+class DocumentLines:
+    parser: B3Parser
+    pages: List[PageLines] = field(default_factory=list)
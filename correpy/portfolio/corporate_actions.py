@@ -0,0 +1,184 @@
+"""Splits, reverse splits and bonus shares, indexed by ticker and ex-date.
+
+The factor of an event is the number of shares held after it for each share held before it (2 for a 1:2 split,
+1/10 for a 10:1 reverse split, 11/10 for a 10% bonus), kept as a Fraction so chained events stay exact. Trades made
+before the ex-date are in the shares of before the event, trades made on the ex-date already in the new ones.
+"""
+
+import csv
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from fractions import Fraction
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.utils import build_new_entity
+from correpy.portfolio.exceptions import InvalidCorporateActionException
+from correpy.utils import PathOrFile, parse_date
+
+CORPORATE_ACTION_COLUMNS = ("ticker", "ex_date", "action_type", "factor")
+# Factors such as 3 have no exact decimal price, so adjusted prices are rounded to this exponent
+ADJUSTED_PRICE_EXPONENT = Decimal("1e-10")
+
+
+class CorporateActionType(Enum):
+    SPLIT = "DESDOBRAMENTO"
+    REVERSE_SPLIT = "GRUPAMENTO"
+    BONUS = "BONIFICACAO"
+
+
+@dataclass(frozen=True)
+class CorporateAction:
+    ticker: str
+    ex_date: date
+    action_type: CorporateActionType
+    factor: Fraction
+
+    def __post_init__(self) -> None:
+        increases_shares = self.action_type != CorporateActionType.REVERSE_SPLIT
+        if self.factor <= 0 or (self.factor > 1) != increases_shares:
+            raise InvalidCorporateActionException(
+                f"Factor {self.factor} is not valid for a {self.action_type.name} of {self.ticker}"
+            )
+
+
+def scale_decimal(value: Decimal, factor: Fraction) -> Decimal:
+    return value * factor.numerator / factor.denominator
+
+
+def scale_price(price: Decimal, factor: Fraction) -> Decimal:
+    """Price of a share after an event of the factor, rounded to ADJUSTED_PRICE_EXPONENT when it is not exact"""
+    scaled_price = scale_decimal(price, 1 / factor)
+    rounded_price = scaled_price.quantize(ADJUSTED_PRICE_EXPONENT)
+    # Exact prices keep their exponent, e.g. 15.05 and not 15.0500000000
+    return scaled_price if scaled_price == rounded_price else rounded_price
+
+
+def read_corporate_actions(
+    path: PathOrFile, delimiter: str = ";", encoding: str = "utf-8"
+) -> Iterator[CorporateAction]:
+    """Events of a delimited file with the CORPORATE_ACTION_COLUMNS, e.g. `PETR4;2008-04-25;DESDOBRAMENTO;2`.
+
+    The type is the name or the value of a CorporateActionType, the ex-date is ISO or dd/mm/yyyy and the factor is a
+    decimal or a fraction (`1/10`).
+    """
+    with open(path, newline="", encoding=encoding) as file:
+        rows = csv.DictReader(file, delimiter=delimiter)
+        if rows.fieldnames is None or not set(CORPORATE_ACTION_COLUMNS).issubset(rows.fieldnames):
+            raise InvalidCorporateActionException(f"Columns {', '.join(CORPORATE_ACTION_COLUMNS)} were not found")
+        for line_number, row in enumerate(rows, start=2):
+            action_type = row["action_type"].strip().upper()
+            try:
+                yield CorporateAction(
+                    ticker=row["ticker"].strip().upper(),
+                    ex_date=parse_date(row["ex_date"].strip()),
+                    action_type=(
+                        CorporateActionType[action_type]
+                        if action_type in CorporateActionType.__members__
+                        else CorporateActionType(action_type)
+                    ),
+                    factor=Fraction(row["factor"].strip()),
+                )
+            except (ValueError, ZeroDivisionError, AttributeError) as exc:
+                raise InvalidCorporateActionException(f"Line {line_number} of {path} is not valid") from exc
+
+
+class CorporateActionIndex:
+    """Events sorted by ex-date for each ticker, with the cumulative product of their factors.
+
+    The factor between two dates is the ratio of two cumulative factors found by binary search. Adding an event only
+    recomputes the cumulative factors of its ticker from its ex-date, which costs nothing for the newest event.
+    """
+
+    def __init__(self, corporate_actions: Iterable[CorporateAction] = ()) -> None:
+        self.__actions_by_ticker: Dict[str, List[CorporateAction]] = {}
+        self.__ex_dates_by_ticker: Dict[str, List[date]] = {}
+        # One more than the events: the product of the factors of the events before each index
+        self.__cumulative_factors_by_ticker: Dict[str, List[Fraction]] = {}
+        self.__actions: Set[CorporateAction] = set()
+        self.add_corporate_actions(corporate_actions)
+
+    def __len__(self) -> int:
+        return len(self.__actions)
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.__actions_by_ticker)
+
+    def add_corporate_actions(self, corporate_actions: Iterable[CorporateAction]) -> None:
+        for corporate_action in corporate_actions:
+            self.add_corporate_action(corporate_action)
+
+    def add_corporate_action(self, corporate_action: CorporateAction) -> bool:
+        """False when the event was already added, so files loaded again do not apply their events twice"""
+        if corporate_action in self.__actions:
+            return False
+        self.__actions.add(corporate_action)
+        ticker = corporate_action.ticker
+        actions = self.__actions_by_ticker.setdefault(ticker, [])
+        ex_dates = self.__ex_dates_by_ticker.setdefault(ticker, [])
+        cumulative_factors = self.__cumulative_factors_by_ticker.setdefault(ticker, [Fraction(1)])
+
+        action_index = bisect_right(ex_dates, corporate_action.ex_date)
+        actions.insert(action_index, corporate_action)
+        ex_dates.insert(action_index, corporate_action.ex_date)
+        cumulative_factors.append(Fraction(1))
+        for index in range(action_index, len(actions)):
+            cumulative_factors[index + 1] = cumulative_factors[index] * actions[index].factor
+        return True
+
+    def get_corporate_actions(self, ticker: str) -> List[CorporateAction]:
+        return list(self.__actions_by_ticker.get(ticker, []))
+
+    def get_factor(self, ticker: str, start: Optional[date] = None, end: Optional[date] = None) -> Fraction:
+        """Product of the factors of the events with ex-date after start and up to end (the latest one when None)"""
+        ex_dates = self.__ex_dates_by_ticker.get(ticker)
+        if not ex_dates:
+            return Fraction(1)
+        cumulative_factors = self.__cumulative_factors_by_ticker[ticker]
+        first_index = 0 if start is None else bisect_right(ex_dates, start)
+        last_index = len(ex_dates) if end is None else bisect_right(ex_dates, end)
+        if first_index >= last_index:
+            return Fraction(1)
+        return cumulative_factors[last_index] / cumulative_factors[first_index]
+
+    def adjust_transaction(self, transaction: Transaction, trade_date: date, at: Optional[date] = None) -> Transaction:
+        """Transaction in the shares of `at` (the latest ones when None), with the same gross value.
+
+        The gross value is exact when the factor has an exact decimal price, and off by less than the amount times
+        half of ADJUSTED_PRICE_EXPONENT otherwise (e.g. 1000 shares at 10.00 split by 3 are 3000 at 3.3333333333).
+        """
+        ticker = transaction.security.ticker
+        factor = Fraction(1) if ticker is None else self.get_factor(ticker, start=trade_date, end=at)
+        if factor == 1:
+            return transaction
+        # dataclasses.replace would run __post_init__ again and recompute the withheld taxes from the rounded price
+        return build_new_entity(
+            Transaction,
+            **{
+                **vars(transaction),
+                "amount": scale_decimal(transaction.amount, factor),
+                "unit_price": scale_price(transaction.unit_price, factor),
+            },
+        )
+
+    def adjust_brokerage_notes(
+        self, brokerage_notes: Iterable[BrokerageNote], at: Optional[date] = None
+    ) -> List[BrokerageNote]:
+        """Copies of the notes with their transactions adjusted. Notes without events after them are not copied."""
+        adjusted_brokerage_notes = []
+        for brokerage_note in brokerage_notes:
+            transactions = [
+                self.adjust_transaction(transaction, trade_date=brokerage_note.reference_date, at=at)
+                for transaction in brokerage_note.transactions
+            ]
+            if any(
+                adjusted is not transaction for adjusted, transaction in zip(transactions, brokerage_note.transactions)
+            ):
+                brokerage_note = replace(brokerage_note, transactions=transactions)
+            adjusted_brokerage_notes.append(brokerage_note)
+        return adjusted_brokerage_notes
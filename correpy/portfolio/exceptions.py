@@ -0,0 +1,6 @@
+class DuplicatedBrokerageNoteException(Exception):
+    pass
+
+
+class InvalidCorporateActionException(Exception):
+    pass
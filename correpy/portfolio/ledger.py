@@ -0,0 +1,241 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field, replace
+from datetime import date
+from decimal import Decimal
+from fractions import Fraction
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.transaction import Transaction, get_position_key
+from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+from correpy.portfolio.corporate_actions import CorporateAction, CorporateActionIndex, scale_decimal
+from correpy.portfolio.exceptions import DuplicatedBrokerageNoteException
+
+# IRRF is an advance of the income tax, not a cost of the operations
+NON_COST_FEE_TYPES = {BrokerageNoteFeeType.IRRF}
+
+# Entries of a ticker are ordered by trading date, note and position of the transaction in the note
+EntryKey = Tuple[date, int, int]
+
+
+def get_brokerage_note_costs(brokerage_note: BrokerageNote) -> Decimal:
+    return sum(
+        (
+            fee_value
+            for fee_type, fee_value in brokerage_note.fees_by_fee_type.items()
+            if fee_type not in NON_COST_FEE_TYPES
+        ),
+        Decimal(0),
+    )
+
+
+def prorate_fees(*, fees: Decimal, transactions: List[Transaction]) -> List[Decimal]:
+    """Splits the fees by the gross value of each transaction. The last one takes the remainder, so shares add up"""
+    gross_values = [transaction.amount * transaction.unit_price for transaction in transactions]
+    total_gross_value = sum(gross_values, Decimal(0))
+    if not total_gross_value:
+        return [Decimal(0)] * len(transactions)
+    shares = [fees * gross_value / total_gross_value for gross_value in gross_values[:-1]]
+    return [*shares, fees - sum(shares, Decimal(0))]
+
+
+@dataclass
+class Position:
+    ticker: str
+    amount: Decimal = Decimal(0)
+    average_cost: Decimal = Decimal(0)
+    realized_profit: Decimal = Decimal(0)
+
+    @property
+    def total_cost(self) -> Decimal:
+        return self.amount * self.average_cost
+
+    def adjust(self, factor: Fraction) -> "Position":
+        """Same position after a split, reverse split or bonus: the total cost is spread over the new amount"""
+        if factor == 1:
+            return self
+        return replace(
+            self, amount=scale_decimal(self.amount, factor), average_cost=scale_decimal(self.average_cost, 1 / factor)
+        )
+
+
+@dataclass
+class LedgerEntry:  # pylint:disable=too-many-instance-attributes
+    """One transaction applied to a position and the position right after it"""
+
+    reference_date: date
+    reference_id: int
+    transaction_index: int
+    transaction_type: TransactionType
+    amount: Decimal
+    unit_price: Decimal
+    fees: Decimal
+    realized_profit: Decimal = Decimal(0)
+    position: Position = field(default_factory=lambda: Position(ticker=""))
+
+    @property
+    def key(self) -> EntryKey:
+        return self.reference_date, self.reference_id, self.transaction_index
+
+    def __lt__(self, other: "LedgerEntry") -> bool:
+        return self.key < other.key
+
+    def apply(self, previous_position: Position) -> None:
+        """Average cost method: trades increasing the position change its average cost, trades reducing it realize
+        the profit against the average cost. Short positions (sells beyond the held amount) follow the same rules.
+        """
+        signed_amount = self.amount if self.transaction_type == TransactionType.BUY else -self.amount
+        # Net unit value of the trade: fees increase what is paid on buys and decrease what is received on sells
+        net_unit_price = (self.amount * self.unit_price + self.fees * (1 if signed_amount > 0 else -1)) / self.amount
+
+        held_amount = previous_position.amount
+        average_cost = previous_position.average_cost
+        self.realized_profit = Decimal(0)
+        if held_amount and (held_amount > 0) != (signed_amount > 0):
+            closed_amount = min(abs(held_amount), abs(signed_amount))
+            direction = 1 if held_amount > 0 else -1
+            self.realized_profit = (net_unit_price - average_cost) * closed_amount * direction
+
+        new_amount = held_amount + signed_amount
+        if not new_amount:
+            average_cost = Decimal(0)
+        elif not held_amount or (held_amount > 0) != (new_amount > 0):
+            average_cost = net_unit_price
+        elif (held_amount > 0) == (signed_amount > 0):
+            average_cost = (held_amount * average_cost + signed_amount * net_unit_price) / new_amount
+
+        self.position = Position(
+            ticker=previous_position.ticker,
+            amount=new_amount,
+            average_cost=average_cost,
+            realized_profit=previous_position.realized_profit + self.realized_profit,
+        )
+
+
+class PositionLedger:
+    """Positions, average costs and realized profits of a client, built incrementally from brokerage notes.
+
+    Entries are indexed by ticker (sorted by date) and tickers by trading date. Adding a note costs
+    O(transactions in the note) when it is not older than the notes already added for its tickers, otherwise only
+    the entries of those tickers after it are recomputed.
+
+    Positions follow the corporate actions of the index: each entry starts from the previous position adjusted by the
+    events between both trades, so entries stay as traded. A new event only recomputes the entries of its ticker
+    traded from its ex-date on, none for an event newer than every trade.
+    """
+
+    def __init__(self, corporate_actions: Optional[CorporateActionIndex] = None) -> None:
+        self.corporate_actions = corporate_actions or CorporateActionIndex()
+        self.__entries_by_ticker: Dict[str, List[LedgerEntry]] = {}
+        self.__entry_dates_by_ticker: Dict[str, List[date]] = {}
+        self.__tickers_by_date: Dict[date, Set[str]] = {}
+        self.__note_keys: Set[Tuple[int, date]] = set()
+        self.unallocated_fees = Decimal(0)
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.__entries_by_ticker)
+
+    def add_brokerage_notes(self, brokerage_notes: Iterable[BrokerageNote]) -> None:
+        for brokerage_note in brokerage_notes:
+            self.add_brokerage_note(brokerage_note)
+
+    def add_brokerage_note(self, brokerage_note: BrokerageNote) -> None:
+        note_key = (brokerage_note.reference_id, brokerage_note.reference_date)
+        if note_key in self.__note_keys:
+            raise DuplicatedBrokerageNoteException(f"Brokerage note {note_key} was already added to the ledger")
+        self.__note_keys.add(note_key)
+
+        costs = get_brokerage_note_costs(brokerage_note)
+        if not brokerage_note.transactions:
+            self.unallocated_fees += costs
+            return
+        fees = prorate_fees(fees=costs, transactions=brokerage_note.transactions)
+        for transaction_index, (transaction, transaction_fees) in enumerate(zip(brokerage_note.transactions, fees)):
+            entry = LedgerEntry(
+                reference_date=brokerage_note.reference_date,
+                reference_id=brokerage_note.reference_id,
+                transaction_index=transaction_index,
+                transaction_type=transaction.transaction_type,
+                amount=transaction.amount,
+                unit_price=transaction.unit_price,
+                fees=transaction_fees,
+            )
+            self.__add_entry(ticker=get_position_key(transaction), entry=entry)
+
+    def __add_entry(self, *, ticker: str, entry: LedgerEntry) -> None:
+        entries = self.__entries_by_ticker.setdefault(ticker, [])
+        entry_dates = self.__entry_dates_by_ticker.setdefault(ticker, [])
+        self.__tickers_by_date.setdefault(entry.reference_date, set()).add(ticker)
+
+        if not entries or not entry < entries[-1]:
+            entries.append(entry)
+            entry_dates.append(entry.reference_date)
+            self.__apply_entries(ticker, first_index=len(entries) - 1)
+            return
+
+        # Older than the last entry of the ticker: inserted in order and the following entries are recomputed
+        entry_index = bisect_right(entries, entry)
+        entries.insert(entry_index, entry)
+        entry_dates.insert(entry_index, entry.reference_date)
+        self.__apply_entries(ticker, first_index=entry_index)
+
+    def __apply_entries(self, ticker: str, first_index: int) -> None:
+        entries = self.__entries_by_ticker[ticker]
+        for index in range(first_index, len(entries)):
+            if not index:
+                entries[index].apply(Position(ticker=ticker))
+                continue
+            previous_entry = entries[index - 1]
+            factor = self.corporate_actions.get_factor(
+                ticker, start=previous_entry.reference_date, end=entries[index].reference_date
+            )
+            entries[index].apply(previous_entry.position.adjust(factor))
+
+    def add_corporate_action(self, corporate_action: CorporateAction) -> None:
+        if not self.corporate_actions.add_corporate_action(corporate_action):
+            return
+        if (entry_dates := self.__entry_dates_by_ticker.get(corporate_action.ticker)) is None:
+            return
+        first_index = bisect_left(entry_dates, corporate_action.ex_date)
+        if first_index < len(entry_dates):
+            self.__apply_entries(corporate_action.ticker, first_index=first_index)
+
+    def add_corporate_actions(self, corporate_actions: Iterable[CorporateAction]) -> None:
+        for corporate_action in corporate_actions:
+            self.add_corporate_action(corporate_action)
+
+    def get_position(self, ticker: str, at: Optional[date] = None) -> Position:
+        """Position at the end of the given date (the latest one when no date is given), in the shares of that date"""
+        entries = self.__entries_by_ticker.get(ticker, [])
+        entries_count = len(entries) if at is None else bisect_right(self.__entry_dates_by_ticker[ticker], at)
+        if not entries_count:
+            return Position(ticker=ticker)
+        last_entry = entries[entries_count - 1]
+        factor = self.corporate_actions.get_factor(ticker, start=last_entry.reference_date, end=at)
+        return replace(last_entry.position.adjust(factor))
+
+    def get_positions(self, at: Optional[date] = None) -> Dict[str, Position]:
+        """Open positions (amount different from zero) by ticker"""
+        positions = {ticker: self.get_position(ticker, at=at) for ticker in self.__entries_by_ticker}
+        return {ticker: position for ticker, position in positions.items() if position.amount}
+
+    def get_entries(self, ticker: str, start: Optional[date] = None, end: Optional[date] = None) -> List[LedgerEntry]:
+        """Entries of the ticker traded between start and end, both included"""
+        entry_dates = self.__entry_dates_by_ticker.get(ticker, [])
+        first_index = 0 if start is None else bisect_left(entry_dates, start)
+        last_index = len(entry_dates) if end is None else bisect_right(entry_dates, end)
+        return self.__entries_by_ticker.get(ticker, [])[first_index:last_index]
+
+    def get_tickers_traded_on(self, reference_date: date) -> Set[str]:
+        return set(self.__tickers_by_date.get(reference_date, set()))
+
+    def get_realized_profit(self, start: Optional[date] = None, end: Optional[date] = None) -> Decimal:
+        return sum(
+            (
+                entry.realized_profit
+                for ticker in self.__entries_by_ticker
+                for entry in self.get_entries(ticker, start=start, end=end)
+            ),
+            Decimal(0),
+        )
@@ -0,0 +1,78 @@
+import argparse
+import pathlib
+import sys
+
+from correpy.regression.golden_corpus import (
+    DEFAULT_THROUGHPUT_MARGIN,
+    CorpusReport,
+    GoldenCorpusRunner,
+    read_baseline,
+    write_json,
+)
+
+
+def print_report(report: CorpusReport) -> None:
+    print(f"{report.documents} documents in {report.wall_time_in_seconds:.2f}s")
+    for stats in report.stats_by_parser.values():
+        print(
+            f"{stats.parser_name}: {stats.documents} documents, {stats.failed_documents} failed, "
+            f"{stats.documents_per_second:.1f} docs/s, p50 {stats.latency_p50_in_seconds * 1000:.1f}ms, "
+            f"p95 {stats.latency_p95_in_seconds * 1000:.1f}ms"
+        )
+    for document in report.missing_golden_outputs:
+        print(f"MISSING GOLDEN OUTPUT {document}")
+    for document, error in report.errors.items():
+        print(f"ERROR {document}: {error}")
+    for mismatch in report.mismatches:
+        print(
+            f"MISMATCH {mismatch.document} {mismatch.field_path}: "
+            f"expected {mismatch.expected!r}, got {mismatch.actual!r}"
+        )
+    for regression in report.regressions:
+        print(
+            f"REGRESSION {regression.parser_name}: {regression.documents_per_second:.1f} docs/s, "
+            f"baseline {regression.baseline_documents_per_second:.1f} docs/s"
+        )
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(
+        prog="python -m correpy.regression", description="Compares the parsers against a golden corpus"
+    )
+    argument_parser.add_argument("corpus", help="Directory with the PDF documents")
+    argument_parser.add_argument("golden", help="Directory with the golden outputs")
+    argument_parser.add_argument("--password", help="Password of the documents")
+    argument_parser.add_argument("--workers", type=int, help="Worker processes, defaults to the number of CPUs")
+    argument_parser.add_argument("--baseline", type=pathlib.Path, help="JSON with the docs/s of each parser")
+    argument_parser.add_argument(
+        "--margin", type=float, default=DEFAULT_THROUGHPUT_MARGIN, help="Allowed throughput drop, 0.2 for 20%%"
+    )
+    argument_parser.add_argument("--update-golden", action="store_true", help="Writes the current outputs as golden")
+    argument_parser.add_argument("--update-baseline", action="store_true", help="Writes the current docs/s as baseline")
+    arguments = argument_parser.parse_args()
+
+    runner = GoldenCorpusRunner(
+        corpus_path=arguments.corpus,
+        golden_path=arguments.golden,
+        password=arguments.password,
+        max_workers=arguments.workers,
+    )
+    baseline = read_baseline(arguments.baseline) if arguments.baseline else {}
+    report = runner.run(baseline=baseline, margin=arguments.margin, update_golden_outputs=arguments.update_golden)
+    print_report(report)
+
+    if arguments.update_baseline and arguments.baseline:
+        write_json(
+            arguments.baseline,
+            {
+                parser_name: stats.documents_per_second
+                for parser_name, stats in report.stats_by_parser.items()
+                if stats.documents
+            },
+        )
+        report.regressions = []
+    sys.exit(0 if report.passed else 1)
+
+
+if __name__ == "__main__":
+    main()
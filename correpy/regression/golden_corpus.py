@@ -0,0 +1,243 @@
+"""Differential runner comparing the parsers against the golden outputs of a local corpus of documents.
+
+Every PDF under the corpus directory has a golden output, the JSON of its notes, at the same relative path under the
+golden directory (`notes/2022/05.pdf` -> `golden/notes/2022/05.pdf.json`). Documents are parsed in a process pool,
+compared field by field and timed, and the throughput of each parser is checked against a stored baseline.
+"""
+
+import io
+import json
+import os
+import pathlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.serialization.json_format import brokerage_note_to_json
+from correpy.utils import JsonValue, get_percentile
+
+GOLDEN_OUTPUT_SUFFIX = ".json"
+DEFAULT_THROUGHPUT_MARGIN = 0.2
+FAILED_PARSER_NAME = "unknown"
+
+
+@dataclass(frozen=True)
+class FieldMismatch:
+    document: str
+    field_path: str
+    expected: JsonValue
+    actual: JsonValue
+
+
+def compare_json(expected: JsonValue, actual: JsonValue, document: str, field_path: str = "") -> List[FieldMismatch]:
+    """Differences down to the leaf fields, with paths like `[0].transactions[3].unit_price`"""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        mismatches = []
+        for key in sorted(expected.keys() | actual.keys()):
+            mismatches.extend(compare_json(expected.get(key), actual.get(key), document, f"{field_path}.{key}"))
+        return mismatches
+    if isinstance(expected, list) and isinstance(actual, list):
+        mismatches = []
+        for index in range(max(len(expected), len(actual))):
+            mismatches.extend(
+                compare_json(
+                    expected[index] if index < len(expected) else None,
+                    actual[index] if index < len(actual) else None,
+                    document,
+                    f"{field_path}[{index}]",
+                )
+            )
+        return mismatches
+    if expected != actual:
+        return [FieldMismatch(document=document, field_path=field_path, expected=expected, actual=actual)]
+    return []
+
+
+@dataclass(frozen=True)
+class DocumentResult:
+    document: str
+    parser_name: str
+    latency_in_seconds: float
+    output: JsonValue = None
+    error: Optional[str] = None
+
+
+def parse_corpus_document(path: str, password: Optional[str]) -> DocumentResult:
+    """Runs in the pool; errors are returned, so one broken document does not stop the run"""
+    with open(path, "rb") as file:
+        content = io.BytesIO(file.read())
+    started_at = time.perf_counter()
+    parser_name = FAILED_PARSER_NAME
+    try:
+        parser = ParserFactory(brokerage_note=content, password=password).get_parser()
+        parser_name = type(parser).__name__
+        brokerage_notes = parser.parse_brokerage_note()
+    except Exception as exc:  # pylint:disable=broad-except
+        return DocumentResult(
+            document=path,
+            parser_name=parser_name,
+            latency_in_seconds=time.perf_counter() - started_at,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+    return DocumentResult(
+        document=path,
+        parser_name=parser_name,
+        latency_in_seconds=time.perf_counter() - started_at,
+        output=[brokerage_note_to_json(brokerage_note) for brokerage_note in brokerage_notes],
+    )
+
+
+@dataclass
+class ParserStats:
+    """Throughput and latencies of the documents parsed without errors, failed ones are only counted"""
+
+    parser_name: str
+    documents: int
+    documents_per_second: float
+    latency_p50_in_seconds: float
+    latency_p95_in_seconds: float
+    failed_documents: int = 0
+
+
+@dataclass
+class ThroughputRegression:
+    parser_name: str
+    documents_per_second: float
+    baseline_documents_per_second: float
+
+
+@dataclass
+class CorpusReport:
+    documents: int = 0
+    wall_time_in_seconds: float = 0.0
+    mismatches: List[FieldMismatch] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    missing_golden_outputs: List[str] = field(default_factory=list)
+    stats_by_parser: Dict[str, ParserStats] = field(default_factory=dict)
+    regressions: List[ThroughputRegression] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not (self.mismatches or self.errors or self.missing_golden_outputs or self.regressions)
+
+
+def build_parser_stats(results: Iterable[DocumentResult]) -> Dict[str, ParserStats]:
+    """Documents per second of one worker (documents over the summed latencies), independent of the pool size.
+
+    Failed documents stop early or time out, so they are left out of the throughput and latencies.
+    """
+    latencies_by_parser: Dict[str, List[float]] = {}
+    failures_by_parser: Dict[str, int] = {}
+    for result in results:
+        if result.error is None:
+            latencies_by_parser.setdefault(result.parser_name, []).append(result.latency_in_seconds)
+        else:
+            failures_by_parser[result.parser_name] = failures_by_parser.get(result.parser_name, 0) + 1
+    stats_by_parser = {}
+    for parser_name in sorted(latencies_by_parser.keys() | failures_by_parser.keys()):
+        latencies = sorted(latencies_by_parser.get(parser_name, []))
+        stats_by_parser[parser_name] = ParserStats(
+            parser_name=parser_name,
+            documents=len(latencies),
+            documents_per_second=len(latencies) / sum(latencies) if sum(latencies) else 0.0,
+            latency_p50_in_seconds=get_percentile(latencies, 0.5),
+            latency_p95_in_seconds=get_percentile(latencies, 0.95),
+            failed_documents=failures_by_parser.get(parser_name, 0),
+        )
+    return stats_by_parser
+
+
+def find_throughput_regressions(
+    stats_by_parser: Dict[str, ParserStats], baseline: Dict[str, float], margin: float = DEFAULT_THROUGHPUT_MARGIN
+) -> List[ThroughputRegression]:
+    """Parsers slower than their baseline by more than `margin` (0.2 fails below 80% of the baseline). Parsers without
+    successful documents have no throughput to compare, their failures are reported as errors."""
+    return [
+        ThroughputRegression(
+            parser_name=parser_name,
+            documents_per_second=stats.documents_per_second,
+            baseline_documents_per_second=baseline[parser_name],
+        )
+        for parser_name, stats in stats_by_parser.items()
+        if parser_name in baseline
+        and stats.documents
+        and stats.documents_per_second < baseline[parser_name] * (1 - margin)
+    ]
+
+
+def read_baseline(path: pathlib.Path) -> Dict[str, float]:
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as file:
+        return {
+            parser_name: float(documents_per_second) for parser_name, documents_per_second in json.load(file).items()
+        }
+
+
+def write_json(path: pathlib.Path, value: JsonValue) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(value, file, indent=2, ensure_ascii=False)
+        file.write("\n")
+
+
+class GoldenCorpusRunner:
+    def __init__(
+        self,
+        corpus_path: "os.PathLike[str]",
+        golden_path: "os.PathLike[str]",
+        password: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.corpus_path = pathlib.Path(corpus_path)
+        self.golden_path = pathlib.Path(golden_path)
+        self.password = password
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def find_documents(self) -> List[pathlib.Path]:
+        return sorted(path for path in self.corpus_path.rglob("*") if path.suffix.lower() == ".pdf")
+
+    def get_golden_output_path(self, document: pathlib.Path) -> pathlib.Path:
+        relative_path = document.relative_to(self.corpus_path)
+        return self.golden_path / relative_path.parent / f"{relative_path.name}{GOLDEN_OUTPUT_SUFFIX}"
+
+    def parse_documents(self, documents: Sequence[pathlib.Path]) -> Tuple[List[DocumentResult], float]:
+        started_at = time.perf_counter()
+        paths = [str(document) for document in documents]
+        if self.max_workers <= 1 or len(paths) <= 1:
+            results = list(map(parse_corpus_document, paths, repeat(self.password)))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(paths))) as executor:
+                results = list(executor.map(parse_corpus_document, paths, repeat(self.password)))
+        return results, time.perf_counter() - started_at
+
+    def run(
+        self,
+        baseline: Optional[Dict[str, float]] = None,
+        margin: float = DEFAULT_THROUGHPUT_MARGIN,
+        update_golden_outputs: bool = False,
+    ) -> CorpusReport:
+        """With `update_golden_outputs` the current outputs are written as the new golden ones instead of compared"""
+        documents = self.find_documents()
+        results, wall_time_in_seconds = self.parse_documents(documents)
+        report = CorpusReport(documents=len(documents), wall_time_in_seconds=wall_time_in_seconds)
+
+        for document, result in zip(documents, results):
+            if result.error is not None:
+                report.errors[result.document] = result.error
+                continue
+            golden_output_path = self.get_golden_output_path(document)
+            if update_golden_outputs:
+                write_json(golden_output_path, result.output)
+            elif not golden_output_path.exists():
+                report.missing_golden_outputs.append(result.document)
+            else:
+                with open(golden_output_path, encoding="utf-8") as file:
+                    report.mismatches.extend(compare_json(json.load(file), result.output, document=result.document))
+
+        report.stats_by_parser = build_parser_stats(results)
+        report.regressions = find_throughput_regressions(report.stats_by_parser, baseline or {}, margin=margin)
+        return report
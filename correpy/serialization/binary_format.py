@@ -0,0 +1,248 @@
+"""Compact, versioned and columnar binary encoding of brokerage notes.
+
+Layout (little-endian, every section padded to 8 bytes):
+
+- header: magic, version, notes count, transactions count, strings count and strings blob size
+- interned strings: offsets (uint32) followed by the utf-8 blob, shared by security names and tickers
+- notes columns: reference id, reference date ordinal, transactions count and the fees ordered by
+  BrokerageNoteFeeType ordinal
+- transactions columns: TransactionType ordinal, amount, unit price, source withheld taxes and the
+  security name and ticker string indexes (-1 when there is no ticker) and the SecurityType ordinal (255 when
+  there is none)
+
+Money is stored as fixed-point integers: an int64 coefficient column and an int8 exponent column, so the
+exact Decimal (scale included) is rebuilt on decoding.
+"""
+
+import struct
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE, BrokerageNote
+from correpy.domain.entities.security import Security
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.enums import BrokerageNoteFeeType, SecurityType, TransactionType
+from correpy.domain.utils import build_new_entity
+from correpy.serialization.columnar import (
+    NO_STRING_INDEX,
+    ColumnReader,
+    IntegerTypeCode,
+    StringInterner,
+    pack_column,
+)
+from correpy.serialization.exceptions import InvalidWireFormatException
+
+WIRE_FORMAT_MAGIC = b"CRPY"
+WIRE_FORMAT_VERSION = 2
+HEADER_STRUCT = struct.Struct("<4sHxxIIII")
+NO_SECURITY_TYPE_ORDINAL = 255
+MAX_FIXED_POINT_DIGITS = 18
+MIN_EXPONENT, MAX_EXPONENT = -127, 127
+STRING_EXPONENT = -128
+
+FEE_TYPES = list(BrokerageNoteFeeType)
+TRANSACTION_TYPES = list(TransactionType)
+TRANSACTION_TYPE_ORDINALS = {transaction_type: ordinal for ordinal, transaction_type in enumerate(TRANSACTION_TYPES)}
+SECURITY_TYPES = list(SecurityType)
+SECURITY_TYPE_ORDINALS = {security_type: ordinal for ordinal, security_type in enumerate(SECURITY_TYPES)}
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def _to_fixed_point(value: Decimal, interner: StringInterner) -> Tuple[int, int]:
+    """Values that do not fit an int64 coefficient and an int8 exponent are kept as interned strings"""
+    _, digits, exponent = value.as_tuple()
+    if not isinstance(exponent, int):
+        raise InvalidWireFormatException(f"Value {value} can not be encoded")
+    if len(digits) > MAX_FIXED_POINT_DIGITS or not MIN_EXPONENT <= exponent <= MAX_EXPONENT:
+        return interner.intern(str(value)), STRING_EXPONENT
+    return int(value.scaleb(-exponent)), exponent
+
+
+def _pack_column(typecode: IntegerTypeCode, values: Iterable[int]) -> bytes:
+    try:
+        return pack_column(typecode, values)
+    except OverflowError as exc:
+        raise InvalidWireFormatException("Value out of the wire format range") from exc
+
+
+def encode_brokerage_notes(brokerage_notes: Iterable[BrokerageNote]) -> bytes:
+    brokerage_notes = list(brokerage_notes)
+    transactions = [transaction for brokerage_note in brokerage_notes for transaction in brokerage_note.transactions]
+    interner = StringInterner()
+    security_name_indexes = [interner.intern(transaction.security.name) for transaction in transactions]
+    security_ticker_indexes = [interner.intern(transaction.security.ticker) for transaction in transactions]
+
+    fees = [
+        _to_fixed_point(fee_value, interner)
+        for brokerage_note in brokerage_notes
+        for fee_value in brokerage_note.fees_by_fee_type.values()
+    ]
+    amounts = [_to_fixed_point(transaction.amount, interner) for transaction in transactions]
+    unit_prices = [_to_fixed_point(transaction.unit_price, interner) for transaction in transactions]
+    withheld_taxes = [_to_fixed_point(transaction.source_withheld_taxes, interner) for transaction in transactions]
+
+    strings_sections, strings_size = interner.pack()
+    sections = [
+        HEADER_STRUCT.pack(
+            WIRE_FORMAT_MAGIC,
+            WIRE_FORMAT_VERSION,
+            len(brokerage_notes),
+            len(transactions),
+            len(interner.strings),
+            strings_size,
+        ),
+        strings_sections,
+        _pack_column("q", (brokerage_note.reference_id for brokerage_note in brokerage_notes)),
+        _pack_column("i", (brokerage_note.reference_date.toordinal() for brokerage_note in brokerage_notes)),
+        _pack_column("I", (len(brokerage_note.transactions) for brokerage_note in brokerage_notes)),
+        _pack_column("q", (coefficient for coefficient, _ in fees)),
+        _pack_column("b", (exponent for _, exponent in fees)),
+        _pack_column("B", (TRANSACTION_TYPE_ORDINALS[transaction.transaction_type] for transaction in transactions)),
+    ]
+    for fixed_point_values in (amounts, unit_prices, withheld_taxes):
+        sections.append(_pack_column("q", (coefficient for coefficient, _ in fixed_point_values)))
+        sections.append(_pack_column("b", (exponent for _, exponent in fixed_point_values)))
+    sections.append(_pack_column("i", security_name_indexes))
+    sections.append(_pack_column("i", security_ticker_indexes))
+    sections.append(
+        _pack_column(
+            "B",
+            (
+                (
+                    NO_SECURITY_TYPE_ORDINAL
+                    if transaction.security.security_type is None
+                    else SECURITY_TYPE_ORDINALS[transaction.security.security_type]
+                )
+                for transaction in transactions
+            ),
+        )
+    )
+    return b"".join(sections)
+
+
+class BrokerageNoteBatchView:
+    """Zero-copy view over an encoded batch of brokerage notes.
+
+    Columns are memoryviews over the given buffer (e.g. a shared memory block), so numeric columns can be read
+    without copying, and BrokerageNote objects are only built when requested.
+    """
+
+    def __init__(self, buffer: Buffer) -> None:
+        self.__buffer = memoryview(buffer).cast("B")
+        if len(self.__buffer) < HEADER_STRUCT.size:
+            raise InvalidWireFormatException("Buffer is smaller than the wire format header")
+        magic, version, notes_count, transactions_count, strings_count, strings_size = HEADER_STRUCT.unpack_from(
+            self.__buffer
+        )
+        if magic != WIRE_FORMAT_MAGIC:
+            raise InvalidWireFormatException("Buffer does not contain brokerage notes in the wire format")
+        if version != WIRE_FORMAT_VERSION:
+            raise InvalidWireFormatException(f"Unsupported wire format version {version}")
+
+        self.notes_count: int = notes_count
+        self.transactions_count: int = transactions_count
+        reader = ColumnReader(self.__buffer, HEADER_STRUCT.size, exception_class=InvalidWireFormatException)
+        self.__string_offsets, self.__strings_blob = reader.read_strings(strings_count, strings_size)
+        self.reference_ids = reader.read_column("q", notes_count)
+        self.reference_date_ordinals = reader.read_column("i", notes_count)
+        self.transactions_counts = reader.read_column("I", notes_count)
+        self.fee_coefficients = reader.read_column("q", notes_count * len(FEE_TYPES))
+        self.fee_exponents = reader.read_column("b", notes_count * len(FEE_TYPES))
+        self.transaction_type_ordinals = reader.read_column("B", transactions_count)
+        self.amount_coefficients = reader.read_column("q", transactions_count)
+        self.amount_exponents = reader.read_column("b", transactions_count)
+        self.unit_price_coefficients = reader.read_column("q", transactions_count)
+        self.unit_price_exponents = reader.read_column("b", transactions_count)
+        self.source_withheld_taxes_coefficients = reader.read_column("q", transactions_count)
+        self.source_withheld_taxes_exponents = reader.read_column("b", transactions_count)
+        self.security_name_indexes = reader.read_column("i", transactions_count)
+        self.security_ticker_indexes = reader.read_column("i", transactions_count)
+        self.security_type_ordinals = reader.read_column("B", transactions_count)
+
+        self.__strings: List[Optional[str]] = [None] * strings_count
+        self.__first_transaction_indexes = [0]
+        for transactions_count_by_note in self.transactions_counts:
+            self.__first_transaction_indexes.append(self.__first_transaction_indexes[-1] + transactions_count_by_note)
+
+    def release(self) -> None:
+        """Releases the views on the buffer, required before closing a shared memory block"""
+        for attribute_name, attribute in list(vars(self).items()):
+            if isinstance(attribute, memoryview):
+                attribute.release()
+                setattr(self, attribute_name, None)
+
+    def __get_interned_string(self, index: int) -> str:
+        # Each interned string is decoded once and shared by all the transactions referencing it
+        if (value := self.__strings[index]) is None:
+            start, end = self.__string_offsets[index], self.__string_offsets[index + 1]
+            value = self.__strings[index] = str(self.__strings_blob[start:end], "utf-8")
+        return value
+
+    def get_string(self, index: int) -> Optional[str]:
+        if index == NO_STRING_INDEX:
+            return None
+        return self.__get_interned_string(index)
+
+    @staticmethod
+    def get_security_type(ordinal: int) -> Optional[SecurityType]:
+        if ordinal == NO_SECURITY_TYPE_ORDINAL:
+            return None
+        return SECURITY_TYPES[ordinal]
+
+    def __to_decimal(self, coefficient: int, exponent: int) -> Decimal:
+        if exponent == STRING_EXPONENT:
+            return Decimal(self.__get_interned_string(coefficient))
+        return Decimal(coefficient).scaleb(exponent)
+
+    def __build_transaction(self, index: int) -> Transaction:
+        security = build_new_entity(
+            Security,
+            name=self.__get_interned_string(self.security_name_indexes[index]),
+            ticker=self.get_string(self.security_ticker_indexes[index]),
+            security_type=self.get_security_type(self.security_type_ordinals[index]),
+        )
+        return build_new_entity(
+            Transaction,
+            transaction_type=TRANSACTION_TYPES[self.transaction_type_ordinals[index]],
+            amount=self.__to_decimal(self.amount_coefficients[index], self.amount_exponents[index]),
+            unit_price=self.__to_decimal(self.unit_price_coefficients[index], self.unit_price_exponents[index]),
+            security=security,
+            source_withheld_taxes=self.__to_decimal(
+                self.source_withheld_taxes_coefficients[index], self.source_withheld_taxes_exponents[index]
+            ),
+        )
+
+    def __len__(self) -> int:
+        return self.notes_count
+
+    def __getitem__(self, index: int) -> BrokerageNote:
+        if not 0 <= index < self.notes_count:
+            raise IndexError(index)
+        first_fee_index = index * len(FEE_TYPES)
+        fees = {
+            FEE_FIELD_NAME_BY_FEE_TYPE[fee_type]: self.__to_decimal(
+                self.fee_coefficients[first_fee_index + fee_ordinal], self.fee_exponents[first_fee_index + fee_ordinal]
+            )
+            for fee_ordinal, fee_type in enumerate(FEE_TYPES)
+        }
+        transactions_range = range(self.__first_transaction_indexes[index], self.__first_transaction_indexes[index + 1])
+        return BrokerageNote(
+            reference_id=self.reference_ids[index],
+            reference_date=date.fromordinal(self.reference_date_ordinals[index]),
+            transactions=[self.__build_transaction(transaction_index) for transaction_index in transactions_range],
+            **fees,
+        )
+
+    def __iter__(self) -> Iterator[BrokerageNote]:
+        for index in range(self.notes_count):
+            yield self[index]
+
+
+def decode_brokerage_notes(buffer: Buffer) -> List[BrokerageNote]:
+    batch_view = BrokerageNoteBatchView(buffer)
+    try:
+        return list(batch_view)
+    finally:
+        batch_view.release()
@@ -0,0 +1,91 @@
+"""Building blocks of the little-endian columnar files of correpy (wire format, instrument index, extraction cache).
+
+Every section is padded to 8 bytes and columns are arrays of fixed-size values. Strings are interned and stored as a
+uint32 offsets column followed by their utf-8 blob.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Type, Union
+
+IntegerTypeCode = Literal["b", "B", "i", "I", "q"]
+ColumnTypeCode = Literal["b", "B", "i", "I", "q", "d"]
+
+NO_STRING_INDEX = -1
+
+
+def padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def pack_column(typecode: ColumnTypeCode, values: Iterable[Union[int, float]]) -> bytes:
+    """Raises OverflowError when a value does not fit the typecode"""
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    column_bytes = column.tobytes()
+    return column_bytes + padding(len(column_bytes))
+
+
+class StringInterner:
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self.__indexes: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING_INDEX
+        if (index := self.__indexes.get(value)) is None:
+            index = self.__indexes[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def pack(self) -> Tuple[bytes, int]:
+        """Offsets and blob sections of the interned strings, and the size of the blob"""
+        encoded_strings = [value.encode("utf-8") for value in self.strings]
+        string_offsets = [0]
+        for encoded_string in encoded_strings:
+            string_offsets.append(string_offsets[-1] + len(encoded_string))
+        strings_blob = b"".join(encoded_strings)
+        return pack_column("I", string_offsets) + strings_blob + padding(len(strings_blob)), len(strings_blob)
+
+
+class ColumnReader:
+    """Reads the sections of a buffer in order, raising `exception_class` when the buffer is truncated.
+
+    Columns are zero-copy views over the buffer, unless `copy` is set so the buffer can be closed (e.g. a mmap) while
+    the columns are still in use.
+    """
+
+    def __init__(self, buffer: memoryview, offset: int, exception_class: Type[Exception], copy: bool = False) -> None:
+        self.buffer = buffer
+        self.offset = offset
+        self.exception_class = exception_class
+        self.copy = copy
+
+    def read_bytes(self, size: int) -> memoryview:
+        if self.offset + size > len(self.buffer):
+            raise self.exception_class("Buffer is truncated")
+        view = self.buffer[self.offset : self.offset + size]
+        self.offset += size + len(padding(size))
+        return memoryview(view.tobytes()) if self.copy else view
+
+    def read_column(self, typecode: IntegerTypeCode, count: int) -> Sequence[int]:
+        view = self.read_bytes(count * array(typecode).itemsize)
+        if sys.byteorder == "big":
+            column = array(typecode, view.tobytes())
+            column.byteswap()
+            return column
+        return view.cast(typecode)
+
+    def read_strings(self, count: int, blob_size: int) -> Tuple[Sequence[int], memoryview]:
+        """Offsets and blob of `count` strings packed by StringInterner.pack"""
+        return self.read_column("I", count + 1), self.read_bytes(blob_size)
+
+    def read_float_column(self, count: int) -> Sequence[float]:
+        view = self.read_bytes(count * array("d").itemsize)
+        if sys.byteorder == "big":
+            column = array("d", view.tobytes())
+            column.byteswap()
+            return column
+        return view.cast("d")
@@ -0,0 +1,2 @@
+class InvalidWireFormatException(Exception):
+    pass
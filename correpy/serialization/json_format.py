@@ -0,0 +1,31 @@
+"""JSON encoding of brokerage notes, used by the golden outputs and the JSON lines written by the watch mode."""
+
+from typing import Dict
+
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE, BrokerageNote
+from correpy.utils import JsonValue
+
+
+def brokerage_note_to_json(brokerage_note: BrokerageNote) -> Dict[str, JsonValue]:
+    """Decimals are kept as strings, so the JSON holds the exact values"""
+    return {
+        "reference_id": brokerage_note.reference_id,
+        "reference_date": brokerage_note.reference_date.isoformat(),
+        **{fee_column: str(getattr(brokerage_note, fee_column)) for fee_column in FEE_FIELD_NAME_BY_FEE_TYPE.values()},
+        "transactions": [
+            {
+                "transaction_type": transaction.transaction_type.value,
+                "amount": str(transaction.amount),
+                "unit_price": str(transaction.unit_price),
+                "source_withheld_taxes": str(transaction.source_withheld_taxes),
+                "security": {
+                    "name": transaction.security.name,
+                    "ticker": transaction.security.ticker,
+                    "security_type": (
+                        None if transaction.security.security_type is None else transaction.security.security_type.name
+                    ),
+                },
+            }
+            for transaction in brokerage_note.transactions
+        ],
+    }
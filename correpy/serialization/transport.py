@@ -0,0 +1,41 @@
+import typing
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, List, Protocol
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.serialization.binary_format import decode_brokerage_notes, encode_brokerage_notes
+
+
+class BytesConnection(Protocol):
+    """Anything able to send and receive whole messages, like the ends of a multiprocessing Pipe"""
+
+    def send_bytes(self, buf: bytes) -> None: ...
+
+    def recv_bytes(self) -> bytes: ...
+
+
+def send_brokerage_notes(connection: BytesConnection, brokerage_notes: Iterable[BrokerageNote]) -> None:
+    connection.send_bytes(encode_brokerage_notes(brokerage_notes))
+
+
+def receive_brokerage_notes(connection: BytesConnection) -> List[BrokerageNote]:
+    return decode_brokerage_notes(connection.recv_bytes())
+
+
+def write_brokerage_notes_to_shared_memory(brokerage_notes: Iterable[BrokerageNote]) -> SharedMemory:
+    """Encodes the notes into a new shared memory block. Its name is what must be sent to the reader process"""
+    payload = encode_brokerage_notes(brokerage_notes)
+    shared_memory = SharedMemory(create=True, size=len(payload))
+    typing.cast(memoryview, shared_memory.buf)[: len(payload)] = payload
+    return shared_memory
+
+
+def read_brokerage_notes_from_shared_memory(name: str, unlink: bool = True) -> List[BrokerageNote]:
+    """Decodes the notes straight from the shared memory block, then closes (and by default unlinks) it"""
+    shared_memory = SharedMemory(name=name)
+    try:
+        return decode_brokerage_notes(typing.cast(memoryview, shared_memory.buf))
+    finally:
+        shared_memory.close()
+        if unlink:
+            shared_memory.unlink()
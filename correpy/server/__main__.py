@@ -0,0 +1,37 @@
+import argparse
+
+from correpy.server.client import DEFAULT_SERVER_ADDRESS
+from correpy.server.daemon import ParsingServer
+from correpy.server.exceptions import InsecureServerAddressException
+from correpy.server.protocol import ServerAddress
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(prog="python -m correpy.server", description="Warm parsing server")
+    argument_parser.add_argument("--socket", default=DEFAULT_SERVER_ADDRESS, help="Unix socket path to listen on")
+    argument_parser.add_argument("--host", help="Listen on this loopback TCP host instead of a Unix socket")
+    argument_parser.add_argument("--port", type=int, default=8765, help="TCP port, used with --host")
+    argument_parser.add_argument("--workers", type=int, help="Worker processes, defaults to the number of CPUs")
+    argument_parser.add_argument(
+        "--allowed-path-root",
+        action="append",
+        dest="allowed_path_roots",
+        help="Directory the documents requested by path must be in, may be repeated. Any path is read when omitted",
+    )
+    arguments = argument_parser.parse_args()
+
+    address: ServerAddress = (arguments.host, arguments.port) if arguments.host else arguments.socket
+    try:
+        server = ParsingServer(
+            address=address, max_workers=arguments.workers, allowed_path_roots=arguments.allowed_path_roots
+        )
+    except InsecureServerAddressException as exc:
+        argument_parser.error(str(exc))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import io
+import os
+import socket
+import tempfile
+import threading
+import typing
+from typing import Dict, List, Optional, Tuple, Type, Union
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.parsers.brokerage_notes.parallel_parser import BrokerageNoteSource, read_brokerage_note_source
+from correpy.parsers.exceptions import (
+    InvalidPasswordException,
+    ParsingBudgetExceededException,
+    ProblemParsingBrokerageNoteException,
+)
+from correpy.parsers.parsing_budget import ParsingBudget, ParsingDiagnostics
+from correpy.parsers.password_resolver import Password, PasswordResolver
+from correpy.serialization.binary_format import decode_brokerage_notes
+from correpy.server.daemon import ServerStats
+from correpy.server.exceptions import InvalidMessageException, RemoteParsingException
+from correpy.server.protocol import (
+    OK_STATUS,
+    PARSE_COMMAND,
+    STATS_COMMAND,
+    MessageHeader,
+    ServerAddress,
+    create_connection,
+    receive_message,
+    send_message,
+)
+
+DEFAULT_SERVER_ADDRESS = os.path.join(tempfile.gettempdir(), "correpy.sock")
+
+PARSER_EXCEPTIONS: Dict[str, Type[Exception]] = {
+    exception_class.__name__: exception_class
+    for exception_class in (InvalidPasswordException, ProblemParsingBrokerageNoteException)
+}
+
+
+def build_diagnostics(diagnostics_fields: MessageHeader) -> ParsingDiagnostics:
+    return ParsingDiagnostics(
+        pages_in_document=typing.cast(int, diagnostics_fields["pages_in_document"]),
+        pages_read=typing.cast(int, diagnostics_fields["pages_read"]),
+        words_read=typing.cast(int, diagnostics_fields["words_read"]),
+        words_per_page=typing.cast(List[int], diagnostics_fields["words_per_page"]),
+        estimated_memory_in_bytes=typing.cast(int, diagnostics_fields["estimated_memory_in_bytes"]),
+        elapsed_seconds=typing.cast(float, diagnostics_fields["elapsed_seconds"]),
+    )
+
+
+def build_exception_from_error_header(error_header: MessageHeader) -> Exception:
+    """Rebuilds the parser exceptions raised on the server, so callers handle them as if parsing locally"""
+    exception_name = str(error_header.get("exception"))
+    message = str(error_header.get("message"))
+    if exception_name == ParsingBudgetExceededException.__name__:
+        return ParsingBudgetExceededException(
+            budget_name=str(error_header["budget_name"]),
+            limit=typing.cast(float, error_header["limit"]),
+            observed=typing.cast(float, error_header["observed"]),
+            diagnostics=build_diagnostics(typing.cast(MessageHeader, error_header["diagnostics"])),
+        )
+    if exception_class := PARSER_EXCEPTIONS.get(exception_name):
+        return exception_class(message)
+    return RemoteParsingException(exception_name=exception_name, message=message)
+
+
+class ParsingClient:
+    """Client of a ParsingServer. The connection is opened on the first request and reused by the next ones"""
+
+    def __init__(self, address: ServerAddress = DEFAULT_SERVER_ADDRESS, timeout: Optional[float] = None) -> None:
+        self.address = address
+        self.timeout = timeout
+        self.__connection: Optional[socket.socket] = None
+        self.__lock = threading.Lock()
+
+    def __request(self, header: MessageHeader, payload: bytes = b"") -> Tuple[MessageHeader, bytes]:
+        with self.__lock:
+            if self.__connection is None:
+                self.__connection = create_connection(self.address, timeout=self.timeout)
+            try:
+                send_message(self.__connection, header, payload)
+                response = receive_message(self.__connection)
+            except Exception:
+                self.close()
+                raise
+        if response is None:
+            self.close()
+            raise InvalidMessageException("Server closed the connection without answering")
+        response_header, response_payload = response
+        if response_header.get("status") != OK_STATUS:
+            raise build_exception_from_error_header(typing.cast(MessageHeader, response_header.get("error") or {}))
+        return response_header, response_payload
+
+    def close(self) -> None:
+        if self.__connection is not None:
+            self.__connection.close()
+            self.__connection = None
+
+    def __enter__(self) -> "ParsingClient":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def parse(
+        self,
+        brokerage_note: Union[BrokerageNoteSource, bytes],
+        password: Optional[Password] = None,
+        budget: Optional[ParsingBudget] = None,
+    ) -> List[BrokerageNote]:
+        """Paths are sent as paths over a Unix socket, so the server must be able to read them. Other sources, and paths
+        over TCP, are sent as bytes
+        """
+        header: MessageHeader = {"command": PARSE_COMMAND}
+        payload = b""
+        if isinstance(brokerage_note, io.BytesIO):
+            payload = brokerage_note.getvalue()
+        elif isinstance(brokerage_note, bytes):
+            payload = brokerage_note
+        elif not isinstance(self.address, str):
+            payload = read_brokerage_note_source(brokerage_note).getvalue()
+        else:
+            header["path"] = os.path.abspath(brokerage_note)
+
+        if isinstance(password, PasswordResolver):
+            header["password_candidates"] = list(password.iter_candidates())
+            header["client_id"] = password.client_id
+        else:
+            header["password"] = password
+        if budget is not None:
+            header["budget"] = {
+                "max_pages": budget.max_pages,
+                "max_words_per_page": budget.max_words_per_page,
+                "deadline_in_seconds": budget.deadline_in_seconds,
+                "max_memory_in_bytes": budget.max_memory_in_bytes,
+            }
+
+        response_header, response_payload = self.__request(header, payload)
+        resolved_password = response_header.get("password")
+        if isinstance(password, PasswordResolver) and password.client_id and isinstance(resolved_password, str):
+            password.memory.remember(client_id=password.client_id, password=resolved_password)
+        return decode_brokerage_notes(response_payload)
+
+    def get_stats(self) -> ServerStats:
+        response_header, _ = self.__request({"command": STATS_COMMAND})
+        return ServerStats(**typing.cast(Dict[str, int], response_header["stats"]))
+
+
+class RemoteParserFactory:
+    """Drop-in replacement of ParserFactory that parses on a running ParsingServer"""
+
+    def __init__(
+        self,
+        brokerage_note: Union[BrokerageNoteSource, bytes],
+        password: Optional[Password] = None,
+        budget: Optional[ParsingBudget] = None,
+        client: Optional[ParsingClient] = None,
+    ) -> None:
+        self.__brokerage_note = brokerage_note
+        self.__password = password
+        self.__budget = budget
+        self.__client = client
+
+    def parse(self) -> List[BrokerageNote]:
+        if self.__client is not None:
+            return self.__client.parse(self.__brokerage_note, password=self.__password, budget=self.__budget)
+        with ParsingClient() as client:
+            return client.parse(self.__brokerage_note, password=self.__password, budget=self.__budget)
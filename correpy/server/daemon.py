@@ -0,0 +1,252 @@
+import dataclasses
+import os
+import socket
+import socketserver
+import threading
+import time
+import typing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.server.exceptions import InsecureServerAddressException, InvalidMessageException
+from correpy.server.protocol import (
+    ERROR_STATUS,
+    OK_STATUS,
+    PARSE_COMMAND,
+    STATS_COMMAND,
+    MessageHeader,
+    ServerAddress,
+    is_loopback_host,
+    receive_message,
+    send_message,
+)
+from correpy.server.worker import ParseRequest, build_error_header, parse_to_wire_format, warm_up_worker
+from correpy.utils import get_percentile
+
+# Number of most recent requests used to compute the latency percentiles
+LATENCY_WINDOW_SIZE = 1000
+# Only the user running the server may connect to its Unix socket
+UNIX_SOCKET_MODE = 0o600
+
+
+@dataclass
+class ServerStats:
+    workers: int
+    queue_depth: int
+    in_flight: int
+    processed: int
+    failed: int
+    latency_p50_in_seconds: float
+    latency_p95_in_seconds: float
+
+
+class _ParsingRequestHandler(socketserver.BaseRequestHandler):
+    """Serves the requests of one client connection until the client closes it"""
+
+    server: "_ThreadingServer"
+
+    def handle(self) -> None:
+        connection: socket.socket = self.request
+        while True:
+            try:
+                message = receive_message(connection)
+            except (InvalidMessageException, OSError):
+                return
+            if message is None:
+                return
+            header, payload = message
+            response_header, response_payload = self.server.parsing_server.handle_message(header, payload)
+            try:
+                send_message(connection, response_header, response_payload)
+            except OSError:
+                return
+
+
+class _ThreadingServer(socketserver.ThreadingMixIn, socketserver.BaseServer):
+    daemon_threads = True
+    parsing_server: "ParsingServer"
+
+
+class _ThreadingUnixServer(_ThreadingServer, socketserver.UnixStreamServer):
+    def server_bind(self) -> None:
+        super().server_bind()
+        # Before listening, so no client connects while the socket still has the mode given by the umask
+        os.chmod(typing.cast(str, self.server_address), UNIX_SOCKET_MODE)
+
+
+class _ThreadingTCPServer(_ThreadingServer, socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+class ParsingServer:
+    """Long running parsing server with a pool of warm worker processes.
+
+    Listens on a Unix socket (string address) or on a loopback TCP address (host and port tuple) and answers parse
+    requests with the notes encoded in the wire format. Each client connection is served by its own thread, which
+    waits for a worker process to parse the document.
+
+    Clients are not authenticated: TCP hosts reachable from other machines are refused, and documents are read from
+    a path only for clients of the Unix socket, since any local user may connect to the TCP port. The Unix socket is
+    only accessible by the user running the server, and when allowed_path_roots is given, only paths inside one of
+    those directories are read.
+    """
+
+    def __init__(
+        self,
+        address: ServerAddress,
+        max_workers: Optional[int] = None,
+        budget: Optional[ParsingBudget] = None,
+        allowed_path_roots: Optional[Sequence[str]] = None,
+    ) -> None:
+        if not isinstance(address, str) and not is_loopback_host(address[0]):
+            raise InsecureServerAddressException(f"TCP host {address[0]} is not a loopback address")
+        self.address = address
+        self.allowed_path_roots = (
+            None if allowed_path_roots is None else [os.path.realpath(root) for root in allowed_path_roots]
+        )
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.budget = budget
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__server: Optional[_ThreadingServer] = None
+        self.__serving_thread: Optional[threading.Thread] = None
+        self.__stats_lock = threading.Lock()
+        self.__pending = 0
+        self.__processed = 0
+        self.__failed = 0
+        self.__latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW_SIZE)
+
+    def __build_server(self) -> _ThreadingServer:
+        server: _ThreadingServer
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            server = _ThreadingUnixServer(self.address, _ParsingRequestHandler)
+        else:
+            server = _ThreadingTCPServer(self.address, _ParsingRequestHandler)
+            # The real port is known only after binding when port 0 is requested
+            self.address = typing.cast(Tuple[str, int], server.server_address[:2])
+        server.parsing_server = self
+        return server
+
+    def __start_workers(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=warm_up_worker)
+        # Workers are started (and warmed up) before serving instead of on the first requests
+        for future in [executor.submit(os.getpid) for _ in range(self.max_workers)]:
+            future.result()
+        return executor
+
+    def start(self) -> None:
+        """Starts the workers and serves requests in a background thread"""
+        self.__executor = self.__start_workers()
+        self.__server = self.__build_server()
+        self.__serving_thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+        self.__serving_thread.start()
+
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            while self.__serving_thread is not None and self.__serving_thread.is_alive():
+                self.__serving_thread.join(timeout=1)
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+    def __enter__(self) -> "ParsingServer":
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.shutdown()
+
+    def get_stats(self) -> ServerStats:
+        with self.__stats_lock:
+            pending = self.__pending
+            processed = self.__processed
+            failed = self.__failed
+            latencies = sorted(self.__latencies)
+        return ServerStats(
+            workers=self.max_workers,
+            queue_depth=max(pending - self.max_workers, 0),
+            in_flight=min(pending, self.max_workers),
+            processed=processed,
+            failed=failed,
+            latency_p50_in_seconds=get_percentile(latencies, 0.5),
+            latency_p95_in_seconds=get_percentile(latencies, 0.95),
+        )
+
+    def __is_path_allowed(self, path: str) -> bool:
+        if self.allowed_path_roots is None:
+            return True
+        # Resolved first, so neither ".." nor symbolic links lead outside of the roots
+        real_path = os.path.realpath(path)
+        return any(os.path.commonpath([root, real_path]) == root for root in self.allowed_path_roots)
+
+    def __build_parse_request(self, header: MessageHeader, payload: bytes) -> ParseRequest:
+        path = header.get("path")
+        if path is not None and not isinstance(self.address, str):
+            raise InvalidMessageException("Paths are only accepted on Unix sockets, send the document bytes instead")
+        if path is not None and (not isinstance(path, str) or not self.__is_path_allowed(path)):
+            raise InvalidMessageException(f"Path {path} is not inside the allowed path roots of the server")
+        budget_fields = header.get("budget")
+        password_candidates = header.get("password_candidates") or []
+        return ParseRequest(
+            content=payload if path is None else None,
+            path=path,
+            password=typing.cast(Optional[str], header.get("password")),
+            password_candidates=typing.cast(List[str], password_candidates),
+            client_id=typing.cast(Optional[str], header.get("client_id")),
+            budget=(
+                ParsingBudget(**typing.cast(Dict[str, Optional[int]], budget_fields)) if budget_fields else self.budget
+            ),
+        )
+
+    def __parse(self, header: MessageHeader, payload: bytes) -> Tuple[MessageHeader, bytes]:
+        if self.__executor is None:
+            raise InvalidMessageException("Server is not running")
+        started_at = time.monotonic()
+        with self.__stats_lock:
+            self.__pending += 1
+        try:
+            parse_request = self.__build_parse_request(header, payload)
+            encoded_brokerage_notes, password, error_header = self.__executor.submit(
+                parse_to_wire_format, parse_request
+            ).result()
+        except Exception as exc:  # pylint:disable=broad-except
+            encoded_brokerage_notes, password, error_header = b"", None, build_error_header(exc)
+        finally:
+            with self.__stats_lock:
+                self.__pending -= 1
+
+        with self.__stats_lock:
+            self.__latencies.append(time.monotonic() - started_at)
+            if error_header is None:
+                self.__processed += 1
+            else:
+                self.__failed += 1
+
+        if error_header is not None:
+            return {"status": ERROR_STATUS, "error": error_header}, b""
+        return {"status": OK_STATUS, "password": password}, encoded_brokerage_notes
+
+    def handle_message(self, header: MessageHeader, payload: bytes) -> Tuple[MessageHeader, bytes]:
+        command = header.get("command")
+        if command == PARSE_COMMAND:
+            return self.__parse(header, payload)
+        if command == STATS_COMMAND:
+            stats = typing.cast(MessageHeader, dataclasses.asdict(self.get_stats()))
+            return {"status": OK_STATUS, "stats": stats}, b""
+        error = InvalidMessageException(f"Unknown command {command}")
+        return {"status": ERROR_STATUS, "error": build_error_header(error)}, b""
@@ -0,0 +1,15 @@
+class InvalidMessageException(Exception):
+    pass
+
+
+class InsecureServerAddressException(Exception):
+    """Raised for TCP addresses reachable from other machines, as the server does not authenticate its clients"""
+
+
+class RemoteParsingException(Exception):
+    """Raised by the client for server side errors that are not one of the parser exceptions"""
+
+    def __init__(self, *, exception_name: str, message: str) -> None:
+        super().__init__(f"{exception_name}: {message}")
+        self.exception_name = exception_name
+        self.message = message
@@ -0,0 +1,92 @@
+"""Framing of the messages exchanged by the parsing server and its clients.
+
+Every message is a fixed size prefix with the sizes of a JSON header and of a binary payload, followed by both.
+Requests carry the PDF bytes as payload (or its path in the header) and responses carry the parsed notes in the
+wire format of correpy.serialization.
+"""
+
+import ipaddress
+import json
+import socket
+import struct
+from typing import Dict, Optional, Tuple, Union, cast
+
+from correpy.server.exceptions import InvalidMessageException
+from correpy.utils import JsonValue
+
+MESSAGE_PREFIX_STRUCT = struct.Struct("<II")
+MAX_HEADER_SIZE = 1024 * 1024
+MAX_PAYLOAD_SIZE = 256 * 1024 * 1024
+
+MessageHeader = Dict[str, JsonValue]
+ServerAddress = Union[str, Tuple[str, int]]
+
+PARSE_COMMAND = "parse"
+STATS_COMMAND = "stats"
+OK_STATUS = "ok"
+ERROR_STATUS = "error"
+
+
+def create_connection(address: ServerAddress, timeout: Optional[float] = None) -> socket.socket:
+    """A string address is the path of a Unix socket, a tuple is a (host, port) TCP address"""
+    if isinstance(address, str):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+        connection.connect(address)
+        return connection
+    return socket.create_connection(address, timeout=timeout)
+
+
+def is_loopback_host(host: str) -> bool:
+    """Whether every address of the host is a loopback one, so a TCP server on it is unreachable from other machines"""
+    try:
+        addresses = {address_info[4][0] for address_info in socket.getaddrinfo(host, None)}
+    except socket.gaierror:
+        return False
+    # IPv6 addresses may carry a "%<zone>" suffix
+    return bool(addresses) and all(
+        ipaddress.ip_address(str(address).partition("%")[0]).is_loopback for address in addresses
+    )
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = connection.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            if remaining == size:
+                return None
+            raise InvalidMessageException("Connection closed in the middle of a message")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_message(connection: socket.socket, header: MessageHeader, payload: bytes = b"") -> None:
+    encoded_header = json.dumps(header).encode("utf-8")
+    connection.sendall(MESSAGE_PREFIX_STRUCT.pack(len(encoded_header), len(payload)) + encoded_header)
+    if payload:
+        connection.sendall(payload)
+
+
+def receive_message(connection: socket.socket) -> Optional[Tuple[MessageHeader, bytes]]:
+    """Reads the next message, None when the other side closed the connection between messages"""
+    prefix = _receive_exactly(connection, MESSAGE_PREFIX_STRUCT.size)
+    if prefix is None:
+        return None
+    header_size, payload_size = MESSAGE_PREFIX_STRUCT.unpack(prefix)
+    if header_size > MAX_HEADER_SIZE:
+        raise InvalidMessageException(f"Message header of {header_size} bytes is too large")
+    if payload_size > MAX_PAYLOAD_SIZE:
+        raise InvalidMessageException(f"Message payload of {payload_size} bytes is too large")
+
+    encoded_header = _receive_exactly(connection, header_size) or b""
+    payload = (_receive_exactly(connection, payload_size) or b"") if payload_size else b""
+    try:
+        header = json.loads(encoded_header)
+    except ValueError as exc:
+        raise InvalidMessageException("Message header is not valid JSON") from exc
+    if not isinstance(header, dict):
+        raise InvalidMessageException("Message header must be a JSON object")
+    return cast(MessageHeader, header), payload
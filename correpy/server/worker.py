@@ -0,0 +1,70 @@
+import dataclasses
+import typing
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import fitz
+
+from correpy.parsers.brokerage_notes.parallel_parser import read_brokerage_note_source
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.exceptions import ParsingBudgetExceededException
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.parsers.password_resolver import Password, PasswordResolver
+from correpy.serialization.binary_format import encode_brokerage_notes
+from correpy.server.exceptions import InvalidMessageException
+from correpy.server.protocol import MessageHeader
+
+
+@dataclass
+class ParseRequest:
+    content: Optional[bytes] = None
+    path: Optional[str] = None
+    password: Optional[str] = None
+    password_candidates: List[str] = field(default_factory=list)
+    client_id: Optional[str] = None
+    budget: Optional[ParsingBudget] = None
+
+    def get_password(self) -> Optional[Password]:
+        if not self.password_candidates and self.client_id is None:
+            return self.password
+        candidates = [self.password, *self.password_candidates] if self.password else self.password_candidates
+        return PasswordResolver(candidates=candidates, client_id=self.client_id)
+
+
+def warm_up_worker() -> None:
+    """Runs once per worker process, so MuPDF and the parsers are loaded before the first request arrives"""
+    fitz.open().close()
+
+
+def build_error_header(exception: Exception) -> MessageHeader:
+    error_header: MessageHeader = {"exception": type(exception).__name__, "message": str(exception)}
+    if isinstance(exception, ParsingBudgetExceededException):
+        error_header.update(
+            budget_name=exception.budget_name,
+            limit=exception.limit,
+            observed=exception.observed,
+            diagnostics=typing.cast(MessageHeader, dataclasses.asdict(exception.diagnostics)),
+        )
+    return error_header
+
+
+def parse_to_wire_format(request: ParseRequest) -> Tuple[bytes, Optional[str], Optional[MessageHeader]]:
+    """Parses a document inside a worker process.
+
+    Returns the encoded notes and the password that opened the document, or the error header. Errors are returned
+    instead of raised since not every parser exception can be pickled back to the server process.
+    """
+    try:
+        if request.content is not None:
+            content = read_brokerage_note_source(request.content)
+        elif request.path is not None:
+            content = read_brokerage_note_source(request.path)
+        else:
+            raise InvalidMessageException("Parse request without content nor path")
+        parser = ParserFactory(
+            brokerage_note=content, password=request.get_password(), budget=request.budget
+        ).get_parser()
+        brokerage_notes = parser.parse_brokerage_note()
+    except Exception as exc:  # pylint:disable=broad-except
+        return b"", None, build_error_header(exc)
+    return encode_brokerage_notes(brokerage_notes), parser.fitz_parser.password, None
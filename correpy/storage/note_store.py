@@ -0,0 +1,195 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Generic, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.transaction import Transaction, get_position_key
+from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+
+StoredNoteKey = Tuple[int, date]
+ItemT = TypeVar("ItemT")
+
+
+class StoredTransaction(NamedTuple):
+    reference_date: date
+    reference_id: int
+    transaction: Transaction
+
+
+class _DateIndex(Generic[ItemT]):
+    """Items sorted by date: a compact array of day ordinals for the bisects, next to the items themselves"""
+
+    def __init__(self) -> None:
+        self.day_ordinals = array("i")
+        self.items: List[ItemT] = []
+
+    def add(self, day_ordinal: int, item: ItemT) -> None:
+        if not self.day_ordinals or day_ordinal >= self.day_ordinals[-1]:
+            self.day_ordinals.append(day_ordinal)
+            self.items.append(item)
+            return
+        index = bisect_right(self.day_ordinals, day_ordinal)
+        self.day_ordinals.insert(index, day_ordinal)
+        self.items.insert(index, item)
+
+    def get_range(self, start: Optional[date], end: Optional[date]) -> List[ItemT]:
+        first_index = 0 if start is None else bisect_left(self.day_ordinals, start.toordinal())
+        last_index = len(self.items) if end is None else bisect_right(self.day_ordinals, end.toordinal())
+        return self.items[first_index:last_index]
+
+    def get_memory_in_bytes(self) -> int:
+        return sys.getsizeof(self.day_ordinals) + sys.getsizeof(self.items)
+
+
+class NoteStore:
+    """In-memory store of parsed notes with secondary indexes.
+
+    Notes are indexed by NoteKey, reference id and date, and transactions by ticker, transaction type and date.
+    Date ranges are answered with bisects, so queries do not scan the whole store. A note added with a NoteKey
+    already stored is merged into it, like the parsers do with partial notes.
+    """
+
+    def __init__(self) -> None:
+        self.__notes: Dict[StoredNoteKey, BrokerageNote] = {}
+        self.__note_keys_by_reference_id: Dict[int, List[StoredNoteKey]] = {}
+        self.__notes_by_date: _DateIndex[BrokerageNote] = _DateIndex()
+        self.__transactions_by_date: _DateIndex[StoredTransaction] = _DateIndex()
+        self.__transactions_by_ticker: Dict[str, _DateIndex[StoredTransaction]] = {}
+        self.__transactions_by_type: Dict[TransactionType, _DateIndex[StoredTransaction]] = {}
+
+    def __len__(self) -> int:
+        return len(self.__notes)
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self.__transactions_by_ticker)
+
+    def add_brokerage_notes(self, brokerage_notes: Iterable[BrokerageNote]) -> None:
+        for brokerage_note in brokerage_notes:
+            self.add_brokerage_note(brokerage_note)
+
+    def add_brokerage_note(self, brokerage_note: BrokerageNote) -> None:
+        note_key = (brokerage_note.reference_id, brokerage_note.reference_date)
+        day_ordinal = brokerage_note.reference_date.toordinal()
+        if (stored_brokerage_note := self.__notes.get(note_key)) is None:
+            stored_brokerage_note = BrokerageNote(
+                reference_id=brokerage_note.reference_id, reference_date=brokerage_note.reference_date
+            )
+            self.__notes[note_key] = stored_brokerage_note
+            self.__note_keys_by_reference_id.setdefault(brokerage_note.reference_id, []).append(note_key)
+            self.__notes_by_date.add(day_ordinal, stored_brokerage_note)
+        stored_brokerage_note.merge(brokerage_note)
+
+        for transaction in brokerage_note.transactions:
+            stored_transaction = StoredTransaction(
+                reference_date=brokerage_note.reference_date,
+                reference_id=brokerage_note.reference_id,
+                transaction=transaction,
+            )
+            self.__transactions_by_date.add(day_ordinal, stored_transaction)
+            self.__transactions_by_ticker.setdefault(get_position_key(transaction), _DateIndex()).add(
+                day_ordinal, stored_transaction
+            )
+            self.__transactions_by_type.setdefault(transaction.transaction_type, _DateIndex()).add(
+                day_ordinal, stored_transaction
+            )
+
+    def get_brokerage_note(self, reference_id: int, reference_date: date) -> Optional[BrokerageNote]:
+        return self.__notes.get((reference_id, reference_date))
+
+    def get_brokerage_notes_by_reference_id(self, reference_id: int) -> List[BrokerageNote]:
+        return [self.__notes[note_key] for note_key in self.__note_keys_by_reference_id.get(reference_id, [])]
+
+    def get_brokerage_notes(self, start: Optional[date] = None, end: Optional[date] = None) -> List[BrokerageNote]:
+        """Notes traded between start and end (both included), ordered by date"""
+        return self.__notes_by_date.get_range(start, end)
+
+    def get_transactions(
+        self,
+        ticker: Optional[str] = None,
+        transaction_type: Optional[TransactionType] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[StoredTransaction]:
+        """Transactions ordered by date. The most selective index is sliced, the other filter is applied on it"""
+        if ticker is not None:
+            if (ticker_index := self.__transactions_by_ticker.get(ticker)) is None:
+                return []
+            stored_transactions = ticker_index.get_range(start, end)
+            if transaction_type is None:
+                return stored_transactions
+            return [
+                stored_transaction
+                for stored_transaction in stored_transactions
+                if stored_transaction.transaction.transaction_type == transaction_type
+            ]
+        if transaction_type is not None:
+            if (type_index := self.__transactions_by_type.get(transaction_type)) is None:
+                return []
+            return type_index.get_range(start, end)
+        return self.__transactions_by_date.get_range(start, end)
+
+    def get_fees(self, start: Optional[date] = None, end: Optional[date] = None) -> Dict[BrokerageNoteFeeType, Decimal]:
+        fees = {fee_type: Decimal(0) for fee_type in BrokerageNoteFeeType}
+        for brokerage_note in self.get_brokerage_notes(start=start, end=end):
+            for fee_type, fee_value in brokerage_note.fees_by_fee_type.items():
+                fees[fee_type] += fee_value
+        return fees
+
+    def get_volume(
+        self,
+        ticker: Optional[str] = None,
+        transaction_type: Optional[TransactionType] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Decimal:
+        """Traded financial volume (amount times unit price)"""
+        return sum(
+            (
+                stored_transaction.transaction.amount * stored_transaction.transaction.unit_price
+                for stored_transaction in self.get_transactions(
+                    ticker=ticker, transaction_type=transaction_type, start=start, end=end
+                )
+            ),
+            Decimal(0),
+        )
+
+    def get_traded_amount(
+        self,
+        ticker: str,
+        transaction_type: Optional[TransactionType] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Decimal:
+        return sum(
+            (
+                stored_transaction.transaction.amount
+                for stored_transaction in self.get_transactions(
+                    ticker=ticker, transaction_type=transaction_type, start=start, end=end
+                )
+            ),
+            Decimal(0),
+        )
+
+    def get_index_memory_in_bytes(self) -> int:
+        """Memory used by the indexes, on top of the notes and transactions themselves"""
+        transaction_indexes = [
+            self.__transactions_by_date,
+            *self.__transactions_by_ticker.values(),
+            *self.__transactions_by_type.values(),
+        ]
+        return (
+            sys.getsizeof(self.__notes)
+            + sys.getsizeof(self.__note_keys_by_reference_id)
+            + sum(sys.getsizeof(note_keys) for note_keys in self.__note_keys_by_reference_id.values())
+            + sum(sys.getsizeof(note_key) for note_key in self.__notes)
+            + sys.getsizeof(self.__transactions_by_ticker)
+            + sys.getsizeof(self.__transactions_by_type)
+            + self.__notes_by_date.get_memory_in_bytes()
+            + sum(date_index.get_memory_in_bytes() for date_index in transaction_indexes)
+            # One StoredTransaction per transaction, shared by the indexes
+            + sum(sys.getsizeof(stored_transaction) for stored_transaction in self.__transactions_by_date.items)
+        )
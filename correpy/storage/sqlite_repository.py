@@ -0,0 +1,299 @@
+"""SQLite repository of brokerage notes.
+
+Money is stored as TEXT with the exact Decimal representation and dates as ISO 8601 TEXT, so values are loaded back
+unchanged and dates sort correctly. Notes are unique by (broker, reference_id, reference_date): saving a note again
+replaces its fees and transactions, which makes re-parsing a document idempotent.
+"""
+
+import sqlite3
+from collections import ChainMap
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE, BrokerageNote
+from correpy.domain.entities.security import Security
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.enums import SecurityType, TransactionType
+from correpy.domain.utils import build_new_entity
+
+DEFAULT_BATCH_SIZE = 5000
+# SQLite default limit of parameters in a statement
+MAX_QUERY_PARAMETERS = 999
+
+FEE_COLUMNS = list(FEE_FIELD_NAME_BY_FEE_TYPE.values())
+# Cheaper than BrokerageNote.fees_by_fee_type, which builds a dict for every note
+get_fee_values = attrgetter(*FEE_COLUMNS)
+TRANSACTION_TYPES_BY_VALUE = {transaction_type.value: transaction_type for transaction_type in TransactionType}
+SECURITY_TYPES_BY_NAME = {security_type.name: security_type for security_type in SecurityType}
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS securities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    ticker TEXT,
+    security_type TEXT
+);
+CREATE INDEX IF NOT EXISTS securities_ticker ON securities (ticker);
+
+CREATE TABLE IF NOT EXISTS brokerage_notes (
+    id INTEGER PRIMARY KEY,
+    broker TEXT NOT NULL,
+    reference_id INTEGER NOT NULL,
+    reference_date TEXT NOT NULL,
+    {", ".join(f"{fee_column} TEXT NOT NULL" for fee_column in FEE_COLUMNS)},
+    UNIQUE (broker, reference_id, reference_date)
+);
+CREATE INDEX IF NOT EXISTS brokerage_notes_reference_date ON brokerage_notes (reference_date);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    brokerage_note_id INTEGER NOT NULL REFERENCES brokerage_notes (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    transaction_type TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    unit_price TEXT NOT NULL,
+    source_withheld_taxes TEXT NOT NULL,
+    security_id INTEGER NOT NULL REFERENCES securities (id),
+    PRIMARY KEY (brokerage_note_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transactions_security ON transactions (security_id);
+"""
+
+UPSERT_BROKERAGE_NOTE = f"""
+INSERT INTO brokerage_notes (broker, reference_id, reference_date, {", ".join(FEE_COLUMNS)})
+VALUES (?, ?, ?, {", ".join("?" for _ in FEE_COLUMNS)})
+ON CONFLICT (broker, reference_id, reference_date) DO UPDATE SET
+{", ".join(f"{fee_column} = excluded.{fee_column}" for fee_column in FEE_COLUMNS)}
+"""
+
+# Tickers and types missing from a stored security are filled by later notes, but never erased
+UPSERT_SECURITY = """
+INSERT INTO securities (name, ticker, security_type) VALUES (?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+ticker = COALESCE(excluded.ticker, ticker), security_type = COALESCE(excluded.security_type, security_type)
+"""
+
+INSERT_TRANSACTION = """
+INSERT INTO transactions
+(brokerage_note_id, position, transaction_type, amount, unit_price, source_withheld_taxes, security_id)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_BROKERAGE_NOTES = f"""
+SELECT n.id, n.reference_id, n.reference_date, {", ".join(f"n.{fee_column}" for fee_column in FEE_COLUMNS)},
+t.transaction_type, t.amount, t.unit_price, t.source_withheld_taxes, s.name, s.ticker, s.security_type
+FROM brokerage_notes n
+LEFT JOIN transactions t ON t.brokerage_note_id = n.id
+LEFT JOIN securities s ON s.id = t.security_id
+"""
+
+NoteKeyByBroker = Tuple[str, int, str]
+# Id, ticker and security type name of a stored security
+StoredSecurity = Tuple[int, Optional[str], Optional[str]]
+
+
+def _iter_chunks(values: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class SQLiteNoteRepository:
+    """Stores notes, transactions and securities in a SQLite database, in batches of `batch_size` notes.
+
+    Each batch is written in a single database transaction with executemany, on a WAL journal.
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        # Securities by name, only updated once the batch writing them is committed
+        self.__stored_securities: Dict[str, StoredSecurity] = {}
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "SQLiteNoteRepository":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __upsert_securities(self, securities: Iterable[Security]) -> Dict[str, StoredSecurity]:
+        """Upserts the securities that are not stored yet or that bring a ticker or type the stored one lacks.
+
+        Returns them as stored, to be cached by the caller once the batch is committed.
+        """
+        changed_securities = {}
+        for security in securities:
+            ticker, security_type = security.ticker, security.security_type and security.security_type.name
+            if (stored_security := self.__stored_securities.get(security.name)) is not None:
+                _, stored_ticker, stored_security_type = stored_security
+                # Same merge as UPSERT_SECURITY, nothing to write when the stored security already has every value
+                if (ticker or stored_ticker, security_type or stored_security_type) == (
+                    stored_ticker,
+                    stored_security_type,
+                ):
+                    continue
+            changed_securities[security.name] = (security.name, ticker, security_type)
+        upserted_securities: Dict[str, StoredSecurity] = {}
+        if changed_securities:
+            self.connection.executemany(UPSERT_SECURITY, changed_securities.values())
+            for names in _iter_chunks(changed_securities, MAX_QUERY_PARAMETERS):
+                query = (
+                    "SELECT name, id, ticker, security_type FROM securities "
+                    f"WHERE name IN ({', '.join('?' for _ in names)})"
+                )
+                for name, security_id, stored_ticker, stored_security_type in self.connection.execute(query, names):
+                    upserted_securities[name] = (security_id, stored_ticker, stored_security_type)
+        return upserted_securities
+
+    def __get_brokerage_note_ids(self, broker: str, note_keys: Sequence[Tuple[int, str]]) -> Dict[NoteKeyByBroker, int]:
+        brokerage_note_ids = {}
+        reference_ids = list({str(reference_id) for reference_id, _ in note_keys})
+        for chunk in _iter_chunks(reference_ids, MAX_QUERY_PARAMETERS - 1):
+            query = (
+                "SELECT reference_id, reference_date, id FROM brokerage_notes "
+                f"WHERE broker = ? AND reference_id IN ({', '.join('?' for _ in chunk)})"
+            )
+            for reference_id, reference_date, brokerage_note_id in self.connection.execute(query, [broker, *chunk]):
+                brokerage_note_ids[(broker, reference_id, reference_date)] = brokerage_note_id
+        return brokerage_note_ids
+
+    def __save_batch(self, brokerage_notes: List[BrokerageNote], broker: str) -> None:
+        note_keys = [
+            (brokerage_note.reference_id, brokerage_note.reference_date.isoformat())
+            for brokerage_note in brokerage_notes
+        ]
+        note_rows = [
+            (broker, *note_key, *map(str, get_fee_values(brokerage_note)))
+            for note_key, brokerage_note in zip(note_keys, brokerage_notes)
+        ]
+        with self.connection:
+            self.connection.executemany(UPSERT_BROKERAGE_NOTE, note_rows)
+            brokerage_note_ids = self.__get_brokerage_note_ids(broker, note_keys)
+            ids_in_batch = [(brokerage_note_ids[(broker, note_key[0], note_key[1])],) for note_key in note_keys]
+            # Saving a note again replaces its transactions
+            self.connection.executemany("DELETE FROM transactions WHERE brokerage_note_id = ?", ids_in_batch)
+
+            upserted_securities = self.__upsert_securities(
+                transaction.security
+                for brokerage_note in brokerage_notes
+                for transaction in brokerage_note.transactions
+            )
+            stored_securities = ChainMap(upserted_securities, self.__stored_securities)
+            self.connection.executemany(
+                INSERT_TRANSACTION,
+                (
+                    (
+                        brokerage_note_id,
+                        position,
+                        transaction.transaction_type.value,
+                        str(transaction.amount),
+                        str(transaction.unit_price),
+                        str(transaction.source_withheld_taxes),
+                        stored_securities[transaction.security.name][0],
+                    )
+                    for brokerage_note, (brokerage_note_id,) in zip(brokerage_notes, ids_in_batch)
+                    for position, transaction in enumerate(brokerage_note.transactions)
+                ),
+            )
+        # A rolled back batch leaves the cache untouched, so its securities are upserted again by the next batches
+        self.__stored_securities.update(upserted_securities)
+
+    def save_brokerage_notes(self, brokerage_notes: Iterable[BrokerageNote], broker: str = "") -> None:
+        """Saves (or replaces) the notes. Notes repeated inside the input are saved once, the last one wins"""
+        batch: Dict[Tuple[int, date], BrokerageNote] = {}
+        for brokerage_note in brokerage_notes:
+            batch[(brokerage_note.reference_id, brokerage_note.reference_date)] = brokerage_note
+            if len(batch) >= self.batch_size:
+                self.__save_batch(list(batch.values()), broker=broker)
+                batch = {}
+        if batch:
+            self.__save_batch(list(batch.values()), broker=broker)
+
+    @staticmethod
+    def __build_brokerage_note(row: Sequence[object]) -> BrokerageNote:
+        fee_values = row[3 : 3 + len(FEE_COLUMNS)]
+        fees: Dict[str, Decimal] = {
+            fee_column: Decimal(str(fee_value)) for fee_column, fee_value in zip(FEE_COLUMNS, fee_values)
+        }
+        return BrokerageNote(
+            reference_id=int(str(row[1])), reference_date=date.fromisoformat(str(row[2])), **fees  # type: ignore[arg-type]
+        )
+
+    @staticmethod
+    def __build_transaction(row: Sequence[object]) -> Transaction:
+        transaction_type, amount, unit_price, source_withheld_taxes, name, ticker, security_type = row[
+            3 + len(FEE_COLUMNS) :
+        ]
+        # Values are stored already cleaned and computed, so __post_init__ is not run again
+        return build_new_entity(
+            Transaction,
+            transaction_type=TRANSACTION_TYPES_BY_VALUE[str(transaction_type)],
+            amount=Decimal(str(amount)),
+            unit_price=Decimal(str(unit_price)),
+            security=build_new_entity(
+                Security,
+                name=name,
+                ticker=ticker,
+                security_type=None if security_type is None else SECURITY_TYPES_BY_NAME[str(security_type)],
+            ),
+            source_withheld_taxes=Decimal(str(source_withheld_taxes)),
+        )
+
+    def iter_brokerage_notes(
+        self, broker: Optional[str] = None, start: Optional[date] = None, end: Optional[date] = None
+    ) -> Iterator[BrokerageNote]:
+        """Streams the notes ordered by date, building each note only when the cursor reaches it"""
+        conditions, parameters = [], []
+        if broker is not None:
+            conditions.append("n.broker = ?")
+            parameters.append(broker)
+        if start is not None:
+            conditions.append("n.reference_date >= ?")
+            parameters.append(start.isoformat())
+        if end is not None:
+            conditions.append("n.reference_date <= ?")
+            parameters.append(end.isoformat())
+        query = SELECT_BROKERAGE_NOTES
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        query += " ORDER BY n.reference_date, n.id, t.position"
+
+        cursor = self.connection.execute(query, parameters)
+        brokerage_note: Optional[BrokerageNote] = None
+        brokerage_note_id = None
+        while rows := cursor.fetchmany(self.batch_size):
+            for row in rows:
+                if row[0] != brokerage_note_id:
+                    if brokerage_note is not None:
+                        yield brokerage_note
+                    brokerage_note_id, brokerage_note = row[0], self.__build_brokerage_note(row)
+                if row[3 + len(FEE_COLUMNS)] is not None:
+                    brokerage_note.transactions.append(self.__build_transaction(row))  # type: ignore[union-attr]
+        if brokerage_note is not None:
+            yield brokerage_note
+
+    def get_brokerage_note(self, reference_id: int, reference_date: date, broker: str = "") -> Optional[BrokerageNote]:
+        query = f"{SELECT_BROKERAGE_NOTES} WHERE n.broker = ? AND n.reference_id = ? AND n.reference_date = ?"
+        query += " ORDER BY t.position"
+        rows = self.connection.execute(query, (broker, reference_id, reference_date.isoformat())).fetchall()
+        if not rows:
+            return None
+        brokerage_note = self.__build_brokerage_note(rows[0])
+        if rows[0][3 + len(FEE_COLUMNS)] is not None:
+            brokerage_note.transactions = [self.__build_transaction(row) for row in rows]
+        return brokerage_note
+
+    def count_brokerage_notes(self) -> int:
+        return int(self.connection.execute("SELECT COUNT(*) FROM brokerage_notes").fetchone()[0])
+
+    def count_transactions(self) -> int:
+        return int(self.connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0])
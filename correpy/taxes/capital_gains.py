@@ -0,0 +1,652 @@
+"""Monthly capital gains tax of stock exchange operations (Brazilian rules), computed for many clients at once.
+
+Per client and month:
+
+- day trades (same ticker bought and sold on the same day) are separated from swing trades
+- swing trade sells are compared against the average cost of the position (fees included)
+- swing trade gains of stocks are exempt when the stock sales of the month are up to R$ 20.000,00; ETFs, BDRs and
+  options have no exemption
+- real estate funds (FII) are taxed at 20% on both swing and day trades, without exemption, and their results are kept
+  apart from the other securities
+- losses are carried forward and offset the next gains of the same kind (swing trade, day trade or real estate fund)
+- the IRRF withheld on the notes offsets the tax due, the remainder is used in the next months
+- tax payments below R$ 10,00 are postponed to the next months
+
+Transactions are loaded into columns and computed with NumPy when it is installed, falling back to plain Python
+otherwise. Sequential steps (average cost and carry forwards) walk every position, or every client, at the same
+time: one vectorized step per day traded, or per month, instead of one Python loop per object.
+
+Money is kept in integer centavos (int64 columns with NumPy), so sums are exact and the exemption limit is compared
+without float errors. Shares of a value (the day trade part of a day, the average cost of the amount sold) and taxes
+are rounded half up to the centavo, and values are converted to Decimal only on the results. With NumPy, a value in
+centavos times an amount must fit in an int64.
+"""
+
+import typing
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from enum import IntEnum
+from typing import DefaultDict, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.transaction import get_position_key
+from correpy.domain.enums import SecurityType, TransactionType
+from correpy.domain.fixed_point import (
+    CENTS_SCALE,
+    divide_rounding_half_up,
+    from_scaled_int,
+    round_to_scaled_int,
+    to_scaled_int,
+)
+from correpy.portfolio.ledger import get_brokerage_note_costs, prorate_fees
+
+try:
+    import numpy as np
+    import numpy.typing as npt
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+
+SWING_TRADE_TAX_PERCENTAGE = 15
+DAY_TRADE_TAX_PERCENTAGE = 20
+REAL_ESTATE_FUND_TAX_PERCENTAGE = 20
+SWING_TRADE_SALES_EXEMPTION_LIMIT_IN_CENTS = 2_000_000
+MINIMUM_TAX_PAYMENT_IN_CENTS = 1_000
+
+
+def get_month_key(reference_date: date) -> int:
+    return reference_date.year * 12 + reference_date.month - 1
+
+
+def get_month_from_key(month_key: int) -> date:
+    return date(month_key // 12, month_key % 12 + 1, 1)
+
+
+class TaxCategory(IntEnum):
+    """Securities sharing the same rates, exemption and loss carry forward"""
+
+    STOCK = 0
+    # ETFs, BDRs and options: taxed as stocks, without the exemption
+    COMMON = 1
+    REAL_ESTATE_FUND = 2
+
+
+def get_tax_category(security_type: Optional[SecurityType]) -> TaxCategory:
+    """Securities without a type are taxed as stocks"""
+    if security_type is None or security_type == SecurityType.STOCK:
+        return TaxCategory.STOCK
+    if security_type == SecurityType.REAL_STATE_FUND:
+        return TaxCategory.REAL_ESTATE_FUND
+    return TaxCategory.COMMON
+
+
+@dataclass
+class TransactionColumns:  # pylint:disable=too-many-instance-attributes
+    """Transactions of many clients in columns. Buy values include the fees, sell values are net of them.
+
+    Values are in centavos and amounts must be whole numbers. Security types are kept by ticker, from the first
+    transaction of the ticker having one.
+    """
+
+    clients: List[str] = field(default_factory=list)
+    tickers: List[str] = field(default_factory=list)
+    security_types: List[Optional[SecurityType]] = field(default_factory=list)
+    client_indexes: List[int] = field(default_factory=list)
+    ticker_indexes: List[int] = field(default_factory=list)
+    day_ordinals: List[int] = field(default_factory=list)
+    is_buy: List[bool] = field(default_factory=list)
+    amounts: List[int] = field(default_factory=list)
+    gross_values: List[int] = field(default_factory=list)
+    net_values: List[int] = field(default_factory=list)
+    irrf_client_indexes: List[int] = field(default_factory=list)
+    irrf_month_keys: List[int] = field(default_factory=list)
+    irrf_values: List[int] = field(default_factory=list)
+
+    @classmethod
+    def from_brokerage_notes(
+        cls, brokerage_notes_by_client: Mapping[str, Iterable[BrokerageNote]]
+    ) -> "TransactionColumns":
+        columns = cls()
+        ticker_indexes: Dict[str, int] = {}
+        for client_index, (client_id, brokerage_notes) in enumerate(brokerage_notes_by_client.items()):
+            columns.clients.append(client_id)
+            for brokerage_note in brokerage_notes:
+                columns._add_brokerage_note(
+                    client_index=client_index, brokerage_note=brokerage_note, ticker_indexes=ticker_indexes
+                )
+        return columns
+
+    def __get_ticker_index(
+        self, ticker: str, security_type: Optional[SecurityType], ticker_indexes: Dict[str, int]
+    ) -> int:
+        if (ticker_index := ticker_indexes.get(ticker)) is None:
+            ticker_index = ticker_indexes[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+            self.security_types.append(security_type)
+        elif self.security_types[ticker_index] is None:
+            self.security_types[ticker_index] = security_type
+        return ticker_index
+
+    def _add_brokerage_note(
+        self, *, client_index: int, brokerage_note: BrokerageNote, ticker_indexes: Dict[str, int]
+    ) -> None:
+        day_ordinal = brokerage_note.reference_date.toordinal()
+        fees = prorate_fees(fees=get_brokerage_note_costs(brokerage_note), transactions=brokerage_note.transactions)
+        for transaction, transaction_fees in zip(brokerage_note.transactions, fees):
+            is_buy = transaction.transaction_type == TransactionType.BUY
+            gross_value = transaction.amount * transaction.unit_price
+            self.client_indexes.append(client_index)
+            self.ticker_indexes.append(
+                self.__get_ticker_index(
+                    get_position_key(transaction), transaction.security.security_type, ticker_indexes
+                )
+            )
+            self.day_ordinals.append(day_ordinal)
+            self.is_buy.append(is_buy)
+            self.amounts.append(to_scaled_int(transaction.amount, 1))
+            self.gross_values.append(round_to_scaled_int(gross_value, CENTS_SCALE))
+            self.net_values.append(
+                round_to_scaled_int(
+                    gross_value + transaction_fees if is_buy else gross_value - transaction_fees, CENTS_SCALE
+                )
+            )
+
+        irrf = brokerage_note.irrf or sum(
+            (transaction.source_withheld_taxes for transaction in brokerage_note.transactions), Decimal(0)
+        )
+        if irrf:
+            self.irrf_client_indexes.append(client_index)
+            self.irrf_month_keys.append(get_month_key(brokerage_note.reference_date))
+            self.irrf_values.append(round_to_scaled_int(irrf, CENTS_SCALE))
+
+    def get_ticker_tax_categories(self) -> List[TaxCategory]:
+        return [get_tax_category(security_type) for security_type in self.security_types]
+
+
+@dataclass
+class MonthlyTaxResult:  # pylint:disable=too-many-instance-attributes
+    """Swing and day trade figures exclude the real estate funds, which have their own figures.
+
+    `is_exempt` tells the swing trade gains of stocks were exempt, since the stock sales were under the limit.
+    """
+
+    client_id: str
+    month: date
+    swing_trade_sales: Decimal
+    stock_sales: Decimal
+    swing_trade_result: Decimal
+    day_trade_result: Decimal
+    real_estate_fund_result: Decimal
+    is_exempt: bool
+    swing_trade_tax_base: Decimal
+    day_trade_tax_base: Decimal
+    real_estate_fund_tax_base: Decimal
+    tax_due: Decimal
+    irrf_offset: Decimal
+    tax_payable: Decimal
+    swing_trade_loss_carry_forward: Decimal
+    day_trade_loss_carry_forward: Decimal
+    real_estate_fund_loss_carry_forward: Decimal
+
+
+class MonthlyFigures(NamedTuple):
+    """Figures in centavos by (client index, month key). Swing trade results are split between stocks and the other
+    securities"""
+
+    client_indexes: List[int]
+    month_keys: List[int]
+    swing_trade_sales: List[int]
+    stock_sales: List[int]
+    stock_results: List[int]
+    common_results: List[int]
+    day_trade_results: List[int]
+    real_estate_fund_results: List[int]
+    irrf: List[int]
+
+
+class MonthlyTaxes(NamedTuple):
+    """Results of the monthly step in centavos, in the order of MonthlyFigures"""
+
+    is_exempt: List[bool]
+    swing_trade_tax_bases: List[int]
+    day_trade_tax_bases: List[int]
+    real_estate_fund_tax_bases: List[int]
+    taxes_due: List[int]
+    irrf_offsets: List[int]
+    taxes_payable: List[int]
+    swing_trade_losses: List[int]
+    day_trade_losses: List[int]
+    real_estate_fund_losses: List[int]
+
+
+class DaySplit(NamedTuple):
+    """Trades of a position on a day, split between the day trade and the swing trade amounts"""
+
+    day_trade_result: int
+    bought_amount: int
+    bought_value: int
+    sold_amount: int
+    sales: int
+    sold_value: int
+
+
+def _from_cents(value: int) -> Decimal:
+    return from_scaled_int(value, CENTS_SCALE)
+
+
+def _prorate(value: int, part: int, whole: int) -> int:
+    """Share `part / whole` of a value, rounded half up to the centavo. Zero for an empty whole"""
+    return divide_rounding_half_up(value * part, whole) if whole else 0
+
+
+def _split_day(day: Sequence[int]) -> DaySplit:
+    """From the buy amount, buy value, sell amount, sell gross value and sell net value of the day"""
+    buy_amount, buy_value, sell_amount, sell_gross_value, sell_value = day
+    day_trade_amount = min(buy_amount, sell_amount)
+    day_trade_buy_value = _prorate(buy_value, day_trade_amount, buy_amount)
+    day_trade_sell_value = _prorate(sell_value, day_trade_amount, sell_amount)
+    return DaySplit(
+        day_trade_result=day_trade_sell_value - day_trade_buy_value,
+        bought_amount=buy_amount - day_trade_amount,
+        bought_value=buy_value - day_trade_buy_value,
+        sold_amount=sell_amount - day_trade_amount,
+        sales=sell_gross_value - _prorate(sell_gross_value, day_trade_amount, sell_amount),
+        sold_value=sell_value - day_trade_sell_value,
+    )
+
+
+def _sell_from_position(position: List[int], amount: int) -> int:
+    """Removes up to `amount` from the (amount, cost) position and returns the average cost of what was removed"""
+    held_amount, held_cost = position
+    matched_amount = min(amount, held_amount)
+    cost = _prorate(held_cost, matched_amount, held_amount)
+    position[:] = [held_amount - matched_amount, held_cost - cost]
+    return cost
+
+
+def _add_day_results(month: List[int], tax_category: TaxCategory, day_split: DaySplit, swing_trade_result: int) -> None:
+    """Adds the results of a day to the figures of MonthlyFigures after the month key"""
+    if tax_category == TaxCategory.REAL_ESTATE_FUND:
+        month[5] += swing_trade_result + day_split.day_trade_result
+        return
+    month[0] += day_split.sales
+    month[4] += day_split.day_trade_result
+    if tax_category == TaxCategory.STOCK:
+        month[1] += day_split.sales
+        month[2] += swing_trade_result
+    else:
+        month[3] += swing_trade_result
+
+
+def _offset_loss(result: int, loss: int) -> Tuple[int, int]:
+    """Tax base of a result and the loss left to carry forward"""
+    if result < 0:
+        return 0, loss - result
+    used_loss = min(loss, result)
+    return result - used_loss, loss - used_loss
+
+
+def _compute_tax_due(swing_trade_tax_base: int, day_trade_tax_base: int, real_estate_fund_tax_base: int) -> int:
+    return divide_rounding_half_up(
+        swing_trade_tax_base * SWING_TRADE_TAX_PERCENTAGE
+        + day_trade_tax_base * DAY_TRADE_TAX_PERCENTAGE
+        + real_estate_fund_tax_base * REAL_ESTATE_FUND_TAX_PERCENTAGE,
+        100,
+    )
+
+
+def _compute_tax_bases(*, figures: Sequence[int], state: List[int]) -> Tuple[bool, int, int, int]:
+    """Exemption and tax bases of a month, offsetting the losses of the state"""
+    _, stock_sales, stock_result, common_result, day_trade_result, real_estate_fund_result, _ = figures
+    is_exempt = stock_result > 0 and stock_sales <= SWING_TRADE_SALES_EXEMPTION_LIMIT_IN_CENTS
+    swing_trade_tax_base, state[0] = _offset_loss(common_result + (0 if is_exempt else stock_result), state[0])
+    day_trade_tax_base, state[1] = _offset_loss(day_trade_result, state[1])
+    real_estate_fund_tax_base, state[2] = _offset_loss(real_estate_fund_result, state[2])
+    return is_exempt, swing_trade_tax_base, day_trade_tax_base, real_estate_fund_tax_base
+
+
+def _compute_monthly_tax(*, figures: Sequence[int], state: List[int]) -> Tuple[bool, int, int, int, int, int, int]:
+    """Plain Python version of one month, from the figures of MonthlyFigures after the month key.
+
+    State: swing trade, day trade and real estate fund losses, IRRF credit and postponed tax.
+    """
+    is_exempt, swing_trade_tax_base, day_trade_tax_base, real_estate_fund_tax_base = _compute_tax_bases(
+        figures=figures, state=state
+    )
+    tax_due = _compute_tax_due(swing_trade_tax_base, day_trade_tax_base, real_estate_fund_tax_base)
+    irrf_available = state[3] + figures[-1]
+    irrf_offset = min(irrf_available, tax_due)
+    tax_payable = tax_due - irrf_offset + state[4]
+    state[3] = irrf_available - irrf_offset
+    state[4] = tax_payable if tax_payable < MINIMUM_TAX_PAYMENT_IN_CENTS else 0
+    return (
+        is_exempt,
+        swing_trade_tax_base,
+        day_trade_tax_base,
+        real_estate_fund_tax_base,
+        tax_due,
+        irrf_offset,
+        tax_payable - state[4],
+    )
+
+
+class CapitalGainsTaxEngine:
+    """Computes the monthly tax figures of every client. Swing trade sells beyond the position are taken at zero
+    cost, since short selling is not tracked.
+    """
+
+    def __init__(self, use_numpy: Optional[bool] = None) -> None:
+        self.use_numpy = HAS_NUMPY if use_numpy is None else use_numpy
+        if self.use_numpy and not HAS_NUMPY:
+            raise ImportError("NumPy is not installed")
+
+    def compute(self, brokerage_notes_by_client: Mapping[str, Iterable[BrokerageNote]]) -> List[MonthlyTaxResult]:
+        return self.compute_columns(TransactionColumns.from_brokerage_notes(brokerage_notes_by_client))
+
+    def compute_columns(self, columns: TransactionColumns) -> List[MonthlyTaxResult]:
+        if self.use_numpy:
+            figures, taxes = _compute_with_numpy(columns)
+        else:
+            figures, taxes = _PythonTaxComputation(columns).compute()
+
+        return [
+            MonthlyTaxResult(
+                client_id=columns.clients[figures.client_indexes[index]],
+                month=get_month_from_key(figures.month_keys[index]),
+                swing_trade_sales=_from_cents(figures.swing_trade_sales[index]),
+                stock_sales=_from_cents(figures.stock_sales[index]),
+                swing_trade_result=_from_cents(figures.stock_results[index] + figures.common_results[index]),
+                day_trade_result=_from_cents(figures.day_trade_results[index]),
+                real_estate_fund_result=_from_cents(figures.real_estate_fund_results[index]),
+                is_exempt=bool(taxes.is_exempt[index]),
+                swing_trade_tax_base=_from_cents(taxes.swing_trade_tax_bases[index]),
+                day_trade_tax_base=_from_cents(taxes.day_trade_tax_bases[index]),
+                real_estate_fund_tax_base=_from_cents(taxes.real_estate_fund_tax_bases[index]),
+                tax_due=_from_cents(taxes.taxes_due[index]),
+                irrf_offset=_from_cents(taxes.irrf_offsets[index]),
+                tax_payable=_from_cents(taxes.taxes_payable[index]),
+                swing_trade_loss_carry_forward=_from_cents(taxes.swing_trade_losses[index]),
+                day_trade_loss_carry_forward=_from_cents(taxes.day_trade_losses[index]),
+                real_estate_fund_loss_carry_forward=_from_cents(taxes.real_estate_fund_losses[index]),
+            )
+            for index in range(len(figures.client_indexes))
+        ]
+
+
+class _PythonTaxComputation:
+    def __init__(self, columns: TransactionColumns) -> None:
+        self.columns = columns
+
+    def __aggregate_days(self) -> Dict[Tuple[int, int, int], List[int]]:
+        """Buy amount, buy value, sell amount, sell gross value and sell net value by (client, ticker, day)"""
+        days: DefaultDict[Tuple[int, int, int], List[int]] = defaultdict(lambda: [0] * 5)
+        columns = self.columns
+        for index, is_buy in enumerate(columns.is_buy):
+            day = days[(columns.client_indexes[index], columns.ticker_indexes[index], columns.day_ordinals[index])]
+            if is_buy:
+                day[0] += columns.amounts[index]
+                day[1] += columns.net_values[index]
+            else:
+                day[2] += columns.amounts[index]
+                day[3] += columns.gross_values[index]
+                day[4] += columns.net_values[index]
+        return days
+
+    def __aggregate_months(self) -> Dict[Tuple[int, int], List[int]]:
+        """Figures of MonthlyFigures after the month key, by (client, month)"""
+        months: DefaultDict[Tuple[int, int], List[int]] = defaultdict(lambda: [0] * 7)
+        positions: DefaultDict[Tuple[int, int], List[int]] = defaultdict(lambda: [0, 0])
+        tax_categories = self.columns.get_ticker_tax_categories()
+        for (client_index, ticker_index, day_ordinal), day in sorted(self.__aggregate_days().items()):
+            day_split = _split_day(day)
+            position = positions[(client_index, ticker_index)]
+            swing_trade_result = day_split.sold_value - _sell_from_position(position, day_split.sold_amount)
+            position[0] += day_split.bought_amount
+            position[1] += day_split.bought_value
+            _add_day_results(
+                months[(client_index, get_month_key(date.fromordinal(day_ordinal)))],
+                tax_categories[ticker_index],
+                day_split,
+                swing_trade_result,
+            )
+        for client_index, month_key, irrf in zip(
+            self.columns.irrf_client_indexes, self.columns.irrf_month_keys, self.columns.irrf_values
+        ):
+            months[(client_index, month_key)][6] += irrf
+        return months
+
+    def compute(self) -> Tuple[MonthlyFigures, MonthlyTaxes]:
+        monthly_figures = MonthlyFigures([], [], [], [], [], [], [], [], [])
+        monthly_taxes = MonthlyTaxes([], [], [], [], [], [], [], [], [], [])
+        states: DefaultDict[int, List[int]] = defaultdict(lambda: [0] * 5)
+        for (client_index, month_key), figures in sorted(self.__aggregate_months().items()):
+            for figures_column, value in zip(monthly_figures, (client_index, month_key, *figures)):
+                figures_column.append(value)
+            state = states[client_index]
+            month_taxes = _compute_monthly_tax(figures=figures, state=state)
+            for taxes_column, value in zip(monthly_taxes, (*month_taxes, *state[:3])):
+                typing.cast(List[int], taxes_column).append(value)
+        return monthly_figures, monthly_taxes
+
+
+if HAS_NUMPY:
+    IntArray = npt.NDArray[np.int64]
+    BoolArray = npt.NDArray[np.bool_]
+
+    def _group_starts(*keys: IntArray) -> IntArray:
+        """Start index of each run of equal keys, for arrays already sorted by the keys"""
+        changed = np.zeros(len(keys[0]), dtype=bool)
+        if len(changed):
+            changed[0] = True
+        for key in keys:
+            changed[1:] |= key[1:] != key[:-1]
+        return typing.cast(IntArray, np.flatnonzero(changed))
+
+    def _iter_steps(group_starts: IntArray, size: int) -> Iterable[Tuple[IntArray, IntArray]]:
+        """Yields, for the k-th row of every group at once, the row indexes and their group indexes"""
+        group_indexes = np.repeat(np.arange(len(group_starts)), np.diff(np.append(group_starts, size)))
+        positions_in_group = np.arange(size) - group_starts[group_indexes]
+        order = np.argsort(positions_in_group, kind="stable")
+        step_starts = _group_starts(positions_in_group[order])
+        for rows in np.split(order, step_starts[1:]):
+            yield rows, group_indexes[rows]
+
+    def _divide_rounding_half_up(dividends: IntArray, divisors: Union[IntArray, int]) -> IntArray:
+        """As divide_rounding_half_up, for positive divisors"""
+        quotients = (2 * np.abs(dividends) + divisors) // (2 * np.asarray(divisors))
+        return typing.cast(IntArray, np.where(dividends < 0, -quotients, quotients))
+
+    def _prorate_values(values: IntArray, parts: IntArray, wholes: IntArray) -> IntArray:
+        """As _prorate"""
+        return typing.cast(
+            IntArray, np.where(wholes > 0, _divide_rounding_half_up(values * parts, np.maximum(wholes, 1)), 0)
+        )
+
+    def _offset_losses(results: IntArray, losses: IntArray) -> Tuple[IntArray, IntArray]:
+        """Tax bases of the results and the losses left to carry forward, as _offset_loss"""
+        gains = np.maximum(results, 0)
+        used_losses = np.minimum(losses, gains)
+        return gains - used_losses, losses + np.maximum(-results, 0) - used_losses
+
+    def _split_days(days: List[IntArray]) -> List[IntArray]:
+        """As _split_day for every aggregated day, in the order of DaySplit"""
+        buy_amounts, buy_values, sell_amounts, sell_gross_values, sell_values = days
+        day_trade_amounts = np.minimum(buy_amounts, sell_amounts)
+        day_trade_buy_values = _prorate_values(buy_values, day_trade_amounts, buy_amounts)
+        day_trade_sell_values = _prorate_values(sell_values, day_trade_amounts, sell_amounts)
+        return [
+            day_trade_sell_values - day_trade_buy_values,
+            buy_amounts - day_trade_amounts,
+            buy_values - day_trade_buy_values,
+            sell_amounts - day_trade_amounts,
+            sell_gross_values - _prorate_values(sell_gross_values, day_trade_amounts, sell_amounts),
+            sell_values - day_trade_sell_values,
+        ]
+
+    def _sell_from_positions(
+        position_starts: IntArray, bought_amounts: IntArray, bought_values: IntArray, sold_amounts: IntArray
+    ) -> IntArray:
+        """As _sell_from_position for the days of every position, walking one day of every position at a time"""
+        costs = np.zeros(len(sold_amounts), dtype=np.int64)
+        position_amounts = np.zeros(len(position_starts), dtype=np.int64)
+        position_costs = np.zeros(len(position_starts), dtype=np.int64)
+        for rows, positions in _iter_steps(position_starts, len(sold_amounts)):
+            held_amounts = position_amounts[positions]
+            matched_amounts = np.minimum(sold_amounts[rows], held_amounts)
+            costs[rows] = _prorate_values(position_costs[positions], matched_amounts, held_amounts)
+            position_amounts[positions] = held_amounts - matched_amounts + bought_amounts[rows]
+            position_costs[positions] += bought_values[rows] - costs[rows]
+        return costs
+
+    def _get_month_keys(day_ordinals: IntArray) -> IntArray:
+        epoch_day = np.int64(date(1970, 1, 1).toordinal())
+        months_since_epoch = (day_ordinals - epoch_day).astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+        return typing.cast(IntArray, months_since_epoch + get_month_key(date(1970, 1, 1)))
+
+    def _split_by_tax_category(
+        tax_categories: IntArray, sales: IntArray, swing_trade_results: IntArray, day_trade_results: IntArray
+    ) -> List[IntArray]:
+        """As _add_day_results, for every day"""
+        is_stock = tax_categories == TaxCategory.STOCK
+        is_common = tax_categories == TaxCategory.COMMON
+        is_real_estate_fund = tax_categories == TaxCategory.REAL_ESTATE_FUND
+        return [
+            np.where(is_real_estate_fund, 0, sales),
+            np.where(is_stock, sales, 0),
+            np.where(is_stock, swing_trade_results, 0),
+            np.where(is_common, swing_trade_results, 0),
+            np.where(is_real_estate_fund, 0, day_trade_results),
+            np.where(is_real_estate_fund, swing_trade_results + day_trade_results, 0),
+        ]
+
+    def _pay_taxes(
+        taxes_due: IntArray, irrf_available: IntArray, postponed_taxes: IntArray
+    ) -> Tuple[IntArray, IntArray, IntArray]:
+        """IRRF offsets, taxes payable and taxes postponed to the next month, as _compute_monthly_tax"""
+        irrf_offsets = np.minimum(irrf_available, taxes_due)
+        month_payable = taxes_due - irrf_offsets + postponed_taxes
+        is_postponed: BoolArray = month_payable < MINIMUM_TAX_PAYMENT_IN_CENTS
+        return irrf_offsets, np.where(is_postponed, 0, month_payable), np.where(is_postponed, month_payable, 0)
+
+    def _compute_client_months(
+        client_starts: IntArray, results: IntArray, irrf: IntArray
+    ) -> Tuple[IntArray, IntArray, IntArray]:
+        """Walks one month of every client at a time, from the taxed swing trade, day trade and real estate fund
+        results of every month (rows of `results`).
+
+        Returns the tax bases and the losses carried forward, in the order of the results, and the tax due, IRRF
+        offset and tax payable of every month.
+        """
+        size = results.shape[1]
+        tax_bases = np.zeros((3, size), dtype=np.int64)
+        losses_by_month = np.zeros((3, size), dtype=np.int64)
+        taxes = np.zeros((3, size), dtype=np.int64)
+        losses = np.zeros((3, len(client_starts)), dtype=np.int64)
+        irrf_credits = np.zeros(len(client_starts), dtype=np.int64)
+        postponed_taxes = np.zeros(len(client_starts), dtype=np.int64)
+        for rows, client_rows in _iter_steps(client_starts, size):
+            tax_bases[:, rows], losses[:, client_rows] = _offset_losses(results[:, rows], losses[:, client_rows])
+            taxes[0, rows] = _divide_rounding_half_up(
+                tax_bases[0, rows] * SWING_TRADE_TAX_PERCENTAGE
+                + tax_bases[1, rows] * DAY_TRADE_TAX_PERCENTAGE
+                + tax_bases[2, rows] * REAL_ESTATE_FUND_TAX_PERCENTAGE,
+                100,
+            )
+            irrf_available = irrf_credits[client_rows] + irrf[rows]
+            taxes[1, rows], taxes[2, rows], postponed_taxes[client_rows] = _pay_taxes(
+                taxes[0, rows], irrf_available, postponed_taxes[client_rows]
+            )
+            irrf_credits[client_rows] = irrf_available - taxes[1, rows]
+            losses_by_month[:, rows] = losses[:, client_rows]
+        return tax_bases, losses_by_month, taxes
+
+    def _compute_monthly_taxes(clients: IntArray, figures: List[IntArray]) -> MonthlyTaxes:
+        """As _compute_monthly_tax, for the figures of MonthlyFigures after the month key of every month"""
+        _, stock_sales, stock_results, common_results, day_trade_results, fund_results, irrf = figures
+        exempt = (stock_results > 0) & (stock_sales <= SWING_TRADE_SALES_EXEMPTION_LIMIT_IN_CENTS)
+        tax_bases, losses, taxes = _compute_client_months(
+            _group_starts(clients),
+            np.stack((common_results + np.where(exempt, 0, stock_results), day_trade_results, fund_results)),
+            irrf,
+        )
+        return MonthlyTaxes(exempt.tolist(), *tax_bases.tolist(), *taxes.tolist(), *losses.tolist())
+
+    class _NumpyTaxComputation:
+        def __init__(self, columns: TransactionColumns) -> None:
+            self.columns = columns
+
+        def __aggregate_days(self) -> Tuple[IntArray, IntArray, IntArray, List[IntArray]]:
+            clients = np.asarray(self.columns.client_indexes, dtype=np.int64)
+            tickers = np.asarray(self.columns.ticker_indexes, dtype=np.int64)
+            days = np.asarray(self.columns.day_ordinals, dtype=np.int64)
+            is_buy = np.asarray(self.columns.is_buy, dtype=bool)
+            amounts = np.asarray(self.columns.amounts, dtype=np.int64)
+            gross_values = np.asarray(self.columns.gross_values, dtype=np.int64)
+            net_values = np.asarray(self.columns.net_values, dtype=np.int64)
+
+            order = np.lexsort((days, tickers, clients))
+            clients, tickers, days = clients[order], tickers[order], days[order]
+            is_buy, is_sell = is_buy[order], ~is_buy[order]
+            starts = _group_starts(clients, tickers, days)
+            aggregated = [
+                np.add.reduceat(values[order] * mask, starts) if len(starts) else np.zeros(0, dtype=np.int64)
+                for values, mask in (
+                    (amounts, is_buy),
+                    (net_values, is_buy),
+                    (amounts, is_sell),
+                    (gross_values, is_sell),
+                    (net_values, is_sell),
+                )
+            ]
+            return clients[starts], tickers[starts], days[starts], aggregated
+
+        def __compute_daily_results(self) -> Tuple[IntArray, IntArray, List[IntArray]]:
+            """Clients, month keys and the figures of MonthlyFigures after the month key, of every day"""
+            clients, tickers, days, aggregated = self.__aggregate_days()
+            day_trade_results, bought_amounts, bought_values, sold_amounts, sales, sold_values = _split_days(aggregated)
+            costs = _sell_from_positions(_group_starts(clients, tickers), bought_amounts, bought_values, sold_amounts)
+            tax_categories = np.asarray(self.columns.get_ticker_tax_categories(), dtype=np.int64)
+            return (
+                clients,
+                _get_month_keys(days),
+                _split_by_tax_category(tax_categories[tickers], sales, sold_values - costs, day_trade_results),
+            )
+
+        def __aggregate_months(self) -> Tuple[IntArray, IntArray, List[IntArray]]:
+            """Monthly figures of MonthlyFigures after the month key"""
+            clients, month_keys, daily_values = self.__compute_daily_results()
+            irrf_count = len(self.columns.irrf_values)
+            clients = np.concatenate((clients, np.asarray(self.columns.irrf_client_indexes, dtype=np.int64)))
+            month_keys = np.concatenate((month_keys, np.asarray(self.columns.irrf_month_keys, dtype=np.int64)))
+            values = [np.concatenate((column, np.zeros(irrf_count, dtype=np.int64))) for column in daily_values]
+            values.append(
+                np.concatenate(
+                    (np.zeros(len(daily_values[0]), dtype=np.int64), np.asarray(self.columns.irrf_values, np.int64))
+                )
+            )
+            order = np.lexsort((month_keys, clients))
+            clients, month_keys = clients[order], month_keys[order]
+            starts = _group_starts(clients, month_keys)
+            aggregated = [
+                np.add.reduceat(column[order], starts) if len(starts) else np.zeros(0, dtype=np.int64)
+                for column in values
+            ]
+            return clients[starts], month_keys[starts], aggregated
+
+        def compute(self) -> Tuple[MonthlyFigures, MonthlyTaxes]:
+            clients, month_keys, figures = self.__aggregate_months()
+            monthly_figures = MonthlyFigures(
+                clients.tolist(), month_keys.tolist(), *(column.tolist() for column in figures)
+            )
+            return monthly_figures, _compute_monthly_taxes(clients, figures)
+
+    def _compute_with_numpy(columns: TransactionColumns) -> Tuple[MonthlyFigures, MonthlyTaxes]:
+        return _NumpyTaxComputation(columns).compute()
+
+else:  # pragma: no cover
+
+    def _compute_with_numpy(columns: TransactionColumns) -> Tuple[MonthlyFigures, MonthlyTaxes]:
+        raise ImportError("NumPy is not installed")
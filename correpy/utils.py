@@ -1,11 +1,24 @@
+import math
+import os
 import re
+import typing
 from datetime import date, datetime
 from decimal import Decimal
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Union
 
 NUMBER_STRUCTURE_REGEX = r"(?<![\d(\.|,)])(?:0,\d{2}|[1-9]\d{0,2}(?:\.\d{3})*,\d{2}|[1-9]\d{0,2})(?![\d(\.|,)])"
 AMOUNT_STRUCTURE_REGEX = r"(?<![\d.,])(?:0|[1-9]\d{0,2}(?:\.\d{3})*|\d+)(?![\d.,])"
 DATE_STRUCTURE_REGEX = r"[\d]{1,2}/[\d]{1,2}/[\d]{4}"
 ID_STRUCTURE_REGEX = r"^\D*(\d+)"
+CNPJ_STRUCTURE_REGEX = r"\d{2}\.\d{3}\.\d{3}/\d{4}-\d{2}"
+
+if TYPE_CHECKING:
+    PathOrFile = Union[str, os.PathLike[str]]
+else:
+    # os.PathLike is only subscriptable from Python 3.9
+    PathOrFile = Union[str, os.PathLike]
+
+JsonValue = Union[None, bool, int, float, str, typing.List["JsonValue"], Dict[str, "JsonValue"]]
 
 
 def extract_value_from_line(*, line: str) -> Decimal:
@@ -30,3 +43,24 @@ def extract_date_from_line(*, line: str) -> date:
 def extract_id_from_line(*, line: str) -> int:
     """Extraction of the note id (number)"""
     return int(re.search(ID_STRUCTURE_REGEX, line).group(1))
+
+
+def extract_cnpj_from_line(*, line: str) -> Optional[str]:
+    if cnpj := re.search(CNPJ_STRUCTURE_REGEX, line):
+        return cnpj[0]
+    return None
+
+
+def parse_date(value: str) -> date:
+    """Date written in ISO format or as dd/mm/yyyy"""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, "%d/%m/%Y").date()
+
+
+def get_percentile(sorted_values: Sequence[float], percentile: float) -> float:
+    """Nearest-rank percentile, 0 when there are no values"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(math.ceil(percentile * len(sorted_values)) - 1, 0)]
@@ -0,0 +1,77 @@
+import argparse
+import logging
+from typing import List
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.pipeline.brokerage_notes import build_brokerage_note_pipeline
+from correpy.pipeline.extraction_cache import ExtractionCache
+from correpy.storage.sqlite_repository import SQLiteNoteRepository
+from correpy.watch.folder_watcher import (
+    DEFAULT_POLL_INTERVAL_IN_SECONDS,
+    DEFAULT_SETTLE_SECONDS,
+    BrokerageNoteSink,
+    FolderWatcher,
+    JsonLinesSink,
+    WatchState,
+)
+
+
+def build_repository_sink(repository: SQLiteNoteRepository) -> BrokerageNoteSink:
+    def save_brokerage_notes(_source: str, brokerage_notes: List[BrokerageNote]) -> None:
+        repository.save_brokerage_notes(brokerage_notes)
+
+    return save_brokerage_notes
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(
+        prog="python -m correpy.watch", description="Parses the notes dropped into directories as they arrive"
+    )
+    argument_parser.add_argument("directories", nargs="+", help="Directories to watch, subdirectories included")
+    sink_arguments = argument_parser.add_mutually_exclusive_group(required=True)
+    sink_arguments.add_argument("--jsonl", help="Appends the parsed notes to this JSON lines file")
+    sink_arguments.add_argument("--sqlite", help="Saves the parsed notes in this SQLite database")
+    argument_parser.add_argument("--state", required=True, help="JSON file with the files already processed")
+    argument_parser.add_argument("--password", help="Password of the documents")
+    argument_parser.add_argument(
+        "--suffixes", nargs="+", default=[".pdf"], help="Extensions of the watched files, e.g. .pdf .zip .eml"
+    )
+    argument_parser.add_argument(
+        "--settle-seconds", type=float, default=DEFAULT_SETTLE_SECONDS, help="Time a file must stay unchanged"
+    )
+    argument_parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL_IN_SECONDS)
+    argument_parser.add_argument("--polling", action="store_true", help="Polls instead of using inotify")
+    argument_parser.add_argument("--workers", type=int, default=1, help="Extraction processes")
+    argument_parser.add_argument("--extraction-cache", help="Directory of the extraction cache")
+    arguments = argument_parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    pipeline = build_brokerage_note_pipeline(
+        extraction_workers=arguments.workers,
+        extraction_in_processes=arguments.workers > 1,
+        extraction_cache=ExtractionCache(arguments.extraction_cache) if arguments.extraction_cache else None,
+    )
+    repository = SQLiteNoteRepository(path=arguments.sqlite) if arguments.sqlite else None
+    sink = build_repository_sink(repository) if repository is not None else JsonLinesSink(arguments.jsonl)
+    watcher = FolderWatcher(
+        directories=arguments.directories,
+        sink=sink,
+        state=WatchState(arguments.state),
+        password=arguments.password,
+        pipeline=pipeline,
+        suffixes=arguments.suffixes,
+        settle_seconds=arguments.settle_seconds,
+        poll_interval_in_seconds=arguments.poll_interval,
+        use_inotify=False if arguments.polling else None,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if repository is not None:
+            repository.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Detection of the files changed under the watched directories.
+
+`wait` blocks until something may have changed and returns the changed paths, or None when the caller must scan the
+directories again. inotify only reports changes made by the local kernel, so directories shared over the network
+(NFS, SMB) must be polled.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Final, List, Optional, Protocol, Sequence, Set
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+INOTIFY_EVENT_STRUCT = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+# Returned by `wait` when the changed paths are unknown
+SCAN_DIRECTORIES: Final = None
+
+
+class ChangeDetector(Protocol):
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        """Changed paths, or SCAN_DIRECTORIES when the directories must be scanned again"""
+        ...
+
+    def close(self) -> None:
+        """Releases the resources of the detector"""
+        ...
+
+
+class PollingChangeDetector:
+    """Never knows what changed: every wait is followed by a scan, which only stats the files"""
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        time.sleep(timeout)
+        return SCAN_DIRECTORIES
+
+    def close(self) -> None:
+        pass
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    if not sys.platform.startswith("linux"):
+        return None
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class InotifyChangeDetector:
+    """Watches the directories and their subdirectories, including the ones created later, with inotify"""
+
+    def __init__(self, directories: Sequence[str]) -> None:
+        libc = _load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.__libc = libc
+        self.__file_descriptor = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.__file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.__directories_by_watch: Dict[int, str] = {}
+        try:
+            for directory in directories:
+                self.__add_watches(directory)
+        except BaseException:
+            self.close()
+            raise
+
+    def __add_watches(self, directory: str) -> None:
+        for current_directory, _, _ in os.walk(directory):
+            watch = self.__libc.inotify_add_watch(self.__file_descriptor, os.fsencode(current_directory), WATCH_MASK)
+            if watch < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {current_directory}")
+            self.__directories_by_watch[watch] = current_directory
+
+    def wait(self, timeout: float) -> Optional[Set[str]]:
+        readable, _, _ = select.select([self.__file_descriptor], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            events = os.read(self.__file_descriptor, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changed_paths: Set[str] = set()
+        offset = 0
+        while offset < len(events):
+            watch, mask, _, name_size = INOTIFY_EVENT_STRUCT.unpack_from(events, offset)
+            offset += INOTIFY_EVENT_STRUCT.size
+            name = os.fsdecode(events[offset : offset + name_size].rstrip(b"\0"))
+            offset += name_size
+            if mask & IN_Q_OVERFLOW:
+                return SCAN_DIRECTORIES
+            if mask & IN_IGNORED:
+                self.__directories_by_watch.pop(watch, None)
+                continue
+            if (directory := self.__directories_by_watch.get(watch)) is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                # Files may be written into a new directory before its watch exists, so it is scanned once
+                if mask & (IN_CREATE | IN_MOVED_TO) and os.path.isdir(path):
+                    self.__add_watches(path)
+                    changed_paths.update(_list_files(path))
+                continue
+            changed_paths.add(path)
+        return changed_paths
+
+    def close(self) -> None:
+        if self.__file_descriptor >= 0:
+            os.close(self.__file_descriptor)
+            self.__file_descriptor = -1
+
+
+def _list_files(directory: str) -> List[str]:
+    return [
+        os.path.join(current_directory, file_name)
+        for current_directory, _, file_names in os.walk(directory)
+        for file_name in file_names
+    ]
+
+
+def build_change_detector(directories: Sequence[str], use_inotify: Optional[bool] = None) -> ChangeDetector:
+    """inotify when available, unless `use_inotify` is False. With True it is required."""
+    if use_inotify is False:
+        return PollingChangeDetector()
+    try:
+        return InotifyChangeDetector(directories)
+    except OSError:
+        if use_inotify:
+            raise
+        return PollingChangeDetector()
@@ -0,0 +1,2 @@
+class InvalidWatchStateException(Exception):
+    pass
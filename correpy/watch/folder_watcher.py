@@ -0,0 +1,268 @@
+"""Watch mode: parses the documents dropped into directories as soon as they are completely written.
+
+A file is ready once its size and modification time stayed the same for `settle_seconds`, so files still being
+copied are not parsed half written. The state file keeps the signature (size and modification time) of every
+processed file, so restarts and rescans skip them without reading or hashing their content, and a file written
+again is parsed again.
+"""
+
+import json
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.parsers.brokerage_notes.parallel_parser import BrokerageNoteSource
+from correpy.parsers.password_resolver import Password
+from correpy.pipeline.brokerage_notes import build_brokerage_note_pipeline, parse_brokerage_notes
+from correpy.pipeline.document_sources import iter_brokerage_note_sources
+from correpy.pipeline.exceptions import InvalidDocumentArchiveException
+from correpy.pipeline.merge_index import get_source_label
+from correpy.pipeline.pipeline import Pipeline
+from correpy.pipeline.products import DocumentJob
+from correpy.serialization.json_format import brokerage_note_to_json
+from correpy.watch.change_detectors import ChangeDetector, build_change_detector
+from correpy.watch.exceptions import InvalidWatchStateException
+
+WATCH_STATE_VERSION = 1
+DEFAULT_SUFFIXES = (".pdf",)
+DEFAULT_SETTLE_SECONDS = 1.0
+DEFAULT_POLL_INTERVAL_IN_SECONDS = 1.0
+# Full scans done even with inotify, for the changes it misses (e.g. files written by another host on a share)
+DEFAULT_RESCAN_INTERVAL_IN_SECONDS = 60.0
+
+# Receives the label of each parsed document (its path, or `archive.zip!member.pdf`) and its notes
+BrokerageNoteSink = Callable[[str, List[BrokerageNote]], None]
+
+
+class FileSignature(NamedTuple):
+    size: int
+    modified_at_ns: int
+
+
+def get_file_signature(path: str) -> Optional[FileSignature]:
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return None
+    return FileSignature(size=file_stat.st_size, modified_at_ns=file_stat.st_mtime_ns)
+
+
+@dataclass
+class ProcessedFile:
+    size: int
+    modified_at_ns: int
+    brokerage_notes: int = 0
+    error: Optional[str] = None
+
+    @property
+    def signature(self) -> FileSignature:
+        return FileSignature(size=self.size, modified_at_ns=self.modified_at_ns)
+
+
+class WatchState:
+    """Processed files by path, kept in a JSON file written atomically after each batch.
+
+    Without a path, they are only kept in memory.
+    """
+
+    def __init__(self, path: "Optional[Union[str, os.PathLike[str]]]" = None) -> None:
+        self.path = pathlib.Path(path) if path is not None else None
+        self.processed_files: Dict[str, ProcessedFile] = {}
+        if self.path is not None and self.path.exists():
+            self.__load(self.path)
+
+    def __load(self, path: pathlib.Path) -> None:
+        try:
+            with open(path, encoding="utf-8") as file:
+                content = json.load(file)
+            if content["version"] != WATCH_STATE_VERSION:
+                raise InvalidWatchStateException(f"Unsupported watch state version {content['version']}")
+            self.processed_files = {
+                file_path: ProcessedFile(**processed_file) for file_path, processed_file in content["files"].items()
+            }
+        except (ValueError, KeyError, TypeError) as exc:
+            raise InvalidWatchStateException(f"Watch state {path} is not valid") from exc
+
+    def is_processed(self, path: str, signature: FileSignature) -> bool:
+        processed_file = self.processed_files.get(path)
+        return processed_file is not None and processed_file.signature == signature
+
+    def mark_processed(self, path: str, processed_file: ProcessedFile) -> None:
+        self.processed_files[path] = processed_file
+
+    def forget_missing_files(self, existing_paths: Set[str]) -> None:
+        for path in [path for path in self.processed_files if path not in existing_paths]:
+            del self.processed_files[path]
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+                json.dump(
+                    {
+                        "version": WATCH_STATE_VERSION,
+                        "files": {
+                            path: asdict(processed_file) for path, processed_file in self.processed_files.items()
+                        },
+                    },
+                    file,
+                )
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+
+class JsonLinesSink:
+    """Appends one JSON line per note, with the label of the document it came from"""
+
+    def __init__(self, path: "Union[str, os.PathLike[str]]") -> None:
+        self.path = pathlib.Path(path)
+
+    def __call__(self, source: str, brokerage_notes: List[BrokerageNote]) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            for brokerage_note in brokerage_notes:
+                file.write(json.dumps({"source": source, **brokerage_note_to_json(brokerage_note)}, ensure_ascii=False))
+                file.write("\n")
+
+
+class FolderWatcher:
+    """Parses the new and changed files of the directories (subdirectories included) with a brokerage note pipeline.
+
+    Only files with `suffixes` are watched; adding `.zip`, `.eml` or `.mbox` to them parses the PDFs inside those.
+    A document that fails is logged and recorded with its error in the state, and parsed again only when it changes.
+    """
+
+    def __init__(
+        self,
+        directories: Sequence["Union[str, os.PathLike[str]]"],
+        sink: BrokerageNoteSink,
+        state: Optional[WatchState] = None,
+        password: Optional[Password] = None,
+        pipeline: Optional[Pipeline[DocumentJob, List[BrokerageNote]]] = None,
+        suffixes: Sequence[str] = DEFAULT_SUFFIXES,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        poll_interval_in_seconds: float = DEFAULT_POLL_INTERVAL_IN_SECONDS,
+        rescan_interval_in_seconds: float = DEFAULT_RESCAN_INTERVAL_IN_SECONDS,
+        use_inotify: Optional[bool] = None,
+    ) -> None:
+        self.directories = [os.path.abspath(directory) for directory in directories]
+        self.sink = sink
+        self.state = state or WatchState()
+        self.password = password
+        self.pipeline = pipeline or build_brokerage_note_pipeline()
+        self.suffixes = tuple(suffix.lower() for suffix in suffixes)
+        self.settle_seconds = settle_seconds
+        self.poll_interval_in_seconds = poll_interval_in_seconds
+        self.rescan_interval_in_seconds = rescan_interval_in_seconds
+        self.use_inotify = use_inotify
+        # Files waiting to settle: the last signature seen and since when it did not change
+        self.__pending_files: Dict[str, Tuple[FileSignature, float]] = {}
+
+    def is_watched_file(self, path: str) -> bool:
+        return path.lower().endswith(self.suffixes)
+
+    def scan(self) -> Set[str]:
+        """Watched files under the directories. Files gone from them are forgotten by the state."""
+        paths = {
+            os.path.join(current_directory, file_name)
+            for directory in self.directories
+            for current_directory, _, file_names in os.walk(directory)
+            for file_name in file_names
+            if self.is_watched_file(file_name)
+        }
+        self.state.forget_missing_files(paths)
+        return paths
+
+    def __add_changed_paths(self, paths: Set[str], now: float) -> None:
+        for path in paths:
+            if not self.is_watched_file(path) or (signature := get_file_signature(path)) is None:
+                continue
+            if self.state.is_processed(path, signature):
+                continue
+            pending_file = self.__pending_files.get(path)
+            if pending_file is None or pending_file[0] != signature:
+                self.__pending_files[path] = (signature, now)
+
+    def __pop_ready_files(self, now: float) -> Dict[str, FileSignature]:
+        ready_files = {}
+        for path, (signature, unchanged_since) in list(self.__pending_files.items()):
+            current_signature = get_file_signature(path)
+            if current_signature is None:
+                del self.__pending_files[path]
+            elif current_signature != signature:
+                self.__pending_files[path] = (current_signature, now)
+            elif now - unchanged_since >= self.settle_seconds:
+                ready_files[path] = signature
+                del self.__pending_files[path]
+        return ready_files
+
+    def process_files(self, files: Dict[str, FileSignature]) -> None:
+        """Parses the files in a single pipeline run, then records them in the state"""
+        watched_paths: List[str] = []
+        processed_files = {
+            path: ProcessedFile(size=signature.size, modified_at_ns=signature.modified_at_ns)
+            for path, signature in files.items()
+        }
+
+        def iter_sources() -> Iterator[BrokerageNoteSource]:
+            for path in files:
+                try:
+                    for source in iter_brokerage_note_sources([path]):
+                        # Results are matched to their file by the index of their source
+                        watched_paths.append(path)
+                        yield source
+                except InvalidDocumentArchiveException as exc:
+                    processed_files[path].error = str(exc)
+
+        for result in parse_brokerage_notes(iter_sources(), password=self.password, pipeline=self.pipeline):
+            processed_file = processed_files[watched_paths[result.index]]
+            label = get_source_label(result.item.source, result.index)
+            if result.value is None:
+                processed_file.error = f"{label}: {type(result.error).__name__}: {result.error}"
+                logging.warning("Could not parse %s on stage %s: %r", label, result.failed_stage, result.error)
+                continue
+            self.sink(label, result.value)
+            processed_file.brokerage_notes += len(result.value)
+
+        for path, processed_file in processed_files.items():
+            self.state.mark_processed(path, processed_file)
+        self.state.save()
+
+    def run_once(self, changed_paths: Optional[Set[str]] = None, now: Optional[float] = None) -> List[str]:
+        """Registers the changed paths (all the watched files when None) and processes the files that settled"""
+        now = time.monotonic() if now is None else now
+        self.__add_changed_paths(self.scan() if changed_paths is None else changed_paths, now=now)
+        ready_files = self.__pop_ready_files(now=now)
+        if ready_files:
+            self.process_files(ready_files)
+        return list(ready_files)
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        """Watches until `stop` is set"""
+        stop = stop or threading.Event()
+        change_detector: ChangeDetector = build_change_detector(self.directories, use_inotify=self.use_inotify)
+        try:
+            self.run_once()
+            last_scan_at = time.monotonic()
+            while not stop.is_set():
+                # While files are settling, wake up often enough to process them as soon as they are ready
+                timeout = self.poll_interval_in_seconds
+                if self.__pending_files:
+                    timeout = min(timeout, max(self.settle_seconds / 2, 0.05))
+                changed_paths = change_detector.wait(timeout)
+                if changed_paths is None or time.monotonic() - last_scan_at >= self.rescan_interval_in_seconds:
+                    changed_paths = None
+                    last_scan_at = time.monotonic()
+                self.run_once(changed_paths)
+        finally:
+            change_detector.close()
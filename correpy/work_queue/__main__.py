@@ -0,0 +1,64 @@
+import argparse
+import os
+import pathlib
+from typing import Iterator, List
+
+from correpy.work_queue.job_queue import DEFAULT_LEASE_IN_SECONDS, DEFAULT_MAX_ATTEMPTS, JobQueue, JobStatus
+from correpy.work_queue.worker import run_queue_workers
+
+
+def iter_document_paths(paths: List[str]) -> Iterator[str]:
+    """Absolute paths, so every host finds the documents when the share is mounted at the same place"""
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(
+                str(document.resolve())
+                for document in pathlib.Path(path).rglob("*")
+                if document.suffix.lower() == ".pdf"
+            )
+        else:
+            yield str(pathlib.Path(path).resolve())
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(
+        prog="python -m correpy.work_queue", description="Batch parsing shared by workers of one or many hosts"
+    )
+    subparsers = argument_parser.add_subparsers(dest="command", required=True)
+    enqueue_parser = subparsers.add_parser("enqueue", help="Adds documents, or the PDFs of directories, to the queue")
+    enqueue_parser.add_argument("queue", help="SQLite file of the queue, on the shared filesystem")
+    enqueue_parser.add_argument("paths", nargs="+")
+    work_parser = subparsers.add_parser("work", help="Parses jobs until the queue has no unfinished job")
+    work_parser.add_argument("queue")
+    work_parser.add_argument("--processes", type=int, help="Worker processes, defaults to the number of CPUs")
+    work_parser.add_argument("--password", help="Password of the documents")
+    work_parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_IN_SECONDS, help="Lease of a job, seconds")
+    work_parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    status_parser = subparsers.add_parser("status", help="Jobs by status and the errors of the failed ones")
+    status_parser.add_argument("queue")
+    arguments = argument_parser.parse_args()
+
+    if arguments.command == "enqueue":
+        with JobQueue(arguments.queue) as job_queue:
+            print(f"{job_queue.enqueue(iter_document_paths(arguments.paths))} jobs enqueued")
+    elif arguments.command == "work":
+        for stats in run_queue_workers(
+            arguments.queue,
+            processes=arguments.processes,
+            password=arguments.password,
+            lease_in_seconds=arguments.lease,
+            max_attempts=arguments.max_attempts,
+        ):
+            print(
+                f"{stats.worker_id}: {stats.completed} completed, {stats.failed} failed, {stats.retried} retried, "
+                f"{stats.lost_leases} lost leases"
+            )
+    else:
+        with JobQueue(arguments.queue) as job_queue:
+            print(", ".join(f"{count} {status.value}" for status, count in job_queue.count_jobs().items()))
+            for job_result in job_queue.iter_results(statuses=[JobStatus.FAILED]):
+                print(f"FAILED {job_result.source} after {job_result.attempts} attempts: {job_result.error}")
+
+
+if __name__ == "__main__":
+    main()
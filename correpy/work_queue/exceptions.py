@@ -0,0 +1,2 @@
+class InvalidJobQueueException(Exception):
+    pass
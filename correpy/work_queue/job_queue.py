@@ -0,0 +1,219 @@
+"""Queue of parsing jobs in a SQLite database, shared by worker processes on one or many hosts.
+
+Workers claim jobs with a lease: a claimed job belongs to its worker until the lease expires, and a job whose worker
+crashed is claimed again by another one once its lease is over, up to `max_attempts` claims. Results are written back
+in the wire format of correpy.serialization, errors as text.
+
+Hosts share the database file over a filesystem, so the database uses a rollback journal instead of WAL (which
+needs shared memory) and claims are serialized by SQLite's file locks. The filesystem must honor POSIX locks (e.g.
+NFSv4) and the clocks of the hosts must be synchronized, since leases are wall-clock timestamps.
+"""
+
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.serialization.binary_format import decode_brokerage_notes
+from correpy.work_queue.exceptions import InvalidJobQueueException
+
+JOB_QUEUE_SCHEMA_VERSION = 1
+DEFAULT_LEASE_IN_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+# Waiting for the lock of another worker, which only holds it for a claim or a completion
+DEFAULT_LOCK_TIMEOUT_IN_SECONDS = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    result BLOB,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires_at);
+"""
+
+
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Job:
+    id: int
+    source: str
+    attempts: int
+
+
+@dataclass(frozen=True)
+class JobResult:
+    source: str
+    status: JobStatus
+    attempts: int
+    error: Optional[str] = None
+    result: Optional[bytes] = None
+
+    @property
+    def brokerage_notes(self) -> Optional[List[BrokerageNote]]:
+        return None if self.result is None else decode_brokerage_notes(self.result)
+
+
+def build_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class JobQueue:
+    """Connection of one process to the queue. Each worker process opens its own."""
+
+    def __init__(
+        self,
+        path: str,
+        lease_in_seconds: float = DEFAULT_LEASE_IN_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        lock_timeout_in_seconds: float = DEFAULT_LOCK_TIMEOUT_IN_SECONDS,
+    ) -> None:
+        self.lease_in_seconds = lease_in_seconds
+        self.max_attempts = max_attempts
+        # Transactions are opened explicitly, so claims take the write lock before reading the pending jobs
+        self.connection = sqlite3.connect(path, timeout=lock_timeout_in_seconds, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode = DELETE")
+        schema_version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if schema_version not in (0, JOB_QUEUE_SCHEMA_VERSION):
+            raise InvalidJobQueueException(f"Unsupported job queue schema version {schema_version}")
+        # executescript commits on its own, every statement of the schema is idempotent
+        self.connection.executescript(SCHEMA)
+        self.connection.execute(f"PRAGMA user_version = {JOB_QUEUE_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
+
+    def __transaction(self) -> "_ImmediateTransaction":
+        return _ImmediateTransaction(self.connection)
+
+    def enqueue(self, sources: Iterable[str]) -> int:
+        """Number of jobs added. Sources already in the queue are ignored, whatever their status."""
+        now = time.time()
+        with self.__transaction():
+            cursor = self.connection.executemany(
+                "INSERT OR IGNORE INTO jobs (source, status, updated_at) VALUES (?, ?, ?)",
+                ((source, JobStatus.PENDING.value, now) for source in sources),
+            )
+        return cursor.rowcount
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[Job]:
+        """Leases up to `limit` pending jobs, or running jobs whose lease expired, in the order they were enqueued.
+
+        Expired jobs already claimed `max_attempts` times are failed instead, since they probably crash workers.
+        """
+        now = time.time()
+        claimable_condition = "(status = ? OR (status = ? AND lease_expires_at < ?))"
+        claimable_parameters = (JobStatus.PENDING.value, JobStatus.RUNNING.value, now)
+        with self.__transaction():
+            # Failed before selecting, so they do not take the place of claimable jobs in the limit
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?, "
+                f"error = COALESCE(error, 'Lease expired on every attempt') WHERE {claimable_condition} "
+                "AND attempts >= ?",
+                (JobStatus.FAILED.value, now, *claimable_parameters, self.max_attempts),
+            )
+            jobs = [
+                Job(id=job_id, source=source, attempts=attempts + 1)
+                for job_id, source, attempts in self.connection.execute(
+                    f"SELECT id, source, attempts FROM jobs WHERE {claimable_condition} ORDER BY id LIMIT ?",
+                    (*claimable_parameters, limit),
+                )
+            ]
+            self.connection.executemany(
+                "UPDATE jobs SET status = ?, attempts = ?, lease_owner = ?, lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ?",
+                (
+                    (JobStatus.RUNNING.value, job.attempts, worker_id, now + self.lease_in_seconds, now, job.id)
+                    for job in jobs
+                ),
+            )
+        return jobs
+
+    def renew_leases(self, worker_id: str, jobs: Sequence[Job]) -> int:
+        """Extends the leases still owned by the worker, for documents taking longer than a lease"""
+        now = time.time()
+        with self.__transaction():
+            cursor = self.connection.executemany(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                ((now + self.lease_in_seconds, job.id, JobStatus.RUNNING.value, worker_id) for job in jobs),
+            )
+        return cursor.rowcount
+
+    def complete(self, worker_id: str, job: Job, result: bytes) -> bool:
+        """False when the lease was lost (expired and claimed by another worker), the result is then discarded"""
+        return self.__finish(worker_id, job, status=JobStatus.DONE, result=result, error=None)
+
+    def fail(self, worker_id: str, job: Job, error: str, retry: bool = False) -> bool:
+        """With `retry`, the job goes back to pending while it has attempts left"""
+        status = JobStatus.PENDING if retry and job.attempts < self.max_attempts else JobStatus.FAILED
+        return self.__finish(worker_id, job, status=status, result=None, error=error)
+
+    def __finish(
+        self, worker_id: str, job: Job, status: JobStatus, result: Optional[bytes], error: Optional[str]
+    ) -> bool:
+        with self.__transaction():
+            cursor = self.connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL, "
+                "updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (status.value, result, error, time.time(), job.id, JobStatus.RUNNING.value, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def count_jobs(self) -> Dict[JobStatus, int]:
+        counts = {status: 0 for status in JobStatus}
+        for status, count in self.connection.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[JobStatus(status)] = count
+        return counts
+
+    def has_unfinished_jobs(self) -> bool:
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM jobs WHERE status IN (?, ?) LIMIT 1", (JobStatus.PENDING.value, JobStatus.RUNNING.value)
+            ).fetchone()
+            is not None
+        )
+
+    def iter_results(self, statuses: Sequence[JobStatus] = (JobStatus.DONE, JobStatus.FAILED)) -> Iterator[JobResult]:
+        cursor = self.connection.execute(
+            f"SELECT source, status, attempts, error, result FROM jobs "
+            f"WHERE status IN ({', '.join('?' for _ in statuses)}) ORDER BY id",
+            [status.value for status in statuses],
+        )
+        for source, status, attempts, error, result in cursor:
+            yield JobResult(source=source, status=JobStatus(status), attempts=attempts, error=error, result=result)
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE takes the write lock up front, so two workers never read the same pending jobs"""
+
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self.connection = connection
+
+    def __enter__(self) -> None:
+        self.connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exception_type: Optional[type], *_: object) -> None:
+        self.connection.execute("ROLLBACK" if exception_type is not None else "COMMIT")
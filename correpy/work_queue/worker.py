@@ -0,0 +1,176 @@
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import List, Optional, Set
+
+from correpy.parsers.brokerage_notes.parallel_parser import read_brokerage_note_source
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.serialization.binary_format import encode_brokerage_notes
+from correpy.work_queue.job_queue import (
+    DEFAULT_LEASE_IN_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    Job,
+    JobQueue,
+    build_worker_id,
+)
+
+DEFAULT_IDLE_WAIT_IN_SECONDS = 1.0
+# Errors of the shared filesystem may be transient, parsing errors are not and are failed on the first attempt
+RETRIABLE_EXCEPTIONS = (OSError,)
+
+
+@dataclass
+class WorkerStats:
+    worker_id: str
+    completed: int = 0
+    failed: int = 0
+    retried: int = 0
+    lost_leases: int = 0
+
+
+def parse_job_source(source: str, password: Optional[str], budget: Optional[ParsingBudget]) -> bytes:
+    brokerage_notes = ParserFactory(
+        brokerage_note=read_brokerage_note_source(source), password=password, budget=budget
+    ).parse()
+    return encode_brokerage_notes(brokerage_notes)
+
+
+class QueueWorker:
+    """Claims and parses jobs until the queue has no unfinished job, or forever with `wait_for_jobs`.
+
+    A background thread renews the leases of the claimed jobs every third of a lease, so a slow document is not
+    claimed by another worker while it is still being parsed. Only a crashed worker stops renewing its leases.
+    """
+
+    def __init__(
+        self,
+        queue_path: str,
+        password: Optional[str] = None,
+        budget: Optional[ParsingBudget] = None,
+        worker_id: Optional[str] = None,
+        claim_size: int = 1,
+        lease_in_seconds: float = DEFAULT_LEASE_IN_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        idle_wait_in_seconds: float = DEFAULT_IDLE_WAIT_IN_SECONDS,
+    ) -> None:
+        self.queue_path = queue_path
+        self.password = password
+        self.budget = budget
+        self.worker_id = worker_id or build_worker_id()
+        self.claim_size = claim_size
+        self.lease_in_seconds = lease_in_seconds
+        self.max_attempts = max_attempts
+        self.idle_wait_in_seconds = idle_wait_in_seconds
+        self.stats = WorkerStats(worker_id=self.worker_id)
+        self.__claimed_jobs: Set[Job] = set()
+        self.__claimed_jobs_lock = threading.Lock()
+
+    def __open_queue(self) -> JobQueue:
+        return JobQueue(self.queue_path, lease_in_seconds=self.lease_in_seconds, max_attempts=self.max_attempts)
+
+    def __renew_leases(self, stop: threading.Event) -> None:
+        # SQLite connections can not be shared between threads, so the renewals use their own
+        with self.__open_queue() as job_queue:
+            while not stop.wait(self.lease_in_seconds / 3):
+                with self.__claimed_jobs_lock:
+                    claimed_jobs = list(self.__claimed_jobs)
+                if not claimed_jobs:
+                    continue
+                try:
+                    job_queue.renew_leases(self.worker_id, claimed_jobs)
+                except sqlite3.OperationalError as exc:
+                    # E.g. the lock timeout or an unavailable share, the next renewal tries again before the lease ends
+                    logging.warning("Could not renew the leases of worker %s: %r", self.worker_id, exc)
+
+    def __process(self, job_queue: JobQueue, job: Job) -> None:
+        try:
+            result = parse_job_source(job.source, password=self.password, budget=self.budget)
+        except Exception as exc:  # pylint:disable=broad-except
+            retry = isinstance(exc, RETRIABLE_EXCEPTIONS)
+            finished = job_queue.fail(self.worker_id, job, error=f"{type(exc).__name__}: {exc}", retry=retry)
+            if finished and retry and job.attempts < self.max_attempts:
+                self.stats.retried += 1
+            elif finished:
+                self.stats.failed += 1
+        else:
+            finished = job_queue.complete(self.worker_id, job, result=result)
+            if finished:
+                self.stats.completed += 1
+        if not finished:
+            self.stats.lost_leases += 1
+
+    def run(self, wait_for_jobs: bool = False, stop: Optional[threading.Event] = None) -> WorkerStats:
+        stop = stop or threading.Event()
+        stop_renewals = threading.Event()
+        lease_renewer = threading.Thread(target=self.__renew_leases, args=(stop_renewals,), daemon=True)
+        lease_renewer.start()
+        try:
+            with self.__open_queue() as job_queue:
+                while not stop.is_set():
+                    jobs = job_queue.claim(self.worker_id, limit=self.claim_size)
+                    if not jobs:
+                        # Jobs running elsewhere may still come back when their worker crashed
+                        if not wait_for_jobs and not job_queue.has_unfinished_jobs():
+                            break
+                        stop.wait(self.idle_wait_in_seconds)
+                        continue
+                    with self.__claimed_jobs_lock:
+                        self.__claimed_jobs.update(jobs)
+                    for job in jobs:
+                        self.__process(job_queue, job)
+                        with self.__claimed_jobs_lock:
+                            self.__claimed_jobs.discard(job)
+        finally:
+            stop_renewals.set()
+            lease_renewer.join()
+        return self.stats
+
+
+def _run_queue_worker(
+    _: int,
+    queue_path: str,
+    password: Optional[str],
+    budget: Optional[ParsingBudget],
+    claim_size: int,
+    lease_in_seconds: float,
+    max_attempts: int,
+) -> WorkerStats:
+    return QueueWorker(
+        queue_path=queue_path,
+        password=password,
+        budget=budget,
+        claim_size=claim_size,
+        lease_in_seconds=lease_in_seconds,
+        max_attempts=max_attempts,
+    ).run()
+
+
+def run_queue_workers(
+    queue_path: str,
+    processes: Optional[int] = None,
+    password: Optional[str] = None,
+    budget: Optional[ParsingBudget] = None,
+    claim_size: int = 1,
+    lease_in_seconds: float = DEFAULT_LEASE_IN_SECONDS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> List[WorkerStats]:
+    """Runs one worker per process on this host until the queue has no unfinished job"""
+    processes = processes or os.cpu_count() or 1
+    run_worker = partial(
+        _run_queue_worker,
+        queue_path=queue_path,
+        password=password,
+        budget=budget,
+        claim_size=claim_size,
+        lease_in_seconds=lease_in_seconds,
+        max_attempts=max_attempts,
+    )
+    if processes == 1:
+        return [run_worker(0)]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(run_worker, range(processes)))
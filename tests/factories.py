@@ -1,9 +1,10 @@
 import sys
+from decimal import Decimal
 
 import factory
 from factory.fuzzy import FuzzyChoice
 
-from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.brokerage_note import FEE_FIELD_NAME_BY_FEE_TYPE, BrokerageNote
 from correpy.domain.entities.security import Security
 from correpy.domain.entities.transaction import Transaction
 from correpy.domain.enums import TransactionType
@@ -43,3 +44,25 @@ class BrokerageNoteFactory(factory.Factory):
 
     class Meta:
         model = BrokerageNote
+
+
+NO_FEES = {field_name: Decimal(0) for field_name in FEE_FIELD_NAME_BY_FEE_TYPE.values()}
+
+
+def build_brokerage_note(reference_id, reference_date, transactions, security_type=None, **fees):
+    """Brokerage note with only the given fees, its transactions given as (transaction type, amount, unit price,
+    security name) tuples"""
+    return BrokerageNoteFactory(
+        reference_id=reference_id,
+        reference_date=reference_date,
+        transactions=[
+            TransactionFactory(
+                transaction_type=transaction_type,
+                amount=Decimal(amount),
+                unit_price=Decimal(unit_price),
+                security=SecurityFactory(name=name, security_type=security_type),
+            )
+            for transaction_type, amount, unit_price, name in transactions
+        ],
+        **{**NO_FEES, **{field_name: Decimal(fee) for field_name, fee in fees.items()}},
+    )
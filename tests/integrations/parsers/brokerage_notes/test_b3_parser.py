@@ -8,7 +8,7 @@ from testfixtures import compare
 from correpy.domain.entities.brokerage_note import BrokerageNote
 from correpy.domain.entities.security import Security
 from correpy.domain.entities.transaction import Transaction
-from correpy.domain.enums import TransactionType
+from correpy.domain.enums import SecurityType, TransactionType
 from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
 
 
@@ -39,7 +39,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=54,
                         unit_price=Decimal('24.99'),
                         security=Security(
-                            name='BBSEGURIDADE ON NM'
+                            name='BBSEGURIDADE ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -47,7 +48,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=65,
                         unit_price=Decimal('15.94'),
                         security=Security(
-                            name='BR PARTNERS UNT N2'
+                            name='BR PARTNERS UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -55,7 +57,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=300,
                         unit_price=Decimal('15.85'),
                         security=Security(
-                            name='BR PARTNERS UNT N2'
+                            name='BR PARTNERS UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -63,7 +66,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=40,
                         unit_price=Decimal('32.91'),
                         security=Security(
-                            name='BRASIL ON NM'
+                            name='BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -71,7 +75,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=1,
                         unit_price=Decimal('32.91'),
                         security=Security(
-                            name='BRASIL ON NM'
+                            name='BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -79,7 +84,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=44,
                         unit_price=Decimal('20.90'),
                         security=Security(
-                            name='ENERGIAS BR ON NM'
+                            name='ENERGIAS BR ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -87,7 +93,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=100,
                         unit_price=Decimal('20.86'),
                         security=Security(
-                            name='ENERGIAS BR ON NM'
+                            name='ENERGIAS BR ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -95,7 +102,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=16,
                         unit_price=Decimal('41.65'),
                         security=Security(
-                            name='ENGIE BRASIL ON NM'
+                            name='ENGIE BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -103,7 +111,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=11,
                         unit_price=Decimal('41.65'),
                         security=Security(
-                            name='ENGIE BRASIL ON NM'
+                            name='ENGIE BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -111,7 +120,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=73,
                         unit_price=Decimal('20.80'),
                         security=Security(
-                            name='KLABIN S/A UNT N2'
+                            name='KLABIN S/A UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -119,7 +129,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=83,
                         unit_price=Decimal('26.34'),
                         security=Security(
-                            name='SUL AMERICA UNT N2'
+                            name='SUL AMERICA UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -127,7 +138,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=100,
                         unit_price=Decimal('26.34'),
                         security=Security(
-                            name='SUL AMERICA UNT N2'
+                            name='SUL AMERICA UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -135,7 +147,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=100,
                         unit_price=Decimal('26.34'),
                         security=Security(
-                            name='SUL AMERICA UNT N2'
+                            name='SUL AMERICA UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -143,7 +156,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=100,
                         unit_price=Decimal('24.68'),
                         security=Security(
-                            name='BLAU ON NM'
+                            name='BLAU ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -151,7 +165,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=100,
                         unit_price=Decimal('24.67'),
                         security=Security(
-                            name='BLAU ON NM'
+                            name='BLAU ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -159,7 +174,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=200,
                         unit_price=Decimal('17.29'),
                         security=Security(
-                            name='MOVIDA ON NM'
+                            name='MOVIDA ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -167,7 +183,8 @@ def test_b3_parser_WHEN_called_with_single_page_note_THEN_correctly_parses_broke
                         amount=100,
                         unit_price=Decimal('17.29'),
                         security=Security(
-                            name='MOVIDA ON NM'
+                            name='MOVIDA ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     )
                 ]
@@ -0,0 +1,70 @@
+import io
+import pathlib
+from datetime import date
+from decimal import Decimal
+
+import fitz
+import pytest
+from testfixtures import compare
+
+from correpy.domain.entities.brokerage_note_header import BrokerageNoteHeader
+from correpy.parsers.brokerage_notes.header_scanner import BrokerageNoteHeaderScanner
+from correpy.parsers.exceptions import ParsingBudgetExceededException
+from correpy.parsers.parsing_budget import ParsingBudget
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.parent.resolve()}/fixtures"
+
+
+def test_header_scanner_WHEN_called_THEN_returns_note_identification_and_net_value():
+    with open(f"{fixtures_folder}/b3_one_page.pdf", "rb") as file:
+        content = io.BytesIO(file.read())
+
+    brokerage_note_headers = BrokerageNoteHeaderScanner(brokerage_note=content).scan()
+
+    compare(
+        brokerage_note_headers,
+        [
+            BrokerageNoteHeader(
+                reference_id=4535159,
+                reference_date=date(2022, 5, 2),
+                broker_cnpj="02.332.886/0011-78",
+                net_value=Decimal("-121.06"),
+                page_numbers=[0],
+            )
+        ],
+    )
+
+
+def test_header_scanner_WHEN_note_has_multiple_pages_THEN_returns_one_header_with_all_pages():
+    one_page_document = fitz.open(f"{fixtures_folder}/b3_one_page.pdf")
+    document = fitz.open()
+    for _ in range(2):
+        document.insert_pdf(one_page_document)
+
+    brokerage_note_headers = BrokerageNoteHeaderScanner(brokerage_note=io.BytesIO(document.tobytes())).scan()
+
+    assert len(brokerage_note_headers) == 1
+    assert brokerage_note_headers[0].page_numbers == [0, 1]
+
+
+def test_header_scanner_WHEN_scanned_regions_exceed_words_budget_THEN_raises_budget_exception():
+    with open(f"{fixtures_folder}/b3_one_page.pdf", "rb") as file:
+        content = io.BytesIO(file.read())
+    scanner = BrokerageNoteHeaderScanner(brokerage_note=content, budget=ParsingBudget(max_words_per_page=10))
+
+    with pytest.raises(ParsingBudgetExceededException) as exc_info:
+        scanner.scan()
+
+    assert exc_info.value.budget_name == "max_words_per_page"
+
+
+def test_header_scanner_WHEN_called_THEN_registers_both_regions_of_each_page_as_one_page_read():
+    with open(f"{fixtures_folder}/b3_one_page.pdf", "rb") as file:
+        content = io.BytesIO(file.read())
+    scanner = BrokerageNoteHeaderScanner(brokerage_note=content)
+
+    scanner.scan()
+
+    diagnostics = scanner.fitz_parser.budget_tracker.diagnostics
+    assert diagnostics.pages_read == 1
+    assert 0 < diagnostics.words_read == sum(diagnostics.words_per_page)
@@ -0,0 +1,40 @@
+import io
+import pathlib
+
+import fitz
+from testfixtures import compare
+
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.parallel_parser import ParallelParser, split_page_ranges
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.parent.resolve()}/fixtures"
+
+
+def build_multiple_pages_brokerage_note(pages):
+    """Every page repeats the same note, so every page range holds a part of it"""
+    one_page_document = fitz.open(f"{fixtures_folder}/b3_one_page.pdf")
+    document = fitz.open()
+    for _ in range(pages):
+        document.insert_pdf(one_page_document)
+    return io.BytesIO(document.tobytes())
+
+
+def test_split_page_ranges_WHEN_called_THEN_returns_contiguous_ranges_covering_all_pages():
+    assert split_page_ranges(page_count=5, pages_per_range=2) == [range(0, 2), range(2, 4), range(4, 5)]
+
+
+def test_parallel_parser_WHEN_note_spans_multiple_page_ranges_THEN_returns_same_result_as_sequential_parser():
+    content = build_multiple_pages_brokerage_note(pages=3)
+    expected_result = B3Parser(brokerage_note=io.BytesIO(content.getvalue())).parse_brokerage_note()
+
+    brokerage_notes = ParallelParser(brokerage_note=content, max_workers=2, pages_per_range=1).parse()
+
+    compare(brokerage_notes, expected_result)
+    assert len(brokerage_notes[0].transactions) == 17 * 3
+
+
+def test_parallel_parser_WHEN_called_with_file_path_THEN_parses_brokerage_note():
+    brokerage_notes = ParallelParser(brokerage_note=f"{fixtures_folder}/b3_one_page.pdf", max_workers=2).parse()
+
+    assert [brokerage_note.reference_id for brokerage_note in brokerage_notes] == [4535159]
+    assert len(brokerage_notes[0].transactions) == 17
@@ -14,7 +14,9 @@ from testfixtures import compare
 from correpy.domain.entities.brokerage_note import BrokerageNote
 from correpy.domain.entities.security import Security
 from correpy.domain.entities.transaction import Transaction
-from correpy.domain.enums import TransactionType
+from correpy.domain.enums import SecurityType, TransactionType
+from correpy.instruments.name_resolver import NameResolver
+from correpy.instruments.security_classifier import SecurityClassifier
 from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
 
 fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.resolve()}/fixtures"
@@ -45,7 +47,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=54,
                         unit_price=Decimal('24.99'),
                         security=Security(
-                            name='BBSEGURIDADE ON NM'
+                            name='BBSEGURIDADE ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -53,7 +56,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=65,
                         unit_price=Decimal('15.94'),
                         security=Security(
-                            name='BR PARTNERS UNT N2'
+                            name='BR PARTNERS UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -61,7 +65,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=300,
                         unit_price=Decimal('15.85'),
                         security=Security(
-                            name='BR PARTNERS UNT N2'
+                            name='BR PARTNERS UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -69,7 +74,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=40,
                         unit_price=Decimal('32.91'),
                         security=Security(
-                            name='BRASIL ON NM'
+                            name='BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -77,7 +83,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=1,
                         unit_price=Decimal('32.91'),
                         security=Security(
-                            name='BRASIL ON NM'
+                            name='BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -85,7 +92,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=44,
                         unit_price=Decimal('20.90'),
                         security=Security(
-                            name='ENERGIAS BR ON NM'
+                            name='ENERGIAS BR ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -93,7 +101,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=100,
                         unit_price=Decimal('20.86'),
                         security=Security(
-                            name='ENERGIAS BR ON NM'
+                            name='ENERGIAS BR ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -101,7 +110,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=16,
                         unit_price=Decimal('41.65'),
                         security=Security(
-                            name='ENGIE BRASIL ON NM'
+                            name='ENGIE BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -109,7 +119,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=11,
                         unit_price=Decimal('41.65'),
                         security=Security(
-                            name='ENGIE BRASIL ON NM'
+                            name='ENGIE BRASIL ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -117,7 +128,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=73,
                         unit_price=Decimal('20.80'),
                         security=Security(
-                            name='KLABIN S/A UNT N2'
+                            name='KLABIN S/A UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -125,7 +137,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=83,
                         unit_price=Decimal('26.34'),
                         security=Security(
-                            name='SUL AMERICA UNT N2'
+                            name='SUL AMERICA UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -133,7 +146,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=100,
                         unit_price=Decimal('26.34'),
                         security=Security(
-                            name='SUL AMERICA UNT N2'
+                            name='SUL AMERICA UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -141,7 +155,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=100,
                         unit_price=Decimal('26.34'),
                         security=Security(
-                            name='SUL AMERICA UNT N2'
+                            name='SUL AMERICA UNT N2',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -149,7 +164,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=100,
                         unit_price=Decimal('24.68'),
                         security=Security(
-                            name='BLAU ON NM'
+                            name='BLAU ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -157,7 +173,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=100,
                         unit_price=Decimal('24.67'),
                         security=Security(
-                            name='BLAU ON NM'
+                            name='BLAU ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -165,7 +182,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=200,
                         unit_price=Decimal('17.29'),
                         security=Security(
-                            name='MOVIDA ON NM'
+                            name='MOVIDA ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     ),
                     Transaction(
@@ -173,7 +191,8 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
                         amount=100,
                         unit_price=Decimal('17.29'),
                         security=Security(
-                            name='MOVIDA ON NM'
+                            name='MOVIDA ON NM',
+                            security_type=SecurityType.STOCK
                         )
                     )
                 ]
@@ -184,3 +203,17 @@ def test_parser_factory_WHEN_called_with_brokerage_note_not_from_nu_invest_THEN_
         brokerage_notes = factory.parse()
 
         compare(brokerage_notes, expected_result)
+
+
+def test_parser_factory_WHEN_called_with_security_classifier_THEN_classifies_securities_with_it():
+    name_resolver = NameResolver(
+        [("BB SEGURIDADE PARTICIPACOES S.A. ON NM", "BBSE3"), ("BR ADVISORY PARTNERS S.A. UNT N2", "BRBI11")]
+    )
+    with open(f"{fixtures_folder}/b3_one_page.pdf", "rb") as f:
+        content = io.BytesIO(f.read())
+
+    brokerage_notes = ParserFactory(
+        brokerage_note=content, security_classifier=SecurityClassifier(name_resolver=name_resolver)
+    ).parse()
+
+    assert [transaction.security.ticker for transaction in brokerage_notes[0].transactions[:2]] == ["BBSE3", "BRBI11"]
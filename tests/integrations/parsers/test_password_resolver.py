@@ -0,0 +1,36 @@
+import io
+import pathlib
+
+import fitz
+import pytest
+
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.exceptions import InvalidPasswordException
+from correpy.parsers.password_resolver import PasswordMemory, PasswordResolver
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.resolve()}/fixtures"
+
+
+def build_encrypted_brokerage_note(password):
+    document = fitz.open(f"{fixtures_folder}/b3_one_page.pdf")
+    content = io.BytesIO(document.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw=password, owner_pw="owner"))
+    content.seek(0)
+    return content
+
+
+def test_parser_factory_WHEN_called_with_password_resolver_THEN_parses_with_first_valid_candidate():
+    memory = PasswordMemory()
+    resolver = PasswordResolver(candidates=["111", "222", "048"], client_id="0600655", memory=memory)
+
+    brokerage_notes = ParserFactory(brokerage_note=build_encrypted_brokerage_note("048"), password=resolver).parse()
+
+    assert [brokerage_note.reference_id for brokerage_note in brokerage_notes] == [4535159]
+    assert len(brokerage_notes[0].transactions) == 17
+    assert memory.get_passwords(client_id="0600655") == ["048"]
+
+
+def test_parser_factory_WHEN_called_with_password_resolver_without_valid_candidate_THEN_raises_invalid_password():
+    resolver = PasswordResolver(candidates=["111"], memory=PasswordMemory())
+
+    with pytest.raises(InvalidPasswordException):
+        ParserFactory(brokerage_note=build_encrypted_brokerage_note("048"), password=resolver).parse()
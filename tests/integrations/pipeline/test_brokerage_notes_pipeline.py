@@ -0,0 +1,118 @@
+import io
+import pathlib
+import zipfile
+
+import fitz
+from testfixtures import compare
+
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.exceptions import InvalidPasswordException
+from correpy.pipeline.brokerage_notes import build_brokerage_note_pipeline, parse_brokerage_notes
+from correpy.pipeline.document_sources import iter_brokerage_note_sources
+from correpy.pipeline.extraction_cache import ExtractionCache
+from correpy.pipeline.merge_index import BrokerageNoteMergeIndex, MergeOutcome
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.resolve()}/fixtures"
+brokerage_note_path = f"{fixtures_folder}/b3_one_page.pdf"
+
+
+def build_multiple_pages_brokerage_note(pages):
+    one_page_document = fitz.open(brokerage_note_path)
+    document = fitz.open()
+    for _ in range(pages):
+        document.insert_pdf(one_page_document)
+    return document.tobytes()
+
+
+def test_parse_brokerage_notes_WHEN_called_THEN_returns_same_result_as_parser_factory():
+    sources = [brokerage_note_path, build_multiple_pages_brokerage_note(pages=3)] * 3
+    expected_result = [ParserFactory(brokerage_note=io.BytesIO(open(brokerage_note_path, "rb").read())).parse()]
+    expected_result.append(ParserFactory(brokerage_note=io.BytesIO(sources[1])).parse())
+
+    results = list(parse_brokerage_notes(sources, ordered=True))
+
+    compare([result.value for result in results], expected_result * 3)
+
+
+def test_parse_brokerage_notes_WHEN_extraction_runs_in_processes_THEN_returns_same_result_as_parser_factory():
+    pipeline = build_brokerage_note_pipeline(extraction_workers=2, extraction_in_processes=True, parsing_workers=2)
+    expected_result = ParserFactory(brokerage_note=io.BytesIO(open(brokerage_note_path, "rb").read())).parse()
+
+    results = list(parse_brokerage_notes([brokerage_note_path] * 4, pipeline=pipeline))
+
+    compare([result.value for result in results], [expected_result] * 4)
+    assert [stats.processed for stats in pipeline.stats] == [4, 4, 4, 4]
+
+
+def test_parse_brokerage_notes_WHEN_password_is_invalid_THEN_returns_error_of_extraction_stage():
+    document = fitz.open(brokerage_note_path)
+    encrypted = document.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw="048", owner_pw="owner")
+
+    results = list(parse_brokerage_notes([encrypted], password="111"))
+
+    assert isinstance(results[0].error, InvalidPasswordException)
+    assert results[0].failed_stage == "extraction"
+
+
+def test_parse_brokerage_notes_WHEN_merge_index_is_given_THEN_same_notes_are_parsed_and_returned_once():
+    merge_index = BrokerageNoteMergeIndex()
+    # Saved again, so the file differs from the original but holds the same note
+    resent_brokerage_note = build_multiple_pages_brokerage_note(pages=1)
+    expected_result = ParserFactory(brokerage_note=io.BytesIO(open(brokerage_note_path, "rb").read())).parse()
+
+    results = list(
+        parse_brokerage_notes(
+            [brokerage_note_path, brokerage_note_path, resent_brokerage_note],
+            ordered=True,
+            merge_index=merge_index,
+        )
+    )
+
+    compare([result.value for result in results], [expected_result, []])
+    assert merge_index.stats.skipped_sources == 1
+    assert merge_index.stats.outcomes[MergeOutcome.DUPLICATE] == 1
+    assert merge_index.brokerage_notes == expected_result
+
+
+def test_parse_brokerage_notes_WHEN_extraction_cache_is_given_THEN_documents_are_replayed_with_same_result(tmp_path):
+    extraction_cache = ExtractionCache(tmp_path)
+    pipeline = build_brokerage_note_pipeline(extraction_cache=extraction_cache)
+    sources = [brokerage_note_path, build_multiple_pages_brokerage_note(pages=3)]
+    expected_result = [result.value for result in parse_brokerage_notes(sources, ordered=True)]
+
+    first_results = list(parse_brokerage_notes(sources, pipeline=pipeline, ordered=True))
+    second_results = list(parse_brokerage_notes(sources, pipeline=pipeline, ordered=True))
+
+    compare([result.value for result in first_results], expected_result)
+    compare([result.value for result in second_results], expected_result)
+    assert (extraction_cache.stats.hits, extraction_cache.stats.misses) == (2, 2)
+
+
+def test_parse_brokerage_notes_WHEN_document_is_encrypted_THEN_extraction_cache_checks_password_every_time(tmp_path):
+    extraction_cache = ExtractionCache(tmp_path)
+    pipeline = build_brokerage_note_pipeline(extraction_cache=extraction_cache)
+    document = fitz.open(brokerage_note_path)
+    encrypted = document.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw="048", owner_pw="owner")
+
+    valid_results = list(parse_brokerage_notes([encrypted], password="048", pipeline=pipeline))
+    invalid_results = list(parse_brokerage_notes([encrypted], password="111", pipeline=pipeline))
+
+    assert valid_results[0].error is None
+    assert isinstance(invalid_results[0].error, InvalidPasswordException)
+    assert (extraction_cache.stats.hits, extraction_cache.stats.misses) == (0, 2)
+
+
+def test_parse_brokerage_notes_WHEN_sources_come_from_zip_in_processes_THEN_returns_same_result_as_parser_factory(
+    tmp_path,
+):
+    archive_path = tmp_path / "notas.zip"
+    with zipfile.ZipFile(archive_path, "w") as zip_file:
+        for index in range(4):
+            zip_file.write(brokerage_note_path, arcname=f"{index}.pdf")
+    pipeline = build_brokerage_note_pipeline(extraction_workers=2, extraction_in_processes=True, parsing_workers=2)
+    expected_result = ParserFactory(brokerage_note=io.BytesIO(open(brokerage_note_path, "rb").read())).parse()
+
+    results = list(parse_brokerage_notes(iter_brokerage_note_sources([archive_path]), pipeline=pipeline, ordered=True))
+
+    compare([result.value for result in results], [expected_result] * 4)
+    assert [result.item.source.name for result in results] == [f"{archive_path}!{index}.pdf" for index in range(4)]
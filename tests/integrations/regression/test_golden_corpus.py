@@ -0,0 +1,56 @@
+import json
+import pathlib
+import shutil
+
+from correpy.regression.golden_corpus import GoldenCorpusRunner
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.resolve()}/fixtures"
+brokerage_note_path = f"{fixtures_folder}/b3_one_page.pdf"
+
+
+def build_corpus(corpus_path):
+    for relative_path in ("2022/05/a.pdf", "2022/05/b.pdf", "c.pdf"):
+        (corpus_path / relative_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy(brokerage_note_path, corpus_path / relative_path)
+
+
+def test_run_WHEN_golden_outputs_were_updated_THEN_passes(tmp_path):
+    build_corpus(tmp_path / "corpus")
+    runner = GoldenCorpusRunner(corpus_path=tmp_path / "corpus", golden_path=tmp_path / "golden", max_workers=2)
+
+    runner.run(update_golden_outputs=True)
+    report = runner.run(baseline={"B3Parser": 0.001})
+
+    assert report.passed
+    assert report.documents == 3
+    assert report.stats_by_parser["B3Parser"].documents == 3
+    assert (tmp_path / "golden" / "2022" / "05" / "a.pdf.json").exists()
+
+
+def test_run_WHEN_golden_output_differs_or_is_missing_THEN_reports_mismatch(tmp_path):
+    build_corpus(tmp_path / "corpus")
+    runner = GoldenCorpusRunner(corpus_path=tmp_path / "corpus", golden_path=tmp_path / "golden", max_workers=1)
+    runner.run(update_golden_outputs=True)
+    golden_output_path = tmp_path / "golden" / "c.pdf.json"
+    golden_output = json.loads(golden_output_path.read_text())
+    golden_output[0]["transactions"][0]["unit_price"] = "1.00"
+    golden_output_path.write_text(json.dumps(golden_output))
+    (tmp_path / "golden" / "2022" / "05" / "b.pdf.json").unlink()
+
+    report = runner.run()
+
+    assert not report.passed
+    assert [(mismatch.field_path, mismatch.expected) for mismatch in report.mismatches] == [
+        ("[0].transactions[0].unit_price", "1.00")
+    ]
+    assert report.missing_golden_outputs == [str(tmp_path / "corpus" / "2022" / "05" / "b.pdf")]
+
+
+def test_run_WHEN_throughput_is_below_baseline_THEN_reports_regression(tmp_path):
+    build_corpus(tmp_path / "corpus")
+    runner = GoldenCorpusRunner(corpus_path=tmp_path / "corpus", golden_path=tmp_path / "golden", max_workers=1)
+
+    report = runner.run(baseline={"B3Parser": 1_000_000.0}, update_golden_outputs=True)
+
+    assert [regression.parser_name for regression in report.regressions] == ["B3Parser"]
+    assert not report.passed
@@ -0,0 +1,120 @@
+import io
+import os
+import pathlib
+import stat
+
+import fitz
+import pytest
+from testfixtures import compare
+
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.exceptions import InvalidPasswordException, ParsingBudgetExceededException
+from correpy.parsers.parsing_budget import ParsingBudget
+from correpy.parsers.password_resolver import PasswordMemory, PasswordResolver
+from correpy.server.client import ParsingClient, RemoteParserFactory
+from correpy.server.daemon import ParsingServer
+from correpy.server.exceptions import InsecureServerAddressException, InvalidMessageException
+from correpy.server.protocol import PARSE_COMMAND, create_connection, receive_message, send_message
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.resolve()}/fixtures"
+brokerage_note_path = f"{fixtures_folder}/b3_one_page.pdf"
+
+
+@pytest.fixture(scope="module")
+def parsing_server(tmp_path_factory):
+    with ParsingServer(address=str(tmp_path_factory.mktemp("server") / "correpy.sock"), max_workers=1) as server:
+        yield server
+
+
+def read_brokerage_note():
+    with open(brokerage_note_path, "rb") as file:
+        return io.BytesIO(file.read())
+
+
+def test_remote_parser_factory_WHEN_called_THEN_returns_same_result_as_parser_factory(parsing_server):
+    expected_result = ParserFactory(brokerage_note=read_brokerage_note()).parse()
+
+    with ParsingClient(address=parsing_server.address) as client:
+        from_bytes = RemoteParserFactory(brokerage_note=read_brokerage_note(), client=client).parse()
+        from_path = RemoteParserFactory(brokerage_note=brokerage_note_path, client=client).parse()
+
+    compare(from_bytes, expected_result)
+    compare(from_path, expected_result)
+
+
+def test_parsing_client_WHEN_password_resolver_is_given_THEN_remembers_the_password_used_by_the_server(
+    parsing_server,
+):
+    document = fitz.open(brokerage_note_path)
+    content = io.BytesIO(document.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, user_pw="048", owner_pw="owner"))
+    memory = PasswordMemory()
+    resolver = PasswordResolver(candidates=["111", "048"], client_id="0600655", memory=memory)
+
+    with ParsingClient(address=parsing_server.address) as client:
+        brokerage_notes = client.parse(content, password=resolver)
+        with pytest.raises(InvalidPasswordException):
+            client.parse(content, password="111")
+
+    assert [brokerage_note.reference_id for brokerage_note in brokerage_notes] == [4535159]
+    assert memory.get_passwords(client_id="0600655") == ["048"]
+
+
+def test_parsing_client_WHEN_budget_is_exceeded_THEN_raises_budget_exception_with_diagnostics(parsing_server):
+    with ParsingClient(address=parsing_server.address) as client:
+        with pytest.raises(ParsingBudgetExceededException) as exc_info:
+            client.parse(read_brokerage_note(), budget=ParsingBudget(max_words_per_page=10))
+
+    assert exc_info.value.budget_name == "max_words_per_page"
+    assert exc_info.value.diagnostics.pages_in_document == 1
+
+
+def test_parsing_client_WHEN_get_stats_is_called_THEN_returns_server_counters(parsing_server):
+    with ParsingClient(address=parsing_server.address) as client:
+        client.parse(read_brokerage_note())
+        stats = client.get_stats()
+
+    assert stats.workers == 1
+    assert stats.queue_depth == 0
+    assert stats.processed >= 1
+    assert stats.latency_p95_in_seconds >= stats.latency_p50_in_seconds > 0
+
+
+def test_parsing_server_WHEN_tcp_host_is_not_loopback_THEN_raises_insecure_address_exception():
+    with pytest.raises(InsecureServerAddressException):
+        ParsingServer(address=("0.0.0.0", 0), max_workers=1)
+
+
+def test_parsing_server_WHEN_listening_on_tcp_THEN_refuses_paths_and_client_sends_their_bytes():
+    expected_result = ParserFactory(brokerage_note=read_brokerage_note()).parse()
+
+    with ParsingServer(address=("127.0.0.1", 0), max_workers=1) as server:
+        with create_connection(server.address) as connection:
+            send_message(connection, {"command": PARSE_COMMAND, "path": brokerage_note_path})
+            response_header, _ = receive_message(connection)
+        with ParsingClient(address=server.address) as client:
+            from_path = RemoteParserFactory(brokerage_note=brokerage_note_path, client=client).parse()
+
+    assert response_header["error"]["exception"] == InvalidMessageException.__name__
+    compare(from_path, expected_result)
+
+
+def test_parsing_server_WHEN_listening_on_unix_socket_THEN_only_its_user_can_connect(parsing_server):
+    assert stat.S_IMODE(os.stat(parsing_server.address).st_mode) == 0o600
+
+
+def test_parsing_server_WHEN_path_is_outside_allowed_roots_THEN_refuses_it(tmp_path):
+    socket_path = str(tmp_path / "correpy.sock")
+    escaping_path = f"{fixtures_folder}/../../../{pathlib.Path(brokerage_note_path).name}"
+
+    with ParsingServer(address=socket_path, max_workers=1, allowed_path_roots=[fixtures_folder]) as server:
+        with create_connection(server.address) as connection:
+            send_message(connection, {"command": PARSE_COMMAND, "path": "/etc/passwd"})
+            outside_header, _ = receive_message(connection)
+            send_message(connection, {"command": PARSE_COMMAND, "path": escaping_path})
+            escaping_header, _ = receive_message(connection)
+        with ParsingClient(address=server.address) as client:
+            inside_result = RemoteParserFactory(brokerage_note=brokerage_note_path, client=client).parse()
+
+    assert outside_header["error"]["exception"] == InvalidMessageException.__name__
+    assert escaping_header["error"]["exception"] == InvalidMessageException.__name__
+    assert [brokerage_note.reference_id for brokerage_note in inside_result] == [4535159]
@@ -0,0 +1,55 @@
+import pathlib
+import shutil
+import threading
+import time
+
+import pytest
+
+from correpy.watch.change_detectors import InotifyChangeDetector
+from correpy.watch.folder_watcher import FolderWatcher, WatchState
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.resolve()}/fixtures"
+brokerage_note_path = f"{fixtures_folder}/b3_one_page.pdf"
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_folder_watcher_WHEN_document_is_dropped_THEN_notes_reach_the_sink_within_seconds(tmp_path, use_inotify):
+    if use_inotify:
+        try:
+            InotifyChangeDetector([str(tmp_path)]).close()
+        except OSError:
+            pytest.skip("inotify is not available")
+    directory = tmp_path / "notas"
+    directory.mkdir()
+    parsed = threading.Event()
+    sink_calls = []
+
+    def sink(source, brokerage_notes):
+        sink_calls.append((source, brokerage_notes))
+        parsed.set()
+
+    watcher = FolderWatcher(
+        directories=[directory],
+        sink=sink,
+        state=WatchState(tmp_path / "state.json"),
+        settle_seconds=0.2,
+        poll_interval_in_seconds=0.1,
+        use_inotify=use_inotify,
+    )
+    stop = threading.Event()
+    thread = threading.Thread(target=watcher.run, args=(stop,))
+    thread.start()
+    try:
+        time.sleep(0.2)
+        dropped_at = time.monotonic()
+        shutil.copy(brokerage_note_path, directory / "nota.pdf")
+
+        assert parsed.wait(timeout=10)
+        assert time.monotonic() - dropped_at < 5
+    finally:
+        stop.set()
+        thread.join()
+
+    assert sink_calls[0][0] == str(directory / "nota.pdf")
+    assert sink_calls[0][1][0].reference_id == 4535159
+    assert len(sink_calls[0][1][0].transactions) == 17
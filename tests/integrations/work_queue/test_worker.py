@@ -0,0 +1,67 @@
+import io
+import pathlib
+import shutil
+import sqlite3
+import threading
+from unittest import mock
+
+from testfixtures import compare
+
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.work_queue.job_queue import JobQueue, JobStatus
+from correpy.work_queue.worker import QueueWorker, run_queue_workers
+
+fixtures_folder = f"{pathlib.Path(__file__).parent.parent.parent.resolve()}/fixtures"
+brokerage_note_path = f"{fixtures_folder}/b3_one_page.pdf"
+
+
+def test_run_queue_workers_WHEN_several_processes_share_the_queue_THEN_every_job_is_parsed_once(tmp_path):
+    sources = []
+    for index in range(8):
+        shutil.copy(brokerage_note_path, tmp_path / f"{index}.pdf")
+        sources.append(str(tmp_path / f"{index}.pdf"))
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+    sources.append(str(tmp_path / "broken.pdf"))
+    queue_path = str(tmp_path / "queue.sqlite")
+    with JobQueue(queue_path) as job_queue:
+        job_queue.enqueue(sources)
+    expected_result = ParserFactory(brokerage_note=io.BytesIO(open(brokerage_note_path, "rb").read())).parse()
+
+    worker_stats = run_queue_workers(queue_path, processes=3)
+
+    assert len({stats.worker_id for stats in worker_stats}) == 3
+    assert sum(stats.completed for stats in worker_stats) == 8
+    assert sum(stats.failed for stats in worker_stats) == 1
+    with JobQueue(queue_path) as job_queue:
+        job_results = list(job_queue.iter_results())
+    assert [job_result.status for job_result in job_results] == [JobStatus.DONE] * 8 + [JobStatus.FAILED]
+    assert job_results[-1].attempts == 1
+    for job_result in job_results[:-1]:
+        compare(job_result.brokerage_notes, expected_result)
+
+
+def test_queue_worker_WHEN_lease_renewal_fails_THEN_keeps_renewing_the_leases(tmp_path):
+    queue_path = str(tmp_path / "queue.sqlite")
+    with JobQueue(queue_path) as job_queue:
+        job_queue.enqueue([brokerage_note_path])
+    renewals = []
+    renewed_after_failure = threading.Event()
+
+    def renew_leases(_, worker_id, jobs):
+        renewals.append(worker_id)
+        if len(renewals) == 1:
+            raise sqlite3.OperationalError("database is locked")
+        renewed_after_failure.set()
+        return len(jobs)
+
+    def parse_job_source(*_, **__):
+        assert renewed_after_failure.wait(timeout=5)
+        return b""
+
+    with mock.patch.object(JobQueue, "renew_leases", renew_leases), mock.patch(
+        "correpy.work_queue.worker.parse_job_source", parse_job_source
+    ):
+        stats = QueueWorker(queue_path, lease_in_seconds=0.3).run()
+
+    assert len(renewals) >= 2
+    assert stats.completed == 1
@@ -1,9 +1,16 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
 from pytest import mark
 
-from correpy.utils import extract_date_from_line, extract_value_from_line, extract_amount_from_line
+from correpy.utils import (
+    extract_amount_from_line,
+    extract_cnpj_from_line,
+    extract_date_from_line,
+    extract_value_from_line,
+    get_percentile,
+    parse_date,
+)
 
 
 @mark.parametrize(
@@ -56,3 +63,25 @@ def test_extract_date_from_line_when_called_then_returns_date_correctly():
     date_string = " 03/02/2024 "
     expected_result = datetime.strptime("03/02/2024", "%d/%m/%Y").date()
     assert extract_date_from_line(line=date_string) == expected_result
+
+
+@mark.parametrize(
+    "input_string, expected_result",
+    [
+        ("XP INVESTIMENTOS CNPJ: 02.332.886/0011-78", "02.332.886/0011-78"),
+        ("Nr. nota 4535159", None),
+    ],
+)
+def test_extract_cnpj_from_line_when_called_then_returns_cnpj_or_none(input_string, expected_result):
+    assert extract_cnpj_from_line(line=input_string) == expected_result
+
+
+@mark.parametrize("input_string", ["2024-03-15", "15/03/2024"])
+def test_parse_date_when_called_with_iso_or_brazilian_date_then_returns_date(input_string):
+    assert parse_date(input_string) == date(2024, 3, 15)
+
+
+def test_get_percentile_when_called_then_returns_nearest_rank_value():
+    assert get_percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.0
+    assert get_percentile([1.0, 2.0, 3.0, 4.0], 0.95) == 4.0
+    assert get_percentile([], 0.5) == 0.0
@@ -111,3 +111,20 @@ def test_update_fee_from_fee_type_when_called_with_invalid_fee_type_then_raises_
 
     with pytest.raises(InvalidBrokerageNoteFeeTypeException):
         brokerage_note.update_fee_from_fee_type(fee_type="invalid", fee_value=Decimal(20))
+
+
+def test_merge_when_called_then_sums_fees_and_appends_transactions_of_partial_brokerage_note():
+    brokerage_note = BrokerageNoteFactory()
+    partial_brokerage_note = BrokerageNoteFactory(
+        reference_id=brokerage_note.reference_id, reference_date=brokerage_note.reference_date
+    )
+    expected_fees = {
+        fee_type: fee_value + partial_brokerage_note.fees_by_fee_type[fee_type]
+        for fee_type, fee_value in brokerage_note.fees_by_fee_type.items()
+    }
+    expected_transactions = brokerage_note.transactions + partial_brokerage_note.transactions
+
+    brokerage_note.merge(partial_brokerage_note)
+
+    assert brokerage_note.fees_by_fee_type == expected_fees
+    assert brokerage_note.transactions == expected_transactions
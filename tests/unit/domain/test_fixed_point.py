@@ -0,0 +1,94 @@
+import random
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from correpy.domain.entities.security import Security
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+from correpy.domain.exceptions import InvalidFixedPointValueException
+from correpy.domain.fixed_point import (
+    FixedPointBrokerageNote,
+    FixedPointTransaction,
+    from_scaled_int,
+    sum_fees,
+    sum_source_withheld_taxes,
+    sum_volume,
+    to_scaled_int,
+)
+from tests.factories import build_brokerage_note
+
+NOTE_DATE = date(2022, 5, 2)
+
+
+def test_to_scaled_int_when_value_has_more_decimal_places_than_scale_then_raises_exception():
+    assert to_scaled_int(Decimal("24.99"), 100) == 2499
+    assert from_scaled_int(100, 100) == Decimal("1.00")
+    assert str(from_scaled_int(-61005, 1000)) == "-61.005"
+
+    with pytest.raises(InvalidFixedPointValueException):
+        to_scaled_int(Decimal("61.005"), 100)
+
+
+def test_fixed_point_brokerage_note_when_converted_back_then_returns_the_same_brokerage_note():
+    brokerage_note = build_brokerage_note(
+        1,
+        NOTE_DATE,
+        [(TransactionType.SELL, 54, "24.99", "PETR4"), (TransactionType.BUY, 200, "17.295", "PETR4")],
+        emoluments="1.58",
+        settlement_fee="0.35",
+    )
+
+    fixed_point_brokerage_note = FixedPointBrokerageNote.from_brokerage_note(brokerage_note, unit_price_scale=1000)
+
+    assert fixed_point_brokerage_note.fees_by_fee_type[BrokerageNoteFeeType.EMOLUMENTS] == 158
+    assert fixed_point_brokerage_note.transactions[1].unit_price == 17295
+    assert fixed_point_brokerage_note.to_brokerage_note() == brokerage_note
+
+
+def test_fixed_point_transaction_create_when_selling_then_withheld_taxes_match_transaction():
+    randomizer = random.Random(7)
+    for _ in range(5000):
+        amount, unit_price = randomizer.randint(1, 100_000), randomizer.randint(1, 1_000_000)
+        transaction = Transaction(
+            transaction_type=TransactionType.SELL,
+            amount=Decimal(amount),
+            unit_price=from_scaled_int(unit_price, 100),
+            security=Security(name="PETR4"),
+        )
+
+        fixed_point_transaction = FixedPointTransaction.create(
+            transaction_type=TransactionType.SELL, amount=amount, unit_price=unit_price, security=transaction.security
+        )
+
+        assert from_scaled_int(fixed_point_transaction.source_withheld_taxes, 100) == transaction.source_withheld_taxes
+
+
+def test_sum_fees_and_volume_when_called_then_returns_exact_decimal_totals():
+    brokerage_notes = [
+        build_brokerage_note(
+            1, NOTE_DATE, [(TransactionType.SELL, 3, "0.10", "PETR4")], emoluments="0.10", settlement_fee="0.35"
+        ),
+        build_brokerage_note(
+            2, NOTE_DATE, [(TransactionType.BUY, 1, "0.20", "PETR4")], emoluments="0.20", settlement_fee="0.35"
+        ),
+    ]
+    fixed_point_brokerage_notes = [FixedPointBrokerageNote.from_brokerage_note(note) for note in brokerage_notes]
+    transactions = [
+        *(transaction for note in fixed_point_brokerage_notes for transaction in note.transactions),
+        FixedPointTransaction.create(
+            transaction_type=TransactionType.SELL,
+            amount=1000,
+            unit_price=1005,
+            security=Security(name="PETR4"),
+            unit_price_scale=1000,
+        ),
+    ]
+
+    fees = sum_fees(fixed_point_brokerage_notes)
+
+    assert fees[BrokerageNoteFeeType.EMOLUMENTS] == Decimal("0.30")
+    assert fees[BrokerageNoteFeeType.SETTLEMENT_FEE] == Decimal("0.70")
+    assert sum_volume(transactions) == Decimal("1005.50")
+    assert sum_source_withheld_taxes(transactions) == Decimal("0.05")
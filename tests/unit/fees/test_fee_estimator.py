@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from pytest import mark, param
+
+from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+from correpy.fees.fee_estimator import HAS_NUMPY, FeeDeviation, FeeEstimator
+from correpy.fees.fee_schedule import FeeRate, FeeSchedule
+from tests.factories import build_brokerage_note
+
+requires_numpy = mark.skipif(not HAS_NUMPY, reason="NumPy is not installed")
+use_numpy_options = mark.parametrize("use_numpy", [param(True, marks=requires_numpy), False])
+
+FEE_SCHEDULE = FeeSchedule(
+    [
+        FeeRate(BrokerageNoteFeeType.SETTLEMENT_FEE, date(2019, 1, 1), Decimal("0.000275"), Decimal("0.0002")),
+        FeeRate(BrokerageNoteFeeType.SETTLEMENT_FEE, date(2020, 1, 1), Decimal("0.00025"), Decimal("0.00018")),
+        FeeRate(BrokerageNoteFeeType.EMOLUMENTS, date(2020, 1, 1), Decimal("0.00005"), Decimal("0.00005")),
+    ]
+)
+
+BROKERAGE_NOTES = [
+    # Volume of 100000.00 on the 2019 rates, emoluments are not checked before their first rate
+    build_brokerage_note(
+        1, date(2019, 6, 3), [(TransactionType.BUY, 1000, 100, "VALE3")], settlement_fee="27.50", emoluments="3.10"
+    ),
+    # Swing trade volume of 20000.00 and day trade volume of 10000.00 + 11000.00
+    build_brokerage_note(
+        2,
+        date(2020, 6, 1),
+        [
+            (TransactionType.BUY, 1000, 20, "PETR4"),
+            (TransactionType.BUY, 500, 20, "VALE3"),
+            (TransactionType.SELL, 500, 22, "VALE3"),
+        ],
+        settlement_fee="8.78",
+        emoluments="2.05",
+    ),
+    # Wrong settlement fee and emoluments
+    build_brokerage_note(
+        3, date(2020, 6, 2), [(TransactionType.SELL, 100, 100, "VALE3")], settlement_fee="25.00", emoluments="0.60"
+    ),
+]
+
+
+@use_numpy_options
+def test_fee_estimator_when_estimating_then_uses_rates_of_the_date_and_day_trade_rates(use_numpy):
+    fee_estimator = FeeEstimator(FEE_SCHEDULE, use_numpy=use_numpy)
+
+    expected_fees = fee_estimator.estimate_columns(fee_estimator.load_columns(BROKERAGE_NOTES))
+
+    assert expected_fees == {
+        BrokerageNoteFeeType.SETTLEMENT_FEE: [pytest.approx(27.5), pytest.approx(8.78), pytest.approx(2.5)],
+        BrokerageNoteFeeType.EMOLUMENTS: [None, pytest.approx(2.05), pytest.approx(0.5)],
+    }
+
+
+@use_numpy_options
+def test_fee_estimator_when_fees_deviate_more_than_tolerance_then_flags_them(use_numpy):
+    deviations = FeeEstimator(FEE_SCHEDULE, use_numpy=use_numpy).find_deviations(BROKERAGE_NOTES)
+
+    assert deviations == [
+        FeeDeviation(
+            note_index=2,
+            reference_id=3,
+            reference_date=date(2020, 6, 2),
+            fee_type=BrokerageNoteFeeType.SETTLEMENT_FEE,
+            parsed_fee=Decimal("25.00"),
+            expected_fee=Decimal("2.50"),
+        ),
+        FeeDeviation(
+            note_index=2,
+            reference_id=3,
+            reference_date=date(2020, 6, 2),
+            fee_type=BrokerageNoteFeeType.EMOLUMENTS,
+            parsed_fee=Decimal("0.60"),
+            expected_fee=Decimal("0.50"),
+        ),
+    ]
+
+
+@use_numpy_options
+def test_fee_estimator_when_deviation_is_within_tolerance_then_does_not_flag_it(use_numpy):
+    brokerage_notes = [
+        build_brokerage_note(
+            1, date(2020, 6, 2), [(TransactionType.SELL, 100, 100, "VALE3")], settlement_fee="2.51", emoluments="0.50"
+        ),
+        build_brokerage_note(
+            2,
+            date(2020, 6, 2),
+            [(TransactionType.SELL, 10000, 100, "VALE3")],
+            settlement_fee="252.00",
+            emoluments="50.00",
+        ),
+    ]
+
+    assert FeeEstimator(FEE_SCHEDULE, use_numpy=use_numpy).find_deviations(brokerage_notes) == []
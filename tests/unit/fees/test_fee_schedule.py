@@ -0,0 +1,60 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.fees.exceptions import InvalidFeeScheduleException
+from correpy.fees.fee_schedule import FeeRate, FeeSchedule, read_fee_schedule
+
+
+def test_fee_schedule_when_getting_fee_rate_then_uses_the_last_rate_started_on_the_date():
+    fee_schedule = FeeSchedule(
+        [
+            FeeRate(BrokerageNoteFeeType.EMOLUMENTS, date(2020, 1, 1), Decimal("0.00005"), Decimal("0.00005")),
+            FeeRate(BrokerageNoteFeeType.EMOLUMENTS, date(2019, 1, 1), Decimal("0.00004"), Decimal("0.00004")),
+        ]
+    )
+
+    assert fee_schedule.get_fee_rate(BrokerageNoteFeeType.EMOLUMENTS, date(2018, 12, 31)) is None
+    assert fee_schedule.get_fee_rate(BrokerageNoteFeeType.EMOLUMENTS, date(2019, 12, 31)).rate == Decimal("0.00004")
+    assert fee_schedule.get_fee_rate(BrokerageNoteFeeType.EMOLUMENTS, date(2020, 1, 1)).rate == Decimal("0.00005")
+    assert fee_schedule.get_fee_rate(BrokerageNoteFeeType.SETTLEMENT_FEE, date(2020, 1, 1)) is None
+
+
+def test_fee_schedule_when_fee_type_has_two_rates_on_the_same_date_then_raises_invalid_fee_schedule_exception():
+    fee_rate = FeeRate(BrokerageNoteFeeType.EMOLUMENTS, date(2020, 1, 1), Decimal("0.00005"), Decimal("0.00005"))
+
+    with pytest.raises(InvalidFeeScheduleException):
+        FeeSchedule([fee_rate, fee_rate])
+
+
+def test_read_fee_schedule_when_called_then_parses_percentages_and_defaults_day_trade_rate(tmp_path):
+    path = tmp_path / "taxas.csv"
+    path.write_text(
+        "fee_type;start_date;rate;day_trade_rate\n"
+        "SETTLEMENT_FEE;2019-11-01;0,025%;0,018%\n"
+        "EMOLUMENTS;01/11/2019;0.00005;\n",
+        encoding="utf-8",
+    )
+
+    fee_schedule = read_fee_schedule(path)
+
+    assert fee_schedule.get_fee_rates(BrokerageNoteFeeType.SETTLEMENT_FEE) == [
+        FeeRate(BrokerageNoteFeeType.SETTLEMENT_FEE, date(2019, 11, 1), Decimal("0.00025"), Decimal("0.00018"))
+    ]
+    assert fee_schedule.get_fee_rates(BrokerageNoteFeeType.EMOLUMENTS) == [
+        FeeRate(BrokerageNoteFeeType.EMOLUMENTS, date(2019, 11, 1), Decimal("0.00005"), Decimal("0.00005"))
+    ]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["fee_type;rate\nEMOLUMENTS;0.00005\n", "fee_type;start_date;rate\nCORRETAGEM;2019-11-01;0.00005\n"],
+)
+def test_read_fee_schedule_when_file_is_not_valid_then_raises_invalid_fee_schedule_exception(tmp_path, content):
+    path = tmp_path / "taxas.csv"
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(InvalidFeeScheduleException):
+        read_fee_schedule(path)
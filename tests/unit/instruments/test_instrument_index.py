@@ -0,0 +1,83 @@
+import pytest
+
+from correpy.domain.enums import SecurityType
+from correpy.instruments.exceptions import InvalidInstrumentIndexException, InvalidInstrumentListException
+from correpy.instruments.instrument_index import (
+    InstrumentIndex,
+    compile_instrument_index,
+    compile_instrument_index_file,
+    read_instrument_list,
+)
+
+B3_INSTRUMENT_LIST = """Status do Arquivo: Final
+RptDt;TckrSymb;Asst;SgmtNm;SctyCtgyNm;CrpnNm
+2022-05-02;PETR4;PETR;CASH;SHARES;PETROLEO BRASILEIRO S.A. PETROBRAS
+2022-05-02;BTLG11;BTLG;CASH;FUNDS;BTG PACTUAL LOGISTICA FII
+2022-05-02;BOVA11;BOVA;CASH;ETF EQUITIES;ISHARES BOVA
+2022-05-02;AAPL34;AAPL;CASH;BDR;APPLE INC
+2022-05-02;PETRE300;PETR;EQUITY DERIVATE;OPTION ON EQUITIES;PETROLEO BRASILEIRO S.A. PETROBRAS
+2022-05-02;DI1F23;DI1;FINANCIAL;FUTURE;
+"""
+
+
+def test_instrument_index_when_compiled_then_finds_every_ticker():
+    instruments = [(f"TCK{index}", list(SecurityType)[index % len(SecurityType)]) for index in range(1000)]
+
+    index = InstrumentIndex(compile_instrument_index(instruments))
+
+    assert len(index) == 1000
+    assert all(index.get_security_type(ticker) == security_type for ticker, security_type in instruments)
+    assert index.get_security_type("TCK1000") is None
+    assert index.get_security_type("AÇÃO") is None
+
+
+def test_compile_instrument_index_when_ticker_is_repeated_then_last_one_wins():
+    index = InstrumentIndex(compile_instrument_index([("PETR4", SecurityType.OPTION), ("PETR4", SecurityType.STOCK)]))
+
+    assert len(index) == 1
+    assert index.get_security_type("PETR4") == SecurityType.STOCK
+
+
+def test_read_instrument_list_when_called_with_b3_file_then_maps_categories_and_skips_unknown_ones(tmp_path):
+    path = tmp_path / "instruments.csv"
+    path.write_text(B3_INSTRUMENT_LIST, encoding="latin-1")
+
+    assert list(read_instrument_list(path)) == [
+        ("PETR4", SecurityType.STOCK),
+        ("BTLG11", SecurityType.REAL_STATE_FUND),
+        ("BOVA11", SecurityType.ETF),
+        ("AAPL34", SecurityType.BDR),
+        ("PETRE300", SecurityType.OPTION),
+    ]
+
+
+def test_read_instrument_list_when_columns_are_missing_then_raises_invalid_instrument_list_exception(tmp_path):
+    path = tmp_path / "instruments.csv"
+    path.write_text("Ticker;Type\nPETR4;SHARES\n", encoding="latin-1")
+
+    with pytest.raises(InvalidInstrumentListException):
+        list(read_instrument_list(path))
+
+
+def test_compile_instrument_index_file_when_opened_then_returns_memory_mapped_index(tmp_path):
+    instrument_list_path, index_path = tmp_path / "instruments.csv", tmp_path / "instruments.idx"
+    instrument_list_path.write_text(B3_INSTRUMENT_LIST, encoding="latin-1")
+
+    assert compile_instrument_index_file(instrument_list_path, index_path) == 5
+    assert InstrumentIndex.open(index_path).get_security_type("BOVA11") == SecurityType.ETF
+
+
+def test_compile_instrument_index_file_when_index_can_not_be_replaced_then_removes_temporary_file(tmp_path):
+    instrument_list_path, index_path = tmp_path / "instruments.csv", tmp_path / "instruments.idx"
+    instrument_list_path.write_text(B3_INSTRUMENT_LIST, encoding="latin-1")
+    index_path.mkdir()
+
+    with pytest.raises(OSError):
+        compile_instrument_index_file(instrument_list_path, index_path)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["instruments.csv", "instruments.idx"]
+
+
+def test_instrument_index_when_buffer_is_not_an_index_then_raises_invalid_instrument_index_exception():
+    with pytest.raises(InvalidInstrumentIndexException):
+        InstrumentIndex(b"CRPY" + b"\0" * 32)
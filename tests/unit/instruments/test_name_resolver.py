@@ -0,0 +1,101 @@
+import pytest
+
+from correpy.instruments.exceptions import InvalidInstrumentListException
+from correpy.instruments.name_resolver import NameResolver, read_instrument_names, split_security_name
+
+B3_INSTRUMENT_LIST = """Status do Arquivo: Final
+RptDt;TckrSymb;SctyCtgyNm;SpcfctnCd;CrpnNm
+2022-05-02;BBSE3;SHARES;ON NM;BB SEGURIDADE PARTICIPAÇÕES S.A.
+2022-05-02;BRBI11;UNIT;UNT N2;BR ADVISORY PARTNERS PARTICIPACOES S.A.
+2022-05-02;PETR3;SHARES;ON N2;PETROLEO BRASILEIRO S.A. PETROBRAS
+2022-05-02;PETR4;SHARES;PN N2;PETROLEO BRASILEIRO S.A. PETROBRAS
+2022-05-02;PETR4F;SHARES;PN N2;PETROLEO BRASILEIRO S.A. PETROBRAS
+2022-05-02;PETRE300;OPTION ON EQUITIES;PN N2;PETROLEO BRASILEIRO S.A. PETROBRAS
+2022-05-02;PRIO3;SHARES;ON NM;PETRO RIO S.A.
+2022-05-02;MGLU3;SHARES;ON NM;MAGAZINE LUIZA S.A.
+"""
+
+
+@pytest.fixture
+def name_resolver(tmp_path):
+    path = tmp_path / "instruments.csv"
+    path.write_text(B3_INSTRUMENT_LIST, encoding="latin-1")
+    return NameResolver(read_instrument_names(path))
+
+
+@pytest.mark.parametrize(
+    "name, base, share_class",
+    [
+        ("BBSEGURIDADE ON NM", "BBSEGURIDADE", "ON"),
+        ("BR PARTNERS UNT N2", "BRPARTNERS", "UNT"),
+        ("ITAUUNIBANCO PN EJ N1", "ITAUUNIBANCO", "PN"),
+        ("BB SEGURIDADE PARTICIPAÇÕES S.A.", "BBSEGURIDADEPARTICIPACOES", None),
+    ],
+)
+def test_split_security_name_when_called_then_drops_segments_and_events(name, base, share_class):
+    assert split_security_name(name) == (base, share_class)
+
+
+def test_read_instrument_names_when_called_with_b3_file_then_appends_specification_and_skips_other_categories(
+    tmp_path,
+):
+    path = tmp_path / "instruments.csv"
+    path.write_text(B3_INSTRUMENT_LIST, encoding="latin-1")
+
+    instrument_names = list(read_instrument_names(path))
+
+    assert instrument_names[0] == ("BB SEGURIDADE PARTICIPAÇÕES S.A. ON NM", "BBSE3")
+    assert "PETRE300" not in {ticker for _, ticker in instrument_names}
+
+
+def test_read_instrument_names_when_columns_are_missing_then_raises_invalid_instrument_list_exception(tmp_path):
+    path = tmp_path / "instruments.csv"
+    path.write_text("Ticker;Type\nPETR4;SHARES\n", encoding="latin-1")
+
+    with pytest.raises(InvalidInstrumentListException):
+        list(read_instrument_names(path))
+
+
+@pytest.mark.parametrize(
+    "name, ticker",
+    [
+        ("BBSEGURIDADE ON NM", "BBSE3"),
+        ("BR PARTNERS UNT N2", "BRBI11"),
+        ("PETROBRAS ON N2", "PETR3"),
+        ("PETROBRAS PN EDJ N2", "PETR4"),
+        ("PETRORIO ON NM", "PRIO3"),
+        ("MAGAZ LUIZA ON NM", "MGLU3"),
+        ("PETROBRAS UNT N2", None),
+        ("BANCO INTER UNT N2", None),
+        ("", None),
+    ],
+)
+def test_name_resolver_when_name_is_in_notes_format_then_resolves_its_ticker(name_resolver, name, ticker):
+    assert name_resolver.resolve(name) == ticker
+
+
+def test_name_resolver_when_reference_has_the_names_of_the_notes_then_resolves_exactly():
+    name_resolver = NameResolver([("BBSEGURIDADE ON NM", "BBSE3"), ("TAESA", "TAEE11")])
+
+    assert name_resolver.resolve("BBSEGURIDADE ON NM") == "BBSE3"
+    assert name_resolver.resolve("BBSEGURIDADE PN") is None
+    assert name_resolver.resolve("TAESA UNT N2") == "TAEE11"
+
+
+def test_name_resolver_when_share_class_has_tickers_of_same_length_then_is_ambiguous():
+    name_resolver = NameResolver([("ALPHA ON", "ALPH3"), ("ALPHA ON", "ALPA3"), ("ALPHA ON", "ALPH3F")])
+
+    assert name_resolver.resolve("ALPHA ON") is None
+
+
+def test_name_resolver_when_name_scores_the_same_in_two_bases_then_is_not_resolved():
+    name_resolver = NameResolver([("ALPHA BETA ON", "ALPB3"), ("ALPHA ZETA ON", "ALPZ3")])
+
+    assert name_resolver.resolve("ALPHA ON") is None
+
+
+def test_name_resolver_when_name_is_resolved_again_then_uses_cache(name_resolver):
+    for _ in range(3):
+        name_resolver.resolve("BBSEGURIDADE ON NM")
+
+    assert (name_resolver.cache_hits, name_resolver.cache_misses) == (2, 1)
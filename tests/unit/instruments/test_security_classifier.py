@@ -0,0 +1,80 @@
+import pytest
+
+from correpy.domain.entities.security import Security
+from correpy.domain.enums import SecurityType
+from correpy.instruments.instrument_index import InstrumentIndex, compile_instrument_index
+from correpy.instruments.name_resolver import NameResolver
+from correpy.instruments.security_classifier import SecurityClassifier
+
+
+@pytest.fixture
+def indexed_security_classifier():
+    index = InstrumentIndex(
+        compile_instrument_index(
+            [("PETR4", SecurityType.STOCK), ("BOVA11", SecurityType.ETF), ("PETRE300", SecurityType.OPTION)]
+        )
+    )
+    return SecurityClassifier(index=index)
+
+
+@pytest.mark.parametrize(
+    "name, ticker, security_type",
+    [
+        ("BBSEGURIDADE ON NM", None, SecurityType.STOCK),
+        ("BR PARTNERS UNT N2", None, SecurityType.STOCK),
+        ("PETROBRAS PN PETR4 N2", "PETR4", SecurityType.STOCK),
+        ("PETROBRAS PN PETR4F N2", "PETR4F", SecurityType.STOCK),
+        ("GOOGLE DRN GOOG34", "GOOG34", SecurityType.BDR),
+        ("APPLE DRN", None, SecurityType.BDR),
+        ("FII BTLG BTLG11 TEST", "BTLG11", SecurityType.REAL_STATE_FUND),
+        ("ISHARE BOVA BOVA11", "BOVA11", SecurityType.ETF),
+        ("OPCAO DE COMPRA PETRE300 PN", "PETRE300", SecurityType.OPTION),
+        ("ABCD11 TEST", "ABCD11", None),
+    ],
+)
+def test_build_security_when_classifier_has_no_index_then_uses_regex_fallback(name, ticker, security_type):
+    security = SecurityClassifier().build_security(name)
+
+    assert (security.ticker, security.security_type) == (ticker, security_type)
+
+
+@pytest.mark.parametrize(
+    "name, ticker, security_type",
+    [
+        ("ISHARES BOVA11 CI", "BOVA11", SecurityType.ETF),
+        ("PETROBRAS PN PETR4F N2", "PETR4F", SecurityType.STOCK),
+        ("PETRE300 PN", "PETRE300", SecurityType.OPTION),
+        ("BBSEGURIDADE ON NM", None, SecurityType.STOCK),
+    ],
+)
+def test_build_security_when_classifier_has_index_then_uses_indexed_ticker(
+    indexed_security_classifier, name, ticker, security_type
+):
+    security = indexed_security_classifier.build_security(name)
+
+    assert (security.ticker, security.security_type) == (ticker, security_type)
+
+
+def test_build_security_when_name_has_no_ticker_then_uses_name_resolver():
+    index = InstrumentIndex(compile_instrument_index([("BRBI11", SecurityType.STOCK)]))
+    name_resolver = NameResolver(
+        [("BB SEGURIDADE PARTICIPACOES S.A. ON NM", "BBSE3"), ("BR ADVISORY PARTNERS S.A. UNT N2", "BRBI11")]
+    )
+    security_classifier = SecurityClassifier(index=index, name_resolver=name_resolver)
+
+    securities = [
+        security_classifier.build_security(name) for name in ("BBSEGURIDADE ON NM", "BR PARTNERS UNT N2", "VALE ON")
+    ]
+
+    assert [(security.ticker, security.security_type) for security in securities] == [
+        ("BBSE3", SecurityType.STOCK),
+        ("BRBI11", SecurityType.STOCK),
+        (None, SecurityType.STOCK),
+    ]
+
+
+def test_security_when_built_with_type_then_keeps_it_without_classifying_the_name():
+    security = Security(name="ISHARES BOVA11 CI", ticker="BOVA11", security_type=SecurityType.STOCK)
+
+    assert (security.ticker, security.security_type) == ("BOVA11", SecurityType.STOCK)
+    assert Security(name="BBSEGURIDADE ON NM").security_type is None
@@ -0,0 +1,150 @@
+import io
+from dataclasses import replace
+
+import pytest
+
+from correpy.domain.enums import BrokerageNoteFeeType
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.broker_layout import LineKind, PrefixMatcher
+from correpy.parsers.brokerage_notes.broker_layouts import B3_LAYOUT, INTER_LAYOUT, NUINVEST_LAYOUT
+from correpy.parsers.brokerage_notes.brokerage_note_section import BrokerageNoteSection
+from correpy.parsers.brokerage_notes.inter_parser.inter import InterParser
+from correpy.parsers.brokerage_notes.nuinvest_parser.nuinvest import NuInvestParser
+from correpy.parsers.brokerage_notes.parser_factory import ParserFactory
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+from correpy.parsers.exceptions import InvalidBrokerLayoutException
+from correpy.parsers.fitz_parser import FitzParser
+
+
+def build_section(lines):
+    return BrokerageNoteSection(
+        words_grouped_by_line=[
+            [
+                WordRectangle(x0=10 * index, y0=10 * line_index, x1=10 * index + 5, y1=10 * line_index + 5, value=word)
+                for index, word in enumerate(line.split())
+            ]
+            for line_index, line in enumerate(lines)
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "layout, line_text, expected_kind",
+    [
+        (B3_LAYOUT, "Q Negociação C/V Tipo mercado Prazo", LineKind.HEADER),
+        (B3_LAYOUT, "1-BOVESPA C VISTA PETROBRAS PN 100 28,50 2.850,00 D", LineKind.NONE),
+        (B3_LAYOUT, "Resumo dos Negócios Resumo Financeiro", LineKind.END),
+        (INTER_LAYOUT, "Resumo dos negócios", LineKind.END),
+        (INTER_LAYOUT, "D/C", LineKind.END),
+        (INTER_LAYOUT, "Resumo dos Negócios", LineKind.NONE),
+        (NUINVEST_LAYOUT, "Mercado C/V Tipo de Mercado", LineKind.HEADER | LineKind.END),
+        (NUINVEST_LAYOUT, "BOVESPA C VISTA ITAUSA PN 100 10,00 1.000,00 D", LineKind.NONE),
+        (NUINVEST_LAYOUT, "Total Operações", LineKind.END),
+        (NUINVEST_LAYOUT, "", LineKind.END),
+    ],
+)
+def test_classify_transactions_line_when_called_then_returns_kinds_of_markers_line_starts_with(
+    layout, line_text, expected_kind
+):
+    assert layout.classify_transactions_line(line_text) == expected_kind
+
+
+def test_classify_transactions_line_when_marker_starts_with_another_marker_then_line_has_both_kinds():
+    layout = replace(B3_LAYOUT, transactions_end_markers=("Quadro",))
+
+    assert layout.classify_transactions_line("Quadro de negócios") == LineKind.HEADER | LineKind.END
+    assert layout.classify_transactions_line("Q Negociação") == LineKind.HEADER
+
+
+def test_prefix_matcher_when_text_starts_with_several_prefixes_then_returns_value_of_longest():
+    matcher = PrefixMatcher([("Taxa", 1), ("Taxa de Registro", 2), ("Taxa.", 3)], default=0)
+
+    assert matcher.match("Taxa de Registro 0,10") == 2
+    assert matcher.match("Taxa de Custódia") == 1
+    assert matcher.match("Taxa. A") == 3
+    assert matcher.match("Emolumentos") == 0
+
+
+def test_prefix_matcher_when_there_is_no_prefix_then_returns_default():
+    assert PrefixMatcher([], default="default").match("any text") == "default"
+
+
+@pytest.mark.parametrize(
+    "layout, line_text, expected_fee_type",
+    [
+        (B3_LAYOUT, "Taxa de liquidação 0,71 D", BrokerageNoteFeeType.SETTLEMENT_FEE),
+        (B3_LAYOUT, "I.R.R.F. s/ operações, base R$0,00 0,00", BrokerageNoteFeeType.IRRF),
+        (B3_LAYOUT, "Taxa de Liquidação 0,71 D", None),
+        (NUINVEST_LAYOUT, "Taxa de Liquidação 0,71 D", BrokerageNoteFeeType.SETTLEMENT_FEE),
+        (NUINVEST_LAYOUT, "Taxa de Termo / Opções 0,00", BrokerageNoteFeeType.TERM_FEE),
+        (NUINVEST_LAYOUT, "I.R.R.F. s/ operações, base R$0,00 0,00", None),
+    ],
+)
+def test_get_fee_type_when_called_then_returns_fee_type_of_header_line_starts_with(
+    layout, line_text, expected_fee_type
+):
+    assert layout.get_fee_type(line_text) == expected_fee_type
+
+
+def test_broker_layout_when_column_of_a_field_is_not_a_transaction_column_then_raises_exception():
+    with pytest.raises(InvalidBrokerLayoutException):
+        replace(
+            B3_LAYOUT,
+            transaction_column_header_by_field={**B3_LAYOUT.transaction_column_header_by_field, "amount": "Qtd"},
+        )
+
+
+def test_broker_layout_when_there_is_no_header_marker_then_raises_exception():
+    with pytest.raises(InvalidBrokerLayoutException):
+        replace(B3_LAYOUT, transactions_header_markers=())
+
+
+def test_parser_factory_when_built_then_maps_cnpj_of_each_layout_to_its_parser():
+    assert ParserFactory.CNPJ_PARSER_MAP == {
+        "62.169.875/0001-79": NuInvestParser,
+        "18.945.670/0001-46": InterParser,
+    }
+
+
+@pytest.mark.parametrize(
+    "parser_class, expected_lines",
+    [
+        (B3Parser, ["1-BOVESPA C VISTA PETROBRAS PN 100 28,50 2.850,00 D", "D/C Débito/Crédito"]),
+        (InterParser, ["1-BOVESPA C VISTA PETROBRAS PN 100 28,50 2.850,00 D"]),
+    ],
+)
+def test_get_transaction_lines_when_inter_note_has_d_c_line_then_only_inter_ends_transactions_there(
+    parser_class, expected_lines
+):
+    section = build_section(
+        [
+            "Q Negociação C/V Tipo mercado",
+            "1-BOVESPA C VISTA PETROBRAS PN 100 28,50 2.850,00 D",
+            "D/C Débito/Crédito",
+            "Resumo dos Negócios",
+        ]
+    )
+    parser = parser_class(
+        brokerage_note=io.BytesIO(), fitz_parser=FitzParser.from_extracted_words(words=[], page_range=range(0))
+    )
+
+    assert parser.get_transaction_lines(transactions_brokerage_note_section=section) == expected_lines
+
+
+def test_get_transaction_lines_when_inter_note_has_b3_summary_title_then_it_does_not_end_transactions():
+    section = build_section(
+        [
+            "Q Negociação C/V",
+            "1-BOVESPA C VISTA ITAUSA PN 10 10,00 100,00 D",
+            "Resumo dos Negócios",
+            "Resumo dos negócios",
+        ]
+    )
+    parser = InterParser(
+        brokerage_note=io.BytesIO(), fitz_parser=FitzParser.from_extracted_words(words=[], page_range=range(0))
+    )
+
+    assert parser.get_transaction_lines(transactions_brokerage_note_section=section) == [
+        "1-BOVESPA C VISTA ITAUSA PN 10 10,00 100,00 D",
+        "Resumo dos Negócios",
+    ]
@@ -5,8 +5,13 @@ import fitz
 import pytest
 
 from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
-from correpy.parsers.exceptions import InvalidPasswordException, ProblemParsingBrokerageNoteException
+from correpy.parsers.exceptions import (
+    InvalidPasswordException,
+    ParsingBudgetExceededException,
+    ProblemParsingBrokerageNoteException,
+)
 from correpy.parsers.fitz_parser import FitzParser
+from correpy.parsers.parsing_budget import ParsingBudget
 
 
 class TestConnectBankAccount:
@@ -69,21 +74,44 @@ class TestConnectBankAccount:
 
         assert fitz_parser.words == [expected_words]
 
-    def test_is_word_in_rectangle_when_called_with_rectangle_surrounding_word_then_returns_true(self):
-        word = WordRectangle(x0=1, y0=1, x1=2, y1=2, value="test")
-        surrounding_rectangle = fitz.Rect(0, 0, 3, 3)
+    def test_initialize_fitz_parser_when_called_with_document_above_max_pages_then_raises_before_reading_words(self):
+        self.document_mock.page_count = 2
 
-        is_in_rectangle = FitzParser.is_word_in_rectangle(rectangle=surrounding_rectangle, word=word)
+        with pytest.raises(ParsingBudgetExceededException):
+            FitzParser(file=self.brokerage_note, password="123", budget=ParsingBudget(max_pages=1))
 
-        assert is_in_rectangle is True
+        self.text_page_mock.extractWORDS.assert_not_called()
 
-    def test_is_word_in_rectangle_when_called_without_rectangle_surrounding_word_then_returns_false(self):
-        word = WordRectangle(x0=1, y0=1, x1=2, y1=2, value="test")
-        surrounding_rectangle = fitz.Rect(-1, -1, 0, 0)
+    def test_initialize_fitz_parser_when_called_with_page_above_max_words_then_raises_parsing_budget_exceeded(self):
+        self.document_mock.page_count = 1
+        self.text_page_mock.extractWORDS.return_value = [(0, 0, 1, 1, "test"), (1, 1, 2, 2, "test")]
 
-        is_in_rectangle = FitzParser.is_word_in_rectangle(rectangle=surrounding_rectangle, word=word)
+        with pytest.raises(ParsingBudgetExceededException):
+            FitzParser(file=self.brokerage_note, password="123", budget=ParsingBudget(max_words_per_page=1))
+
+    def test_get_words_in_rectangle_when_called_with_page_range_then_reads_only_range_pages_by_document_page_number(
+        self,
+    ):
+        word_rectangle_text_page = (1, 1, 2, 2, "test")
+        self.document_mock.page_count = 10
+        self.document_mock.__getitem__.return_value = self.page_mock
+        self.text_page_mock.extractWORDS.return_value = [word_rectangle_text_page]
+
+        fitz_parser = FitzParser(file=self.brokerage_note, password="123", page_range=range(4, 6))
+
+        assert len(fitz_parser.words) == 2
+        assert fitz_parser.get_words_in_rectangle(page_number=5, rectangle=fitz.Rect(0, 0, 3, 3)) == [
+            word_rectangle_text_page
+        ]
+
+    def test_get_page_layout_when_called_twice_for_same_page_then_returns_same_layout_built_from_page_words(self):
+        self.text_page_mock.extractWORDS.return_value = [(0, 0, 1, 1, "test")]
+
+        fitz_parser = FitzParser(file=self.brokerage_note, password="123")
 
-        assert is_in_rectangle is False
+        page_layout = fitz_parser.get_page_layout(page_number=0)
+        assert page_layout is fitz_parser.get_page_layout(page_number=0)
+        assert [line.text for line in page_layout.lines] == ["test"]
 
     def test_get_words_in_rectangle_when_called_with_rectangle_surrounding_words_then_returns_all_words(self):
         word_rectangle_text_page = (1, 1, 2, 2, "test")
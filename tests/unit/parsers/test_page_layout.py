@@ -0,0 +1,79 @@
+import fitz
+
+from correpy.parsers.brokerage_notes.brokerage_note_section import BrokerageNoteSection
+from correpy.parsers.brokerage_notes.page_layout import PageLayout, is_word_in_rectangle
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+
+WORDS = [
+    WordRectangle(x0=50, y0=20, x1=60, y1=30.4, value="right"),
+    WordRectangle(x0=10, y0=20, x1=20, y1=30, value="left"),
+    WordRectangle(x0=10, y0=0, x1=20, y1=10, value="title"),
+    WordRectangle(x0=10, y0=40, x1=20, y1=50, value="last"),
+]
+
+
+def test_page_layout_when_called_with_words_then_groups_close_y1_words_in_lines_sorted_by_x0():
+    page_layout = PageLayout(words=WORDS)
+
+    assert [line.text for line in page_layout.lines] == ["title", "left right", "last"]
+
+
+def test_get_lines_in_rectangle_when_rectangle_contains_whole_lines_then_returns_lines_shared_with_layout():
+    page_layout = PageLayout(words=WORDS)
+
+    lines = page_layout.get_lines_in_rectangle(rectangle=fitz.Rect(0, 15, 100, 35))
+
+    assert lines == [page_layout.lines[1]]
+    assert lines[0] is page_layout.lines[1]
+
+
+def test_get_lines_in_rectangle_when_rectangle_contains_part_of_line_then_returns_only_words_in_rectangle():
+    page_layout = PageLayout(words=WORDS)
+
+    lines = page_layout.get_lines_in_rectangle(rectangle=fitz.Rect(0, 5, 30, 35))
+
+    assert [line.text for line in lines] == ["title", "left"]
+
+
+def test_get_lines_in_rectangle_when_called_with_empty_rectangle_then_returns_empty_list():
+    page_layout = PageLayout(words=WORDS)
+
+    assert page_layout.get_lines_in_rectangle(rectangle=fitz.Rect(0, 100, 0, 0)) == []
+
+
+def test_get_lines_in_rectangle_when_line_straddles_the_y_tolerance_then_keeps_its_words_on_both_ends():
+    # The first word of each line is above the rectangle's edge, the second is within the tolerance and inside it
+    page_layout = PageLayout(
+        words=[
+            WordRectangle(x0=10, y0=0, x1=20, y1=9.5, value="above"),
+            WordRectangle(x0=30, y0=5, x1=40, y1=10.4, value="top"),
+            WordRectangle(x0=10, y0=29.9, x1=20, y1=30, value="bottom"),
+            WordRectangle(x0=30, y0=20.5, x1=40, y1=30.9, value="below"),
+        ],
+        y_tolerance=1.0,
+    )
+
+    lines = page_layout.get_lines_in_rectangle(rectangle=fitz.Rect(0, 10, 100, 20.6))
+
+    assert [line.text for line in lines] == ["top", "below"]
+
+
+def test_is_word_in_rectangle_when_called_with_rectangle_surrounding_word_then_returns_true():
+    word = WordRectangle(x0=1, y0=1, x1=2, y1=2, value="test")
+
+    assert is_word_in_rectangle(rectangle=fitz.Rect(0, 0, 3, 3), word=word) is True
+
+
+def test_is_word_in_rectangle_when_called_without_rectangle_surrounding_word_then_returns_false():
+    word = WordRectangle(x0=1, y0=1, x1=2, y1=2, value="test")
+
+    assert is_word_in_rectangle(rectangle=fitz.Rect(-1, -1, 0, 0), word=word) is False
+
+
+def test_brokerage_note_section_when_built_from_layout_lines_then_returns_text_by_lines_and_full_text():
+    page_layout = PageLayout(words=WORDS)
+
+    section = BrokerageNoteSection(words_grouped_by_line=page_layout.lines)
+
+    assert section.text_by_lines == ["title", "left right", "last"]
+    assert section.full_text == "titleleft rightlast"
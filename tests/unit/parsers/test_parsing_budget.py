@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+
+from correpy.parsers.exceptions import ParsingBudgetExceededException
+from correpy.parsers.parsing_budget import ParsingBudget, ParsingBudgetTracker
+
+WORDS = [(0, 0, 1, 1, "test"), (1, 1, 2, 2, "other")]
+
+
+def test_check_page_count_when_called_with_more_pages_than_budget_then_raises_parsing_budget_exceeded_exception():
+    tracker = ParsingBudgetTracker(budget=ParsingBudget(max_pages=2))
+
+    with pytest.raises(ParsingBudgetExceededException) as exc_info:
+        tracker.check_page_count(page_count=3)
+
+    assert exc_info.value.budget_name == "max_pages"
+    assert exc_info.value.observed == 3
+    assert exc_info.value.diagnostics.pages_in_document == 3
+
+
+def test_check_page_count_when_called_without_budget_then_does_not_raise():
+    tracker = ParsingBudgetTracker()
+
+    tracker.check_page_count(page_count=10000)
+
+    assert tracker.diagnostics.pages_in_document == 10000
+
+
+def test_register_page_words_when_called_with_more_words_than_budget_then_raises_with_partial_diagnostics():
+    tracker = ParsingBudgetTracker(budget=ParsingBudget(max_words_per_page=2))
+    tracker.register_page_words(words=WORDS)
+
+    with pytest.raises(ParsingBudgetExceededException) as exc_info:
+        tracker.register_page_words(words=WORDS * 2)
+
+    assert exc_info.value.budget_name == "max_words_per_page"
+    assert exc_info.value.diagnostics.pages_read == 1
+    assert exc_info.value.diagnostics.words_per_page == [2]
+
+
+def test_register_page_words_when_estimated_memory_exceeds_budget_then_raises_parsing_budget_exceeded_exception():
+    tracker = ParsingBudgetTracker(budget=ParsingBudget(max_memory_in_bytes=1))
+
+    with pytest.raises(ParsingBudgetExceededException) as exc_info:
+        tracker.register_page_words(words=WORDS)
+
+    assert exc_info.value.budget_name == "max_memory_in_bytes"
+    assert exc_info.value.diagnostics.pages_read == 0
+
+
+def test_register_page_words_when_called_within_budget_then_updates_diagnostics():
+    tracker = ParsingBudgetTracker(budget=ParsingBudget(max_words_per_page=10, max_memory_in_bytes=10**6))
+
+    tracker.register_page_words(words=WORDS)
+
+    assert tracker.diagnostics.words_read == 2
+    assert tracker.diagnostics.estimated_memory_in_bytes == ParsingBudgetTracker.estimate_words_memory(WORDS)
+
+
+def test_check_deadline_when_deadline_expired_then_raises_parsing_budget_exceeded_exception():
+    with patch("correpy.parsers.parsing_budget.time.monotonic", side_effect=[0, 5, 5]):
+        tracker = ParsingBudgetTracker(budget=ParsingBudget(deadline_in_seconds=1))
+
+        with pytest.raises(ParsingBudgetExceededException) as exc_info:
+            tracker.check_deadline()
+
+    assert exc_info.value.budget_name == "deadline_in_seconds"
+    assert exc_info.value.diagnostics.elapsed_seconds == 5
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from correpy.parsers.exceptions import InvalidPasswordException
+from correpy.parsers.password_resolver import PasswordMemory, PasswordResolver
+
+
+def build_document_mock(valid_password):
+    document_mock = MagicMock()
+    document_mock.needs_pass = True
+    document_mock.authenticate.side_effect = lambda password: password == valid_password
+    return document_mock
+
+
+def test_resolve_when_called_with_valid_candidate_then_returns_candidate_and_remembers_it_for_client():
+    memory = PasswordMemory()
+    resolver = PasswordResolver(candidates=["wrong", "048"], client_id="client", memory=memory)
+
+    password = resolver.resolve(document=build_document_mock(valid_password="048"))
+
+    assert password == "048"
+    assert memory.get_passwords(client_id="client") == ["048"]
+
+
+def test_resolve_when_called_without_valid_candidate_then_raises_invalid_password_exception():
+    resolver = PasswordResolver(candidates=["wrong"], memory=PasswordMemory())
+
+    with pytest.raises(InvalidPasswordException):
+        resolver.resolve(document=build_document_mock(valid_password="048"))
+
+
+def test_resolve_when_document_does_not_need_password_then_returns_none_without_authenticating():
+    document_mock = build_document_mock(valid_password="048")
+    document_mock.needs_pass = False
+
+    password = PasswordResolver(candidates=["048"], memory=PasswordMemory()).resolve(document=document_mock)
+
+    assert password is None
+    document_mock.authenticate.assert_not_called()
+
+
+def test_resolve_when_called_with_callback_then_callback_is_only_called_after_candidates_fail():
+    callback = MagicMock(return_value=["048"])
+    resolver = PasswordResolver(candidates=["123"], callback=callback, memory=PasswordMemory())
+
+    assert resolver.resolve(document=build_document_mock(valid_password="123")) == "123"
+    callback.assert_not_called()
+    assert resolver.resolve(document=build_document_mock(valid_password="048")) == "048"
+    callback.assert_called_once()
+
+
+def test_iter_candidates_when_client_has_remembered_passwords_then_tries_most_recent_one_first():
+    memory = PasswordMemory()
+    memory.remember(client_id="client", password="old")
+    memory.remember(client_id="client", password="recent")
+    resolver = PasswordResolver(candidates=["first", "recent"], client_id="client", memory=memory)
+
+    assert list(resolver.iter_candidates()) == ["recent", "old", "first"]
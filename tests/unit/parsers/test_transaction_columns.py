@@ -0,0 +1,79 @@
+from correpy.parsers.brokerage_notes.b3_parser.b3_parser import B3Parser
+from correpy.parsers.brokerage_notes.transaction_columns import TransactionColumns, TransactionRow
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+
+
+def build_words(words):
+    return [WordRectangle(x0=x0, y0=0, x1=x1, y1=10, value=value) for x0, x1, value in words]
+
+
+HEADER_WORDS = build_words(
+    [
+        (35.5, 40.7, "Q"),
+        (44.5, 77.8, "Negociação"),
+        (92.9, 104.7, "C/V"),
+        (108.4, 121.0, "Tipo"),
+        (122.9, 148.1, "mercado"),
+        (167.2, 184.4, "Prazo"),
+        (192.0, 231.1, "Especificação"),
+        (233.0, 239.8, "do"),
+        (241.6, 258.2, "título"),
+        (311.1, 324.9, "Obs."),
+        (326.6, 334.6, "(*)"),
+        (340.8, 376.0, "Quantidade"),
+        (389.8, 406.4, "Preço"),
+        (411.7, 430.8, "Ajuste"),
+        (446.8, 463.6, "Valor"),
+        (499.3, 518.4, "Ajuste"),
+        (544.3, 555.4, "D/C"),
+    ]
+)
+
+
+def test_split_words_when_row_has_option_expiration_and_observation_then_buckets_words_by_column():
+    transaction_columns = TransactionColumns.from_header_words(
+        HEADER_WORDS, headers=B3Parser.layout.transaction_columns_headers
+    )
+    row_words = build_words(
+        [
+            (44.5, 79.1, "1-BOVESPA"),
+            (96.6, 101.4, "C"),
+            (108.4, 130.0, "OPCAO"),
+            (131.0, 140.0, "DE"),
+            (141.0, 165.0, "COMPRA"),
+            (167.2, 185.0, "12/22"),
+            (192.0, 230.0, "PETRL245"),
+            (232.0, 245.0, "PETR"),
+            (315.0, 320.0, "#"),
+            (370.0, 387.6, "1.000"),
+            (429.0, 444.7, "0,45"),
+            (525.0, 542.1, "450,00"),
+            (549.7, 555.0, "D"),
+        ]
+    )
+
+    words_by_column = transaction_columns.split_words(row_words)
+
+    assert words_by_column["C/V"] == ["C"]
+    assert words_by_column["Tipo"] == ["OPCAO", "DE", "COMPRA"]
+    assert words_by_column["Prazo"] == ["12/22"]
+    assert words_by_column["Especificação"] == ["PETRL245", "PETR"]
+    assert words_by_column["Obs."] == ["#"]
+    assert words_by_column["Quantidade"] == ["1.000"]
+    assert words_by_column["Preço"] == ["0,45"]
+    assert words_by_column["Valor"] == ["450,00"]
+
+
+def test_from_header_words_when_a_header_is_missing_then_returns_none():
+    header_words = [word for word in HEADER_WORDS if word.value != "Prazo"]
+
+    assert (
+        TransactionColumns.from_header_words(header_words, headers=B3Parser.layout.transaction_columns_headers) is None
+    )
+
+
+def test_transaction_row_line_when_text_starts_with_transaction_mark_then_removes_it():
+    transaction_row = TransactionRow(text="N 1-BOVESPA C VISTA PETROBRAS PN N2 100 28,50 2.850,00 D")
+
+    assert transaction_row.line == "1-BOVESPA C VISTA PETROBRAS PN N2 100 28,50 2.850,00 D"
+    assert TransactionRow(text="NU 1-BOVESPA").line == "NU 1-BOVESPA"
@@ -0,0 +1,142 @@
+import io
+import mailbox
+import pickle
+import zipfile
+from email.message import EmailMessage
+
+import pytest
+
+from correpy.pipeline.document_sources import (
+    ArchiveLimits,
+    NamedDocument,
+    iter_brokerage_note_sources,
+    iter_eml_documents,
+    iter_mbox_documents,
+    iter_zip_documents,
+)
+from correpy.pipeline.exceptions import InvalidDocumentArchiveException
+
+
+def build_zip(members):
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w") as zip_file:
+        for member_name, member_content in members.items():
+            zip_file.writestr(member_name, member_content)
+    return content.getvalue()
+
+
+def build_message(attachments):
+    message = EmailMessage()
+    message["Subject"] = "Nota de corretagem"
+    message.set_content("Segue a nota")
+    for file_name, content_type, content in attachments:
+        maintype, subtype = content_type.split("/")
+        message.add_attachment(content, maintype=maintype, subtype=subtype, filename=file_name)
+    return message
+
+
+def test_iter_zip_documents_when_archive_has_nested_zip_then_yields_only_pdfs_with_their_names(tmp_path):
+    path = tmp_path / "notas.zip"
+    path.write_bytes(
+        build_zip({"2022/05.PDF": b"pdf 1", "leiame.txt": b"text", "antigas.zip": build_zip({"01.pdf": b"pdf 2"})})
+    )
+
+    documents = list(iter_zip_documents(path))
+
+    assert [(document.name, document.getvalue()) for document in documents] == [
+        (f"{path}!2022/05.PDF", b"pdf 1"),
+        (f"{path}!antigas.zip!01.pdf", b"pdf 2"),
+    ]
+
+
+def test_iter_zip_documents_when_file_is_not_a_zip_then_raises_exception(tmp_path):
+    path = tmp_path / "notas.zip"
+    path.write_bytes(b"not a zip")
+
+    with pytest.raises(InvalidDocumentArchiveException):
+        list(iter_zip_documents(path))
+
+
+@pytest.mark.parametrize(
+    "members, limits",
+    [
+        ({"01.pdf": b"x" * 11}, ArchiveLimits(max_member_size=10)),
+        ({"a.zip": build_zip({"b.zip": build_zip({"01.pdf": b"pdf"})})}, ArchiveLimits(max_nesting_depth=1)),
+        ({"01.pdf": b"pdf 1", "antigas.zip": build_zip({"02.pdf": b"pdf 2"})}, ArchiveLimits(max_members=2)),
+    ],
+)
+def test_iter_zip_documents_when_archive_exceeds_the_limits_then_raises_exception(tmp_path, members, limits):
+    path = tmp_path / "notas.zip"
+    path.write_bytes(build_zip(members))
+
+    with pytest.raises(InvalidDocumentArchiveException):
+        list(iter_zip_documents(path, limits=limits))
+
+
+def test_iter_zip_documents_when_archive_is_within_the_limits_then_yields_its_pdfs(tmp_path):
+    nested_zip = build_zip({"02.pdf": b"pdf"})
+    path = tmp_path / "notas.zip"
+    path.write_bytes(build_zip({"01.pdf": b"pdf", "a.zip": nested_zip}))
+    limits = ArchiveLimits(max_member_size=len(nested_zip), max_nesting_depth=1, max_members=3)
+
+    documents = list(iter_zip_documents(path, limits=limits))
+
+    assert [document.name for document in documents] == [f"{path}!01.pdf", f"{path}!a.zip!02.pdf"]
+
+
+def test_iter_brokerage_note_sources_when_attached_zip_exceeds_the_limits_then_raises_exception(tmp_path):
+    message = build_message([("notas.zip", "application/zip", build_zip({"01.pdf": b"x" * 11}))])
+    path = tmp_path / "nota.eml"
+    path.write_bytes(message.as_bytes())
+
+    with pytest.raises(InvalidDocumentArchiveException):
+        list(iter_brokerage_note_sources([path], limits=ArchiveLimits(max_member_size=10)))
+
+
+def test_iter_eml_documents_when_message_has_pdf_and_zip_attachments_then_yields_their_pdfs(tmp_path):
+    message = build_message(
+        [
+            ("nota.pdf", "application/pdf", b"pdf 1"),
+            ("notas.zip", "application/zip", build_zip({"02.pdf": b"pdf 2"})),
+            ("foto.png", "image/png", b"png"),
+            ("outra.pdf", "application/octet-stream", b"pdf 3"),
+        ]
+    )
+    path = tmp_path / "nota.eml"
+    path.write_bytes(message.as_bytes())
+
+    documents = list(iter_eml_documents(path))
+
+    assert [(document.name, document.getvalue()) for document in documents] == [
+        (f"{path}!nota.pdf", b"pdf 1"),
+        (f"{path}!notas.zip!02.pdf", b"pdf 2"),
+        (f"{path}!outra.pdf", b"pdf 3"),
+    ]
+
+
+def test_iter_mbox_documents_when_mailbox_has_messages_then_names_documents_by_message_position(tmp_path):
+    path = tmp_path / "caixa.mbox"
+    mbox = mailbox.mbox(path)
+    mbox.add(build_message([]))
+    mbox.add(build_message([("nota.pdf", "application/pdf", b"pdf 1")]))
+    mbox.close()
+
+    documents = list(iter_mbox_documents(path))
+
+    assert [(document.name, document.getvalue()) for document in documents] == [(f"{path}!1!nota.pdf", b"pdf 1")]
+
+
+def test_iter_brokerage_note_sources_when_paths_are_mixed_then_expands_only_archives(tmp_path):
+    path = tmp_path / "notas.zip"
+    path.write_bytes(build_zip({"01.pdf": b"pdf 1"}))
+
+    sources = list(iter_brokerage_note_sources(["nota.pdf", path]))
+
+    assert sources[0] == "nota.pdf"
+    assert sources[1].name == f"{path}!01.pdf"
+
+
+def test_named_document_when_pickled_then_keeps_name_and_content():
+    document = pickle.loads(pickle.dumps(NamedDocument(b"pdf", name="notas.zip!01.pdf")))
+
+    assert (document.name, document.getvalue()) == ("notas.zip!01.pdf", b"pdf")
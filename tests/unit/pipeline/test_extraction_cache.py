@@ -0,0 +1,74 @@
+from dataclasses import replace
+
+from correpy.parsers.brokerage_notes.nuinvest_parser.nuinvest import NuInvestParser
+from correpy.parsers.brokerage_notes.word_rectangle import WordRectangle
+from correpy.pipeline.extraction_cache import (
+    ExtractionCache,
+    decode_extracted_document,
+    encode_extracted_document,
+    get_parsers_fingerprint,
+)
+from correpy.pipeline.products import ExtractedDocument, ExtractedPage
+
+DIGEST = "ab" * 20
+
+
+def build_extracted_document():
+    return ExtractedDocument(
+        parser_class=NuInvestParser,
+        pages=[
+            ExtractedPage(
+                number=0,
+                width=595.0,
+                height=842.0,
+                words=[WordRectangle(0.1, 10.25, 30.5, 20.0, "Negociação"), WordRectangle(1 / 3, 2, 3, 4, "C")],
+                anchors={"Nr. nota": (1.5, 2.5, 3.5, 4.5), "C.I.": None},
+            ),
+            ExtractedPage(number=1, width=595.0, height=842.0, words=[WordRectangle(5, 6, 7, 8, "C")]),
+        ],
+    )
+
+
+def test_decode_extracted_document_when_encoded_then_returns_the_same_document():
+    extracted_document = build_extracted_document()
+
+    assert decode_extracted_document(encode_extracted_document(extracted_document)) == extracted_document
+
+
+def test_get_when_document_was_put_then_returns_it_only_for_the_same_pymupdf_version(tmp_path):
+    extraction_cache = ExtractionCache(tmp_path, pymupdf_version="1.0.0")
+
+    assert extraction_cache.get(DIGEST) is None
+    extraction_cache.put(DIGEST, build_extracted_document())
+
+    assert extraction_cache.get(DIGEST) == build_extracted_document()
+    assert ExtractionCache(tmp_path, pymupdf_version="2.0.0").get(DIGEST) is None
+    assert (extraction_cache.stats.hits, extraction_cache.stats.misses) == (1, 1)
+
+
+def test_get_when_document_was_put_then_returns_it_only_for_the_same_parsers_fingerprint(tmp_path):
+    ExtractionCache(tmp_path, parsers_fingerprint="a").put(DIGEST, build_extracted_document())
+
+    assert ExtractionCache(tmp_path, parsers_fingerprint="a").get(DIGEST) == build_extracted_document()
+    assert ExtractionCache(tmp_path, parsers_fingerprint="b").get(DIGEST) is None
+
+
+def test_get_parsers_fingerprint_when_an_anchor_text_changes_then_changes(monkeypatch):
+    fingerprint = get_parsers_fingerprint()
+
+    monkeypatch.setattr(NuInvestParser, "layout", replace(NuInvestParser.layout, ci_title="Valor/Ajuste"))
+
+    assert get_parsers_fingerprint() != fingerprint
+
+
+def test_get_when_entry_is_corrupted_then_is_a_miss(tmp_path):
+    extraction_cache = ExtractionCache(tmp_path)
+    extraction_cache.put(DIGEST, build_extracted_document())
+    path = extraction_cache.get_path(DIGEST)
+    path.write_bytes(path.read_bytes()[:100])
+
+    assert extraction_cache.get(DIGEST) is None
+
+    path.write_bytes(b"")
+
+    assert extraction_cache.get(DIGEST) is None
@@ -0,0 +1,139 @@
+from datetime import date
+from decimal import Decimal
+
+from correpy.domain.enums import TransactionType
+from correpy.pipeline.merge_index import (
+    BrokerageNoteConflict,
+    BrokerageNoteMergeIndex,
+    MergeOutcome,
+    get_brokerage_note_fingerprint,
+)
+from tests.factories import build_brokerage_note
+
+NOTE_DATE = date(2022, 3, 1)
+
+
+def test_get_brokerage_note_fingerprint_when_transactions_order_and_scale_differ_then_is_the_same():
+    brokerage_note = build_brokerage_note(
+        1, NOTE_DATE, [(TransactionType.BUY, 10, "20.5", "PETR4"), (TransactionType.BUY, 5, 30, "VALE3")]
+    )
+    other_brokerage_note = build_brokerage_note(
+        1, NOTE_DATE, [(TransactionType.BUY, 5, "30.00", "VALE3"), (TransactionType.BUY, 10, "20.50", "PETR4")]
+    )
+
+    assert get_brokerage_note_fingerprint(brokerage_note) == get_brokerage_note_fingerprint(other_brokerage_note)
+    assert get_brokerage_note_fingerprint(brokerage_note) != get_brokerage_note_fingerprint(
+        build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 10, "20.5", "PETR4")])
+    )
+
+
+def test_add_brokerage_note_when_same_note_is_added_again_then_is_a_duplicate():
+    merge_index = BrokerageNoteMergeIndex()
+
+    outcomes = [
+        merge_index.add_brokerage_note(
+            build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 10, 20, "PETR4")], emoluments=Decimal("0.1")),
+            source,
+        )
+        for source in ("daily.pdf", "monthly.pdf")
+    ]
+
+    assert outcomes == [MergeOutcome.NEW, MergeOutcome.DUPLICATE]
+    assert len(merge_index) == 1
+    assert merge_index.stats.outcomes[MergeOutcome.DUPLICATE] == 1
+
+
+def test_add_brokerage_note_when_partial_notes_then_merges_transactions_and_fees():
+    merge_index = BrokerageNoteMergeIndex()
+    first_page = build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 10, 20, "PETR4")])
+    last_page = build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 5, 30, "VALE3")], emoluments=Decimal("0.1"))
+
+    outcomes = [merge_index.add_brokerage_note(first_page), merge_index.add_brokerage_note(last_page)]
+
+    assert outcomes == [MergeOutcome.NEW, MergeOutcome.MERGED]
+    assert merge_index.get_brokerage_note((1, NOTE_DATE)) == build_brokerage_note(
+        1,
+        NOTE_DATE,
+        [(TransactionType.BUY, 10, 20, "PETR4"), (TransactionType.BUY, 5, 30, "VALE3")],
+        emoluments=Decimal("0.1"),
+    )
+    assert len(first_page.transactions) == 1
+
+
+def test_add_brokerage_note_when_note_is_a_part_of_the_known_one_then_is_a_duplicate():
+    merge_index = BrokerageNoteMergeIndex()
+    merge_index.add_brokerage_note(
+        build_brokerage_note(
+            1,
+            NOTE_DATE,
+            [(TransactionType.BUY, 10, 20, "PETR4"), (TransactionType.BUY, 5, 30, "VALE3")],
+            emoluments=Decimal("0.1"),
+        )
+    )
+
+    assert (
+        merge_index.add_brokerage_note(build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 10, 20, "PETR4")]))
+        == MergeOutcome.DUPLICATE
+    )
+
+
+def test_add_brokerage_note_when_note_contains_the_known_one_then_replaces_it():
+    merge_index = BrokerageNoteMergeIndex()
+    full_brokerage_note = build_brokerage_note(
+        1,
+        NOTE_DATE,
+        [(TransactionType.BUY, 10, 20, "PETR4"), (TransactionType.BUY, 5, 30, "VALE3")],
+        emoluments=Decimal("0.1"),
+    )
+    merge_index.add_brokerage_note(build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 10, 20, "PETR4")]))
+
+    assert merge_index.add_brokerage_note(full_brokerage_note) == MergeOutcome.REPLACED
+    assert merge_index.get_brokerage_note((1, NOTE_DATE)) == full_brokerage_note
+
+
+def test_add_brokerage_note_when_notes_disagree_then_reports_a_conflict_and_keeps_the_known_note():
+    merge_index = BrokerageNoteMergeIndex()
+    known_brokerage_note = build_brokerage_note(
+        1, NOTE_DATE, [(TransactionType.BUY, 10, 20, "PETR4")], emoluments=Decimal("0.1")
+    )
+    merge_index.add_brokerage_note(known_brokerage_note, source="a.pdf")
+
+    outcomes = [
+        merge_index.add_brokerage_note(
+            build_brokerage_note(
+                1,
+                NOTE_DATE,
+                [(TransactionType.BUY, 10, 20, "PETR4"), (TransactionType.BUY, 1, 1, "A")],
+                emoluments=Decimal("0.2"),
+            ),
+            "b.pdf",
+        ),
+        merge_index.add_brokerage_note(
+            build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 5, 30, "VALE3")], emoluments=Decimal("0.3")),
+            "c.pdf",
+        ),
+    ]
+
+    assert outcomes == [MergeOutcome.CONFLICT, MergeOutcome.CONFLICT]
+    assert merge_index.conflicts == [
+        BrokerageNoteConflict(
+            note_key=(1, NOTE_DATE), known_sources=("a.pdf",), source="b.pdf", reason="transactions differ"
+        ),
+        BrokerageNoteConflict(note_key=(1, NOTE_DATE), known_sources=("a.pdf",), source="c.pdf", reason="fees differ"),
+    ]
+    assert merge_index.get_brokerage_note((1, NOTE_DATE)) == known_brokerage_note
+
+
+def test_add_brokerage_notes_when_called_then_returns_only_created_or_changed_notes():
+    merge_index = BrokerageNoteMergeIndex()
+    brokerage_note = build_brokerage_note(1, NOTE_DATE, [(TransactionType.BUY, 10, 20, "PETR4")])
+
+    assert merge_index.add_brokerage_notes([brokerage_note]) == [brokerage_note]
+    assert merge_index.add_brokerage_notes([brokerage_note]) == []
+
+
+def test_add_source_when_content_was_already_added_then_returns_false():
+    merge_index = BrokerageNoteMergeIndex()
+
+    assert [merge_index.add_source(source) for source in (b"a", b"b", b"a")] == [True, True, False]
+    assert merge_index.stats.skipped_sources == 1
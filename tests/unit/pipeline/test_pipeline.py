@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from correpy.pipeline.pipeline import Pipeline, Stage
+
+
+def double(value):
+    return value * 2
+
+
+def fail_on_three(value):
+    if value == 3:
+        raise ValueError("three")
+    return value
+
+
+def test_pipeline_run_when_called_with_ordered_then_returns_results_in_items_order():
+    pipeline = Pipeline.from_stage(Stage(name="double", function=double, workers=3)).then(
+        Stage(name="increment", function=lambda value: value + 1, workers=2)
+    )
+
+    results = list(pipeline.run(range(20), ordered=True))
+
+    assert [result.value for result in results] == [value * 2 + 1 for value in range(20)]
+    assert [stats.processed for stats in pipeline.stats] == [20, 20]
+
+
+def test_pipeline_run_when_a_stage_fails_then_returns_the_error_and_skips_next_stages():
+    pipeline = Pipeline.from_stage(Stage(name="validation", function=fail_on_three)).then(
+        Stage(name="double", function=double)
+    )
+
+    results = list(pipeline.run([1, 3, 5], ordered=True))
+
+    assert [result.value for result in results] == [2, None, 10]
+    assert str(results[1].error) == "three"
+    assert results[1].failed_stage == "validation"
+    assert [(stats.processed, stats.failed) for stats in pipeline.stats] == [(2, 1), (2, 0)]
+
+
+def test_pipeline_run_when_stage_runs_in_processes_then_returns_results():
+    pipeline = Pipeline.from_stage(Stage(name="double", function=double, workers=2, in_processes=True))
+
+    results = list(pipeline.run(range(5), ordered=True))
+
+    assert [result.value for result in results] == [0, 2, 4, 6, 8]
+
+
+def test_pipeline_run_when_items_are_produced_then_queues_bound_items_in_flight():
+    produced = []
+    release = threading.Event()
+
+    def items():
+        for value in range(100):
+            produced.append(value)
+            yield value
+
+    def wait_release(value):
+        release.wait()
+        return value
+
+    pipeline = Pipeline.from_stage(Stage(name="wait", function=wait_release), queue_size=2)
+    results = pipeline.run(items())
+    consumer = threading.Thread(target=lambda: list(results))
+    consumer.start()
+    threading.Event().wait(0.3)
+
+    # One item in the stage plus the input and output queues
+    assert len(produced) <= 6
+    release.set()
+    consumer.join()
+    assert len(produced) == 100
+
+
+def test_pipeline_run_when_items_iteration_fails_then_raises_the_error():
+    def items():
+        yield 1
+        raise RuntimeError("broken source")
+
+    with pytest.raises(RuntimeError):
+        list(Pipeline.from_stage(Stage(name="double", function=double)).run(items()))
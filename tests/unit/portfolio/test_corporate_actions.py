@@ -0,0 +1,132 @@
+from datetime import date
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.security import Security
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.enums import TransactionType
+from correpy.portfolio.corporate_actions import (
+    CorporateAction,
+    CorporateActionIndex,
+    CorporateActionType,
+    read_corporate_actions,
+    scale_price,
+)
+from correpy.portfolio.exceptions import InvalidCorporateActionException
+
+SPLIT = CorporateAction(
+    ticker="PETR4", ex_date=date(2022, 3, 1), action_type=CorporateActionType.SPLIT, factor=Fraction(2)
+)
+BONUS = CorporateAction(
+    ticker="PETR4", ex_date=date(2022, 6, 1), action_type=CorporateActionType.BONUS, factor=Fraction(11, 10)
+)
+REVERSE_SPLIT = CorporateAction(
+    ticker="PETR4", ex_date=date(2022, 1, 10), action_type=CorporateActionType.REVERSE_SPLIT, factor=Fraction(1, 10)
+)
+
+
+def test_corporate_action_index_when_getting_factor_then_multiplies_events_after_start_up_to_end():
+    index = CorporateActionIndex([BONUS, SPLIT])
+
+    assert index.get_factor("PETR4", start=date(2022, 2, 28)) == Fraction(22, 10)
+    assert index.get_factor("PETR4", start=date(2022, 3, 1)) == Fraction(11, 10)
+    assert index.get_factor("PETR4", start=date(2022, 2, 28), end=date(2022, 5, 31)) == 2
+    assert index.get_factor("PETR4", start=date(2022, 6, 1)) == 1
+    assert index.get_factor("VALE3", start=date(2022, 1, 1)) == 1
+
+
+def test_corporate_action_index_when_older_event_is_added_then_updates_the_cumulative_factors():
+    index = CorporateActionIndex([SPLIT, BONUS])
+
+    assert index.add_corporate_action(REVERSE_SPLIT)
+    assert not index.add_corporate_action(REVERSE_SPLIT)
+
+    assert index.get_corporate_actions("PETR4") == [REVERSE_SPLIT, SPLIT, BONUS]
+    assert index.get_factor("PETR4", start=date(2022, 1, 3)) == Fraction(22, 100)
+    assert index.get_factor("PETR4", start=date(2022, 1, 10)) == Fraction(22, 10)
+
+
+def test_corporate_action_index_when_adjusting_notes_then_keeps_gross_value_and_notes_without_events():
+    index = CorporateActionIndex([SPLIT])
+    brokerage_notes = [
+        BrokerageNote(
+            reference_id=reference_id,
+            reference_date=reference_date,
+            transactions=[
+                Transaction(
+                    transaction_type=TransactionType.BUY,
+                    amount=Decimal(100),
+                    unit_price=Decimal("30.10"),
+                    security=Security(name="PETROBRAS PN PETR4 N2"),
+                )
+            ],
+        )
+        for reference_id, reference_date in ((1, date(2022, 2, 25)), (2, date(2022, 3, 1)))
+    ]
+
+    adjusted_brokerage_notes = index.adjust_brokerage_notes(brokerage_notes)
+
+    adjusted_transaction = adjusted_brokerage_notes[0].transactions[0]
+    assert (adjusted_transaction.amount, adjusted_transaction.unit_price) == (Decimal(200), Decimal("15.05"))
+    assert brokerage_notes[0].transactions[0].amount == Decimal(100)
+    assert adjusted_brokerage_notes[1] is brokerage_notes[1]
+    assert index.adjust_brokerage_notes(brokerage_notes, at=date(2022, 2, 28))[0] is brokerage_notes[0]
+
+
+def test_corporate_action_index_when_adjusting_sell_transaction_then_keeps_its_withheld_taxes():
+    transaction = Transaction(
+        transaction_type=TransactionType.SELL,
+        amount=Decimal(100),
+        unit_price=Decimal("17.00"),
+        security=Security(name="PETROBRAS PN PETR4 N2"),
+    )
+
+    adjusted_transaction = CorporateActionIndex([BONUS]).adjust_transaction(transaction, trade_date=date(2022, 5, 31))
+
+    assert (adjusted_transaction.amount, adjusted_transaction.unit_price) == (Decimal(110), Decimal("15.4545454545"))
+    assert adjusted_transaction.source_withheld_taxes == transaction.source_withheld_taxes == Decimal("0.09")
+
+
+def test_scale_price_when_factor_has_no_exact_decimal_price_then_rounds_price_keeping_gross_value_within_a_cent():
+    price = scale_price(Decimal("10.00"), Fraction(3))
+
+    assert price == Decimal("3.3333333333")
+    assert abs(price * 1_000_000 * 3 - Decimal("10.00") * 1_000_000) < Decimal("0.01")
+    assert str(scale_price(Decimal("30.10"), Fraction(2))) == "15.05"
+
+
+def test_corporate_action_when_factor_does_not_match_type_then_raises_invalid_corporate_action_exception():
+    with pytest.raises(InvalidCorporateActionException):
+        CorporateAction(
+            ticker="PETR4", ex_date=date(2022, 3, 1), action_type=CorporateActionType.REVERSE_SPLIT, factor=Fraction(2)
+        )
+
+
+def test_read_corporate_actions_when_called_then_parses_types_dates_and_fractions(tmp_path):
+    path = tmp_path / "eventos.csv"
+    path.write_text(
+        "ticker;ex_date;action_type;factor\n"
+        "petr4;2022-03-01;SPLIT;2\n"
+        "PETR4;10/01/2022;GRUPAMENTO;1/10\n"
+        "PETR4;2022-06-01;bonificacao;1.1\n",
+        encoding="utf-8",
+    )
+
+    assert list(read_corporate_actions(path)) == [SPLIT, REVERSE_SPLIT, BONUS]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["ticker;date;factor\nPETR4;2022-03-01;2\n", "ticker;ex_date;action_type;factor\nPETR4;2022-03-01;FUSAO;2\n"],
+)
+def test_read_corporate_actions_when_file_is_not_valid_then_raises_invalid_corporate_action_exception(
+    tmp_path, content
+):
+    path = tmp_path / "eventos.csv"
+    path.write_text(content, encoding="utf-8")
+
+    with pytest.raises(InvalidCorporateActionException):
+        list(read_corporate_actions(path))
@@ -0,0 +1,108 @@
+from datetime import date
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+
+from correpy.domain.enums import TransactionType
+from correpy.portfolio.corporate_actions import CorporateAction, CorporateActionType
+from correpy.portfolio.exceptions import DuplicatedBrokerageNoteException
+from correpy.portfolio.ledger import Position, PositionLedger, prorate_fees
+from tests.factories import build_brokerage_note
+
+
+def test_prorate_fees_when_called_then_splits_by_gross_value_and_adds_up_to_the_fees():
+    transactions = build_brokerage_note(
+        1, date(2022, 1, 3), [(TransactionType.BUY, 1, 10, "VALE3"), (TransactionType.BUY, 2, 10, "PETR4")]
+    ).transactions
+
+    shares = prorate_fees(fees=Decimal("3.00"), transactions=transactions)
+
+    assert sum(shares) == Decimal("3.00")
+    assert shares[1] == 2 * shares[0]
+
+
+def test_position_ledger_when_buying_and_selling_then_keeps_average_cost_and_realized_profit():
+    ledger = PositionLedger()
+    ledger.add_brokerage_note(
+        build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 100, 10, "VALE3 ON")], emoluments=Decimal(10))
+    )
+    ledger.add_brokerage_note(build_brokerage_note(2, date(2022, 2, 3), [(TransactionType.BUY, 100, 12, "VALE3 ON")]))
+    ledger.add_brokerage_note(
+        build_brokerage_note(
+            3, date(2022, 3, 3), [(TransactionType.SELL, 50, 15, "VALE3 ON")], emoluments=Decimal(5), irrf=Decimal(1)
+        )
+    )
+
+    assert ledger.get_position("VALE3") == Position(
+        ticker="VALE3", amount=Decimal(150), average_cost=Decimal("11.05"), realized_profit=Decimal("192.50")
+    )
+    assert ledger.get_position("VALE3", at=date(2022, 1, 31)).amount == Decimal(100)
+    assert ledger.get_position("VALE3", at=date(2021, 12, 31)).amount == Decimal(0)
+    assert ledger.get_realized_profit(start=date(2022, 3, 1), end=date(2022, 3, 31)) == Decimal("192.50")
+    assert ledger.get_tickers_traded_on(date(2022, 2, 3)) == {"VALE3"}
+
+
+def test_position_ledger_when_note_is_older_than_the_last_one_then_recomputes_following_entries():
+    in_order_ledger = PositionLedger()
+    out_of_order_ledger = PositionLedger()
+    brokerage_notes = [
+        build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 100, 10, "PETR4")]),
+        build_brokerage_note(2, date(2022, 2, 3), [(TransactionType.BUY, 100, 20, "PETR4")]),
+        build_brokerage_note(3, date(2022, 3, 3), [(TransactionType.SELL, 100, 30, "PETR4")]),
+    ]
+
+    in_order_ledger.add_brokerage_notes(brokerage_notes)
+    out_of_order_ledger.add_brokerage_notes([brokerage_notes[0], brokerage_notes[2], brokerage_notes[1]])
+
+    assert out_of_order_ledger.get_position("PETR4") == in_order_ledger.get_position("PETR4")
+    assert out_of_order_ledger.get_entries("PETR4") == in_order_ledger.get_entries("PETR4")
+    assert in_order_ledger.get_position("PETR4").realized_profit == Decimal(1500)
+
+
+def test_position_ledger_when_selling_more_than_held_then_opens_a_short_position():
+    ledger = PositionLedger()
+    ledger.add_brokerage_note(build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 10, 10, "ITSA4")]))
+    ledger.add_brokerage_note(build_brokerage_note(2, date(2022, 1, 4), [(TransactionType.SELL, 30, 12, "ITSA4")]))
+    ledger.add_brokerage_note(build_brokerage_note(3, date(2022, 1, 5), [(TransactionType.BUY, 20, 11, "ITSA4")]))
+
+    position = ledger.get_position("ITSA4")
+    assert position.amount == Decimal(0)
+    assert position.realized_profit == Decimal(20 + 20)
+    assert ledger.get_positions() == {}
+
+
+def test_position_ledger_when_note_is_added_twice_then_raises_duplicated_note():
+    ledger = PositionLedger()
+    brokerage_note = build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 10, 10, "ITSA4")])
+    ledger.add_brokerage_note(brokerage_note)
+
+    with pytest.raises(DuplicatedBrokerageNoteException):
+        ledger.add_brokerage_note(brokerage_note)
+
+
+def test_position_ledger_when_corporate_actions_are_added_then_adjusts_positions_after_their_ex_date():
+    ledger = PositionLedger()
+    ledger.add_brokerage_note(build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 100, 30, "PETR4")]))
+    ledger.add_brokerage_note(build_brokerage_note(2, date(2022, 4, 1), [(TransactionType.SELL, 100, 20, "PETR4")]))
+
+    ledger.add_corporate_action(
+        CorporateAction(
+            ticker="PETR4", ex_date=date(2022, 3, 1), action_type=CorporateActionType.SPLIT, factor=Fraction(2)
+        )
+    )
+    ledger.add_corporate_action(
+        CorporateAction(
+            ticker="PETR4", ex_date=date(2022, 6, 1), action_type=CorporateActionType.BONUS, factor=Fraction(11, 10)
+        )
+    )
+
+    assert ledger.get_position("PETR4", at=date(2022, 2, 28)).amount == Decimal(100)
+    assert ledger.get_position("PETR4", at=date(2022, 3, 1)) == Position(
+        ticker="PETR4", amount=Decimal(200), average_cost=Decimal(15)
+    )
+    assert ledger.get_position("PETR4", at=date(2022, 4, 1)) == Position(
+        ticker="PETR4", amount=Decimal(100), average_cost=Decimal(15), realized_profit=Decimal(500)
+    )
+    assert ledger.get_position("PETR4").amount == Decimal(110)
+    assert ledger.get_entries("PETR4")[1].amount == Decimal(100)
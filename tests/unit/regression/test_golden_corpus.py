@@ -0,0 +1,86 @@
+from correpy.regression.golden_corpus import (
+    DocumentResult,
+    FieldMismatch,
+    ParserStats,
+    ThroughputRegression,
+    build_parser_stats,
+    compare_json,
+    find_throughput_regressions,
+)
+
+
+def test_compare_json_when_leaf_fields_differ_then_returns_their_paths():
+    expected = [{"reference_id": 1, "transactions": [{"amount": "10"}, {"amount": "5"}]}]
+    actual = [{"reference_id": 1, "transactions": [{"amount": "11"}]}, {"reference_id": 2}]
+
+    assert compare_json(expected, actual, document="a.pdf") == [
+        FieldMismatch(document="a.pdf", field_path="[0].transactions[0].amount", expected="10", actual="11"),
+        FieldMismatch(document="a.pdf", field_path="[0].transactions[1]", expected={"amount": "5"}, actual=None),
+        FieldMismatch(document="a.pdf", field_path="[1]", expected=None, actual={"reference_id": 2}),
+    ]
+
+
+def test_compare_json_when_outputs_are_equal_then_returns_no_mismatch():
+    output = [{"reference_id": 1, "transactions": [{"security": {"ticker": None}}]}]
+
+    assert compare_json(output, output, document="a.pdf") == []
+
+
+def test_build_parser_stats_when_called_then_computes_throughput_and_percentiles_by_parser():
+    results = [
+        DocumentResult(document=f"{index}.pdf", parser_name="B3Parser", latency_in_seconds=0.01 * index)
+        for index in range(1, 21)
+    ]
+    results.append(DocumentResult(document="inter.pdf", parser_name="InterParser", latency_in_seconds=0.5))
+
+    stats_by_parser = build_parser_stats(results)
+
+    assert list(stats_by_parser) == ["B3Parser", "InterParser"]
+    assert round(stats_by_parser["B3Parser"].documents_per_second, 2) == round(20 / 2.1, 2)
+    assert stats_by_parser["B3Parser"].latency_p50_in_seconds == 0.1
+    assert stats_by_parser["B3Parser"].latency_p95_in_seconds == 0.19
+    assert stats_by_parser["InterParser"].documents_per_second == 2.0
+
+
+def test_build_parser_stats_when_documents_failed_then_counts_them_apart_from_throughput_and_percentiles():
+    results = [
+        DocumentResult(document="a.pdf", parser_name="B3Parser", latency_in_seconds=0.1),
+        DocumentResult(document="b.pdf", parser_name="B3Parser", latency_in_seconds=5.0, error="TimeoutError: "),
+        DocumentResult(document="c.pdf", parser_name="Unknown", latency_in_seconds=0.01, error="ValueError: "),
+    ]
+
+    stats_by_parser = build_parser_stats(results)
+
+    assert stats_by_parser == {
+        "B3Parser": ParserStats(
+            parser_name="B3Parser",
+            documents=1,
+            documents_per_second=10.0,
+            latency_p50_in_seconds=0.1,
+            latency_p95_in_seconds=0.1,
+            failed_documents=1,
+        ),
+        "Unknown": ParserStats(
+            parser_name="Unknown",
+            documents=0,
+            documents_per_second=0.0,
+            latency_p50_in_seconds=0.0,
+            latency_p95_in_seconds=0.0,
+            failed_documents=1,
+        ),
+    }
+    assert not find_throughput_regressions(stats_by_parser, baseline={"B3Parser": 10.0, "Unknown": 10.0})
+
+
+def test_find_throughput_regressions_when_throughput_drops_beyond_margin_then_returns_regression():
+    results = [DocumentResult(document="a.pdf", parser_name="B3Parser", latency_in_seconds=0.1)]
+    results.append(DocumentResult(document="b.pdf", parser_name="InterParser", latency_in_seconds=0.1))
+    stats_by_parser = build_parser_stats(results)
+
+    regressions = find_throughput_regressions(
+        stats_by_parser, baseline={"B3Parser": 12.4, "InterParser": 13.0, "NuInvestParser": 1.0}, margin=0.2
+    )
+
+    assert regressions == [
+        ThroughputRegression(parser_name="InterParser", documents_per_second=10.0, baseline_documents_per_second=13.0)
+    ]
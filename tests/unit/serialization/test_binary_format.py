@@ -0,0 +1,91 @@
+from decimal import Decimal
+from multiprocessing import Pipe
+
+import pytest
+
+from correpy.serialization.binary_format import (
+    BrokerageNoteBatchView,
+    decode_brokerage_notes,
+    encode_brokerage_notes,
+)
+from correpy.serialization.exceptions import InvalidWireFormatException
+from correpy.serialization.transport import (
+    read_brokerage_notes_from_shared_memory,
+    receive_brokerage_notes,
+    send_brokerage_notes,
+    write_brokerage_notes_to_shared_memory,
+)
+from tests.factories import BrokerageNoteFactory, SecurityFactory, TransactionFactory
+
+
+def build_brokerage_notes():
+    return [
+        BrokerageNoteFactory(
+            transactions=[
+                TransactionFactory(security=SecurityFactory(name="PETROBRAS PN PETR4")),
+                TransactionFactory(security=SecurityFactory(name="BBSEGURIDADE ON NM")),
+            ]
+        ),
+        BrokerageNoteFactory(transactions=[]),
+        BrokerageNoteFactory(settlement_fee=Decimal("7.920"), emoluments=Decimal("5E+3")),
+    ]
+
+
+def test_decode_brokerage_notes_when_called_with_encoded_notes_then_rebuilds_exactly_the_same_notes():
+    brokerage_notes = build_brokerage_notes()
+
+    decoded_brokerage_notes = decode_brokerage_notes(encode_brokerage_notes(brokerage_notes))
+
+    assert decoded_brokerage_notes == brokerage_notes
+    assert repr(decoded_brokerage_notes) == repr(brokerage_notes)
+
+
+def test_decode_brokerage_notes_when_values_do_not_fit_fixed_point_then_rebuilds_exact_values():
+    brokerage_note = BrokerageNoteFactory(
+        transactions=[TransactionFactory(amount=Decimal("12345678901234567890.123"), unit_price=Decimal("1E-200"))]
+    )
+
+    assert decode_brokerage_notes(encode_brokerage_notes([brokerage_note])) == [brokerage_note]
+
+
+def test_brokerage_note_batch_view_when_called_then_exposes_columns_without_building_notes():
+    brokerage_notes = build_brokerage_notes()
+
+    batch_view = BrokerageNoteBatchView(encode_brokerage_notes(brokerage_notes))
+
+    assert len(batch_view) == 3
+    assert list(batch_view.reference_ids) == [brokerage_note.reference_id for brokerage_note in brokerage_notes]
+    assert list(batch_view.transactions_counts) == [2, 0, 1]
+    assert batch_view[1] == brokerage_notes[1]
+
+
+def test_brokerage_note_batch_view_when_called_with_other_version_then_raises_invalid_wire_format_exception():
+    payload = bytearray(encode_brokerage_notes(build_brokerage_notes()))
+    payload[4] = 99
+
+    with pytest.raises(InvalidWireFormatException):
+        BrokerageNoteBatchView(payload)
+
+
+def test_brokerage_note_batch_view_when_called_with_truncated_buffer_then_raises_invalid_wire_format_exception():
+    payload = encode_brokerage_notes(build_brokerage_notes())
+
+    with pytest.raises(InvalidWireFormatException):
+        BrokerageNoteBatchView(payload[:40])
+
+
+def test_receive_brokerage_notes_when_notes_sent_through_pipe_then_returns_same_notes():
+    brokerage_notes = build_brokerage_notes()
+    receiver, sender = Pipe(duplex=False)
+
+    send_brokerage_notes(sender, brokerage_notes)
+
+    assert receive_brokerage_notes(receiver) == brokerage_notes
+
+
+def test_read_brokerage_notes_from_shared_memory_when_called_with_block_name_then_returns_same_notes():
+    brokerage_notes = build_brokerage_notes()
+    shared_memory = write_brokerage_notes_to_shared_memory(brokerage_notes)
+    shared_memory.close()
+
+    assert read_brokerage_notes_from_shared_memory(name=shared_memory.name) == brokerage_notes
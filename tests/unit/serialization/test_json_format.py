@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from correpy.domain.enums import SecurityType, TransactionType
+from correpy.serialization.json_format import brokerage_note_to_json
+from tests.factories import BrokerageNoteFactory, SecurityFactory, TransactionFactory
+
+
+def test_brokerage_note_to_json_when_called_then_keeps_decimals_as_strings():
+    transaction = TransactionFactory(
+        transaction_type=TransactionType.BUY,
+        amount=Decimal("100"),
+        unit_price=Decimal("28.50"),
+        security=SecurityFactory(name="PETROBRAS PN", ticker="PETR4", security_type=SecurityType.STOCK),
+    )
+    brokerage_note = BrokerageNoteFactory(settlement_fee=Decimal("0.710"), transactions=[transaction])
+
+    brokerage_note_json = brokerage_note_to_json(brokerage_note)
+
+    assert brokerage_note_json["reference_id"] == brokerage_note.reference_id
+    assert brokerage_note_json["settlement_fee"] == "0.710"
+    assert brokerage_note_json["transactions"] == [
+        {
+            "transaction_type": TransactionType.BUY.value,
+            "amount": "100",
+            "unit_price": "28.50",
+            "source_withheld_taxes": "0",
+            "security": {"name": "PETROBRAS PN", "ticker": "PETR4", "security_type": "STOCK"},
+        }
+    ]
@@ -0,0 +1,57 @@
+import socket
+
+import pytest
+
+from correpy.server.exceptions import InvalidMessageException
+from correpy.server.protocol import (
+    MAX_PAYLOAD_SIZE,
+    MESSAGE_PREFIX_STRUCT,
+    is_loopback_host,
+    receive_message,
+    send_message,
+)
+
+
+def test_send_message_when_called_then_receive_message_returns_header_and_payload():
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        send_message(sender, {"command": "parse", "password": None}, b"%PDF")
+        send_message(sender, {"command": "stats"})
+
+        assert receive_message(receiver) == ({"command": "parse", "password": None}, b"%PDF")
+        assert receive_message(receiver) == ({"command": "stats"}, b"")
+
+
+def test_receive_message_when_connection_is_closed_between_messages_then_returns_none():
+    sender, receiver = socket.socketpair()
+    with receiver:
+        sender.close()
+
+        assert receive_message(receiver) is None
+
+
+def test_receive_message_when_connection_is_closed_in_the_middle_of_a_message_then_raises_invalid_message():
+    sender, receiver = socket.socketpair()
+    with receiver:
+        sender.sendall(MESSAGE_PREFIX_STRUCT.pack(10, 0) + b"{}")
+        sender.close()
+
+        with pytest.raises(InvalidMessageException):
+            receive_message(receiver)
+
+
+def test_receive_message_when_payload_is_too_large_then_raises_invalid_message_before_reading_it():
+    sender, receiver = socket.socketpair()
+    with sender, receiver:
+        sender.sendall(MESSAGE_PREFIX_STRUCT.pack(2, MAX_PAYLOAD_SIZE + 1) + b"{}")
+
+        with pytest.raises(InvalidMessageException):
+            receive_message(receiver)
+
+
+@pytest.mark.parametrize(
+    "host, expected_result",
+    [("127.0.0.1", True), ("::1", True), ("localhost", True), ("0.0.0.0", False), ("", False), ("192.168.0.10", False)],
+)
+def test_is_loopback_host_when_called_then_returns_whether_every_address_of_host_is_loopback(host, expected_result):
+    assert is_loopback_host(host) == expected_result
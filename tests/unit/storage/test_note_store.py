@@ -0,0 +1,79 @@
+from datetime import date
+from decimal import Decimal
+
+from correpy.domain.enums import BrokerageNoteFeeType, TransactionType
+from correpy.storage.note_store import NoteStore
+from tests.factories import build_brokerage_note
+
+
+def build_note_store():
+    note_store = NoteStore()
+    note_store.add_brokerage_notes(
+        [
+            build_brokerage_note(
+                3,
+                date(2022, 4, 1),
+                [(TransactionType.SELL, 10, 30, "PETR4")],
+                emoluments=Decimal("0.30"),
+            ),
+            build_brokerage_note(
+                1,
+                date(2022, 3, 1),
+                [(TransactionType.BUY, 100, 20, "PETR4"), (TransactionType.BUY, 10, 60, "VALE3")],
+                emoluments=Decimal("1.00"),
+            ),
+            build_brokerage_note(
+                2,
+                date(2022, 3, 15),
+                [(TransactionType.SELL, 50, 25, "PETR4")],
+                emoluments=Decimal("0.50"),
+            ),
+        ]
+    )
+    return note_store
+
+
+def test_note_store_get_transactions_when_filtering_by_ticker_and_date_then_returns_only_matching_in_date_order():
+    note_store = build_note_store()
+
+    stored_transactions = note_store.get_transactions(ticker="PETR4", start=date(2022, 3, 1), end=date(2022, 3, 31))
+
+    assert [stored_transaction.reference_id for stored_transaction in stored_transactions] == [1, 2]
+    assert note_store.get_transactions(ticker="PETR4", transaction_type=TransactionType.SELL)[0].reference_id == 2
+    assert len(note_store.get_transactions(transaction_type=TransactionType.BUY)) == 2
+    assert note_store.get_transactions(ticker="ITSA4") == []
+
+
+def test_note_store_get_brokerage_notes_when_called_with_date_range_then_returns_notes_in_date_order():
+    note_store = build_note_store()
+
+    assert [note.reference_id for note in note_store.get_brokerage_notes()] == [1, 2, 3]
+    assert [note.reference_id for note in note_store.get_brokerage_notes(start=date(2022, 3, 2))] == [2, 3]
+    assert note_store.get_brokerage_note(reference_id=2, reference_date=date(2022, 3, 15)).emoluments == Decimal("0.50")
+    assert note_store.get_brokerage_notes_by_reference_id(reference_id=4) == []
+
+
+def test_note_store_aggregates_when_called_then_sum_fees_and_volumes_of_the_range():
+    note_store = build_note_store()
+
+    assert note_store.get_fees(end=date(2022, 3, 31))[BrokerageNoteFeeType.EMOLUMENTS] == Decimal("1.50")
+    assert note_store.get_volume(ticker="PETR4", transaction_type=TransactionType.SELL) == Decimal(1550)
+    assert note_store.get_volume(start=date(2022, 3, 1), end=date(2022, 3, 1)) == Decimal(2600)
+    assert note_store.get_traded_amount(ticker="PETR4", transaction_type=TransactionType.BUY) == Decimal(100)
+
+
+def test_note_store_add_brokerage_note_when_note_key_is_already_stored_then_merges_the_partial_note():
+    note_store = build_note_store()
+
+    note_store.add_brokerage_note(
+        build_brokerage_note(
+            2, date(2022, 3, 15), [(TransactionType.SELL, 50, 26, "PETR4")], emoluments=Decimal("0.50")
+        )
+    )
+
+    brokerage_note = note_store.get_brokerage_note(reference_id=2, reference_date=date(2022, 3, 15))
+    assert len(note_store) == 3
+    assert len(brokerage_note.transactions) == 2
+    assert brokerage_note.emoluments == Decimal("1.00")
+    assert len(note_store.get_transactions(ticker="PETR4")) == 4
+    assert note_store.get_index_memory_in_bytes() > 0
@@ -0,0 +1,122 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from correpy.domain.entities.brokerage_note import BrokerageNote
+from correpy.domain.entities.security import Security
+from correpy.domain.entities.transaction import Transaction
+from correpy.domain.enums import SecurityType, TransactionType
+from correpy.storage.sqlite_repository import SQLiteNoteRepository
+from tests.factories import build_brokerage_note
+
+
+def test_save_brokerage_notes_when_loading_then_returns_the_same_notes_ordered_by_date():
+    brokerage_notes = [
+        build_brokerage_note(
+            2,
+            date(2022, 3, 15),
+            [(TransactionType.SELL, 50, "25.10", "PETR4"), (TransactionType.BUY, 5, "61.005", "VALE3")],
+            emoluments=Decimal("0.50"),
+        ),
+        build_brokerage_note(1, date(2022, 3, 1), [(TransactionType.BUY, 100, "20.00", "PETR4 PN")]),
+        build_brokerage_note(3, date(2022, 4, 1), []),
+    ]
+
+    with SQLiteNoteRepository(batch_size=2) as repository:
+        repository.save_brokerage_notes(brokerage_notes)
+        loaded_brokerage_notes = list(repository.iter_brokerage_notes())
+
+    assert loaded_brokerage_notes == [brokerage_notes[1], brokerage_notes[0], brokerage_notes[2]]
+    assert loaded_brokerage_notes[1].transactions[0].source_withheld_taxes == Decimal("0.06")
+    assert loaded_brokerage_notes[1].transactions[1].unit_price == Decimal("61.005")
+
+
+def test_save_brokerage_notes_when_saved_again_then_replaces_the_note_and_its_transactions():
+    with SQLiteNoteRepository() as repository:
+        repository.save_brokerage_notes([build_brokerage_note(1, date(2022, 3, 1), [(TransactionType.BUY, 1, 2, "A")])])
+        updated_brokerage_note = build_brokerage_note(
+            1, date(2022, 3, 1), [(TransactionType.SELL, 3, 4, "B")], emoluments=Decimal("0.10")
+        )
+        repository.save_brokerage_notes([updated_brokerage_note])
+
+        assert repository.count_brokerage_notes() == 1
+        assert repository.count_transactions() == 1
+        assert repository.get_brokerage_note(1, date(2022, 3, 1)) == updated_brokerage_note
+
+
+def test_save_brokerage_notes_when_brokers_differ_then_keeps_one_note_per_broker():
+    brokerage_note = build_brokerage_note(1, date(2022, 3, 1), [(TransactionType.BUY, 1, 2, "A")])
+
+    with SQLiteNoteRepository() as repository:
+        repository.save_brokerage_notes([brokerage_note], broker="02.332.886/0011-78")
+        repository.save_brokerage_notes([brokerage_note], broker="27.652.684/0001-62")
+
+        assert repository.count_brokerage_notes() == 2
+        assert list(repository.iter_brokerage_notes(broker="02.332.886/0011-78")) == [brokerage_note]
+        assert repository.get_brokerage_note(1, date(2022, 3, 1)) is None
+
+
+def test_iter_brokerage_notes_when_filtering_by_date_then_returns_only_notes_in_range():
+    brokerage_notes = [build_brokerage_note(day, date(2022, 3, day), []) for day in range(1, 11)]
+
+    with SQLiteNoteRepository() as repository:
+        repository.save_brokerage_notes(brokerage_notes)
+        loaded_brokerage_notes = list(repository.iter_brokerage_notes(start=date(2022, 3, 3), end=date(2022, 3, 5)))
+
+    assert [brokerage_note.reference_id for brokerage_note in loaded_brokerage_notes] == [3, 4, 5]
+
+
+def test_save_brokerage_notes_when_using_a_file_then_notes_are_persisted(tmp_path):
+    path = str(tmp_path / "notes.sqlite")
+    brokerage_note = build_brokerage_note(1, date(2022, 3, 1), [(TransactionType.BUY, 1, 2, "A")])
+
+    with SQLiteNoteRepository(path=path) as repository:
+        repository.save_brokerage_notes([brokerage_note])
+    with SQLiteNoteRepository(path=path) as repository:
+        assert repository.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert list(repository.iter_brokerage_notes()) == [brokerage_note]
+
+
+def test_save_brokerage_notes_when_a_batch_is_rolled_back_then_next_batches_store_its_securities():
+    failing_brokerage_note = build_brokerage_note(1, date(2022, 3, 1), [(TransactionType.BUY, 1, 2, "PETROBRAS PN")])
+    # Fails once the securities of the batch were written, rolling the batch back
+    failing_brokerage_note.transactions[0].transaction_type = None
+    brokerage_note = build_brokerage_note(2, date(2022, 3, 2), [(TransactionType.BUY, 1, 2, "PETROBRAS PN")])
+
+    with SQLiteNoteRepository() as repository:
+        with pytest.raises(AttributeError):
+            repository.save_brokerage_notes([failing_brokerage_note])
+        repository.save_brokerage_notes([brokerage_note])
+
+        assert repository.count_brokerage_notes() == 1
+        assert repository.get_brokerage_note(2, date(2022, 3, 2)) == brokerage_note
+
+
+def test_save_brokerage_notes_when_security_is_saved_again_then_fills_its_missing_ticker_and_type_only():
+    def build_security_brokerage_note(reference_id, security):
+        return BrokerageNote(
+            reference_id=reference_id,
+            reference_date=date(2022, 3, reference_id),
+            transactions=[
+                Transaction(
+                    transaction_type=TransactionType.BUY, amount=Decimal(1), unit_price=Decimal(2), security=security
+                )
+            ],
+        )
+
+    brokerage_notes = [
+        build_security_brokerage_note(1, Security(name="PETROBRAS PN")),
+        build_security_brokerage_note(2, Security(name="PETROBRAS PN", ticker="PETR4")),
+        build_security_brokerage_note(3, Security(name="PETROBRAS PN", security_type=SecurityType.STOCK)),
+        build_security_brokerage_note(4, Security(name="PETROBRAS PN")),
+    ]
+
+    with SQLiteNoteRepository() as repository:
+        for brokerage_note in brokerage_notes:
+            repository.save_brokerage_notes([brokerage_note])
+        loaded_securities = [
+            brokerage_note.transactions[0].security for brokerage_note in repository.iter_brokerage_notes()
+        ]
+
+    assert loaded_securities == [Security(name="PETROBRAS PN", ticker="PETR4", security_type=SecurityType.STOCK)] * 4
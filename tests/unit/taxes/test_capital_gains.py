@@ -0,0 +1,257 @@
+from datetime import date
+from decimal import Decimal
+
+from pytest import mark, param
+
+from correpy.domain.enums import SecurityType, TransactionType
+from correpy.taxes.capital_gains import HAS_NUMPY, CapitalGainsTaxEngine
+from tests.factories import build_brokerage_note
+
+requires_numpy = mark.skipif(not HAS_NUMPY, reason="NumPy is not installed")
+use_numpy_options = mark.parametrize("use_numpy", [param(True, marks=requires_numpy), False])
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_swing_trade_sales_are_under_the_limit_then_gain_is_exempt(use_numpy):
+    brokerage_notes = [
+        build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 100, 10, "VALE3")]),
+        build_brokerage_note(2, date(2022, 1, 10), [(TransactionType.SELL, 100, 15, "VALE3")]),
+    ]
+
+    results = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert len(results) == 1
+    assert results[0].swing_trade_result == Decimal("500.00")
+    assert results[0].is_exempt
+    assert results[0].tax_due == Decimal("0.00")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_swing_trade_sales_are_over_the_limit_then_irrf_offsets_the_tax(use_numpy):
+    brokerage_notes = [
+        build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 2000, 10, "VALE3")]),
+        build_brokerage_note(2, date(2022, 2, 10), [(TransactionType.SELL, 2000, 15, "VALE3")]),
+    ]
+
+    results = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    february = results[1]
+    assert february.month == date(2022, 2, 1)
+    assert february.swing_trade_sales == Decimal("30000.00")
+    assert not february.is_exempt
+    assert february.tax_due == Decimal("1500.00")
+    assert february.irrf_offset == Decimal("1.50")
+    assert february.tax_payable == Decimal("1498.50")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_swing_trade_sales_are_exactly_the_limit_then_gain_is_exempt(use_numpy):
+    # As floats, 10000.10 + 9999.70 + 0.20 is 20000.000000000004
+    brokerage_notes = [
+        build_brokerage_note(
+            1,
+            date(2022, 1, 3),
+            [
+                (TransactionType.BUY, 1, "9000.00", "VALE3"),
+                (TransactionType.BUY, 1, "9000.00", "PETR4"),
+                (TransactionType.BUY, 1, "0.10", "ITSA4"),
+            ],
+        ),
+        build_brokerage_note(
+            2,
+            date(2022, 2, 10),
+            [
+                (TransactionType.SELL, 1, "10000.10", "VALE3"),
+                (TransactionType.SELL, 1, "9999.70", "PETR4"),
+                (TransactionType.SELL, 1, "0.20", "ITSA4"),
+            ],
+        ),
+    ]
+
+    february = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})[1]
+
+    assert february.stock_sales == Decimal("20000.00")
+    assert february.swing_trade_result == Decimal("1999.90")
+    assert february.is_exempt
+    assert february.tax_due == Decimal("0.00")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_month_has_loss_then_it_offsets_next_gains_of_the_same_kind(use_numpy):
+    brokerage_notes = [
+        build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 4000, 10, "PETR4")]),
+        build_brokerage_note(2, date(2022, 1, 10), [(TransactionType.SELL, 2500, 8, "PETR4")]),
+        build_brokerage_note(3, date(2022, 2, 10), [(TransactionType.SELL, 1500, 16, "PETR4")]),
+        build_brokerage_note(
+            4, date(2022, 2, 11), [(TransactionType.BUY, 100, 10, "ITSA4"), (TransactionType.SELL, 100, 12, "ITSA4")]
+        ),
+    ]
+
+    january, february = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert january.swing_trade_result == Decimal("-5000.00")
+    assert january.swing_trade_loss_carry_forward == Decimal("5000.00")
+    assert february.swing_trade_result == Decimal("9000.00")
+    assert february.swing_trade_tax_base == Decimal("4000.00")
+    assert february.swing_trade_loss_carry_forward == Decimal("0.00")
+    assert february.day_trade_result == Decimal("200.00")
+    assert february.day_trade_tax_base == Decimal("200.00")
+    assert february.tax_due == Decimal("640.00")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_tax_is_below_the_minimum_payment_then_it_is_postponed(use_numpy):
+    brokerage_notes = [
+        build_brokerage_note(
+            1, date(2022, 1, 3), [(TransactionType.BUY, 10, 10, "ITSA4"), (TransactionType.SELL, 10, 12, "ITSA4")]
+        ),
+        build_brokerage_note(
+            2, date(2022, 2, 3), [(TransactionType.BUY, 100, 10, "ITSA4"), (TransactionType.SELL, 100, 11, "ITSA4")]
+        ),
+    ]
+
+    january, february = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert january.tax_due == Decimal("4.00")
+    assert january.tax_payable == Decimal("0.00")
+    assert february.tax_due == Decimal("20.00")
+    # January tax minus its IRRF (3.99) is paid with February's, both offset by the IRRF of the sells
+    assert february.tax_payable == Decimal("23.93")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_real_estate_fund_has_gain_then_it_is_taxed_at_20_percent_without_exemption(
+    use_numpy,
+):
+    brokerage_notes = [
+        build_brokerage_note(
+            1, date(2022, 1, 3), [(TransactionType.BUY, 100, 100, "HGLG11")], SecurityType.REAL_STATE_FUND
+        ),
+        build_brokerage_note(
+            2, date(2022, 1, 10), [(TransactionType.SELL, 100, 150, "HGLG11")], SecurityType.REAL_STATE_FUND
+        ),
+    ]
+
+    results = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert len(results) == 1
+    assert not results[0].is_exempt
+    assert results[0].swing_trade_sales == Decimal("0.00")
+    assert results[0].swing_trade_result == Decimal("0.00")
+    assert results[0].real_estate_fund_result == Decimal("5000.00")
+    assert results[0].real_estate_fund_tax_base == Decimal("5000.00")
+    assert results[0].tax_due == Decimal("1000.00")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_real_estate_fund_has_day_trade_then_it_is_a_real_estate_fund_result(use_numpy):
+    brokerage_notes = [
+        build_brokerage_note(
+            1,
+            date(2022, 1, 3),
+            [(TransactionType.BUY, 100, 100, "HGLG11"), (TransactionType.SELL, 100, 110, "HGLG11")],
+            SecurityType.REAL_STATE_FUND,
+        ),
+    ]
+
+    results = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert results[0].day_trade_result == Decimal("0.00")
+    assert results[0].real_estate_fund_result == Decimal("1000.00")
+    assert results[0].tax_due == Decimal("200.00")
+
+
+@use_numpy_options
+@mark.parametrize("security_type", [SecurityType.ETF, SecurityType.BDR, SecurityType.OPTION])
+def test_capital_gains_tax_engine_when_security_is_not_a_stock_then_its_gain_has_no_exemption(use_numpy, security_type):
+    brokerage_notes = [
+        build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 100, 100, "BOVA11")], security_type),
+        build_brokerage_note(2, date(2022, 1, 10), [(TransactionType.SELL, 100, 150, "BOVA11")], security_type),
+    ]
+
+    results = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert not results[0].is_exempt
+    assert results[0].swing_trade_sales == Decimal("15000.00")
+    assert results[0].stock_sales == Decimal("0.00")
+    assert results[0].swing_trade_tax_base == Decimal("5000.00")
+    assert results[0].tax_due == Decimal("750.00")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_month_has_stock_and_etf_sales_then_only_stock_sales_count_toward_exemption(
+    use_numpy,
+):
+    brokerage_notes = [
+        build_brokerage_note(1, date(2022, 1, 3), [(TransactionType.BUY, 1000, 10, "VALE3")], SecurityType.STOCK),
+        build_brokerage_note(2, date(2022, 1, 3), [(TransactionType.BUY, 100, 100, "BOVA11")], SecurityType.ETF),
+        build_brokerage_note(3, date(2022, 1, 10), [(TransactionType.SELL, 1000, 15, "VALE3")], SecurityType.STOCK),
+        build_brokerage_note(4, date(2022, 1, 10), [(TransactionType.SELL, 100, 120, "BOVA11")], SecurityType.ETF),
+    ]
+
+    results = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert results[0].swing_trade_sales == Decimal("27000.00")
+    assert results[0].stock_sales == Decimal("15000.00")
+    assert results[0].is_exempt
+    assert results[0].swing_trade_result == Decimal("7000.00")
+    assert results[0].swing_trade_tax_base == Decimal("2000.00")
+    assert results[0].tax_due == Decimal("300.00")
+
+
+@use_numpy_options
+def test_capital_gains_tax_engine_when_real_estate_fund_has_loss_then_it_only_offsets_real_estate_fund_gains(
+    use_numpy,
+):
+    brokerage_notes = [
+        build_brokerage_note(
+            1, date(2022, 1, 3), [(TransactionType.BUY, 200, 100, "HGLG11")], SecurityType.REAL_STATE_FUND
+        ),
+        build_brokerage_note(2, date(2022, 1, 3), [(TransactionType.BUY, 2000, 10, "VALE3")], SecurityType.STOCK),
+        build_brokerage_note(
+            3, date(2022, 1, 10), [(TransactionType.SELL, 100, 90, "HGLG11")], SecurityType.REAL_STATE_FUND
+        ),
+        build_brokerage_note(4, date(2022, 2, 10), [(TransactionType.SELL, 2000, 15, "VALE3")], SecurityType.STOCK),
+        build_brokerage_note(
+            5, date(2022, 3, 10), [(TransactionType.SELL, 100, 110, "HGLG11")], SecurityType.REAL_STATE_FUND
+        ),
+    ]
+
+    january, february, march = CapitalGainsTaxEngine(use_numpy=use_numpy).compute({"client": brokerage_notes})
+
+    assert january.real_estate_fund_loss_carry_forward == Decimal("1000.00")
+    assert january.swing_trade_loss_carry_forward == Decimal("0.00")
+    assert february.swing_trade_tax_base == Decimal("10000.00")
+    assert february.real_estate_fund_loss_carry_forward == Decimal("1000.00")
+    assert march.real_estate_fund_tax_base == Decimal("0.00")
+    assert march.real_estate_fund_loss_carry_forward == Decimal("0.00")
+
+
+@requires_numpy
+def test_capital_gains_tax_engine_when_called_with_many_clients_then_numpy_and_python_results_match():
+    brokerage_notes_by_client = {
+        f"client-{client_index}": [
+            build_brokerage_note(
+                note_index,
+                date(2022, note_index % 12 + 1, 5 + note_index % 3),
+                [
+                    (TransactionType.BUY, 100 + client_index, 10 + note_index % 3, ticker),
+                    (TransactionType.SELL, 50 + note_index, 9 + note_index % 5, ticker),
+                ],
+                security_type,
+            )
+            for note_index in range(24)
+            for ticker, security_type in (
+                ("VALE3", SecurityType.STOCK),
+                ("BOVA11", SecurityType.ETF),
+                ("HGLG11", SecurityType.REAL_STATE_FUND),
+            )
+        ]
+        for client_index in range(20)
+    }
+
+    numpy_results = CapitalGainsTaxEngine(use_numpy=True).compute(brokerage_notes_by_client)
+    python_results = CapitalGainsTaxEngine(use_numpy=False).compute(brokerage_notes_by_client)
+
+    assert numpy_results == python_results
+    assert len(numpy_results) == 20 * 12
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+
+from correpy.watch import change_detectors
+from correpy.watch.change_detectors import InotifyChangeDetector
+
+requires_inotify = pytest.mark.skipif(
+    not sys.platform.startswith("linux") or change_detectors._load_libc() is None,  # pylint:disable=protected-access
+    reason="inotify is not available",
+)
+
+
+@requires_inotify
+def test_inotify_change_detector_when_watch_can_not_be_added_then_closes_the_inotify_descriptor(tmp_path, monkeypatch):
+    missing_directory = str(tmp_path / "missing")
+    monkeypatch.setattr(os, "walk", lambda directory: iter([(missing_directory, [], [])]))
+    open_descriptors = set(os.listdir("/proc/self/fd"))
+
+    with pytest.raises(OSError):
+        InotifyChangeDetector([str(tmp_path)])
+
+    assert set(os.listdir("/proc/self/fd")) <= open_descriptors
+
+
+@requires_inotify
+def test_inotify_change_detector_when_file_is_written_then_returns_its_path(tmp_path):
+    detector = InotifyChangeDetector([str(tmp_path)])
+    try:
+        (tmp_path / "nota.pdf").write_bytes(b"pdf")
+
+        assert detector.wait(timeout=1.0) == {str(tmp_path / "nota.pdf")}
+    finally:
+        detector.close()
@@ -0,0 +1,98 @@
+import json
+import os
+
+import pytest
+
+from correpy.pipeline.pipeline import PipelineResult
+from correpy.watch.exceptions import InvalidWatchStateException
+from correpy.watch.folder_watcher import FolderWatcher, WatchState, get_file_signature
+
+
+class RecordingPipeline:
+    """Stands in for the brokerage note pipeline, returning one empty note list per document"""
+
+    def __init__(self):
+        self.sources = []
+
+    def run(self, jobs, ordered=False):
+        for index, job in enumerate(jobs):
+            self.sources.append(job.source)
+            if os.path.basename(job.source).startswith("broken"):
+                yield PipelineResult(index=index, item=job, error=ValueError("broken"), failed_stage="extraction")
+            else:
+                yield PipelineResult(index=index, item=job, value=[])
+
+
+def build_watcher(directory, state, settle_seconds=0.0):
+    sink_calls = []
+    pipeline = RecordingPipeline()
+    watcher = FolderWatcher(
+        directories=[directory],
+        sink=lambda source, brokerage_notes: sink_calls.append(source),
+        state=state,
+        pipeline=pipeline,
+        settle_seconds=settle_seconds,
+    )
+    return watcher, pipeline, sink_calls
+
+
+def test_run_once_when_file_is_still_changing_then_waits_until_it_settles(tmp_path):
+    path = tmp_path / "nota.pdf"
+    path.write_bytes(b"half")
+    watcher, _, sink_calls = build_watcher(tmp_path, WatchState(), settle_seconds=5)
+
+    assert watcher.run_once(now=0) == []
+    path.write_bytes(b"half written")
+    assert watcher.run_once(now=4) == []
+    assert watcher.run_once(now=8) == []
+    assert watcher.run_once(now=9) == [str(path)]
+    assert sink_calls == [str(path)]
+
+
+def test_run_once_when_state_file_has_the_files_then_only_new_and_changed_files_are_parsed(tmp_path):
+    directory = tmp_path / "notas"
+    (directory / "2022").mkdir(parents=True)
+    (directory / "antiga.pdf").write_bytes(b"pdf")
+    (directory / "2022" / "alterada.pdf").write_bytes(b"pdf")
+    (directory / "leiame.txt").write_bytes(b"text")
+    state_path = tmp_path / "state.json"
+    watcher, _, sink_calls = build_watcher(directory, WatchState(state_path))
+    watcher.run_once()
+
+    (directory / "2022" / "alterada.pdf").write_bytes(b"new pdf")
+    (directory / "nova.pdf").write_bytes(b"pdf")
+    restarted_watcher, pipeline, restarted_sink_calls = build_watcher(directory, WatchState(state_path))
+    restarted_watcher.run_once()
+
+    assert sorted(sink_calls) == [str(directory / "2022" / "alterada.pdf"), str(directory / "antiga.pdf")]
+    assert sorted(restarted_sink_calls) == [str(directory / "2022" / "alterada.pdf"), str(directory / "nova.pdf")]
+    assert restarted_watcher.run_once() == []
+    assert len(pipeline.sources) == 2
+
+
+def test_run_once_when_document_fails_then_records_error_and_parses_it_again_only_when_changed(tmp_path):
+    path = tmp_path / "broken.pdf"
+    path.write_bytes(b"pdf")
+    state = WatchState(tmp_path / "state.json")
+    watcher, pipeline, sink_calls = build_watcher(tmp_path, state)
+
+    watcher.run_once()
+    watcher.run_once()
+
+    assert sink_calls == []
+    assert len(pipeline.sources) == 1
+    assert state.processed_files[str(path)].error == f"{path}: ValueError: broken"
+    assert WatchState(tmp_path / "state.json").processed_files[str(path)].signature == get_file_signature(str(path))
+
+    path.write_bytes(b"fixed pdf")
+    watcher.run_once()
+
+    assert len(pipeline.sources) == 2
+
+
+def test_watch_state_when_file_is_not_valid_then_raises_exception(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"version": 1, "files": {"nota.pdf": {"size": 1}}}))
+
+    with pytest.raises(InvalidWatchStateException):
+        WatchState(path)
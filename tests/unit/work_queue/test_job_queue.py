@@ -0,0 +1,98 @@
+import sqlite3
+from unittest import mock
+
+import pytest
+
+from correpy.work_queue.exceptions import InvalidJobQueueException
+from correpy.work_queue.job_queue import JobQueue, JobStatus
+
+
+@pytest.fixture
+def queue_path(tmp_path):
+    return str(tmp_path / "queue.sqlite")
+
+
+def test_claim_when_jobs_are_pending_then_each_job_is_leased_to_one_worker(queue_path):
+    with JobQueue(queue_path) as job_queue, JobQueue(queue_path) as other_job_queue:
+        assert job_queue.enqueue(["a.pdf", "b.pdf", "c.pdf", "a.pdf"]) == 3
+
+        jobs = job_queue.claim("worker-1", limit=2)
+        other_jobs = other_job_queue.claim("worker-2", limit=2)
+
+        assert [job.source for job in jobs] == ["a.pdf", "b.pdf"]
+        assert [job.source for job in other_jobs] == ["c.pdf"]
+        assert job_queue.claim("worker-1") == []
+        assert job_queue.count_jobs()[JobStatus.RUNNING] == 3
+
+
+def test_claim_when_lease_expired_then_job_is_claimed_again_and_first_worker_loses_it(queue_path):
+    with JobQueue(queue_path, lease_in_seconds=10) as job_queue:
+        job_queue.enqueue(["a.pdf"])
+        with mock.patch("correpy.work_queue.job_queue.time.time", return_value=1000.0):
+            (job,) = job_queue.claim("worker-1")
+        with mock.patch("correpy.work_queue.job_queue.time.time", return_value=1011.0):
+            (reclaimed_job,) = job_queue.claim("worker-2")
+
+        assert reclaimed_job.attempts == 2
+        assert job_queue.complete("worker-1", job, result=b"late") is False
+        assert job_queue.complete("worker-2", reclaimed_job, result=b"notes") is True
+        (job_result,) = job_queue.iter_results()
+        assert (job_result.status, job_result.result, job_result.attempts) == (JobStatus.DONE, b"notes", 2)
+
+
+def test_renew_leases_when_lease_is_renewed_then_job_is_not_claimed_again(queue_path):
+    with JobQueue(queue_path, lease_in_seconds=10) as job_queue:
+        job_queue.enqueue(["a.pdf"])
+        with mock.patch("correpy.work_queue.job_queue.time.time", return_value=1000.0):
+            jobs = job_queue.claim("worker-1")
+        with mock.patch("correpy.work_queue.job_queue.time.time", return_value=1008.0):
+            assert job_queue.renew_leases("worker-1", jobs) == 1
+        with mock.patch("correpy.work_queue.job_queue.time.time", return_value=1011.0):
+            assert job_queue.claim("worker-2") == []
+
+
+def test_claim_when_lease_expired_on_every_attempt_then_job_fails(queue_path):
+    with JobQueue(queue_path, lease_in_seconds=10, max_attempts=2) as job_queue:
+        job_queue.enqueue(["crash.pdf"])
+        for now in (1000.0, 1011.0, 1022.0):
+            with mock.patch("correpy.work_queue.job_queue.time.time", return_value=now):
+                jobs = job_queue.claim("worker")
+
+        assert jobs == []
+        (job_result,) = job_queue.iter_results()
+        assert (job_result.status, job_result.error) == (JobStatus.FAILED, "Lease expired on every attempt")
+        assert not job_queue.has_unfinished_jobs()
+
+
+def test_claim_when_exhausted_jobs_come_first_then_fails_them_and_still_claims_pending_jobs(queue_path):
+    with JobQueue(queue_path, lease_in_seconds=10, max_attempts=1) as job_queue:
+        job_queue.enqueue(["crash-1.pdf", "crash-2.pdf"])
+        with mock.patch("correpy.work_queue.job_queue.time.time", return_value=1000.0):
+            job_queue.claim("worker", limit=2)
+        job_queue.enqueue(["a.pdf"])
+        with mock.patch("correpy.work_queue.job_queue.time.time", return_value=1011.0):
+            jobs = job_queue.claim("worker", limit=1)
+
+        assert [job.source for job in jobs] == ["a.pdf"]
+        assert job_queue.count_jobs()[JobStatus.FAILED] == 2
+
+
+def test_fail_when_retry_is_allowed_then_job_is_pending_until_attempts_are_over(queue_path):
+    with JobQueue(queue_path, max_attempts=2) as job_queue:
+        job_queue.enqueue(["a.pdf"])
+
+        job_queue.fail("worker", job_queue.claim("worker")[0], error="OSError: share unavailable", retry=True)
+        assert job_queue.count_jobs()[JobStatus.PENDING] == 1
+        job_queue.fail("worker", job_queue.claim("worker")[0], error="OSError: share unavailable", retry=True)
+
+        (job_result,) = job_queue.iter_results()
+        assert (job_result.status, job_result.attempts) == (JobStatus.FAILED, 2)
+
+
+def test_job_queue_when_schema_version_is_unknown_then_raises_exception(queue_path):
+    connection = sqlite3.connect(queue_path)
+    connection.execute("PRAGMA user_version = 99")
+    connection.close()
+
+    with pytest.raises(InvalidJobQueueException):
+        JobQueue(queue_path)